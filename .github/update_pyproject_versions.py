@@ -4,6 +4,7 @@ import toml
 
 PYPROJECT_FILES = [
     "src/agent_toolkit/pyproject.toml",
+    "src/asgi_agent/pyproject.toml",
     "src/datasource_django/pyproject.toml",
     "src/datasource_sqlalchemy/pyproject.toml",
     "src/datasource_toolkit/pyproject.toml",
@@ -13,6 +14,7 @@ PYPROJECT_FILES = [
 
 PACKAGE_NAMES = [
     "forestadmin-agent-toolkit",
+    "forestadmin-agent-asgi",
     "forestadmin-datasource-django",
     "forestadmin-datasource-sqlalchemy",
     "forestadmin-datasource-toolkit",
@@ -33,6 +33,7 @@ module.exports = {
           'src/flask_agent/pyproject.toml',
           'src/django_agent/pyproject.toml',
           'src/datasource_django/pyproject.toml',
+          'src/asgi_agent/pyproject.toml',
         ],
         message: 'chore(release): ${nextRelease.gitTag} [skip ci]\n\n${nextRelease.notes}',
       },
@@ -0,0 +1,69 @@
+"""Cost of an ip whitelist check, rule by rule matching vs the compiled matcher.
+
+The rules mix single ips, ranges and subnets of both ip versions. The compiled matcher is measured without its decision
+cache (a new client ip per check), and with it (a few client ips, as in a real session).
+
+usage: python benchmarks/bench_ip_whitelist.py [--rules 1000] [--checks 2000]
+"""
+import argparse
+import random
+import time
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+
+from forestadmin.agent_toolkit.utils.ip_whitelist_util import IpWhitelistMatcher, IpWhitelistUtil
+
+
+def build_rules(count: int, rand: random.Random):
+    rules = []
+    for i in range(count):
+        if i % 4 == 3:
+            base = int(IPv6Address("2001:db8::")) + (rand.randrange(1 << 32) << 64)
+            rules.append({"type": 2, "range": str(IPv6Network((base, 64)))})
+            continue
+
+        base = rand.randrange(int(IPv4Address("1.0.0.0")), int(IPv4Address("223.0.0.0")))
+        if i % 4 == 0:
+            rules.append({"type": 0, "ip": str(IPv4Address(base))})
+        elif i % 4 == 1:
+            rules.append({"type": 1, "ipMinimum": str(IPv4Address(base)), "ipMaximum": str(IPv4Address(base + 255))})
+        else:
+            rules.append({"type": 2, "range": str(IPv4Network((base, 24), strict=False))})
+    return rules
+
+
+def measure(check, ips) -> float:
+    start = time.perf_counter()
+    for ip in ips:
+        check(ip)
+    return (time.perf_counter() - start) / len(ips)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=2000)
+    args = parser.parse_args()
+
+    rand = random.Random(42)
+    rules = build_rules(args.rules, rand)
+    # unmatched ips are the worst case of the rule by rule matching: every rule is tested
+    ips = [str(IPv4Address(rand.randrange(1 << 32))) for _ in range(args.checks)]
+
+    start = time.perf_counter()
+    matcher = IpWhitelistMatcher(rules)
+    compile_duration = time.perf_counter() - start
+
+    results = [
+        ("rule by rule", measure(lambda ip: any(IpWhitelistUtil.is_ip_match_rule(ip, r) for r in rules), ips[:100])),
+        ("compiled", measure(matcher._match, ips)),
+        ("compiled + cache", measure(matcher.is_match, [ips[i % 10] for i in range(args.checks)])),
+    ]
+
+    print(f"{args.rules} rules, compiled in {compile_duration * 1000:.2f}ms")
+    print(f"{'mode':<20}{'per check (us)':>16}")
+    for mode, duration in results:
+        print(f"{mode:<20}{duration * 1_000_000:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
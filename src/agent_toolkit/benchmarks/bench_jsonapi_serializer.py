@@ -0,0 +1,108 @@
+"""Time to serialize a page of records with JsonApiSerializer, as the list route does.
+
+The records have 5 many to one relations, and share their related records (as when listing orders of a few
+customers), so the included records are deduplicated.
+
+usage: python benchmarks/bench_jsonapi_serializer.py [--records 1000] [--related 50] [--runs 20]
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from forestadmin.agent_toolkit.services.serializers.json_api_serializer import JsonApiSerializer
+from forestadmin.datasource_toolkit.collections import Collection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+
+RELATIONS = ["customer", "seller", "store", "carrier", "warehouse"]
+
+
+def column(column_type, is_primary_key=False):
+    return {"type": FieldType.COLUMN, "column_type": column_type, "is_primary_key": is_primary_key}
+
+
+def build_datasource():
+    Collection.__abstractmethods__ = set()  # to instantiate abstract class
+    datasource = Datasource()
+    order = Collection("Order", datasource)  # type:ignore
+    order.add_fields(
+        {
+            "id": column(PrimitiveType.NUMBER, True),
+            "reference": column(PrimitiveType.STRING),
+            "amount": column(PrimitiveType.NUMBER),
+            "paid": column(PrimitiveType.BOOLEAN),
+            "created_at": column(PrimitiveType.DATE),
+        }
+    )
+    for relation in RELATIONS:
+        related = Collection(relation.capitalize(), datasource)  # type:ignore
+        related.add_fields(
+            {
+                "id": column(PrimitiveType.NUMBER, True),
+                "name": column(PrimitiveType.STRING),
+                "created_at": column(PrimitiveType.DATE),
+            }
+        )
+        datasource.add_collection(related)
+        order.add_field(f"{relation}_id", column(PrimitiveType.NUMBER))
+        order.add_field(
+            relation,
+            {
+                "type": FieldType.MANY_TO_ONE,
+                "foreign_collection": relation.capitalize(),
+                "foreign_key": f"{relation}_id",
+                "foreign_key_target": "id",
+            },
+        )
+    datasource.add_collection(order)
+    return datasource, order
+
+
+def build_records(count: int, related: int):
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    records = []
+    for i in range(count):
+        record = {"id": i, "reference": f"order {i}", "amount": "12.5", "paid": i % 2 == 0, "created_at": created_at}
+        for relation in RELATIONS:
+            related_id = i % related
+            record[f"{relation}_id"] = related_id
+            record[relation] = {"id": related_id, "name": f"{relation} {related_id}", "created_at": created_at}
+        records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--related", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    datasource, order = build_datasource()
+    records = build_records(args.records, args.related)
+    projection = Projection(
+        "id",
+        "reference",
+        "amount",
+        "paid",
+        "created_at",
+        *[f"{relation}_id" for relation in RELATIONS],
+        *[f"{relation}:{field}" for relation in RELATIONS for field in ["id", "name", "created_at"]],
+    )
+
+    start = time.perf_counter()
+    dumped = JsonApiSerializer(datasource, projection).serialize(records, order)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        JsonApiSerializer(datasource, projection).serialize(records, order)
+    average = (time.perf_counter() - start) / args.runs
+
+    print(f"{args.records} records, {len(RELATIONS)} relations, {len(dumped['included'])} included records")
+    print(f"first page: {first * 1000:.1f}ms, next pages: {average * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder
 from forestadmin.agent_toolkit.utils.forest_schema.emitter import SchemaEmitter
 from forestadmin.agent_toolkit.utils.forest_schema.type import AgentMeta
 from forestadmin.agent_toolkit.utils.http import ForestHttpApi
+from forestadmin.agent_toolkit.utils.json_encoder import build_json_encoder
 from forestadmin.datasource_toolkit.datasource_customizer.collection_customizer import CollectionCustomizer
 from forestadmin.datasource_toolkit.datasource_customizer.datasource_customizer import DatasourceCustomizer
 from forestadmin.datasource_toolkit.datasource_customizer.types import DataSourceOptions
@@ -52,12 +53,23 @@ class Agent:
         ForestLogger.setup_logger(self.options["logger_level"], self.options["logger"])
         if self.options.get("customize_error_message") is not None:
             HttpResponseBuilder.setup_error_message_customizer(self.options["customize_error_message"])
+        HttpResponseBuilder.setup_json_encoder(build_json_encoder(self.options["json_encoder"]))
+        ForestHttpApi.setup_client(
+            {
+                "timeout": self.options["http_timeout_in_seconds"],
+                "connect_timeout": self.options["http_connect_timeout_in_seconds"],
+                "max_connections": self.options["http_max_connections"],
+                "get_retries": self.options["http_get_retries"],
+            }
+        )
 
         service_options = {
             "env_secret": self.options["env_secret"],
             "server_url": self.options["server_url"],
             "is_production": self.options["is_production"],
             "permission_cache_duration": self.options["permissions_cache_duration_in_seconds"],
+            "permission_cache_soft_duration": self.options["permissions_cache_soft_duration_in_seconds"],
+            "permission_cache_backend": self.options["permissions_cache_backend"],
             "prefix": self.options["prefix"],
             "verify_ssl": self.options["verify_ssl"],
         }
@@ -234,6 +246,8 @@ class Agent:
         else:
             ForestLogger.log("warning", 'Schema update was skipped (caused by options["skip_schema_update"]=True)')
 
+        self._permission_service.build_action_endpoint_index(await self.customizer.get_datasource())
+
         if self.options["instant_cache_refresh"]:
             self._sse_thread.start()
 
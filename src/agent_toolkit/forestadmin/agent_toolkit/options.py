@@ -1,11 +1,15 @@
 import logging
 import os
 import re
-from typing import Callable, Optional, TypedDict
+from typing import TYPE_CHECKING, Callable, Optional, TypedDict, Union
 from urllib.parse import urlparse
 
+from forestadmin.agent_toolkit.services.permissions.cache_backend import PermissionCacheBackend
 from forestadmin.datasource_toolkit.exceptions import ForestException
 
+if TYPE_CHECKING:
+    from forestadmin.agent_toolkit.utils.json_encoder import JsonEncoder
+
 
 class Options(TypedDict):
     # application_url: str  # useless for now
@@ -18,10 +22,17 @@ class Options(TypedDict):
     logger: Callable[[str, str], None]
     logger_level: int
     permissions_cache_duration_in_seconds: int
+    permissions_cache_soft_duration_in_seconds: Optional[int]
+    permissions_cache_backend: Optional[PermissionCacheBackend]
     customize_error_message: Callable[[Exception], str]
     instant_cache_refresh: Optional[bool]
     skip_schema_update: Optional[bool]
     verify_ssl: Optional[bool]
+    http_timeout_in_seconds: float
+    http_connect_timeout_in_seconds: float
+    http_max_connections: int
+    http_get_retries: int
+    json_encoder: Union[str, "JsonEncoder"]
 
 
 class OptionValidator:
@@ -33,8 +44,15 @@ class OptionValidator:
         "logger_level": logging.INFO,
         "customize_error_message": None,
         "permissions_cache_duration_in_seconds": 15 * 60,
+        "permissions_cache_soft_duration_in_seconds": None,
+        "permissions_cache_backend": None,
         "skip_schema_update": False,
         "verify_ssl": os.environ.get("FOREST_VERIFY_SSL", "True").lower() == "true",
+        "http_timeout_in_seconds": 30,
+        "http_connect_timeout_in_seconds": 10,
+        "http_max_connections": 10,
+        "http_get_retries": 2,
+        "json_encoder": "json",
     }
 
     @classmethod
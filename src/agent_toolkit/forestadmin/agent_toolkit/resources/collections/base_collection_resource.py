@@ -1,16 +1,26 @@
-from typing import Union
+from itertools import chain
+from typing import List, Optional, Union
 
 from forestadmin.agent_toolkit.options import Options
 from forestadmin.agent_toolkit.resources.ip_white_list_resource import IpWhitelistResource
 from forestadmin.agent_toolkit.services.permissions.ip_whitelist_service import IpWhiteListService
 from forestadmin.agent_toolkit.services.permissions.permission_service import PermissionService
+from forestadmin.agent_toolkit.services.serializers import add_search_metadata
+from forestadmin.agent_toolkit.services.serializers.json_api_serializer import JsonApiSerializer
+from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder, Response, StreamingResponse
+from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasource_customizer.datasource_customizer import DatasourceCustomizer
 from forestadmin.datasource_toolkit.interfaces.models.collections import BoundCollection, Datasource
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 
 DatasourceAlias = Union[Datasource[BoundCollection], DatasourceCustomizer]
 
 
 class BaseCollectionResource(IpWhitelistResource):
+    # lists of at least this many records are streamed
+    STREAMED_RECORDS_THRESHOLD = 200
+
     def __init__(
         self,
         datasource: DatasourceAlias,
@@ -21,3 +31,27 @@ class BaseCollectionResource(IpWhitelistResource):
         super(BaseCollectionResource, self).__init__(ip_white_list_service, options)
         self.permission = permission
         self.datasource = datasource
+
+    def _build_records_response(
+        self,
+        records: List[RecordsDataAlias],
+        collection: Collection,
+        projection: Projection,
+        search: Optional[str] = None,
+    ) -> Union[Response, StreamingResponse]:
+        """json:api response of a list of records, the large lists are serialized and sent by chunks
+
+        raise JsonApiException
+        """
+        serializer = JsonApiSerializer(self.datasource, projection)
+        if len(records) < self.STREAMED_RECORDS_THRESHOLD:
+            dumped = serializer.serialize(records, collection)
+            if search:
+                dumped = add_search_metadata(dumped, search)
+            return HttpResponseBuilder.build_success_response(dumped)
+
+        chunks = serializer.serialize_chunks(records, collection, HttpResponseBuilder.encode_json, search)
+        # the first chunk is serialized eagerly, so that the errors of the first records are still returned as an error
+        # response
+        first_chunk = next(chunks)
+        return HttpResponseBuilder.build_json_stream_response(chain([first_chunk], chunks))
@@ -14,6 +14,7 @@ from forestadmin.agent_toolkit.resources.collections.decorators import (
 from forestadmin.agent_toolkit.resources.collections.exceptions import CollectionResourceException
 from forestadmin.agent_toolkit.resources.collections.filter import (
     FilterException,
+    build_export_filter,
     build_filter,
     build_paginated_filter,
     parse_condition_tree,
@@ -25,12 +26,11 @@ from forestadmin.agent_toolkit.resources.collections.requests import RequestColl
 from forestadmin.agent_toolkit.resources.context_variable_injector_mixin import ContextVariableInjectorResourceMixin
 from forestadmin.agent_toolkit.services.permissions.ip_whitelist_service import IpWhiteListService
 from forestadmin.agent_toolkit.services.permissions.permission_service import PermissionService
-from forestadmin.agent_toolkit.services.serializers import add_search_metadata
 from forestadmin.agent_toolkit.services.serializers.exceptions import JsonApiException
 from forestadmin.agent_toolkit.services.serializers.json_api_deserializer import JsonApiDeserializer
 from forestadmin.agent_toolkit.services.serializers.json_api_serializer import JsonApiSerializer
 from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder, Request, RequestMethod, Response, User
-from forestadmin.agent_toolkit.utils.csv import Csv, CsvException
+from forestadmin.agent_toolkit.utils.csv import Csv
 from forestadmin.agent_toolkit.utils.id import IdException, unpack_id
 from forestadmin.agent_toolkit.utils.sql_query_checker import SqlQueryChecker
 from forestadmin.datasource_toolkit.collections import Collection
@@ -194,18 +194,12 @@ class CrudResource(BaseCollectionResource, ContextVariableInjectorResourceMixin)
         records = await request.collection.list(request.user, paginated_filter, projections)
 
         try:
-            dumped: Dict[str, Any] = self._serialize_records_with_relationships(
-                records, request.collection, projections, many=True
-            )
+            projections = self._with_to_many_relationships(records, request.collection, projections)
+            return self._build_records_response(records, request.collection, projections, paginated_filter.search)
         except JsonApiException as e:
             ForestLogger.log("exception", e)
             return HttpResponseBuilder.build_client_error_response([e])
 
-        if paginated_filter.search:
-            dumped = add_search_metadata(dumped, paginated_filter.search)
-
-        return HttpResponseBuilder.build_success_response(dumped)
-
     @check_method(RequestMethod.GET)
     @authenticate
     @authorize("browse")
@@ -213,10 +207,9 @@ class CrudResource(BaseCollectionResource, ContextVariableInjectorResourceMixin)
     async def csv(self, request: RequestCollection) -> Response:
         scope_tree = await self.permission.get_scope(request.user, request.collection)
         try:
-            paginated_filter = build_paginated_filter(request, scope_tree)
+            paginated_filter = build_export_filter(request, scope_tree)
             condition_tree = await self._handle_live_query_segment(request, paginated_filter.condition_tree)
             paginated_filter = paginated_filter.override({"condition_tree": condition_tree})
-            paginated_filter.page = None
         except FilterException as e:
             ForestLogger.log("exception", e)
             return HttpResponseBuilder.build_client_error_response([e])
@@ -226,15 +219,14 @@ class CrudResource(BaseCollectionResource, ContextVariableInjectorResourceMixin)
             ForestLogger.log("exception", e)
             return HttpResponseBuilder.build_client_error_response([e])
 
-        records = await request.collection.list(request.user, paginated_filter, projections)
-
-        try:
-            csv_str = Csv.make_csv(records, projections)
-        except CsvException as e:
-            ForestLogger.log("exception", e)
-            return HttpResponseBuilder.build_client_error_response([e])
-        return HttpResponseBuilder.build_csv_response(
-            csv_str, f"{request.query.get('filename', request.collection.name)}.csv"
+        batches = await Csv.iter_batches(
+            lambda page_filter: request.collection.list(request.user, page_filter, projections),
+            request.collection,
+            paginated_filter,
+        )
+        return HttpResponseBuilder.build_csv_stream_response(
+            Csv.make_csv_stream(batches, projections),
+            f"{request.query.get('filename', request.collection.name)}.csv",
         )
 
     @check_method(RequestMethod.GET)
@@ -436,6 +428,19 @@ class CrudResource(BaseCollectionResource, ContextVariableInjectorResourceMixin)
         projection: Projection,
         many: bool,
     ) -> Dict[str, Any]:
+        projection = self._with_to_many_relationships(records, collection, projection)
+        ret = JsonApiSerializer(self.datasource, projection).serialize(
+            records if many is True else records[0], collection
+        )
+        return ret
+
+    def _with_to_many_relationships(
+        self,
+        records: List[RecordsDataAlias],
+        collection: Union[Collection, CollectionCustomizer],
+        projection: Projection,
+    ) -> Projection:
+        """add the to many relations (to dump their links) to the projection and to the records"""
         relations_to_set = []
         projection = Projection(*projection)
         for name, schema in collection.schema["fields"].items():
@@ -450,11 +455,7 @@ class CrudResource(BaseCollectionResource, ContextVariableInjectorResourceMixin)
         for record in records:
             for name in relations_to_set:
                 record[name] = None
-
-        ret = JsonApiSerializer(self.datasource, projection).serialize(
-            records if many is True else records[0], collection
-        )
-        return ret
+        return projection
 
     async def _handle_live_query_segment(
         self, request: RequestCollection, condition_tree: Optional[ConditionTree]
@@ -1,5 +1,5 @@
 import sys
-from typing import Any, Dict, List, Literal, Union, cast
+from typing import List, Literal, Union, cast
 
 if sys.version_info >= (3, 9):
     import zoneinfo
@@ -16,6 +16,7 @@ from forestadmin.agent_toolkit.resources.collections.decorators import (
 )
 from forestadmin.agent_toolkit.resources.collections.exceptions import CollectionResourceException
 from forestadmin.agent_toolkit.resources.collections.filter import (
+    build_export_filter,
     build_filter,
     build_paginated_filter,
     parse_condition_tree,
@@ -26,11 +27,9 @@ from forestadmin.agent_toolkit.resources.collections.requests import (
     RequestCollectionException,
     RequestRelationCollection,
 )
-from forestadmin.agent_toolkit.services.serializers import add_search_metadata
 from forestadmin.agent_toolkit.services.serializers.exceptions import JsonApiException
-from forestadmin.agent_toolkit.services.serializers.json_api_serializer import JsonApiSerializer
 from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder, Request, RequestMethod, Response
-from forestadmin.agent_toolkit.utils.csv import Csv, CsvException
+from forestadmin.agent_toolkit.utils.csv import Csv
 from forestadmin.agent_toolkit.utils.id import unpack_id
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasources import DatasourceException
@@ -105,16 +104,13 @@ class CrudRelatedResource(BaseCollectionResource):
             projection,
         )
         try:
-            dumped = JsonApiSerializer(self.datasource, projection).serialize(records, request.foreign_collection)
+            return self._build_records_response(
+                records, request.foreign_collection, projection, paginated_filter.search
+            )
         except JsonApiException as e:
             ForestLogger.log("exception", e)
             return HttpResponseBuilder.build_client_error_response([e])
 
-        if paginated_filter.search:
-            dumped = add_search_metadata(dumped, paginated_filter.search)
-
-        return HttpResponseBuilder.build_success_response(cast(Dict[str, Any], dumped))
-
     @authenticate
     @authorize("browse")
     @authorize("export")
@@ -133,30 +129,29 @@ class CrudRelatedResource(BaseCollectionResource):
             ForestLogger.log("exception", e)
             return HttpResponseBuilder.build_client_error_response([e])
         scope_tree = await self.permission.get_scope(request.user, request.foreign_collection)
-        paginated_filter = build_paginated_filter(request, scope_tree)
-        paginated_filter.page = None
+        paginated_filter = build_export_filter(request, scope_tree)
         try:
             projection = parse_projection_with_pks(request)
         except DatasourceException as e:
             ForestLogger.log("exception", e)
             return HttpResponseBuilder.build_client_error_response([e])
-        records = await CollectionUtils.list_relation(
-            request.user,
-            cast(Collection, request.collection),
-            ids,
+
+        batches = await Csv.iter_batches(
+            lambda page_filter: CollectionUtils.list_relation(
+                request.user,
+                cast(Collection, request.collection),
+                ids,
+                cast(Collection, request.foreign_collection),
+                request.relation_name,
+                page_filter,
+                projection,
+            ),
             cast(Collection, request.foreign_collection),
-            request.relation_name,
             paginated_filter,
-            projection,
         )
-
-        try:
-            csv_str = Csv.make_csv(records, projection)
-        except CsvException as e:
-            ForestLogger.log("exception", e)
-            return HttpResponseBuilder.build_client_error_response([e])
-        return HttpResponseBuilder.build_csv_response(
-            csv_str, f"{request.query.get('filename', request.collection.name)}.csv"
+        return HttpResponseBuilder.build_csv_stream_response(
+            Csv.make_csv_stream(batches, projection),
+            f"{request.query.get('filename', request.collection.name)}.csv",
         )
 
     @authenticate
@@ -13,6 +13,7 @@ from forestadmin.agent_toolkit.utils.context import (
     Response,
     User,
 )
+from forestadmin.agent_toolkit.utils.token import UserTokenCache
 from forestadmin.datasource_toolkit.exceptions import ForbiddenError
 
 BoundRequest = TypeVar("BoundRequest", bound=Request)
@@ -20,6 +21,8 @@ BoundCollectionResource = TypeVar("BoundCollectionResource", bound=BaseCollectio
 BoundRequestCollection = TypeVar("BoundRequestCollection", bound=RequestCollection)
 BoundIpWhitelistResource = TypeVar("BoundIpWhitelistResource", bound=IpWhitelistResource)
 
+user_token_cache = UserTokenCache()
+
 
 async def _authenticate(
     self: "BoundIpWhitelistResource",
@@ -39,22 +42,30 @@ async def _authenticate(
     except IndexError:
         return Response(status=401)
 
-    try:
-        user = jwt.decode(token, self.option["auth_secret"], algorithms=["HS256"])
-    except jwt.PyJWTError:
-        return Response(status=401)
-
-    request.user = User(
-        rendering_id=int(user["rendering_id"]),
-        user_id=int(user["id"]),
-        tags=user.get("tags", {}),
-        email=user["email"],
-        first_name=user["first_name"],
-        last_name=user["last_name"],
-        team=user["team"],
-        timezone=parse_timezone(request),
-        request={"ip": request.client_ip},
+    cache_key = user_token_cache.build_key(
+        token, self.option["auth_secret"], (request.query or {}).get("timezone"), request.client_ip
     )
+    user = user_token_cache.get(cache_key)
+    if user is None:
+        try:
+            claims = jwt.decode(token, self.option["auth_secret"], algorithms=["HS256"])
+        except jwt.PyJWTError:
+            return Response(status=401)
+
+        user = User(
+            rendering_id=int(claims["rendering_id"]),
+            user_id=int(claims["id"]),
+            tags=claims.get("tags", {}),
+            email=claims["email"],
+            first_name=claims["first_name"],
+            last_name=claims["last_name"],
+            team=claims["team"],
+            timezone=parse_timezone(request),
+            request={"ip": request.client_ip},
+        )
+        user_token_cache.set(cache_key, user, claims.get("exp"))
+
+    request.user = user
     return await decorated_fn(self, request)
 
 
@@ -1,6 +1,8 @@
 import json
 import sys
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, cast
 
 if sys.version_info >= (3, 9):
     import zoneinfo
@@ -30,7 +32,7 @@ from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base i
 from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
 from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter, FilterComponent
 from forestadmin.datasource_toolkit.interfaces.query.page import Page
-from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from forestadmin.datasource_toolkit.interfaces.query.projections import FrozenProjection, Projection
 from forestadmin.datasource_toolkit.interfaces.query.projections.factory import ProjectionFactory
 from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
 from forestadmin.datasource_toolkit.interfaces.query.sort.factory import SortFactory
@@ -41,6 +43,7 @@ from forestadmin.datasource_toolkit.validations.projection import ProjectionVali
 
 DEFAULT_ITEMS_PER_PAGE = 15
 DEFAULT_PAGE_TO_SKIP = 1
+PARSED_QUERIES_CACHE_SIZE = 512
 
 STRING_TO_BOOLEAN = {
     "true": True,
@@ -56,6 +59,52 @@ class FilterException(AgentToolkitException):
     pass
 
 
+T = TypeVar("T")
+
+
+class ParsedQueriesCache:
+    """bounded LRU cache of the condition trees, sorts and projections parsed and validated from the raw parameters
+
+    The frontend sends the same parameters over and over, an entry is reused as long as the schemas of the collections
+    of the datasource (on which the validation depends) are the ones it was parsed with. The callers must copy the
+    cached values, which are not immutable.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[CollectionSchema, ...], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, collection: Collection, key: Tuple[Any, ...], parse: Callable[[], T]) -> T:
+        schemas = tuple(c.schema for c in collection.datasource.collections)
+        cache_key = (collection, *key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and self._is_fresh(entry[0], schemas):
+                self._entries.move_to_end(cache_key)
+                return entry[1]
+
+        value = parse()
+        with self._lock:
+            self._entries[cache_key] = (schemas, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _is_fresh(cached: Tuple[CollectionSchema, ...], schemas: Tuple[CollectionSchema, ...]) -> bool:
+        # the decorators build a new schema when theirs changes
+        return len(cached) == len(schemas) and all(a is b for a, b in zip(cached, schemas))
+
+
+parsed_queries_cache = ParsedQueriesCache(PARSED_QUERIES_CACHE_SIZE)
+
+
 def _get_collection(
     request: Union[RequestCollection, RequestRelationCollection],
 ) -> Union[CollectionCustomizer, Collection]:
@@ -110,6 +159,13 @@ def parse_selection_ids(schema: CollectionSchema, request: RequestCollection) ->
 
 def parse_sort(request: Union[RequestCollection, RequestRelationCollection]):
     raw_sort_string: Optional[str] = _subset_or_query(request, "sort")
+    sort = parsed_queries_cache.get_or_parse(
+        _get_collection(request), ("sort", raw_sort_string), lambda: _parse_sort(request, raw_sort_string)
+    )
+    return Sort([{**clause} for clause in sort])
+
+
+def _parse_sort(request: Union[RequestCollection, RequestRelationCollection], raw_sort_string: Optional[str]) -> Sort:
     if not raw_sort_string:
         return SortFactory.by_primary_keys(_get_collection(request))
 
@@ -198,9 +254,18 @@ def parse_condition_tree(request: Union[RequestCollection, RequestRelationCollec
     if not filters:
         return None
 
+    collection = _get_collection(request)
+    key = filters if isinstance(filters, str) else json.dumps(filters, sort_keys=True)
+    condition_tree = parsed_queries_cache.get_or_parse(
+        collection, ("condition_tree", key), lambda: _parse_condition_tree(collection, filters)
+    )
+    # the decorators may update the leaves of the trees they receive
+    return condition_tree.replace(lambda leaf: leaf.override({}))
+
+
+def _parse_condition_tree(collection: Collection, filters: Union[str, Dict[str, Any]]) -> ConditionTree:
     json_filters = json.loads(filters) if isinstance(filters, str) else filters
     try:
-        collection = _get_collection(request)
         json_filters = sanitize_json_filter(json_filters, collection)
 
         condition_tree = ConditionTreeFactory.from_plain_object(json_filters)
@@ -295,7 +360,20 @@ def _get_expected_type_for_condition(
     return cast(PrimitiveType, field_schema["column_type"])
 
 
+def _projection_key(request: Union[RequestCollection, RequestRelationCollection]) -> Tuple[Tuple[str, str], ...]:
+    if not request.query:
+        return ()
+    return tuple(sorted((key, str(value)) for key, value in request.query.items() if key.startswith("fields[")))
+
+
 def parse_projection(request: Union[RequestCollection, RequestRelationCollection]) -> Projection:
+    projection = parsed_queries_cache.get_or_parse(
+        _get_collection(request), ("projection", *_projection_key(request)), lambda: _parse_projection(request).freeze()
+    )
+    return Projection(*projection)
+
+
+def _parse_projection(request: Union[RequestCollection, RequestRelationCollection]) -> Projection:
     collection = _get_collection(request)
     schema = collection.schema
     if not request.query or not request.query.get(f"fields[{collection.name}]"):
@@ -319,9 +397,14 @@ def parse_projection(request: Union[RequestCollection, RequestRelationCollection
     return Projection(*explicit_request)
 
 
-def parse_projection_with_pks(request: Union[RequestCollection, RequestRelationCollection]):
-    projection = parse_projection(request)
-    return projection.with_pks(_get_collection(request))
+def parse_projection_with_pks(request: Union[RequestCollection, RequestRelationCollection]) -> FrozenProjection:
+    """frozen projection shared by the requests on the same fields, so that its derived projections are computed once"""
+    collection = _get_collection(request)
+    return parsed_queries_cache.get_or_parse(
+        collection,
+        ("projection_with_pks", *_projection_key(request)),
+        lambda: parse_projection(request).with_pks(collection).freeze(),
+    )
 
 
 def build_paginated_filter(
@@ -334,6 +417,18 @@ def build_paginated_filter(
     return res
 
 
+def build_export_filter(
+    request: Union[RequestCollection, RequestRelationCollection], scope: Optional[ConditionTree]
+) -> PaginatedFilter:
+    """unpaginated filter whose sort ends with the primary keys, so that the records can be read in stable batches"""
+    _filter = build_filter(request, scope)
+    sort = parse_sort(request)
+    sorted_fields = [clause["field"] for clause in sort]
+    pk_sort = SortFactory.by_primary_keys(_get_collection(request))
+    sort.extend(clause for clause in pk_sort if clause["field"] not in sorted_fields)
+    return PaginatedFilter({"sort": sort, **_filter.to_filter_component()})  # type: ignore
+
+
 def build_filter(request: Union[RequestCollection, RequestRelationCollection], scope: Optional[ConditionTree]):
     filter_component: FilterComponent = {
         "search": parse_search(request),
@@ -5,7 +5,7 @@ from forestadmin.agent_toolkit.resources.collections.decorators import ip_white_
 from forestadmin.agent_toolkit.resources.ip_white_list_resource import IpWhitelistResource
 from forestadmin.agent_toolkit.resources.security.exceptions import AuthenticationException, OpenIdException
 from forestadmin.agent_toolkit.utils.authentication import ClientFactory, CustomClientOic
-from forestadmin.agent_toolkit.utils.context import Request, Response
+from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder, Request, Response
 from forestadmin.agent_toolkit.utils.http import ForestHttpApi
 from forestadmin.agent_toolkit.utils.token import build_jwt
 
@@ -36,7 +36,7 @@ class Authentication(IpWhitelistResource):
 
         return Response(
             status=200,
-            body=json.dumps({"authorizationUrl": authorization_url}),
+            body=HttpResponseBuilder.encode_json({"authorizationUrl": authorization_url}),
             headers={"content_type": "application/json"},
         )
 
@@ -79,7 +79,7 @@ class Authentication(IpWhitelistResource):
 
         return Response(
             status=200,
-            body=json.dumps({"token": token, "tokenData": body}),
+            body=HttpResponseBuilder.encode_json({"token": token, "tokenData": body}),
             headers={"content_type": "application/json"},
         )
 
@@ -91,7 +91,7 @@ class Authentication(IpWhitelistResource):
         if isinstance(exc, OpenIdException):
             return Response(
                 status=exc.STATUS,
-                body=json.dumps(
+                body=HttpResponseBuilder.encode_json(
                     {
                         "error": exc.error,
                         "error_description": exc.error_description,
@@ -102,7 +102,7 @@ class Authentication(IpWhitelistResource):
         elif isinstance(exc, AuthenticationException):
             return Response(
                 status=exc.STATUS,
-                body=json.dumps(
+                body=HttpResponseBuilder.encode_json(
                     {
                         "error": exc.__class__.__name__,
                         "error_description": exc.args[0],
@@ -0,0 +1,39 @@
+from typing import Dict, Optional, Tuple
+
+from forestadmin.agent_toolkit.utils.forest_schema.generator_action import SchemaActionGenerator
+from forestadmin.datasource_toolkit.collections import Collection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.interfaces.models.collections import CollectionSchema
+
+
+class ActionEndpointIndex:
+    """smart action names by collection and endpoint, to authorize actions without generating the forest schema
+
+    The actions of a collection are indexed again when its schema changes: after `mark_schema_as_dirty`, the decorators
+    build a new schema object.
+    """
+
+    def __init__(self):
+        self._collections: Dict[str, Tuple[CollectionSchema, Dict[str, str]]] = {}
+
+    def build(self, datasource: Datasource):
+        for collection in datasource.collections:
+            self._index_collection(collection)
+
+    def get_action_name(self, collection: Collection, endpoint: str) -> Optional[str]:
+        schema = collection.schema
+        indexed = self._collections.get(collection.name)
+        if indexed is None or indexed[0] is not schema:
+            indexed = self._index_collection(collection)
+        return indexed[1].get(endpoint)
+
+    def _index_collection(self, collection: Collection) -> Tuple[CollectionSchema, Dict[str, str]]:
+        schema = collection.schema
+        endpoints = {
+            SchemaActionGenerator.get_action_endpoint(
+                collection.name, idx, SchemaActionGenerator.get_action_slug(name)
+            ): name
+            for idx, name in enumerate(schema["actions"].keys())
+        }
+        self._collections[collection.name] = (schema, endpoints)
+        return schema, endpoints
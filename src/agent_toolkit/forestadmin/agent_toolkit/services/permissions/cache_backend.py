@@ -0,0 +1,130 @@
+import abc
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+if os.name == "posix":
+    import fcntl
+else:
+    fcntl = None
+
+
+class PermissionCacheBackend(abc.ABC):
+    """cache shared by the agent processes of a host, behind the in process permission caches
+
+    Values are stored with the (wall clock) time they were fetched at, so every process knows their age.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """return (value, fetched_at), or None when the key is missing or expired"""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, fetched_at: float, ttl: float):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abc.abstractmethod
+    def delete_prefix(self, prefix: str):
+        pass
+
+    def get_listener_lock_path(self) -> Optional[str]:
+        """lock file electing the process listening to the server events for the whole host, None to disable it"""
+        return None
+
+
+class SQLitePermissionCacheBackend(PermissionCacheBackend):
+    """permission cache in a sqlite file, shared by the processes (gunicorn or uwsgi workers) of a host
+
+    Values are pickled: the file must only be writable by the agent processes.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS forest_permission_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, fetched_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value, fetched_at FROM forest_permission_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, fetched_at: float, ttl: float):
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO forest_permission_cache (key, value, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value), fetched_at, fetched_at + ttl),
+            )
+
+    def delete(self, key: str):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM forest_permission_cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM forest_permission_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def get_listener_lock_path(self) -> Optional[str]:
+        return f"{self.path}.sse-listener.lock"
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared between threads, nor with the processes forked after their opening
+        pid, connection = getattr(self._local, "connection", (None, None))
+        if pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = (os.getpid(), connection)
+        return connection
+
+
+class HostElection:
+    """an exclusive lock on a file, held by a single process of the host until it releases it or exits"""
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self.is_elected = False
+        self._file = None
+
+    def try_acquire(self) -> bool:
+        if self.is_elected:
+            return True
+
+        # without flock (windows), every process is elected
+        if fcntl is not None:
+            lock_file = open(self.lock_path, "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._file = lock_file
+
+        self.is_elected = True
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self.is_elected = False
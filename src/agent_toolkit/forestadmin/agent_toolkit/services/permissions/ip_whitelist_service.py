@@ -3,7 +3,7 @@ from typing import Any
 from cachetools import TTLCache
 from forestadmin.agent_toolkit.services.permissions.options import RoleOptions
 from forestadmin.agent_toolkit.utils.http import ForestHttpApi
-from forestadmin.agent_toolkit.utils.ip_whitelist_util import IpWhitelistUtil
+from forestadmin.agent_toolkit.utils.ip_whitelist_util import IpWhitelistMatcher
 from forestadmin.datasource_toolkit.exceptions import ForestException
 
 
@@ -13,7 +13,7 @@ class IpWhiteListService:
         self.cache: TTLCache[int, Any] = TTLCache(maxsize=256, ttl=options["permission_cache_duration"])
 
     def invalidate_cache(self):
-        for key in ["rules", "use_ip_whitelist"]:
+        for key in ["rules", "use_ip_whitelist", "matcher"]:
             if key in self.cache:
                 del self.cache[key]
 
@@ -37,8 +37,7 @@ class IpWhiteListService:
         if "rules" not in self.cache or "use_ip_whitelist" not in self.cache:
             await self.retrieve()
 
-        for rule in self.cache["rules"]:
-            if IpWhitelistUtil.is_ip_match_rule(ip, rule):
-                return True
-
-        return False
+        # the rules are compiled on their first use, and again after each fetch
+        if "matcher" not in self.cache:
+            self.cache["matcher"] = IpWhitelistMatcher(self.cache["rules"])
+        return self.cache["matcher"].is_match(ip)
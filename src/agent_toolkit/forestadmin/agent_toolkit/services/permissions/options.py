@@ -1,4 +1,6 @@
-from typing import TypedDict
+from typing import Optional, TypedDict
+
+from forestadmin.agent_toolkit.services.permissions.cache_backend import PermissionCacheBackend
 
 
 class RoleOptions(TypedDict):
@@ -6,4 +8,6 @@ class RoleOptions(TypedDict):
     env_secret: str
     is_production: bool
     permission_cache_duration: int
+    permission_cache_soft_duration: Optional[int]
+    permission_cache_backend: Optional[PermissionCacheBackend]
     prefix: str
@@ -1,8 +1,13 @@
-from typing import Any, Dict, Optional, Union
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypedDict, Union
 
 from cachetools import TTLCache
 from forestadmin.agent_toolkit.forest_logger import ForestLogger
 from forestadmin.agent_toolkit.resources.collections.requests import RequestCollection
+from forestadmin.agent_toolkit.services.permissions.action_endpoint_index import ActionEndpointIndex
+from forestadmin.agent_toolkit.services.permissions.cache_backend import PermissionCacheBackend
 from forestadmin.agent_toolkit.services.permissions.options import RoleOptions
 from forestadmin.agent_toolkit.services.permissions.permissions_functions import (
     _decode_actions_permissions,
@@ -12,28 +17,105 @@ from forestadmin.agent_toolkit.services.permissions.permissions_functions import
     _dict_hash,
     _hash_chart,
 )
+from forestadmin.agent_toolkit.services.permissions.single_flight import SingleFlight, SingleFlightMetrics
 from forestadmin.agent_toolkit.services.permissions.smart_actions_checker import SmartActionChecker
 from forestadmin.agent_toolkit.utils.context import User
 from forestadmin.agent_toolkit.utils.context_variable_injector import ContextVariableInjector
 from forestadmin.agent_toolkit.utils.context_variables import ContextVariables
-from forestadmin.agent_toolkit.utils.forest_schema.emitter import SchemaEmitter
-from forestadmin.agent_toolkit.utils.forest_schema.type import ForestServerAction
+from forestadmin.agent_toolkit.utils.forest_schema.generator_action import SchemaActionGenerator
 from forestadmin.agent_toolkit.utils.http import ForestHttpApi
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasource_customizer.collection_customizer import CollectionCustomizer
+from forestadmin.datasource_toolkit.datasources import Datasource
 from forestadmin.datasource_toolkit.exceptions import ForbiddenError, ForestException
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base import ConditionTree
 from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
 
+_MISSING = object()
+
+
+class PermissionCacheMetrics(TypedDict):
+    stale_hits: int
+    background_refreshes: int
+    background_refresh_failures: int
+
 
 class PermissionService:
+    # number of renderings whose permissions are kept, the least recently used ones are evicted
+    RENDERING_CACHE_SIZE = 64
+    # with a shared cache backend, how long (in seconds) a process keeps the entries it read from the backend,
+    # and so the delay for the invalidations made by other processes to be seen
+    SHARED_CACHE_LOCAL_TTL = 5
+
     def __init__(self, options: RoleOptions):
+        """with permission_cache_soft_duration, the entries older than it are still returned while a thread fetches
+        them again. They are never kept longer than permission_cache_duration, even when the refresh fails.
+
+        permission_cache_backend shares the fetched permissions between the processes of the host."""
         self.options = options
-        self.cache: TTLCache[str, Any] = TTLCache(maxsize=256, ttl=options["permission_cache_duration"])
+        self.cache_backend: Optional[PermissionCacheBackend] = options.get("permission_cache_backend")
+        local_ttl = options["permission_cache_duration"]
+        if self.cache_backend is not None:
+            local_ttl = min(local_ttl, self.SHARED_CACHE_LOCAL_TTL)
+        self.cache: TTLCache[str, Any] = TTLCache(maxsize=256, ttl=local_ttl)
+        self.rendering_cache: TTLCache[int, Any] = TTLCache(maxsize=self.RENDERING_CACHE_SIZE, ttl=local_ttl)
+        self.soft_ttl: Optional[int] = options.get("permission_cache_soft_duration")
+        # concurrent cache misses share a single call to the forest server
+        self._single_flight = SingleFlight()
+        self._action_endpoint_index = ActionEndpointIndex()
+        # the caches are read by the request threads and written by the refresh thread, TTLCache is not thread safe
+        self._lock = threading.Lock()
+        self._fetched_at: Dict[str, float] = {}
+        self._refreshing = set()
+        self._stale_hits = 0
+        self._background_refreshes = 0
+        self._background_refresh_failures = 0
+        self._refresh_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def build_action_endpoint_index(self, datasource: Datasource):
+        """index the smart actions of the datasource collections, instead of doing it on the first action calls"""
+        self._action_endpoint_index.build(datasource)
+
+    def get_fetch_metrics(self) -> SingleFlightMetrics:
+        """number of fetches sent to the forest server (issued), and of cache misses which waited for one of them
+        instead of sending their own (coalesced)"""
+        return self._single_flight.get_metrics()
+
+    def get_cache_metrics(self) -> PermissionCacheMetrics:
+        """number of entries returned after their soft ttl, and of their background refreshes"""
+        with self._lock:
+            return {
+                "stale_hits": self._stale_hits,
+                "background_refreshes": self._background_refreshes,
+                "background_refresh_failures": self._background_refresh_failures,
+            }
 
     def invalidate_cache(self, key: str):
-        if key in self.cache:
-            del self.cache[key]
+        if key == "forest.rendering":
+            self.invalidate_rendering_cache()
+            return
+
+        with self._lock:
+            self.cache.pop(key, None)
+            self._fetched_at.pop(key, None)
+        self._call_cache_backend("delete", key)
+
+    def invalidate_rendering_cache(self, rendering_id: Optional[Union[int, str]] = None):
+        """invalidate the permissions of one rendering, or of all of them when rendering_id is None or invalid"""
+        try:
+            rendering_id = int(rendering_id)  # type: ignore
+        except (TypeError, ValueError):
+            with self._lock:
+                self.rendering_cache.clear()
+                for fetch_key in [key for key in self._fetched_at if key.startswith("forest.rendering:")]:
+                    self._fetched_at.pop(fetch_key, None)
+            self._call_cache_backend("delete_prefix", "forest.rendering:")
+            return
+
+        with self._lock:
+            self.rendering_cache.pop(rendering_id, None)
+            self._fetched_at.pop(f"forest.rendering:{rendering_id}", None)
+        self._call_cache_backend("delete", f"forest.rendering:{rendering_id}")
 
     async def can(self, caller: User, collection: Collection, action: str, allow_fetch: bool = False):
         if not await self._has_permission_system():
@@ -112,15 +194,15 @@ class PermissionService:
 
         user_data = await self.get_user_data(request.user.user_id)
         collection_data = await self._get_collection_permissions_data(allow_fetch)
-        action = await self._find_action_from_endpoint(collection, request.query, request.method)
+        action_name = self._find_action_name_from_endpoint(collection, request.query)
 
-        if action is None:
+        if action_name is None:
             raise ForestException(f"The collection {collection.name} does not have this smart action")
 
         smart_action_approval = SmartActionChecker(
             request,
             collection,
-            collection_data[collection.name]["actions"][action["name"]],
+            collection_data[collection.name]["actions"][action_name],
             request.user,
             user_data["roleId"],
             filter_,
@@ -129,7 +211,7 @@ class PermissionService:
         is_allowed = await smart_action_approval.can_execute()
 
         allowed_txt = "not allowed" if not is_allowed else "allowed"
-        ForestLogger.log("debug", f"User {user_data['roleId']} is {allowed_txt} to perform {action['name']}")
+        ForestLogger.log("debug", f"User {user_data['roleId']} is {allowed_txt} to perform {action_name}")
 
         return is_allowed
 
@@ -150,54 +232,62 @@ class PermissionService:
         return ContextVariableInjector.inject_context_in_filter(scope, context_variable)
 
     async def _has_permission_system(self) -> bool:
-        if "forest.has_permission" not in self.cache:
-            self.cache["forest.has_permission"] = not (
-                await ForestHttpApi.get_environment_permissions(self.options) is True
-            )
+        return await self._get_cached(
+            self.cache, "forest.has_permission", "forest.has_permission", self._fetch_has_permission_system
+        )
 
-        return self.cache["forest.has_permission"]
+    async def _fetch_has_permission_system(self) -> bool:
+        return not (await ForestHttpApi.get_environment_permissions(self.options) is True)
 
     async def get_user_data(self, user_id: int):
-        if "forest.users" not in self.cache:
-            users = {}
-            ForestLogger.log("debug", "Refreshing user permissions cache")
-            response = await ForestHttpApi.get_users(self.options)
-            for user in response:
-                users[user["id"]] = user
-            self.cache["forest.users"] = users
+        return (await self._get_cached(self.cache, "forest.users", "forest.users", self._fetch_users))[user_id]
 
-        return self.cache["forest.users"][user_id]
+    async def _fetch_users(self):
+        users = {}
+        ForestLogger.log("debug", "Refreshing user permissions cache")
+        response = await ForestHttpApi.get_users(self.options)
+        for user in response:
+            users[user["id"]] = user
+        return users
 
     async def get_team(self, rendering_id: int):
         permissions = await self._get_rendering_data(rendering_id)
         return permissions["team"]
 
     async def _get_collection_permissions_data(self, force_fetch: bool = False):
-        if force_fetch and "forest.collections" in self.cache:
-            del self.cache["forest.collections"]
-
-        if "forest.collections" not in self.cache:
-            ForestLogger.log("debug", "Fetching environment permissions")
-            response = await ForestHttpApi.get_environment_permissions(self.options)
-            collections = {}
-            for name, collection in response["collections"].items():
-                collections[name] = {
-                    **_decode_crud_permissions(collection),
-                    **_decode_actions_permissions(collection),
-                }
-            self.cache["forest.collections"] = collections
-
-        return self.cache["forest.collections"]
+        if force_fetch:
+            # the shared cache backend holds the same stale permissions
+            self.invalidate_cache("forest.collections")
 
-    async def _get_rendering_data(self, rendering_id: int, force_fetch: bool = False):
-        if force_fetch and "forest.rendering" in self.cache:
-            del self.cache["forest.rendering"]
+        return await self._get_cached(
+            self.cache, "forest.collections", "forest.collections", self._fetch_collection_permissions_data
+        )
+
+    async def _fetch_collection_permissions_data(self):
+        ForestLogger.log("debug", "Fetching environment permissions")
+        response = await ForestHttpApi.get_environment_permissions(self.options)
+        collections = {}
+        for name, collection in response["collections"].items():
+            collections[name] = {
+                **_decode_crud_permissions(collection),
+                **_decode_actions_permissions(collection),
+            }
+        return collections
 
-        if "forest.rendering" not in self.cache:
-            response = await ForestHttpApi.get_rendering_permissions(rendering_id, self.options)
-            self._handle_rendering_permissions(response)
+    async def _get_rendering_data(self, rendering_id: int, force_fetch: bool = False):
+        if force_fetch:
+            self.invalidate_rendering_cache(rendering_id)
+
+        return await self._get_cached(
+            self.rendering_cache,
+            rendering_id,
+            f"forest.rendering:{rendering_id}",
+            lambda: self._fetch_rendering_data(rendering_id),
+        )
 
-        return self.cache["forest.rendering"]
+    async def _fetch_rendering_data(self, rendering_id: int):
+        response = await ForestHttpApi.get_rendering_permissions(rendering_id, self.options)
+        return self._handle_rendering_permissions(response)
 
     def _handle_rendering_permissions(self, rendering_permissions):
         rendering_cache = {}
@@ -215,20 +305,83 @@ class PermissionService:
         # forest.segment_queries
         rendering_cache["segment_queries"] = _decode_segment_query_permissions(rendering_permissions["collections"])
 
-        self.cache["forest.rendering"] = rendering_cache
-
-    async def _find_action_from_endpoint(
-        self, collection: Collection, get_params: Dict, http_method: str
-    ) -> Optional[ForestServerAction]:
-        # TODO: avoid multiple computation of schema
-        collections = await SchemaEmitter.generate(self.options["prefix"], collection.datasource)
-        actions = [col for col in collections if col["name"] == collection.name][0]["actions"]
-        if len(actions) == 0:
+        return rendering_cache
+
+    async def _get_cached(self, cache: TTLCache, key: Hashable, fetch_key: str, fetch: Callable[[], Awaitable[Any]]):
+        with self._lock:
+            value = cache.get(key, _MISSING)
+            fetched_at = self._fetched_at.get(fetch_key, 0)
+        if value is _MISSING:
+            shared_entry = self._call_cache_backend("get", fetch_key)
+            if shared_entry is None:
+                return await self._fetch_into_cache(cache, key, fetch_key, fetch)
+            value, fetched_at = shared_entry
+            with self._lock:
+                cache[key] = value
+                self._fetched_at[fetch_key] = fetched_at
+
+        if self.soft_ttl is not None and time.time() - fetched_at > self.soft_ttl:
+            with self._lock:
+                self._stale_hits += 1
+            self._refresh_in_background(cache, key, fetch_key, fetch)
+        return value
+
+    async def _fetch_into_cache(self, cache: TTLCache, key: Hashable, fetch_key: str, fetch: Callable[[], Awaitable]):
+        async def _fetch_and_cache():
+            value = await fetch()
+            fetched_at = time.time()
+            with self._lock:
+                cache[key] = value
+                self._fetched_at[fetch_key] = fetched_at
+            self._call_cache_backend("set", fetch_key, value, fetched_at, self.options["permission_cache_duration"])
+            return value
+
+        return await self._single_flight.do(fetch_key, _fetch_and_cache)
+
+    def _refresh_in_background(self, cache: TTLCache, key: Hashable, fetch_key: str, fetch: Callable[[], Awaitable]):
+        with self._lock:
+            if fetch_key in self._refreshing:
+                return
+            self._refreshing.add(fetch_key)
+
+        asyncio.run_coroutine_threadsafe(self._refresh(cache, key, fetch_key, fetch), self._get_refresh_loop())
+
+    async def _refresh(self, cache: TTLCache, key: Hashable, fetch_key: str, fetch: Callable[[], Awaitable]):
+        try:
+            await self._fetch_into_cache(cache, key, fetch_key, fetch)
+            with self._lock:
+                self._background_refreshes += 1
+        except Exception:
+            with self._lock:
+                self._background_refresh_failures += 1
+            ForestLogger.log("warning", f"Cannot refresh {fetch_key} permissions, keeping the cached ones.")
+        finally:
+            with self._lock:
+                self._refreshing.discard(fetch_key)
+
+    def _get_refresh_loop(self) -> asyncio.AbstractEventLoop:
+        """a single loop, running in its own thread, for all the refreshes: with flask and django, the loop of the
+        request ends with the request"""
+        with self._lock:
+            if self._refresh_loop is None:
+                self._refresh_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._refresh_loop.run_forever, name="forest-permissions-refresh", daemon=True
+                ).start()
+            return self._refresh_loop
+
+    def _call_cache_backend(self, method: str, *args):
+        # the permissions are fetched from the server when the shared cache fails
+        if self.cache_backend is None:
+            return None
+        try:
+            return getattr(self.cache_backend, method)(*args)
+        except Exception as exc:
+            ForestLogger.log("warning", f"Permission cache backend error on {method}: {exc}")
             return None
 
-        actions = [
-            action
-            for action in actions
-            if action["id"] == f"{collection.name}-{get_params['action_name']}-{get_params['slug']}"
-        ]
-        return actions[0] if len(actions) > 0 else None
+    def _find_action_name_from_endpoint(self, collection: Collection, get_params: Dict) -> Optional[str]:
+        endpoint = SchemaActionGenerator.get_action_endpoint(
+            collection.name, get_params["action_name"], get_params["slug"]
+        )
+        return self._action_endpoint_index.get_action_name(collection, endpoint)
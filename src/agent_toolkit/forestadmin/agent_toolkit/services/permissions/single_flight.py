@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, TypedDict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlightMetrics(TypedDict):
+    issued: int
+    coalesced: int
+
+
+class SingleFlight:
+    """only one call per key is in flight, the concurrent callers of this key wait for its result
+
+    The callers can run on different event loops (flask and django run one loop per request), so the result is
+    shared through a `concurrent.futures.Future`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, "Future"] = {}
+        self._issued = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._issued += 1
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def get_metrics(self) -> SingleFlightMetrics:
+        with self._lock:
+            return {"issued": self._issued, "coalesced": self._coalesced}
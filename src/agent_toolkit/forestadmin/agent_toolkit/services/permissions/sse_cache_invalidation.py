@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import time
-from threading import Thread
-from typing import TYPE_CHECKING, Dict, List
+import json
+from threading import Event, Thread
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import urllib3
 from forestadmin.agent_toolkit.forest_logger import ForestLogger
 from forestadmin.agent_toolkit.options import Options
+from forestadmin.agent_toolkit.services.permissions.cache_backend import HostElection
 from sseclient import SSEClient
 
 if TYPE_CHECKING:
@@ -17,10 +18,13 @@ class SSECacheInvalidation(Thread):
     _MESSAGE__CACHE_KEYS: Dict[str, List[str]] = {
         "refresh-users": ["forest.users"],
         "refresh-roles": ["forest.collections"],
-        "refresh-renderings": ["forest.collections", "forest.rendering"],
+        # and the renderings listed in the event, see _invalidate_renderings
+        "refresh-renderings": ["forest.collections"],
         # "refresh-customizations": None,  # work with nocode actions
         # TODO: add one for ip whitelist when server implement it
     }
+    # seconds between two attempts to become the listener of the host
+    ELECTION_RETRY_DELAY = 30
 
     def __init__(self, permission_service: "PermissionService", options: Options, *args, **kwargs):
         super().__init__(name="SSECacheInvalidationThread", daemon=True, *args, **kwargs)
@@ -28,13 +32,34 @@ class SSECacheInvalidation(Thread):
         self.options: Options = options
         self.sse_client: SSEClient = None
         self._exit_thread = False
+        self._exit_event = Event()
+
+        # with a cache backend shared by the processes of the host, a single one of them has to listen to the events
+        self.election: Optional[HostElection] = None
+        cache_backend = permission_service.cache_backend
+        if cache_backend is not None and cache_backend.get_listener_lock_path() is not None:
+            self.election = HostElection(cache_backend.get_listener_lock_path())
 
     def stop(self):
         self._exit_thread = True
+        self._exit_event.set()
         if self.sse_client:
             self.sse_client.close()
+        if self.election is not None:
+            self.election.release()
 
     def run(self) -> None:
+        if self.election is not None and not self._wait_for_election():
+            return
+
+        try:
+            self._listen_to_events()
+        finally:
+            # let another process of the host listen when this one gives up
+            if self.election is not None:
+                self.election.release()
+
+    def _listen_to_events(self):
         sleep_delays = [1, 3, 10, 60, 3 * 60, 10 * 60]
         sleep_delays_idx = 0
 
@@ -51,17 +76,7 @@ class SSECacheInvalidation(Thread):
                 for msg in self.sse_client.events():
                     if self._exit_thread:
                         return
-                    if msg.event == "heartbeat":
-                        continue
-
-                    if self._MESSAGE__CACHE_KEYS.get(msg.event) is not None:
-                        for cache_key in self._MESSAGE__CACHE_KEYS[msg.event]:
-                            self.permission_service.invalidate_cache(cache_key)
-                        ForestLogger.log(
-                            "info", f"invalidate cache {self._MESSAGE__CACHE_KEYS[msg.event]} for event {msg.event}"
-                        )
-                    else:
-                        ForestLogger.log("info", f"SSECacheInvalidationThread: unhandled message from server: {msg}")
+                    self._handle_message(msg)
 
             except Exception as exc:
                 ForestLogger.log("debug", f"SSE connection to forestadmin server due to {str(exc)}")
@@ -70,7 +85,7 @@ class SSECacheInvalidation(Thread):
             if sleep_delays_idx < len(sleep_delays):
                 sleep_delay = sleep_delays[sleep_delays_idx]
                 sleep_delays_idx += 1
-                time.sleep(sleep_delay)
+                self._exit_event.wait(sleep_delay)
             else:
                 reason = f"{self.sse_client._event_source.status} {self.sse_client._event_source.reason}"
                 ForestLogger.log(
@@ -78,3 +93,38 @@ class SSECacheInvalidation(Thread):
                     f"SSE connection to forestadmin server failed multiple times because of '{reason}'. Stop trying!",
                 )
                 break
+
+    def _wait_for_election(self) -> bool:
+        """wait to hold the lock of the host, until the process holding it exits"""
+        while not self._exit_thread:
+            if self.election.try_acquire():
+                ForestLogger.log("debug", "This process listens to the forest server events for the host.")
+                return True
+            self._exit_event.wait(self.ELECTION_RETRY_DELAY)
+        return False
+
+    def _handle_message(self, msg):
+        if msg.event == "heartbeat":
+            return
+
+        if self._MESSAGE__CACHE_KEYS.get(msg.event) is not None:
+            for cache_key in self._MESSAGE__CACHE_KEYS[msg.event]:
+                self.permission_service.invalidate_cache(cache_key)
+            if msg.event == "refresh-renderings":
+                self._invalidate_renderings(msg.data)
+            ForestLogger.log("info", f"invalidate cache {self._MESSAGE__CACHE_KEYS[msg.event]} for event {msg.event}")
+        else:
+            ForestLogger.log("info", f"SSECacheInvalidationThread: unhandled message from server: {msg}")
+
+    def _invalidate_renderings(self, data: str):
+        """the event data is like {"renderingIds": [1, 2]}, all the renderings are invalidated when it's not"""
+        try:
+            rendering_ids = json.loads(data).get("renderingIds")
+        except Exception:
+            rendering_ids = None
+
+        if not isinstance(rendering_ids, list):
+            self.permission_service.invalidate_rendering_cache()
+        else:
+            for rendering_id in rendering_ids:
+                self.permission_service.invalidate_rendering_cache(rendering_id)
@@ -25,16 +25,21 @@ class DumpedResult(TypedDict):
     meta: NotRequired[Dict[str, Any]]
 
 
+def get_search_fields(item: Data, search_value: str) -> List[str]:
+    search_fields: List[str] = []
+    for field_name, value in item.get("attributes", {}).items():
+        if search_value.lower() in str(value).lower():
+            search_fields.append(field_name)
+    return search_fields
+
+
 def add_search_metadata(dumped: DumpedResult, search_value: str):
     if len(search_value.strip()) > 0:
         results_data = dumped["data"]
         decorators: Dict[int, Dict[str, Any]] = {}
         key = 0
         for result in results_data:
-            search_fields: List[str] = []
-            for field_name, value in result.get("attributes", {}).items():
-                if search_value.lower() in str(value).lower():
-                    search_fields.append(field_name)
+            search_fields = get_search_fields(result, search_value)
             if len(search_fields) > 0:
                 decorators[key] = {"id": result["id"], "search": search_fields}
                 key += 1
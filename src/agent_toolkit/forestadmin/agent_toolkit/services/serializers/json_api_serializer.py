@@ -1,22 +1,20 @@
+import threading
 from ast import literal_eval
 from datetime import date, datetime, time
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Union, cast
 from urllib.parse import quote
 from uuid import uuid4
 
+from cachetools import LRUCache
 from forestadmin.agent_toolkit.forest_logger import ForestLogger
-from forestadmin.agent_toolkit.services.serializers import Data, DumpedResult, IncludedData
+from forestadmin.agent_toolkit.services.serializers import Data, DumpedResult, IncludedData, get_search_fields
 from forestadmin.agent_toolkit.services.serializers.exceptions import JsonApiSerializerException
-from forestadmin.agent_toolkit.utils.id import pack_id
+from forestadmin.agent_toolkit.utils.id import pack_primary_keys
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasources import Datasource, DatasourceException
 from forestadmin.datasource_toolkit.interfaces.chart import Chart
 from forestadmin.datasource_toolkit.interfaces.fields import (
     Column,
-    ManyToOne,
-    OneToOne,
-    PolymorphicManyToOne,
-    PolymorphicOneToOne,
     PrimitiveType,
     RelationAlias,
     is_column,
@@ -27,251 +25,362 @@ from forestadmin.datasource_toolkit.interfaces.fields import (
     is_polymorphic_many_to_one,
     is_polymorphic_one_to_one,
 )
+from forestadmin.datasource_toolkit.interfaces.models.collections import CollectionSchema
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
-from forestadmin.datasource_toolkit.interfaces.query.projections.factory import ProjectionFactory
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
+from forestadmin.datasource_toolkit.utils.schema import SchemaUtils
+
+Converter = Callable[[Any], Any]
 
 
 def render_chart(chart: Chart):
     return {"id": str(uuid4()), "type": "stats", "attributes": {"value": chart}}
 
 
-class JsonApiSerializer:
-    def __init__(self, datasource: Datasource, projection: Projection) -> None:
-        self.datasource = datasource
-        self.projection = projection
+def _dump_number(value: Any) -> Any:
+    if isinstance(value, (int, float)):
+        return value
+    elif isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return literal_eval(value)
 
-    def serialize(self, data, collection: Collection) -> DumpedResult:
-        if isinstance(data, list):
-            ret = self._serialize_many(data, collection)
-        else:
-            ret = self._serialize_one(data, collection)
 
-        if ret.get("included") == []:
-            del ret["included"]
-        return cast(DumpedResult, ret)
+_CONVERTERS: Dict[PrimitiveType, Converter] = {
+    PrimitiveType.STRING: str,
+    PrimitiveType.ENUM: str,
+    PrimitiveType.BOOLEAN: bool,
+    PrimitiveType.NUMBER: _dump_number,
+    PrimitiveType.UUID: str,
+    PrimitiveType.DATE_ONLY: lambda v: v if isinstance(v, str) else date.isoformat(v),
+    PrimitiveType.TIME_ONLY: lambda v: v if isinstance(v, str) else time.isoformat(v),
+    PrimitiveType.DATE: lambda v: v if isinstance(v, str) else datetime.isoformat(v),
+    PrimitiveType.POINT: lambda v: v,
+    PrimitiveType.BINARY: lambda v: v,  # should not be called, because of binary decorator this type
+    # is transformed to string
+    PrimitiveType.JSON: lambda v: v,
+}
+
+
+def _get_converter(schema: Column) -> Converter:
+    column_type = schema["column_type"]
+    if isinstance(column_type, PrimitiveType):
+        return _CONVERTERS[column_type]
+    elif isinstance(column_type, dict) or isinstance(column_type, list):
+        return lambda v: v
+
+    def _unknown_type(value):
+        ForestLogger.log("error", f"Unknown column type {column_type}")
+        raise JsonApiSerializerException(f"Unknown column type {column_type}")
+
+    return _unknown_type
+
+
+def _get_column_converters(schema: CollectionSchema, names) -> Dict[str, Converter]:
+    return {
+        name: _get_converter(cast(Column, schema["fields"][name]))
+        for name in names
+        if name in schema["fields"] and is_column(schema["fields"][name])
+    }
+
+
+def _to_bytes(encoded: Union[str, bytes]) -> bytes:
+    return encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+
 
-    @classmethod
-    def _get_id(cls, collection: Collection, data: RecordsDataAlias) -> Union[int, str]:
-        pk = pack_id(collection.schema, data)
+def _encode_id(id_: Union[int, str]) -> Union[int, str]:
+    return quote(id_, safe="") if isinstance(id_, str) else id_
+
+
+class _CollectionIds:
+    """primary keys of a collection, resolved once"""
+
+    def __init__(self, collection: Collection):
+        self.name = collection.name
+        self.pks = SchemaUtils.get_primary_keys(collection.schema)
+
+    def pack(self, record: RecordsDataAlias) -> str:
+        return pack_primary_keys(self.pks, record)
+
+    def get_id(self, record: RecordsDataAlias) -> Union[int, str]:
+        pk = self.pack(record)
         try:
-            pk = int(pk)
+            return int(pk)
         except ValueError:
-            pass
-        return pk
-
-    @classmethod
-    def _is_in_included(cls, included: List[Dict[str, Any]], item: IncludedData) -> bool:
-        if "id" not in item or "type" not in item:
-            raise JsonApiSerializerException("Included item must have an id and a type")
-        for included_item in included:
-            if included_item["id"] == item["id"] and included_item["type"] == item["type"]:
-                return True
-        return False
-
-    def _serialize_many(self, data, collection: Collection) -> DumpedResult:
-        ret = {"data": [], "included": []}
-        for item in data:
-            serialized = self._serialize_one(item, collection)
-            ret["data"].append(serialized["data"])
-            for included in serialized.get("included", []):
-                if not self._is_in_included(ret["included"], included):
-                    ret["included"].append(included)
+            return pk
 
-        return cast(DumpedResult, ret)
 
-    def _serialize_one(
-        self, data: RecordsDataAlias, collection: Collection, projection: Optional[Projection] = None
-    ) -> DumpedResult:
-        projection = projection if projection is not None else self.projection
-        pk_value = self._get_id(collection, data)
+class _PolymorphicTarget:
+    """what's needed to include a record of a polymorphic many to one target collection"""
 
-        encoded_pk_value = quote(pk_value, safe="") if isinstance(pk_value, str) else pk_value
-        ret = {
-            "data": {
-                "id": pk_value,
-                "attributes": {},
-                "links": {"self": f"/forest/{collection.name}/{encoded_pk_value}"},
-                "relationships": {},
-                "type": collection.name,
-            },
-            "included": [],
-            "links": {"self": f"/forest/{collection.name}/{encoded_pk_value}"},
-        }
+    def __init__(self, collection: Collection):
+        self.collection = collection
+        self.schema = collection.schema
+        self.ids = _CollectionIds(collection)
+        self.converters = _get_column_converters(self.schema, self.schema["fields"].keys())
+        self.relation_names = [name for name, field in self.schema["fields"].items() if not is_column(field)]
 
-        first_level_projection = [*projection.relations.keys(), *projection.columns]
-        for key, value in data.items():
-            if key not in first_level_projection or key not in collection.schema["fields"]:
-                continue
-            if is_column(collection.schema["fields"][key]) and key in first_level_projection:
-                ret["data"]["attributes"][key] = self._serialize_value(
-                    value, cast(Column, collection.schema["fields"][key])
-                )
-            elif not is_column(collection.schema["fields"][key]):
-                relation, included = self._serialize_relation(
-                    key,
-                    data,
-                    cast(RelationAlias, collection.schema["fields"][key]),
-                    f"/forest/{collection.name}/{encoded_pk_value}",
-                )
-                ret["data"]["relationships"][key] = relation
-                if included is not None and not self._is_in_included(ret["included"], included):
-                    ret["included"].append(included)
-
-        if ret["data"].get("attributes") == {}:
-            del ret["data"]["attributes"]
-        if ret["data"].get("relationships") == {}:
-            del ret["data"]["relationships"]
-        return cast(DumpedResult, ret)
 
-    def _serialize_value(self, value: Any, schema: Column) -> Union[str, int, float, bool, None]:
-        if value is None:
-            return None
+class _SerializerPlan:
+    """field accessors, converters and relation walkers of a (collection, projection), resolved once
 
-        def number_dump(val):
-            if isinstance(val, int) or isinstance(val, float):
-                return val
-            elif isinstance(val, str):
-                return literal_eval(str(value))
-
-        parser_map: Dict[PrimitiveType, Callable] = {
-            PrimitiveType.STRING: str,
-            PrimitiveType.ENUM: str,
-            PrimitiveType.BOOLEAN: bool,
-            PrimitiveType.NUMBER: number_dump,
-            PrimitiveType.UUID: str,
-            PrimitiveType.DATE_ONLY: lambda v: v if isinstance(v, str) else date.isoformat(v),
-            PrimitiveType.TIME_ONLY: lambda v: v if isinstance(v, str) else time.isoformat(v),
-            PrimitiveType.DATE: lambda v: v if isinstance(v, str) else datetime.isoformat(v),
-            PrimitiveType.POINT: lambda v: v,
-            PrimitiveType.BINARY: lambda v: v,  # should not be called, because of binary decorator this type
-            # is transformed to string
-            PrimitiveType.JSON: lambda v: v,
-        }
+    A plan depends on the schemas of its collection and of the collections of its to one relations, it's compiled
+    again when one of them changes (the decorators build a new schema object after `mark_schema_as_dirty`, fields are
+    added to the schema of the other collections).
+    """
 
-        if isinstance(schema["column_type"], PrimitiveType):
-            return parser_map[cast(PrimitiveType, schema["column_type"])](value)
-        elif isinstance(schema["column_type"], dict) or isinstance(schema["column_type"], list):
-            return value
-        else:
-            ForestLogger.log("error", f"Unknown column type {schema['column_type']}")
-            raise JsonApiSerializerException(f"Unknown column type {schema['column_type']}")
+    TO_ONE = "to_one"
+    TO_MANY = "to_many"
+    POLYMORPHIC_MANY_TO_ONE = "polymorphic_many_to_one"
+    OTHER = "other"
 
-    def _serialize_relation(
-        self, name: str, data: Any, schema: RelationAlias, current_link: str
-    ) -> Tuple[Dict[str, Any], Optional[IncludedData]]:
-        relation, included = {}, None
-        sub_data = data[name]
-        if sub_data is None:
-            return {
-                "data": (
-                    None
-                    if is_polymorphic_many_to_one(schema)
-                    or is_polymorphic_one_to_one(schema)
-                    or is_one_to_one(schema)
-                    or is_many_to_one(schema)
-                    else []
-                ),
-                "links": {"related": {"href": f"{current_link}/relationships/{name}"}},
-            }, included
+    def __init__(self, datasource: Datasource, collection: Collection, projection: Projection):
+        self.datasource = datasource
+        self.collection = collection
+        self.schema = collection.schema
+        self.ids = _CollectionIds(collection)
+        self.dependencies: List[Tuple[Collection, CollectionSchema, int]] = []
+        self._add_dependency(collection)
+
+        relation_projections = projection.relations
+        self.converters = _get_column_converters(self.schema, projection.columns)
+        self.relations: Dict[str, Tuple[str, Any]] = {}
+        for name, sub_projection in relation_projections.items():
+            if name not in self.schema["fields"] or is_column(self.schema["fields"][name]):
+                continue
+            self.relations[name] = self._compile_relation(
+                cast(RelationAlias, self.schema["fields"][name]), sub_projection
+            )
 
+        self._polymorphic_targets_lock = threading.Lock()
+        self._polymorphic_targets: Dict[str, _PolymorphicTarget] = {}
+
+    def _compile_relation(self, schema: RelationAlias, sub_projection: Projection) -> Tuple[str, Any]:
         if is_polymorphic_many_to_one(schema):
-            relation, included = self._serialize_polymorphic_many_to_one_relationship(name, data, schema, current_link)
+            return self.POLYMORPHIC_MANY_TO_ONE, schema["foreign_key_type_field"]
         elif is_many_to_one(schema) or is_one_to_one(schema) or is_polymorphic_one_to_one(schema):
-            relation, included = self._serialize_to_one_relationships(name, sub_data, schema, current_link)
+            foreign_collection = self.datasource.get_collection(schema["foreign_collection"])
+            self._add_dependency(foreign_collection)
+            return self.TO_ONE, (
+                _CollectionIds(foreign_collection),
+                _get_column_converters(foreign_collection.schema, sub_projection),
+            )
         elif is_many_to_many(schema) or is_one_to_many(schema):
-            relation = {
-                "data": [],
-                "links": {"related": {"href": f"{current_link}/relationships/{name}"}},
-            }
+            return self.TO_MANY, None
+        # null polymorphic one to many relations are dumped as empty lists, like the other to many relations
+        return self.OTHER, None
 
-        return relation, included
+    def _add_dependency(self, collection: Collection):
+        # the fields count catches the fields added to a collection which is not decorated
+        self.dependencies.append((collection, collection.schema, len(collection.schema["fields"])))
 
-    def _serialize_to_one_relationships(
-        self,
-        name: str,
-        data: Any,
-        schema: Union[PolymorphicOneToOne, OneToOne, ManyToOne],
-        current_link: str,
-    ) -> Tuple[Dict[str, Any], IncludedData]:
-        """return (relationships, included)"""
-        foreign_collection = self.datasource.get_collection(schema["foreign_collection"])
-
-        relation = {
-            "data": {
-                "id": pack_id(foreign_collection.schema, data),
-                # "id": self._get_id(foreign_collection, data),
-                "type": schema["foreign_collection"],
-            },
-            "links": {"related": {"href": f"{current_link}/relationships/{name}"}},
-        }
+    def is_up_to_date(self) -> bool:
+        return all(
+            collection.schema is schema and len(schema["fields"]) == fields_count
+            for collection, schema, fields_count in self.dependencies
+        )
 
-        sub_projection = self.projection.relations[name]
-        included_attributes = {}
-        for key, value in data.items():
-            if key not in sub_projection:
-                continue
-            included_attributes[key] = self._serialize_value(value, foreign_collection.schema["fields"][key])
+    def serialize_record(
+        self, data: RecordsDataAlias, included: List[IncludedData], included_index: Set[Tuple[str, Any]]
+    ) -> Dict[str, Any]:
+        pk_value = self.ids.get_id(data)
+        self_link = f"/forest/{self.ids.name}/{_encode_id(pk_value)}"
+        attributes = {}
+        relationships = {}
+        converters = self.converters
+        relations = self.relations
 
-        id_ = self._get_id(foreign_collection, data)
-        encoded_id = quote(id_, safe="") if isinstance(id_, str) else id_
+        for key, value in data.items():
+            converter = converters.get(key)
+            if converter is not None:
+                attributes[key] = None if value is None else converter(value)
+            elif key in relations:
+                relationships[key] = self._serialize_relation(key, data, self_link, included, included_index)
 
-        included = {
-            "id": id_,
-            "links": {
-                "self": f"/forest/{foreign_collection.name}/{encoded_id}",
-            },
-            "type": foreign_collection.name,
+        ret = {
+            "id": pk_value,
+            "attributes": attributes,
+            "links": {"self": self_link},
+            "relationships": relationships,
+            "type": self.ids.name,
         }
-        if included_attributes != {}:
-            included["attributes"] = included_attributes
-        return relation, cast(IncludedData, included)
+        if attributes == {}:
+            del ret["attributes"]
+        if relationships == {}:
+            del ret["relationships"]
+        return ret
 
-    def _serialize_polymorphic_many_to_one_relationship(
+    def _serialize_relation(
         self,
         name: str,
-        data: Any,
-        schema: PolymorphicManyToOne,
+        data: RecordsDataAlias,
         current_link: str,
-    ) -> Tuple[Dict[str, Any], Optional[IncludedData]]:
-        """return (relationships, included)"""
+        included: List[IncludedData],
+        included_index: Set[Tuple[str, Any]],
+    ) -> Dict[str, Any]:
+        kind, compiled = self.relations[name]
+        links = {"related": {"href": f"{current_link}/relationships/{name}"}}
         sub_data = data[name]
+        if sub_data is None:
+            return {"data": None if kind in (self.TO_ONE, self.POLYMORPHIC_MANY_TO_ONE) else [], "links": links}
+
+        if kind == self.TO_ONE:
+            ids, converters = compiled
+            relation = {"data": {"id": ids.pack(sub_data), "type": ids.name}, "links": links}
+            included_attributes = {
+                key: None if value is None else converters[key](value)
+                for key, value in sub_data.items()
+                if key in converters
+            }
+            id_ = ids.get_id(sub_data)
+            included_item = {"id": id_, "links": {"self": f"/forest/{ids.name}/{_encode_id(id_)}"}, "type": ids.name}
+            if included_attributes != {}:
+                included_item["attributes"] = included_attributes
+            self._add_included(cast(IncludedData, included_item), included, included_index)
+            return relation
+
+        elif kind == self.POLYMORPHIC_MANY_TO_ONE:
+            target = self._get_polymorphic_target(data[compiled])
+            if target is None:
+                return {"data": None, "links": links}
+
+            relation = {"data": {"id": target.ids.pack(sub_data), "type": data[compiled]}, "links": links}
+            id_ = target.ids.get_id(sub_data)
+            included_item = {
+                "type": target.ids.name,
+                "id": id_,
+                "attributes": {
+                    key: None if value is None else target.converters[key](value)
+                    for key, value in sub_data.items()
+                    if key in target.converters
+                },
+                "links": {"self": f"/forest/{target.ids.name}/{_encode_id(id_)}"},
+                "relationships": {
+                    relation_name: {
+                        "links": {"related": {"href": f"/forest/{target.ids.name}/{id_}/relationships/{relation_name}"}}
+                    }
+                    for relation_name in target.relation_names
+                },
+            }
+            self._add_included(cast(IncludedData, included_item), included, included_index)
+            return relation
+
+        elif kind == self.TO_MANY:
+            return {"data": [], "links": links}
+        return {}
+
+    def _get_polymorphic_target(self, collection_name: str) -> Optional[_PolymorphicTarget]:
         try:
-            foreign_collection = self.datasource.get_collection(data[schema["foreign_key_type_field"]])
+            collection = self.datasource.get_collection(collection_name)
         except DatasourceException:
-            return {"data": None, "links": {"related": {"href": f"{current_link}/relationships/{name}"}}}, None
-
-        relation = {
-            "data": {
-                "id": pack_id(foreign_collection.schema, sub_data),  # TODO: validate
-                # "id": self._get_id(foreign_collection, sub_data),
-                "type": data[schema["foreign_key_type_field"]],
-            },
-            "links": {"related": {"href": f"{current_link}/relationships/{name}"}},
-        }
-        included = self._serialize_one(
-            sub_data, foreign_collection, ProjectionFactory.all(foreign_collection, allow_nested=True)
-        )
-        included["data"] = cast(Data, included["data"])
-        included = {
-            "type": included["data"]["type"],
-            "id": included["data"]["id"],
-            "attributes": included["data"]["attributes"],
-            # **included.get("data", {}),  # type: ignore for serialize_one it's a dict
-            "links": included.get("links", {}),
-            "relationships": {},
-        }
+            return None
 
-        # add relationships key in included
-        for foreign_relation_name, foreign_relation_schema in foreign_collection.schema["fields"].items():
-            if not is_column(foreign_relation_schema):
-                included["relationships"][foreign_relation_name] = {
-                    "links": {
-                        "related": {
-                            "href": f"/forest/{foreign_collection.name}/{self._get_id(foreign_collection, sub_data)}"
-                            f"/relationships/{foreign_relation_name}"
-                        }
-                    }
-                }
+        target = self._polymorphic_targets.get(collection_name)
+        if target is None or target.collection is not collection or target.schema is not collection.schema:
+            target = _PolymorphicTarget(collection)
+            with self._polymorphic_targets_lock:
+                self._polymorphic_targets[collection_name] = target
+        return target
+
+    @staticmethod
+    def _add_included(item: IncludedData, included: List[IncludedData], included_index: Set[Tuple[str, Any]]):
+        key = (item["type"], item["id"])
+        if key not in included_index:
+            included_index.add(key)
+            included.append(item)
+
+
+class JsonApiSerializer:
+    PLANS_CACHE_SIZE = 256
+
+    _plans_lock = threading.Lock()
+    _plans: LRUCache = LRUCache(PLANS_CACHE_SIZE)
+
+    def __init__(self, datasource: Datasource, projection: Projection) -> None:
+        self.datasource = datasource
+        self.projection = projection
+
+    def serialize(self, data, collection: Collection) -> DumpedResult:
+        plan = self._get_plan(collection)
+        included: List[IncludedData] = []
+        included_index: Set[Tuple[str, Any]] = set()
+
+        if isinstance(data, list):
+            ret = {"data": [plan.serialize_record(item, included, included_index) for item in data]}
+        else:
+            serialized = plan.serialize_record(data, included, included_index)
+            ret = {"data": serialized, "links": serialized["links"]}
+
+        if included:
+            ret["included"] = included
+        return cast(DumpedResult, ret)
+
+    def serialize_chunks(
+        self,
+        data: List[RecordsDataAlias],
+        collection: Collection,
+        encode: Callable[[Any], Union[str, bytes]],
+        search_value: Optional[str] = None,
+        chunk_size: int = 100,
+    ) -> Iterator[bytes]:
+        """the document of `serialize(data)`, with the search metadata, as encoded chunks of `chunk_size` records
+
+        The `data` items are yielded first, then `included`, so only the serialized included records are kept in memory.
+        """
+        plan = self._get_plan(collection)
+        included: List[IncludedData] = []
+        included_index: Set[Tuple[str, Any]] = set()
+        with_search = search_value is not None and len(search_value.strip()) > 0
+        decorators: Dict[int, Dict[str, Any]] = {}
+
+        fragments: List[bytes] = [b'{"data":[']
+        for index, record in enumerate(data):
+            item = plan.serialize_record(record, included, included_index)
+            if with_search:
+                search_fields = get_search_fields(cast(Data, item), search_value)
+                if len(search_fields) > 0:
+                    decorators[len(decorators)] = {"id": item["id"], "search": search_fields}
+            if index > 0:
+                fragments.append(b",")
+            fragments.append(_to_bytes(encode(item)))
+            if index % chunk_size == chunk_size - 1:
+                yield b"".join(fragments)
+                fragments = []
+        fragments.append(b"]")
+
+        if len(included) > 0:
+            fragments.append(b',"included":[')
+            for index, included_item in enumerate(included):
+                if index > 0:
+                    fragments.append(b",")
+                fragments.append(_to_bytes(encode(included_item)))
+                if index % chunk_size == chunk_size - 1:
+                    yield b"".join(fragments)
+                    fragments = []
+            fragments.append(b"]")
+
+        if with_search:
+            fragments.append(b',"meta":')
+            fragments.append(_to_bytes(encode({"decorators": decorators})))
+        fragments.append(b"}")
+        yield b"".join(fragments)
 
-        return relation, cast(IncludedData, included)
+    def _get_plan(self, collection: Collection) -> _SerializerPlan:
+        key: Tuple[int, int, FrozenSet[str]] = (id(self.datasource), id(collection), frozenset(self.projection))
+        with self._plans_lock:
+            plan = self._plans.get(key)
+        if (
+            plan is None
+            or plan.datasource is not self.datasource
+            or plan.collection is not collection
+            or not plan.is_up_to_date()
+        ):
+            plan = _SerializerPlan(self.datasource, collection, self.projection)
+            with self._plans_lock:
+                self._plans[key] = plan
+        return plan
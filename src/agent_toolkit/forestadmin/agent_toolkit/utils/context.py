@@ -1,9 +1,10 @@
+import asyncio
 import enum
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Any, Callable, Dict, List, Optional, TypedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, TypedDict, Union
 from urllib.error import HTTPError
 
 if sys.version_info >= (3, 9):
@@ -11,6 +12,7 @@ if sys.version_info >= (3, 9):
 else:
     from backports.zoneinfo import ZoneInfo
 
+from forestadmin.agent_toolkit.utils.json_encoder import JsonEncoder, StdlibJsonEncoder
 from forestadmin.datasource_toolkit.exceptions import BusinessError, ForbiddenError, UnprocessableError, ValidationError
 
 
@@ -26,7 +28,7 @@ class CallerRequest(TypedDict):
     ip: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class User:
     rendering_id: int
     user_id: int
@@ -78,7 +80,7 @@ class Request:
 @dataclass
 class Response:
     status: int
-    body: Optional[str] = None
+    body: Optional[Union[str, bytes]] = None
     headers: Dict[str, str] = field(default_factory=lambda: {})
 
 
@@ -90,16 +92,92 @@ class FileResponse:
     headers: Dict[str, str] = field(default_factory=lambda: {})
 
 
+@dataclass
+class StreamingResponse:
+    status: int
+    body: AsyncIterator[Union[str, bytes]]
+    headers: Dict[str, str] = field(default_factory=lambda: {})
+
+    def iter_body_sync(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Iterator[Union[str, bytes]]:
+        """consume the body from synchronous code (wsgi), using a private event loop
+
+        When the calling thread already runs an event loop, the private loop is driven from a worker thread.
+        When `loop` is given, the body is consumed on it, it must be running in another thread.
+        """
+        if loop is not None:
+            yield from self._iter_body_on_loop(loop)
+            return
+
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.get_running_loop()
+            executor = ThreadPoolExecutor(max_workers=1)
+        except RuntimeError:
+            executor = None
+
+        def _run(coroutine):
+            if executor is None:
+                return loop.run_until_complete(coroutine)
+            return executor.submit(loop.run_until_complete, coroutine).result()
+
+        try:
+            while True:
+                try:
+                    yield _run(self.body.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            if hasattr(self.body, "aclose"):
+                _run(self.body.aclose())
+            _run(loop.shutdown_asyncgens())
+            if executor is not None:
+                executor.shutdown()
+            loop.close()
+
+    def _iter_body_on_loop(self, loop: asyncio.AbstractEventLoop) -> Iterator[Union[str, bytes]]:
+        def _run(coroutine):
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        try:
+            while True:
+                try:
+                    yield _run(self.body.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            if hasattr(self.body, "aclose"):
+                _run(self.body.aclose())
+
+
 class HttpResponseBuilder:
     _ERROR_MESSAGE_CUSTOMIZER: Callable[[Exception], str] = None
+    _JSON_ENCODER: JsonEncoder = StdlibJsonEncoder()
 
     @classmethod
     def setup_error_message_customizer(cls, customizer_function: Callable[[Exception], str]):
         cls._ERROR_MESSAGE_CUSTOMIZER = customizer_function
 
+    @classmethod
+    def setup_json_encoder(cls, encoder: JsonEncoder):
+        cls._JSON_ENCODER = encoder
+
+    @staticmethod
+    def encode_json(body: Any) -> Union[str, bytes]:
+        return HttpResponseBuilder._JSON_ENCODER.encode(body)
+
     @staticmethod
     def build_json_response(status: int, body: Dict[str, Any]) -> Response:
-        return Response(status, json.dumps(body), headers={"content-type": "application/json"})
+        return Response(status, HttpResponseBuilder.encode_json(body), headers={"content-type": "application/json"})
+
+    @staticmethod
+    def build_json_stream_response(chunks: Iterable[bytes]) -> StreamingResponse:
+        """stream an already encoded json body, the chunks are produced between the writes of the previous ones"""
+
+        async def _body():
+            for chunk in chunks:
+                yield chunk
+
+        return StreamingResponse(200, _body(), headers={"content-type": "application/json"})
 
     @staticmethod
     def build_client_error_response(reasons: List[Exception]) -> Response:
@@ -126,6 +204,12 @@ class HttpResponseBuilder:
             200, body, headers={"content-type": "text/csv", "Content-Disposition": f'attachment; filename="{filename}"'}
         )
 
+    @staticmethod
+    def build_csv_stream_response(body: AsyncIterator[str], filename: str) -> StreamingResponse:
+        return StreamingResponse(
+            200, body, headers={"content-type": "text/csv", "Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
     @staticmethod
     def build_success_response(body: Dict[str, Any]) -> Response:
         return HttpResponseBuilder.build_json_response(200, body)
@@ -1,10 +1,21 @@
 from csv import DictWriter
 from datetime import date, datetime
 from io import StringIO
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
+from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.exceptions import ForestException
+from forestadmin.datasource_toolkit.interfaces.fields import Operator
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.factory import ConditionTreeFactory
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.page import Page
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
+from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
+from forestadmin.datasource_toolkit.utils.schema import SchemaUtils
+
+CSV_BATCH_SIZE = 1000
 
 
 class CsvException(ForestException):
@@ -25,6 +36,105 @@ class Csv:
         except Exception:
             raise CsvException("Cannot make a csv")
 
+    @staticmethod
+    async def make_csv_stream(
+        batches: AsyncIterator[List[RecordsDataAlias]], projection: Projection
+    ) -> AsyncIterator[str]:
+        """yield the csv header, then one csv chunk per batch of records"""
+        dumped_csv = StringIO()
+        csv_writer = DictWriter(dumped_csv, fieldnames=projection, extrasaction="ignore")
+        try:
+            csv_writer.writeheader()
+        except Exception:
+            raise CsvException("Cannot make a csv")
+        yield Csv._flush(dumped_csv)
+
+        async for rows in batches:
+            try:
+                for row in rows:
+                    csv_writer.writerow(Csv.format_field(row))
+            except Exception:
+                raise CsvException("Cannot make a csv")
+            yield Csv._flush(dumped_csv)
+
+    @staticmethod
+    async def iter_batches(
+        fetch: Callable[[PaginatedFilter], Awaitable[List[RecordsDataAlias]]],
+        collection: Collection,
+        paginated_filter: PaginatedFilter,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[List[RecordsDataAlias]]:
+        """read the records of collection matching paginated_filter batch by batch, to keep a bounded number of them in
+        memory
+
+        The first batch is read eagerly, so that datasource errors can still be returned as an error response.
+        paginated_filter must be sorted on a unique set of fields, otherwise batches may overlap.
+        When it is sorted on the primary keys only, each batch is read after the keys of the last record of the previous
+        one (keyset pagination). Otherwise, the batches are read with an offset: as the datasource has to skip all the
+        previous records, each batch is slower to read than the previous one.
+        """
+        batch_size = batch_size or CSV_BATCH_SIZE
+        keyset_sort = Csv._get_keyset_sort(collection, paginated_filter.sort)
+        first_records = await fetch(paginated_filter.override({"page": Page(0, batch_size)}))
+
+        async def _batches():
+            records, skip = first_records, 0
+            while True:
+                if records:
+                    yield records
+                if len(records) < batch_size:
+                    return
+                if keyset_sort is not None:
+                    page_filter = Csv._after_record(paginated_filter, keyset_sort, records[-1])
+                    page_filter = page_filter.override({"page": Page(0, batch_size)})
+                else:
+                    skip += batch_size
+                    page_filter = paginated_filter.override({"page": Page(skip, batch_size)})
+                records = await fetch(page_filter)
+
+        return _batches()
+
+    @staticmethod
+    def _get_keyset_sort(collection: Collection, sort: Optional[Sort]) -> Optional[Sort]:
+        """the sort when it is on the primary keys only, and they support the operators of the keyset condition"""
+        primary_keys = SchemaUtils.get_primary_keys(collection.schema)
+        if not sort or any(clause["field"] not in primary_keys for clause in sort):
+            return None
+
+        for clause in sort:
+            operators = collection.schema["fields"][clause["field"]].get("filter_operators") or set()
+            needed_operators = {Operator.GREATER_THAN if clause["ascending"] else Operator.LESS_THAN}
+            if len(sort) > 1:
+                needed_operators.add(Operator.EQUAL)
+            if not needed_operators.issubset(operators):
+                return None
+        return sort
+
+    @staticmethod
+    def _after_record(paginated_filter: PaginatedFilter, sort: Sort, record: RecordsDataAlias) -> PaginatedFilter:
+        """filter on the records sorted after record, as (pk1 > v1) or (pk1 = v1 and pk2 > v2) or ..."""
+        trees = []
+        for idx, clause in enumerate(sort):
+            operator = Operator.GREATER_THAN if clause["ascending"] else Operator.LESS_THAN
+            leaves = [
+                ConditionTreeLeaf(previous["field"], Operator.EQUAL, record[previous["field"]])
+                for previous in sort[:idx]
+            ]
+            leaves.append(ConditionTreeLeaf(clause["field"], operator, record[clause["field"]]))
+            trees.append(ConditionTreeFactory.intersect(leaves))
+
+        condition_tree = ConditionTreeFactory.intersect(
+            [paginated_filter.condition_tree, ConditionTreeFactory.union(trees)]
+        )
+        return paginated_filter.override({"condition_tree": condition_tree})
+
+    @staticmethod
+    def _flush(dumped_csv: StringIO) -> str:
+        chunk = dumped_csv.getvalue()
+        dumped_csv.seek(0)
+        dumped_csv.truncate(0)
+        return chunk
+
     @staticmethod
     def format_field(row: Dict[str, Any]) -> Dict[str, Any]:
         updates = {}
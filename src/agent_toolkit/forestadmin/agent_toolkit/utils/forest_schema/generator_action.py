@@ -39,11 +39,19 @@ class SchemaActionGenerator:
         )
     ]
 
+    @staticmethod
+    def get_action_slug(name: str) -> str:
+        return name.lower().replace(r"[^a-z0-9-]+", "-")
+
+    @staticmethod
+    def get_action_endpoint(collection_name: str, idx: int, slug: str) -> str:
+        return f"/forest/_actions/{collection_name}/{idx}/{slug}"
+
     @classmethod
     async def build(cls, prefix: str, collection: Collection, name: str) -> ForestServerAction:
         schema = collection.schema["actions"][name]
         idx = list(collection.schema["actions"].keys()).index(name)
-        slug = name.lower().replace(r"[^a-z0-9-]+", "-")
+        slug = cls.get_action_slug(name)
 
         if not schema.static_form:
             fields, layout = (cls.DUMMY_FIELDS, [])
@@ -57,7 +65,7 @@ class SchemaActionGenerator:
             name=name,
             description=schema.description,
             type=cast(Literal["single", "bulk", "global"], schema.scope.value.lower()),
-            endpoint=f"/forest/_actions/{collection.name}/{idx}/{slug}",
+            endpoint=cls.get_action_endpoint(collection.name, idx, slug),
             download=bool(schema.generate_file),
             fields=fields,
             submitButtonLabel=schema.submit_button_label,
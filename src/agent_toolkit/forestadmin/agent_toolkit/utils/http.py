@@ -1,13 +1,18 @@
+import asyncio
 import json
-from typing import Any, Dict, Optional, TypedDict
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypedDict, TypeVar
+from weakref import ref
 
-from aiohttp import ClientSession, client_exceptions
-from aiohttp.web import HTTPException
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, client_exceptions
+from aiohttp.web import HTTPBadGateway, HTTPException, HTTPGatewayTimeout, HTTPServiceUnavailable
 from forestadmin.agent_toolkit.exceptions import AgentToolkitException
 from forestadmin.agent_toolkit.forest_logger import ForestLogger
 from forestadmin.agent_toolkit.resources.security.exceptions import OpenIdException
 from forestadmin.agent_toolkit.utils.forest_schema.type import ForestSchema
 
+T = TypeVar("T")
+
 
 class ForestHttpApiException(AgentToolkitException):
     pass
@@ -19,7 +24,108 @@ class HttpOptions(TypedDict):
     verify_ssl: bool
 
 
+class HttpClientOptions(TypedDict, total=False):
+    timeout: float
+    connect_timeout: float
+    max_connections: int
+    get_retries: int
+    retry_backoff: float
+
+
+class ForestHttpClient:
+    """pool of keep-alive connections to the forest server
+
+    aiohttp sessions are bound to their event loop, so there is one session per running loop. A session is closed
+    with `close`, or when the tasks of its loop are cancelled (at the end of `asyncio.run` or `async_to_sync`).
+    The sessions are indexed by the id of their loop, and forgotten when they are closed: as a session references its
+    loop, indexing them by the loop itself would keep every loop alive.
+    """
+
+    UNAVAILABLE_ERRORS = {502: HTTPBadGateway, 503: HTTPServiceUnavailable, 504: HTTPGatewayTimeout}
+
+    def __init__(
+        self,
+        timeout: float = 30,
+        connect_timeout: float = 10,
+        max_connections: int = 10,
+        get_retries: int = 2,
+        retry_backoff: float = 0.2,
+    ):
+        self.timeout = ClientTimeout(total=timeout, connect=connect_timeout)
+        self.max_connections = max_connections
+        self.get_retries = get_retries
+        self.retry_backoff = retry_backoff
+        self._sessions: Dict[int, Tuple["ref[asyncio.AbstractEventLoop]", ClientSession]] = {}
+        self._session_closers: Dict[int, asyncio.Task] = {}
+
+    def get_session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        loop_id = id(loop)
+        loop_ref, session = self._sessions.get(loop_id, (None, None))
+        if session is not None and loop_ref() is loop and not session.closed:
+            return session
+
+        closer = self._session_closers.pop(loop_id, None)
+        # the id of a garbage collected loop can be reused
+        if closer is not None and loop_ref() is loop:
+            closer.cancel()
+        session = ClientSession(connector=TCPConnector(limit=self.max_connections), timeout=self.timeout)
+        self._sessions[loop_id] = (ref(loop), session)
+        self._session_closers[loop_id] = loop.create_task(self._close_with_loop(loop_id, session))
+        return session
+
+    async def close(self):
+        loop_id = id(asyncio.get_running_loop())
+        self._sessions.pop(loop_id, None)
+        closer = self._session_closers.pop(loop_id, None)
+        if closer is not None:
+            closer.cancel()
+            await asyncio.gather(closer, return_exceptions=True)
+
+    async def with_retries(self, request: Callable[[], Awaitable[T]]) -> T:
+        """for idempotent requests only: retry on connection errors, timeouts and 502/503/504 answers"""
+        attempt = 0
+        while True:
+            try:
+                return await request()
+            except Exception as exc:
+                if attempt >= self.get_retries or not self._is_retryable(exc):
+                    raise
+            # full jitter, so the agents of a project don't retry all at once
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * 2**attempt))
+            attempt += 1
+
+    @classmethod
+    def raise_for_unavailable(cls, status: int, text: str, headers: Dict[str, str]):
+        if status in cls.UNAVAILABLE_ERRORS:
+            raise cls.UNAVAILABLE_ERRORS[status](text=text, headers=headers)
+
+    @classmethod
+    def _is_retryable(cls, error: Exception) -> bool:
+        if isinstance(error, client_exceptions.ClientSSLError):
+            return False
+        return isinstance(
+            error,
+            (client_exceptions.ClientConnectionError, asyncio.TimeoutError, *cls.UNAVAILABLE_ERRORS.values()),
+        )
+
+    async def _close_with_loop(self, loop_id: int, session: ClientSession):
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            if self._sessions.get(loop_id, (None, None))[1] is session:
+                del self._sessions[loop_id]
+                self._session_closers.pop(loop_id, None)
+            await session.close()
+
+
 class ForestHttpApi:
+    client: ForestHttpClient = ForestHttpClient()
+
+    @classmethod
+    def setup_client(cls, options: HttpClientOptions):
+        cls.client = ForestHttpClient(**options)
+
     @staticmethod
     def build_endpoint(server_url: str, url: str):
         return f"{server_url}{url}"
@@ -64,32 +170,35 @@ class ForestHttpApi:
         endpoint = cls.build_endpoint(options["server_url"], "/liana/v1/ip-whitelist-rules")
         return await cls.get(endpoint, {"forest-secret-key": options["env_secret"]}, options["verify_ssl"])
 
-    @staticmethod
-    async def get(endpoint: str, headers: Dict[str, str], verify_ssl: bool = True) -> Dict[str, Any]:
-        async with ClientSession() as session:
-            try:
-                async with session.get(endpoint, headers=headers, ssl=verify_ssl) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    raise HTTPException(text=await response.text(), headers=headers)
-            except Exception as exc:
-                await ForestHttpApi._handle_server_error(endpoint, exc)
+    @classmethod
+    async def get(cls, endpoint: str, headers: Dict[str, str], verify_ssl: bool = True) -> Dict[str, Any]:
+        async def _get():
+            async with cls.client.get_session().get(endpoint, headers=headers, ssl=verify_ssl) as response:
+                if response.status == 200:
+                    return await response.json()
+                text = await response.text()
+                cls.client.raise_for_unavailable(response.status, text, headers)
+                raise HTTPException(text=text, headers=headers)
 
-    @staticmethod
+        try:
+            return await cls.client.with_retries(_get)
+        except Exception as exc:
+            await ForestHttpApi._handle_server_error(endpoint, exc)
+
+    @classmethod
     async def post(
-        endpoint: str, body: Dict[str, Any], headers: Dict[str, str], verify_ssl: bool = True
+        cls, endpoint: str, body: Dict[str, Any], headers: Dict[str, str], verify_ssl: bool = True
     ) -> Optional[Dict[str, Any]]:
-        async with ClientSession() as session:
-            try:
-                async with session.post(endpoint, json=body, headers=headers, ssl=verify_ssl) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    if response.status == 204:
-                        return None
-                    if str(response.status).startswith("4") or str(response.status).startswith("5"):
-                        raise HTTPException(text=await response.text(), headers=headers)
-            except Exception as exc:
-                await ForestHttpApi._handle_server_error(endpoint, exc)
+        try:
+            async with cls.client.get_session().post(endpoint, json=body, headers=headers, ssl=verify_ssl) as response:
+                if response.status == 200:
+                    return await response.json()
+                if response.status == 204:
+                    return None
+                if str(response.status).startswith("4") or str(response.status).startswith("5"):
+                    raise HTTPException(text=await response.text(), headers=headers)
+        except Exception as exc:
+            await ForestHttpApi._handle_server_error(endpoint, exc)
 
     @staticmethod
     def _parse_forest_response(error: HTTPException):
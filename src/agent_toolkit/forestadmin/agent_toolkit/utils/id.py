@@ -15,7 +15,10 @@ class IdException(AgentToolkitException):
 
 
 def pack_id(schema: CollectionSchema, record: RecordsDataAlias) -> str:
-    schema_pks = SchemaUtils.get_primary_keys(schema)
+    return pack_primary_keys(SchemaUtils.get_primary_keys(schema), record)
+
+
+def pack_primary_keys(schema_pks: List[str], record: RecordsDataAlias) -> str:
     if len(schema_pks) == 0:
         raise IdException("No primary key found in the collection schema.")
     pks = [str(record[pk]) for pk in schema_pks if record.get(pk) is not None]
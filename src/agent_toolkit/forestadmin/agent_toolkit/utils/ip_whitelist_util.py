@@ -1,6 +1,9 @@
+import threading
+from bisect import bisect_right
 from ipaddress import ip_address, ip_network
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
+from cachetools import LRUCache
 from forestadmin.datasource_toolkit.exceptions import ForestException
 
 
@@ -51,3 +54,68 @@ class IpWhitelistUtil:
             return False
 
         return ip_address(ip) in ip_network(subnet)
+
+
+class IpWhitelistMatcher:
+    """the whitelist rules compiled once, to match the client ips in O(log(rules))
+
+    Every rule is an interval of addresses (a single ip, a range or a subnet), so the rules of each ip version are
+    merged into sorted, disjoint intervals searched by bisection. The decisions of the last `decision_cache_size`
+    client ips are cached.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]], decision_cache_size: int = 256):
+        self.allows_loopback = False
+        intervals: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+        for rule in rules:
+            if rule["type"] == IpWhitelistUtil.RULE_MATCH_IP:
+                address = ip_address(rule["ip"])
+                # like is_ip_match_ip, a loopback rule matches the loopback ips of both versions
+                self.allows_loopback = self.allows_loopback or address.is_loopback
+                intervals[address.version].append((int(address), int(address)))
+            elif rule["type"] == IpWhitelistUtil.RULE_MATCH_RANGE:
+                minimum, maximum = ip_address(rule["ipMinimum"]), ip_address(rule["ipMaximum"])
+                intervals[minimum.version].append((int(minimum), int(maximum)))
+            elif rule["type"] == IpWhitelistUtil.RULE_MATCH_SUBNET:
+                network = ip_network(rule["range"])
+                intervals[network.version].append((int(network.network_address), int(network.broadcast_address)))
+            else:
+                raise ForestException("Invalid rule type")
+
+        self._starts: Dict[int, List[int]] = {}
+        self._ends: Dict[int, List[int]] = {}
+        for version, version_intervals in intervals.items():
+            self._starts[version], self._ends[version] = self._merge(version_intervals)
+
+        self._decisions_lock = threading.Lock()
+        self._decisions: LRUCache[str, bool] = LRUCache(decision_cache_size)
+
+    def is_match(self, ip: str) -> bool:
+        with self._decisions_lock:
+            decision = self._decisions.get(ip)
+        if decision is None:
+            decision = self._match(ip)
+            with self._decisions_lock:
+                self._decisions[ip] = decision
+        return decision
+
+    def _match(self, ip: str) -> bool:
+        address = ip_address(ip)
+        if self.allows_loopback and address.is_loopback:
+            return True
+
+        value = int(address)
+        index = bisect_right(self._starts[address.version], value) - 1
+        return index >= 0 and value <= self._ends[address.version][index]
+
+    @staticmethod
+    def _merge(intervals: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+        starts: List[int] = []
+        ends: List[int] = []
+        for start, end in sorted(intervals):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
@@ -0,0 +1,82 @@
+import abc
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Union
+from uuid import UUID
+
+from forestadmin.agent_toolkit.exceptions import AgentToolkitException
+from forestadmin.agent_toolkit.forest_logger import ForestLogger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonEncoderException(AgentToolkitException):
+    pass
+
+
+def encode_default(value: Any) -> Any:
+    """json representation of the values the json module can't encode, shared by all the encoders"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+class JsonEncoder(abc.ABC):
+    """encode the bodies of the json responses, as str or utf-8 bytes"""
+
+    @abc.abstractmethod
+    def encode(self, body: Any) -> Union[str, bytes]:
+        pass
+
+
+class StdlibJsonEncoder(JsonEncoder):
+    def encode(self, body: Any) -> str:
+        return json.dumps(body, default=encode_default)
+
+
+class OrjsonEncoder(JsonEncoder):
+    """encode with orjson, straight to bytes
+
+    The output decodes to the same values as the json module's one, except for NaN and infinite floats (encoded as
+    null instead of the invalid NaN and Infinity tokens). The bodies orjson can't encode (integers over 64 bits,
+    strings with lone surrogates, ...) are encoded by the fallback.
+    """
+
+    def __init__(self, fallback: JsonEncoder = None):
+        if orjson is None:
+            raise JsonEncoderException("orjson is not installed, install it to use OrjsonEncoder.")
+        self.fallback = fallback or StdlibJsonEncoder()
+        # datetimes and dataclasses go through encode_default, to be encoded as with the json module
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def encode(self, body: Any) -> Union[str, bytes]:
+        try:
+            return orjson.dumps(body, default=encode_default, option=self.option)
+        except orjson.JSONEncodeError:
+            return self.fallback.encode(body)
+
+
+def build_json_encoder(encoder: Union[str, JsonEncoder]) -> JsonEncoder:
+    if isinstance(encoder, JsonEncoder):
+        return encoder
+    if encoder == "json":
+        return StdlibJsonEncoder()
+    if encoder == "orjson":
+        if orjson is None:
+            ForestLogger.log("warning", "orjson is not installed, the responses are encoded with the json module.")
+            return StdlibJsonEncoder()
+        return OrjsonEncoder()
+    raise JsonEncoderException(f'Unknown json encoder "{encoder}", it should be "json", "orjson" or a JsonEncoder.')
@@ -1,6 +1,9 @@
+import hashlib
 import sys
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 if sys.version_info >= (3, 9):
     import zoneinfo
@@ -8,6 +11,8 @@ else:
     from backports import zoneinfo
 
 import jwt
+from cachetools import TTLCache
+from forestadmin.agent_toolkit.utils.context import User
 
 
 def build_jwt(body: Dict[str, Any], secret: str, expiration: int = 1) -> Tuple[str, Dict[str, Any]]:
@@ -15,3 +20,41 @@ def build_jwt(body: Dict[str, Any], secret: str, expiration: int = 1) -> Tuple[s
         datetime.now(tz=zoneinfo.ZoneInfo("UTC")) + timedelta(hours=expiration)  # type: ignore
     )
     return jwt.encode(body, secret, algorithm="HS256"), body  # type: ignore
+
+
+class UserTokenCache:
+    """users of the bearer tokens, so a token is only decoded (and its signature verified) the first time it is seen
+
+    Entries are keyed by a digest of the secret and the token, plus the timezone and ip of the request which are part
+    of the user. They expire with the token (its `exp` claim), or after `ttl` seconds for the tokens without one. The
+    cached users are shared by the requests, they must not be modified.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self._lock = threading.Lock()
+        self._cache: TTLCache[Hashable, Tuple[Optional[float], User]] = TTLCache(maxsize, ttl)
+
+    @staticmethod
+    def build_key(token: str, secret: str, timezone: Optional[str], client_ip: str) -> Hashable:
+        return hashlib.sha256(f"{secret}\x00{token}".encode()).digest(), timezone, client_ip
+
+    def get(self, key: Hashable) -> Optional[User]:
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, user = entry
+        if expires_at is not None and time.time() >= expires_at:
+            with self._lock:
+                self._cache.pop(key, None)
+            return None
+        return user
+
+    def set(self, key: Hashable, user: User, expires_at: Optional[float]):
+        with self._lock:
+            self._cache[key] = (expires_at, user)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -3,6 +3,7 @@ import csv
 import importlib
 import json
 import sys
+from io import StringIO
 from unittest import TestCase
 from unittest.mock import ANY, AsyncMock, Mock, patch
 from uuid import UUID
@@ -20,8 +21,7 @@ from forestadmin.agent_toolkit.services.permissions.ip_whitelist_service import
 from forestadmin.agent_toolkit.services.permissions.permission_service import PermissionService
 from forestadmin.agent_toolkit.services.serializers.exceptions import JsonApiSerializerException
 from forestadmin.agent_toolkit.services.serializers.json_api_serializer import JsonApiSerializer
-from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, User
-from forestadmin.agent_toolkit.utils.csv import CsvException
+from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, StreamingResponse, User
 from forestadmin.datasource_toolkit.collections import Collection, CollectionException
 from forestadmin.datasource_toolkit.datasource_customizer.datasource_composite import CompositeDatasource
 from forestadmin.datasource_toolkit.datasources import Datasource, DatasourceException
@@ -1119,6 +1119,41 @@ class TestCrudResource(TestCase):
         self.assertEqual(response_content["meta"]["decorators"]["0"], {"id": 10, "search": ["cost"]})
         self.assertEqual(response_content["meta"]["decorators"]["1"], {"id": 11, "search": ["cost"]})
 
+    def test_list_should_stream_the_large_lists(self):
+        mock_orders = [{"id": i, "cost": 200 + i} for i in range(5)]
+        request = RequestCollection(
+            RequestMethod.GET,
+            self.collection_order,
+            query={
+                "collection_name": "order",
+                "timezone": "Europe/Paris",
+                "fields[order]": "id,cost",
+                "search": "203",
+            },
+            headers={},
+            client_ip="127.0.0.1",
+        )
+        crud_resource = CrudResource(
+            self.datasource_composite,
+            self.datasource,
+            self.permission_service,
+            self.ip_white_list_service,
+            self.options,
+        )
+
+        with patch.object(crud_resource, "STREAMED_RECORDS_THRESHOLD", 5):
+            with patch.object(self.collection_order, "list", new_callable=AsyncMock, return_value=mock_orders):
+                response = self.loop.run_until_complete(crud_resource.list(request))
+
+        self.assertIsInstance(response, StreamingResponse)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        response_content = json.loads(b"".join(response.iter_body_sync()))
+        self.assertEqual([item["id"] for item in response_content["data"]], [0, 1, 2, 3, 4])
+        self.assertEqual(response_content["data"][3]["attributes"], {"id": 3, "cost": 203})
+        self.assertIn("products", response_content["data"][3]["relationships"])
+        self.assertEqual(response_content["meta"], {"decorators": {"0": {"id": 3, "search": ["cost"]}}})
+
     def test_list_should_return_to_many_relations_as_link(self):
         mock_orders = [{"id": 10, "cost": 200}, {"id": 11, "cost": 201}]
         request = RequestCollection(
@@ -1891,7 +1926,7 @@ class TestCrudResource(TestCase):
 
         assert response.status == 200
         self.collection_order.list.assert_awaited()
-        csv_reader = csv.DictReader(response.body)
+        csv_reader = csv.DictReader(StringIO("".join(response.iter_body_sync())))
         response_content = [row for row in csv_reader]
         assert isinstance(response_content, list)
         assert len(response_content) == 2
@@ -1901,7 +1936,6 @@ class TestCrudResource(TestCase):
         assert response_content[1]["id"] == str(mock_orders[1]["id"])
 
     def test_csv_errors(self):
-        mock_orders = [{"id": 10, "cost": 200}, {"id": 11, "cost": 201}]
         request = RequestCollection(
             RequestMethod.GET,
             self.collection_order,
@@ -1959,27 +1993,8 @@ class TestCrudResource(TestCase):
         response_content = json.loads(response.body)
         assert response_content["errors"][0] == {"detail": "🌳🌳🌳", "name": "DatasourceException", "status": 500}
 
-        # CsvException
-        self.collection_order.list = AsyncMock(return_value=mock_orders)
-        with patch(
-            "forestadmin.agent_toolkit.resources.collections.crud.Csv.make_csv",
-            side_effect=CsvException("cannot make csv"),
-        ):
-            response = self.loop.run_until_complete(crud_resource.csv(request))
-        self.permission_service.can.assert_any_await(request.user, request.collection, "browse")
-        self.permission_service.can.assert_any_await(request.user, request.collection, "export")
-        self.permission_service.can.reset_mock()
-
-        assert response.status == 500
-        response_content = json.loads(response.body)
-        assert response_content["errors"][0] == {
-            "detail": "🌳🌳🌳cannot make csv",
-            "name": "CsvException",
-            "status": 500,
-        }
-
-    def test_csv_should_not_apply_pagination(self):
-        mock_orders = [{"id": 10, "cost": 200}, {"id": 11, "cost": 201}]
+    def test_csv_should_read_records_by_batches(self):
+        mock_orders = [{"id": i, "cost": 200 + i} for i in range(5)]
 
         request = RequestCollection(
             RequestMethod.GET,
@@ -1988,6 +2003,7 @@ class TestCrudResource(TestCase):
                 "collection_name": "order",
                 "timezone": "Europe/Paris",
                 "fields[order]": "id,cost",
+                "sort": "-cost",
             },
             headers={},
             client_ip="127.0.0.1",
@@ -1999,16 +2015,23 @@ class TestCrudResource(TestCase):
             self.ip_white_list_service,
             self.options,
         )
-        self.collection_order.list = AsyncMock(return_value=mock_orders)
+        self.collection_order.list = AsyncMock(side_effect=[mock_orders[0:2], mock_orders[2:4], mock_orders[4:]])
 
-        response = self.loop.run_until_complete(crud_resource.csv(request))
+        with patch("forestadmin.agent_toolkit.utils.csv.CSV_BATCH_SIZE", 2):
+            response = self.loop.run_until_complete(crud_resource.csv(request))
+            # only the first batch is read before the response is returned
+            self.assertEqual(self.collection_order.list.await_count, 1)
+            response_content = [*csv.DictReader(StringIO("".join(response.iter_body_sync())))]
         self.permission_service.can.reset_mock()
 
-        assert response.status == 200
-        self.collection_order.list.assert_awaited()
-        self.assertIsNone(self.collection_order.list.await_args[0][1].page)
-        self.collection_order.list.assert_awaited()
-        self.assertIsNone(self.collection_order.list.await_args[0][1].page)
+        self.assertEqual([row["id"] for row in response_content], [str(order["id"]) for order in mock_orders])
+        self.assertEqual(self.collection_order.list.await_count, 3)
+        pages = [call.args[1].page for call in self.collection_order.list.await_args_list]
+        self.assertEqual([(page.skip, page.limit) for page in pages], [(0, 2), (2, 2), (4, 2)])
+        self.assertEqual(
+            self.collection_order.list.await_args[0][1].sort,
+            [{"field": "cost", "ascending": False}, {"field": "id", "ascending": True}],
+        )
 
     def test_csv_should_handle_live_query_segment(self):
         mock_orders = [{"id": 10, "cost": 200}, {"id": 11, "cost": 201}]
@@ -3,6 +3,7 @@ import csv
 import importlib
 import json
 import sys
+from io import StringIO
 from unittest import TestCase
 from unittest.mock import ANY, AsyncMock, Mock, patch
 
@@ -21,8 +22,7 @@ from forestadmin.agent_toolkit.resources.collections.requests import (
 from forestadmin.agent_toolkit.services.permissions.ip_whitelist_service import IpWhiteListService
 from forestadmin.agent_toolkit.services.permissions.permission_service import PermissionService
 from forestadmin.agent_toolkit.services.serializers.exceptions import JsonApiSerializerException
-from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, User
-from forestadmin.agent_toolkit.utils.csv import CsvException
+from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, StreamingResponse, User
 from forestadmin.agent_toolkit.utils.id import unpack_id
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasources import Datasource, DatasourceException
@@ -433,6 +433,37 @@ class TestCrudRelatedResource(TestCase):
         self.assertEqual(response_content["meta"]["decorators"]["0"], {"id": 10, "search": ["cost"]})
         self.assertEqual(response_content["meta"]["decorators"]["1"], {"id": 11, "search": ["cost"]})
 
+    def test_list_should_stream_the_large_lists(self):
+        mock_orders = [{"id": i, "cost": 200 + i} for i in range(5)]
+        request = RequestRelationCollection(
+            RequestMethod.GET,
+            *self.mk_request_customer_order_one_to_many(),
+            headers={},
+            query={
+                "collection_name": "customer",
+                "relation_name": "order",
+                "timezone": "Europe/Paris",
+                "fields[order]": "id,cost",
+                "pks": "2",  # customer id
+            },
+            body=None,
+            user=None,
+            client_ip="127.0.0.1",
+        )
+        crud_related_resource = CrudRelatedResource(
+            self.datasource, self.permission_service, self.ip_white_list_service, self.options
+        )
+
+        with patch.object(crud_related_resource, "STREAMED_RECORDS_THRESHOLD", 5):
+            with patch.object(self.collection_order, "list", new_callable=AsyncMock, return_value=mock_orders):
+                response = self.loop.run_until_complete(crud_related_resource.list(request))
+
+        self.assertIsInstance(response, StreamingResponse)
+        response_content = json.loads(b"".join(response.iter_body_sync()))
+        self.assertEqual([item["id"] for item in response_content["data"]], [0, 1, 2, 3, 4])
+        self.assertEqual(response_content["data"][0]["type"], "order")
+        self.assertNotIn("meta", response_content)
+
     def test_list_error_on_relation_type(self):
         crud_related_resource = CrudRelatedResource(
             self.datasource, self.permission_service, self.ip_white_list_service, self.options
@@ -534,7 +565,7 @@ class TestCrudRelatedResource(TestCase):
         self.collection_order.list = AsyncMock(return_value=mock_orders)
 
         with patch(
-            "forestadmin.agent_toolkit.resources.collections.crud_related.JsonApiSerializer.serialize",
+            "forestadmin.agent_toolkit.resources.collections.base_collection_resource.JsonApiSerializer.serialize",
             side_effect=JsonApiSerializerException,
         ) as mock_serialize:
             response = self.loop.run_until_complete(crud_related_resource.list(request))
@@ -583,7 +614,7 @@ class TestCrudRelatedResource(TestCase):
         self.permission_service.can.reset_mock()
 
         assert response.status == 200
-        csv_reader = csv.DictReader(response.body)
+        csv_reader = csv.DictReader(StringIO("".join(response.iter_body_sync())))
         response_content = [row for row in csv_reader]
         assert isinstance(response_content, list)
         assert len(response_content) == 2
@@ -593,7 +624,6 @@ class TestCrudRelatedResource(TestCase):
         assert response_content[1]["id"] == str(mock_orders[1]["id"])
 
     def test_csv_errors(self):
-        mock_orders = [{"id": 10, "cost": 200}, {"id": 11, "cost": 201}]
         crud_related_resource = CrudRelatedResource(
             self.datasource, self.permission_service, self.ip_white_list_service, self.options
         )
@@ -683,28 +713,8 @@ class TestCrudRelatedResource(TestCase):
             "status": 500,
         }
 
-        # JsonApiException
-        self.collection_order.list = AsyncMock(return_value=mock_orders)
-        with patch(
-            "forestadmin.agent_toolkit.resources.collections.crud_related.Csv.make_csv",
-            side_effect=CsvException("cannot make csv"),
-        ):
-            response = self.loop.run_until_complete(crud_related_resource.csv(request))
-
-        self.permission_service.can.assert_any_await(request.user, request.foreign_collection, "browse")
-        self.permission_service.can.assert_any_await(request.user, request.foreign_collection, "export")
-        self.permission_service.can.reset_mock()
-
-        assert response.status == 500
-        response_content = json.loads(response.body)
-        assert response_content["errors"][0] == {
-            "name": "CsvException",
-            "detail": "🌳🌳🌳cannot make csv",
-            "status": 500,
-        }
-
-    def test_csv_should_not_apply_pagination(self):
-        mock_orders = [{"id": 10, "cost": 200}, {"id": 11, "cost": 201}]
+    def test_csv_should_read_records_by_batches(self):
+        mock_orders = [{"id": i, "cost": 200 + i} for i in range(3)]
 
         request = RequestRelationCollection(
             RequestMethod.GET,
@@ -722,12 +732,17 @@ class TestCrudRelatedResource(TestCase):
             },
         )
         with patch.object(
-            self.collection_order, "list", new_callable=AsyncMock, return_value=mock_orders
+            self.collection_order, "list", new_callable=AsyncMock, side_effect=[mock_orders[0:2], mock_orders[2:]]
         ) as mocked_collection_list:
-            self.loop.run_until_complete(self.crud_related_resource.csv(request))
-            mocked_collection_list.assert_awaited()
-            self.assertIsNone(mocked_collection_list.await_args[0][1].page)
+            with patch("forestadmin.agent_toolkit.utils.csv.CSV_BATCH_SIZE", 2):
+                response = self.loop.run_until_complete(self.crud_related_resource.csv(request))
+                response_content = [*csv.DictReader(StringIO("".join(response.iter_body_sync())))]
+
+            self.assertEqual(mocked_collection_list.await_count, 2)
+            pages = [call.args[1].page for call in mocked_collection_list.await_args_list]
+            self.assertEqual([(page.skip, page.limit) for page in pages], [(0, 2), (2, 2)])
 
+        self.assertEqual([row["id"] for row in response_content], [str(order["id"]) for order in mock_orders])
         self.permission_service.can.reset_mock()
 
     # add
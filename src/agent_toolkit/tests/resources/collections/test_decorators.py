@@ -1,5 +1,6 @@
 import asyncio
 import json
+import time
 from unittest import TestCase
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -10,6 +11,7 @@ from forestadmin.agent_toolkit.resources.collections.decorators import (
     _authorize,
     _check_method,
     _ip_white_list,
+    user_token_cache,
 )
 from forestadmin.agent_toolkit.resources.collections.requests import RequestCollection
 from forestadmin.agent_toolkit.services.permissions.ip_whitelist_service import IpWhiteListService
@@ -89,6 +91,21 @@ class TestDecorators(TestCase):
 
 
 class TestAuthenticateDecorators(TestDecorators):
+    def setUp(self):
+        super().setUp()
+        user_token_cache.clear()
+
+    def _build_request(self, token, timezone="Europe/Paris"):
+        return RequestCollection(
+            method=RequestMethod.GET,
+            collection=self.book_collection,
+            body=None,
+            client_ip="127.0.0.1",
+            user=None,
+            query={"timezone": timezone},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
     def test_should_return_401_if_no_headers(self):
         request = RequestCollection(
             method=RequestMethod.GET,
@@ -192,6 +209,89 @@ class TestAuthenticateDecorators(TestDecorators):
 
         self.assertEqual(response, True)
 
+    def test_should_only_decode_a_token_the_first_time_it_is_seen(self):
+        token = jwt.encode(
+            {
+                "rendering_id": "1",
+                "id": "1",
+                "email": "user@company.com",
+                "first_name": "first_name",
+                "last_name": "last_name",
+                "team": "best_team",
+                "exp": time.time() + 60,
+            },
+            "auth_secret",
+        )
+        decorated_fn = AsyncMock(return_value=True)
+        first_request = self._build_request(token)
+        second_request = self._build_request(token)
+        other_timezone_request = self._build_request(token, "America/New_York")
+
+        with patch("forestadmin.agent_toolkit.resources.collections.decorators.jwt.decode", wraps=jwt.decode) as spy:
+            for request in [first_request, second_request, other_timezone_request]:
+                self.loop.run_until_complete(_authenticate(self.collection_resource, request, decorated_fn))
+
+        self.assertEqual(spy.call_count, 2)
+        self.assertIs(first_request.user, second_request.user)
+        self.assertEqual(first_request.user.user_id, 1)
+        self.assertEqual(str(other_timezone_request.user.timezone), "America/New_York")
+        self.assertRaises(AttributeError, setattr, first_request.user, "user_id", 2)
+
+    def test_should_decode_the_token_again_once_it_is_expired(self):
+        expires_at = time.time() + 60
+        token = jwt.encode(
+            {
+                "rendering_id": "1",
+                "id": "1",
+                "email": "user@company.com",
+                "first_name": "first_name",
+                "last_name": "last_name",
+                "team": "best_team",
+                "exp": expires_at,
+            },
+            "auth_secret",
+        )
+        decorated_fn = AsyncMock(return_value=True)
+        self.loop.run_until_complete(_authenticate(self.collection_resource, self._build_request(token), decorated_fn))
+
+        with patch("forestadmin.agent_toolkit.utils.token.time.time", return_value=expires_at + 1), patch(
+            "forestadmin.agent_toolkit.resources.collections.decorators.jwt.decode",
+            side_effect=jwt.ExpiredSignatureError("Signature has expired"),
+        ) as mock_decode:
+            response = self.loop.run_until_complete(
+                _authenticate(self.collection_resource, self._build_request(token), decorated_fn)
+            )
+
+        mock_decode.assert_called_once()
+        self.assertEqual(response.status, 401)
+        decorated_fn.assert_awaited_once()
+
+    def test_should_not_share_users_between_secrets(self):
+        token = jwt.encode(
+            {
+                "rendering_id": "1",
+                "id": "1",
+                "email": "user@company.com",
+                "first_name": "first_name",
+                "last_name": "last_name",
+                "team": "best_team",
+            },
+            "auth_secret",
+        )
+        decorated_fn = AsyncMock(return_value=True)
+        self.loop.run_until_complete(_authenticate(self.collection_resource, self._build_request(token), decorated_fn))
+
+        other_resource = BaseCollectionResource(
+            self.datasource,
+            self.permission_service,
+            self.ip_white_list_service,
+            {"env_secret": "env_secret", "auth_secret": "other_secret", "server_url": "http://fake.forest.com"},
+        )
+        response = self.loop.run_until_complete(_authenticate(other_resource, self._build_request(token), decorated_fn))
+
+        self.assertEqual(response.status, 401)
+        decorated_fn.assert_awaited_once()
+
 
 class TestAuthorizeDecorators(TestDecorators):
     @classmethod
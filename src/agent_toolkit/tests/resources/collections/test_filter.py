@@ -1,11 +1,20 @@
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from forestadmin.agent_toolkit.resources.collections.filter import parse_condition_tree, parse_projection, parse_sort
+from forestadmin.agent_toolkit.resources.collections.filter import (
+    ParsedQueriesCache,
+    parse_condition_tree,
+    parse_projection,
+    parse_projection_with_pks,
+    parse_sort,
+    parsed_queries_cache,
+)
 from forestadmin.agent_toolkit.resources.collections.requests import RequestCollection
 from forestadmin.agent_toolkit.utils.context import RequestMethod
 from forestadmin.datasource_toolkit.collections import Collection, CollectionException
 from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.decorators.datasource_decorator import DatasourceDecorator
+from forestadmin.datasource_toolkit.decorators.segments.collections import SegmentCollectionDecorator
 from forestadmin.datasource_toolkit.interfaces.fields import (
     Column,
     FieldType,
@@ -15,6 +24,8 @@ from forestadmin.datasource_toolkit.interfaces.fields import (
     PrimitiveType,
 )
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import Aggregator
+from forestadmin.datasource_toolkit.interfaces.query.projections import FrozenProjection, ProjectionException
+from forestadmin.datasource_toolkit.validations.condition_tree import ConditionTreeValidator
 from forestadmin.datasource_toolkit.validations.projection import ProjectionValidator
 
 
@@ -112,6 +123,9 @@ class TestFilter(TestCase):
         cls.datasource.add_collection(cls.collection_person)
         cls.datasource.add_collection(cls.collection_tag)
 
+    def setUp(self) -> None:
+        parsed_queries_cache.clear()
+
 
 class TestFilterConditionTree(TestFilter):
     def test_parse_condition_tree_should_parse_array_when_IN_operator_str(self):
@@ -346,3 +360,106 @@ class TestFilterSort(TestFilter):
         )
         sort = parse_sort(request)
         self.assertEqual(sort, [{"field": "title", "ascending": False}, {"field": "id", "ascending": True}])
+
+
+class TestFilterCache(TestFilter):
+    def setUp(self) -> None:
+        super().setUp()
+        self.decorated_datasource = DatasourceDecorator(self.datasource, SegmentCollectionDecorator)
+        self.decorated_book = self.decorated_datasource.get_collection("Book")
+
+    def _build_request(self, query):
+        return RequestCollection(
+            method=RequestMethod.GET,
+            body=None,
+            query={"collection_name": "Book", **query},
+            collection=self.decorated_book,
+            headers={},
+            client_ip="127.0.0.1",
+        )
+
+    def test_should_not_parse_nor_validate_the_same_parameters_twice(self):
+        request = self._build_request(
+            {
+                "fields[Book]": "id,title,author",
+                "fields[author]": "id",
+                "filters": '{"field": "id", "operator": "in", "value": "1,2"}',
+                "sort": "-title",
+            }
+        )
+
+        with patch(
+            "forestadmin.agent_toolkit.resources.collections.filter.ConditionTreeValidator.validate",
+            wraps=ConditionTreeValidator.validate,
+        ) as spy_tree_validate:
+            with patch(
+                "forestadmin.agent_toolkit.resources.collections.filter.ProjectionValidator.validate",
+                wraps=ProjectionValidator.validate,
+            ) as spy_projection_validate:
+                results = [
+                    (parse_condition_tree(request), parse_projection_with_pks(request), parse_sort(request))
+                    for _ in range(3)
+                ]
+
+        spy_tree_validate.assert_called_once()
+        spy_projection_validate.assert_called_once()
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(results[0][1], ["id", "title", "author:id"])
+
+        other_request = self._build_request({"filters": '{"field": "id", "operator": "equal", "value": 1}'})
+        with patch(
+            "forestadmin.agent_toolkit.resources.collections.filter.ConditionTreeValidator.validate",
+            wraps=ConditionTreeValidator.validate,
+        ) as spy_tree_validate:
+            parse_condition_tree(other_request)
+        spy_tree_validate.assert_called_once()
+
+    def test_should_return_copies_of_the_cached_values(self):
+        request = self._build_request(
+            {"fields[Book]": "id,title", "filters": '{"field": "id", "operator": "equal", "value": 1}', "sort": "id"}
+        )
+        condition_tree = parse_condition_tree(request)
+        condition_tree.field = "title"
+        parse_projection(request).append("author_id")
+        parse_sort(request)[0]["ascending"] = False
+
+        self.assertEqual(parse_condition_tree(request).field, "id")
+        self.assertEqual(parse_projection(request), ["id", "title"])
+        self.assertEqual(parse_sort(request), [{"field": "id", "ascending": True}])
+
+    def test_should_share_a_frozen_projection_with_pks(self):
+        request = self._build_request({"fields[Book]": "id,title,author", "fields[author]": "id"})
+        projection = parse_projection_with_pks(request)
+
+        self.assertIsInstance(projection, FrozenProjection)
+        self.assertIs(parse_projection_with_pks(request), projection)
+        self.assertRaises(ProjectionException, projection.append, "author_id")
+
+    def test_should_parse_the_parameters_again_when_the_schema_changes(self):
+        request = self._build_request({"fields[Book]": "id,title"})
+
+        with patch(
+            "forestadmin.agent_toolkit.resources.collections.filter.ProjectionValidator.validate",
+            wraps=ProjectionValidator.validate,
+        ) as spy_validate:
+            parse_projection(request)
+            parse_projection(request)
+            self.assertEqual(spy_validate.call_count, 1)
+
+            self.decorated_book.add_segment("recent", lambda context: None)
+            self.assertEqual(parse_projection(request), ["id", "title"])
+            self.assertEqual(spy_validate.call_count, 2)
+
+    def test_should_evict_the_least_recently_used_entries(self):
+        cache = ParsedQueriesCache(2)
+        parse = Mock(side_effect=lambda: object())
+
+        first = cache.get_or_parse(self.collection_book, ("a",), parse)
+        cache.get_or_parse(self.collection_book, ("b",), parse)
+        self.assertIs(cache.get_or_parse(self.collection_book, ("a",), parse), first)
+        cache.get_or_parse(self.collection_book, ("c",), parse)
+        self.assertEqual(parse.call_count, 3)
+
+        self.assertIs(cache.get_or_parse(self.collection_book, ("a",), parse), first)
+        cache.get_or_parse(self.collection_book, ("b",), parse)
+        self.assertEqual(parse.call_count, 4)
@@ -7,7 +7,7 @@ from forestadmin.agent_toolkit.resources.security.exceptions import Authenticati
 from forestadmin.agent_toolkit.resources.security.resources import Authentication
 from forestadmin.agent_toolkit.services.permissions.ip_whitelist_service import IpWhiteListService
 from forestadmin.agent_toolkit.utils.authentication import CustomClientOic
-from forestadmin.agent_toolkit.utils.context import Request, RequestMethod
+from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder, Request, RequestMethod
 from forestadmin.agent_toolkit.utils.token import build_jwt
 
 
@@ -284,6 +284,19 @@ class TestAuthenticationResourceHandleError(TestAuthenticationResource):
         self.assertEqual(response_content["error_description"], "error_description")
         self.assertEqual(response_content["state"], "state")
 
+    def test_handle_error_should_encode_the_body_with_the_json_encoder_of_the_agent(self):
+        request = Request(RequestMethod.GET, query={}, headers={}, client_ip="127.0.0.1")
+        encoder = Mock(encode=Mock(return_value=b'{"error": "AuthenticationException"}'))
+        with patch.object(HttpResponseBuilder, "_JSON_ENCODER", encoder):
+            response = self.authentication_resource._handle_error(
+                "authenticate", request, AuthenticationException("state should be a json")
+            )
+
+        encoder.encode.assert_called_once_with(
+            {"error": "AuthenticationException", "error_description": "🌳🌳🌳state should be a json"}
+        )
+        self.assertEqual(response.body, b'{"error": "AuthenticationException"}')
+
     def test_handle_error_should_re_throw_errors_unrelated_to_authentication(self):
         request = Request(RequestMethod.GET, query={}, headers={}, client_ip="127.0.0.1")
 
@@ -0,0 +1,69 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from forestadmin.agent_toolkit.services.permissions.action_endpoint_index import ActionEndpointIndex
+from forestadmin.datasource_toolkit.collections import Collection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.decorators.action.collections import ActionCollectionDecorator
+from forestadmin.datasource_toolkit.decorators.datasource_decorator import DatasourceDecorator
+from forestadmin.datasource_toolkit.interfaces.actions import ActionsScope
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, PrimitiveType
+
+
+class TestActionEndpointIndex(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        Collection.__abstractmethods__ = set()  # to instantiate abstract class
+
+    def setUp(self) -> None:
+        datasource = Datasource()
+        collection = Collection("Booking", datasource)
+        collection.add_fields(
+            {
+                "id": {
+                    "column_type": PrimitiveType.NUMBER,
+                    "is_primary_key": True,
+                    "type": FieldType.COLUMN,
+                    "is_read_only": False,
+                    "validations": [],
+                    "default_value": None,
+                    "filter_operators": set(),
+                    "is_sortable": False,
+                    "enum_values": None,
+                },
+            }
+        )
+        datasource.add_collection(collection)
+        self.datasource = DatasourceDecorator(datasource, ActionCollectionDecorator)
+        self.collection = self.datasource.get_collection("Booking")
+        self.collection.add_action("Mark as live", {"scope": ActionsScope.SINGLE, "execute": lambda ctx, rb: None})
+        self.collection.add_action("Refund", {"scope": ActionsScope.BULK, "execute": lambda ctx, rb: None})
+        self.index = ActionEndpointIndex()
+
+    def test_get_action_name_should_return_the_action_of_the_endpoint(self):
+        self.index.build(self.datasource)
+
+        self.assertEqual(
+            self.index.get_action_name(self.collection, "/forest/_actions/Booking/0/mark as live"), "Mark as live"
+        )
+        self.assertEqual(self.index.get_action_name(self.collection, "/forest/_actions/Booking/1/refund"), "Refund")
+        self.assertIsNone(self.index.get_action_name(self.collection, "/forest/_actions/Booking/1/mark as live"))
+
+    def test_get_action_name_should_not_index_again_while_the_schema_is_unchanged(self):
+        self.index.build(self.datasource)
+
+        with patch.object(self.index, "_index_collection", wraps=self.index._index_collection) as spy_index:
+            self.index.get_action_name(self.collection, "/forest/_actions/Booking/0/mark as live")
+            self.index.get_action_name(self.collection, "/forest/_actions/Booking/1/refund")
+        spy_index.assert_not_called()
+
+    def test_get_action_name_should_index_again_when_the_schema_is_marked_as_dirty(self):
+        self.index.build(self.datasource)
+
+        # add_action marks the schema as dirty
+        self.collection.add_action("Cancel", {"scope": ActionsScope.GLOBAL, "execute": lambda ctx, rb: None})
+
+        self.assertEqual(self.index.get_action_name(self.collection, "/forest/_actions/Booking/2/cancel"), "Cancel")
+
+    def test_get_action_name_should_index_collections_on_first_call_without_build(self):
+        self.assertEqual(self.index.get_action_name(self.collection, "/forest/_actions/Booking/1/refund"), "Refund")
@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from unittest import TestCase, skipUnless
+
+from forestadmin.agent_toolkit.services.permissions.cache_backend import HostElection, SQLitePermissionCacheBackend
+
+
+def _set_in_child_process(path: str):
+    SQLitePermissionCacheBackend(path).set("forest.users", {1: {"roleId": 2}}, time.time(), 60)
+
+
+class TestSQLitePermissionCacheBackend(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "permissions.sqlite")
+        self.backend = SQLitePermissionCacheBackend(self.path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_get_should_return_the_value_and_its_fetch_time(self):
+        self.backend.set("forest.users", {1: {"roleId": 2}}, 1000.0, 60)
+        self.backend.set("forest.users", {1: {"roleId": 3}}, time.time(), 60)
+
+        value, fetched_at = self.backend.get("forest.users")
+        self.assertEqual(value, {1: {"roleId": 3}})
+        self.assertAlmostEqual(fetched_at, time.time(), delta=1)
+        self.assertIsNone(self.backend.get("forest.collections"))
+
+    def test_get_should_ignore_expired_values(self):
+        self.backend.set("forest.users", {}, time.time() - 61, 60)
+
+        self.assertIsNone(self.backend.get("forest.users"))
+
+    def test_delete_and_delete_prefix(self):
+        for key in ["forest.users", "forest.rendering:1", "forest.rendering:2"]:
+            self.backend.set(key, key, time.time(), 60)
+
+        self.backend.delete("forest.rendering:1")
+        self.assertIsNone(self.backend.get("forest.rendering:1"))
+        self.assertIsNotNone(self.backend.get("forest.rendering:2"))
+
+        self.backend.delete_prefix("forest.rendering:")
+        self.assertIsNone(self.backend.get("forest.rendering:2"))
+        self.assertIsNotNone(self.backend.get("forest.users"))
+
+    @skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_values_should_be_shared_with_forked_processes(self):
+        # the connection opened here must not be reused by the forked process
+        self.assertIsNone(self.backend.get("forest.users"))
+
+        process = multiprocessing.get_context("fork").Process(target=_set_in_child_process, args=(self.path,))
+        process.start()
+        process.join(10)
+
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(self.backend.get("forest.users")[0], {1: {"roleId": 2}})
+
+    def test_listener_lock_should_be_next_to_the_database(self):
+        self.assertEqual(self.backend.get_listener_lock_path(), f"{self.path}.sse-listener.lock")
+
+
+class TestHostElection(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.lock_path = os.path.join(self.tmp_dir.name, "listener.lock")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @skipUnless(os.name == "posix", "flock is posix only")
+    def test_only_one_election_should_be_won_until_released(self):
+        election_1 = HostElection(self.lock_path)
+        election_2 = HostElection(self.lock_path)
+
+        self.assertTrue(election_1.try_acquire())
+        self.assertTrue(election_1.try_acquire())
+        self.assertFalse(election_2.try_acquire())
+        self.assertFalse(election_2.is_elected)
+
+        election_1.release()
+        self.assertFalse(election_1.is_elected)
+        self.assertTrue(election_2.try_acquire())
+        election_2.release()
@@ -1,5 +1,10 @@
 import asyncio
+import logging
+import os
+import sqlite3
 import sys
+import tempfile
+import time
 from typing import Dict, Literal, Union
 from unittest import TestCase
 from unittest.mock import AsyncMock, _patch, patch
@@ -10,10 +15,11 @@ else:
     from backports import zoneinfo
 
 from forestadmin.agent_toolkit.resources.collections.requests import RequestCollection
+from forestadmin.agent_toolkit.services.permissions.cache_backend import SQLitePermissionCacheBackend
 from forestadmin.agent_toolkit.services.permissions.options import RoleOptions
 from forestadmin.agent_toolkit.services.permissions.permission_service import PermissionService
 from forestadmin.agent_toolkit.utils.context import RequestMethod, User
-from forestadmin.agent_toolkit.utils.http import ForestHttpApi
+from forestadmin.agent_toolkit.utils.http import ForestHttpApi, ForestHttpApiException
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasources import Datasource
 from forestadmin.datasource_toolkit.decorators.action.collections import ActionCollectionDecorator
@@ -251,6 +257,47 @@ class Test01CachePermissionService(BaseTestPermissionService):
 
         [patch.stop() for name, patch in http_patches.items()]
 
+    def test_rendering_permissions_should_be_cached_per_rendering(self):
+        with self.mock_forest_http_api()["get_rendering_permissions"] as mock_get_rendering_permissions:
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+
+        self.assertEqual(mock_get_rendering_permissions.await_count, 2)
+        self.assertEqual(set(self.permission_service.rendering_cache.keys()), {1, 2})
+
+    def test_invalidate_rendering_cache_should_only_delete_the_given_rendering(self):
+        with self.mock_forest_http_api()["get_rendering_permissions"]:
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+
+        self.permission_service.invalidate_rendering_cache("2")
+        self.assertEqual(set(self.permission_service.rendering_cache.keys()), {1})
+
+        self.permission_service.invalidate_rendering_cache(None)
+        self.assertEqual(len(self.permission_service.rendering_cache), 0)
+
+    def test_invalidate_cache_of_forest_rendering_should_delete_all_renderings(self):
+        with self.mock_forest_http_api()["get_rendering_permissions"]:
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+
+        self.permission_service.invalidate_cache("forest.rendering")
+        self.assertEqual(len(self.permission_service.rendering_cache), 0)
+
+    def test_rendering_cache_should_evict_the_least_recently_used_rendering(self):
+        with patch.object(PermissionService, "RENDERING_CACHE_SIZE", 2):
+            permission_service = PermissionService(self.options)
+
+        with self.mock_forest_http_api()["get_rendering_permissions"]:
+            self.loop.run_until_complete(permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(permission_service._get_rendering_data(2))
+            self.loop.run_until_complete(permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(permission_service._get_rendering_data(3))
+
+        self.assertEqual(set(permission_service.rendering_cache.keys()), {1, 3})
+
 
 class Test02CanPermissionService(BaseTestPermissionService):
     def test_can_should_return_true_in_dev_mode(self):
@@ -828,3 +875,211 @@ class Test06CanLiveQuerySegment(BaseTestPermissionService):
         )
 
         http_patches["get_rendering_permissions"].stop()
+
+
+class Test07SingleFlightPermissionService(BaseTestPermissionService):
+    def test_concurrent_cache_misses_should_send_one_request_per_cache_key(self):
+        http_patches: PatchHttpApiDict = self.mock_forest_http_api()
+        http_mocks: MockHttpApiDict = {name: patch.start() for name, patch in http_patches.items()}
+
+        def _slow_server(response):
+            async def _answer(*args):
+                await asyncio.sleep(0.01)
+                return response
+
+            return _answer
+
+        for mock in http_mocks.values():
+            mock.side_effect = _slow_server(mock.return_value)
+
+        async def _requests():
+            await asyncio.gather(
+                *[self.permission_service.can(self.mocked_caller, self.booking_collection, "browse") for _ in range(5)],
+                *[self.permission_service.get_scope(self.mocked_caller, self.booking_collection) for _ in range(5)],
+            )
+
+        self.loop.run_until_complete(_requests())
+
+        http_mocks["get_users"].assert_awaited_once()
+        http_mocks["get_rendering_permissions"].assert_awaited_once()
+        # has_permission and collections
+        self.assertEqual(http_mocks["get_environment_permissions"].await_count, 2)
+        self.assertEqual(self.permission_service.get_fetch_metrics(), {"issued": 4, "coalesced": 16})
+
+        [patch.stop() for name, patch in http_patches.items()]
+
+
+class Test08StaleWhileRevalidatePermissionService(BaseTestPermissionService):
+    def setUp(self) -> None:
+        super().setUp()
+        # every cached entry is past its soft ttl
+        self.permission_service = PermissionService({**self.options, "permission_cache_soft_duration": 0})
+
+    def wait_for_refreshes(self):
+        deadline = time.monotonic() + 2
+        while self.permission_service._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_stale_entries_should_be_returned_and_refreshed_in_background(self):
+        with patch.object(
+            ForestHttpApi,
+            "get_users",
+            new_callable=AsyncMock,
+            side_effect=[[{"id": 1, "roleId": 1}], [{"id": 1, "roleId": 2}], [{"id": 1, "roleId": 3}]],
+        ) as mock_get_users:
+            first = self.loop.run_until_complete(self.permission_service.get_user_data(1))
+            stale = self.loop.run_until_complete(self.permission_service.get_user_data(1))
+            self.wait_for_refreshes()
+            refreshed = self.loop.run_until_complete(self.permission_service.get_user_data(1))
+            self.wait_for_refreshes()
+
+        self.assertEqual(first["roleId"], 1)
+        self.assertEqual(stale["roleId"], 1)
+        self.assertEqual(refreshed["roleId"], 2)
+        self.assertEqual(mock_get_users.await_count, 3)
+        metrics = self.permission_service.get_cache_metrics()
+        self.assertEqual(metrics["stale_hits"], 2)
+        self.assertEqual(metrics["background_refreshes"], 2)
+        self.assertEqual(metrics["background_refresh_failures"], 0)
+
+    def test_stale_entries_should_be_kept_when_the_refresh_fails(self):
+        with patch.object(
+            ForestHttpApi,
+            "get_users",
+            new_callable=AsyncMock,
+            side_effect=[[{"id": 1, "roleId": 1}], ForestHttpApiException("Forest is in maintenance")],
+        ):
+            self.loop.run_until_complete(self.permission_service.get_user_data(1))
+            with self.assertLogs("forestadmin", level=logging.WARNING) as logger:
+                stale = self.loop.run_until_complete(self.permission_service.get_user_data(1))
+                self.wait_for_refreshes()
+
+        self.assertEqual(stale["roleId"], 1)
+        self.assertEqual(self.permission_service.cache["forest.users"][1]["roleId"], 1)
+        self.assertEqual(
+            logger.output,
+            ["WARNING:forestadmin:Cannot refresh forest.users permissions, keeping the cached ones."],
+        )
+        self.assertEqual(self.permission_service.get_cache_metrics()["background_refresh_failures"], 1)
+
+    def test_expired_entries_should_be_fetched_before_being_returned(self):
+        with patch.object(
+            ForestHttpApi,
+            "get_users",
+            new_callable=AsyncMock,
+            side_effect=[[{"id": 1, "roleId": 1}], [{"id": 1, "roleId": 2}]],
+        ):
+            self.loop.run_until_complete(self.permission_service.get_user_data(1))
+            # past the hard ttl
+            self.permission_service.cache.expire(time.monotonic() + self.options["permission_cache_duration"] + 1)
+            user = self.loop.run_until_complete(self.permission_service.get_user_data(1))
+
+        self.assertEqual(user["roleId"], 2)
+        self.assertEqual(self.permission_service.get_cache_metrics()["stale_hits"], 0)
+
+    def test_rendering_permissions_should_be_refreshed_in_background(self):
+        with self.mock_forest_http_api()["get_rendering_permissions"] as mock_get_rendering_permissions:
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.wait_for_refreshes()
+
+        self.assertEqual(mock_get_rendering_permissions.await_count, 2)
+        self.assertEqual(self.permission_service.get_cache_metrics()["background_refreshes"], 1)
+
+    def test_refreshes_should_share_a_single_thread_and_loop(self):
+        with self.mock_forest_http_api()["get_rendering_permissions"], self.mock_forest_http_api()["get_users"]:
+            for _ in range(3):
+                self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+                self.loop.run_until_complete(self.permission_service.get_user_data(1))
+                self.wait_for_refreshes()
+            refresh_loop = self.permission_service._refresh_loop
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+            self.wait_for_refreshes()
+
+        self.assertIs(self.permission_service._refresh_loop, refresh_loop)
+        self.assertTrue(refresh_loop.is_running())
+        self.assertEqual(self.permission_service.get_cache_metrics()["background_refreshes"], 5)
+
+    def test_without_soft_ttl_entries_should_not_be_refreshed_in_background(self):
+        permission_service = PermissionService(self.options)
+        with self.mock_forest_http_api()["get_users"] as mock_get_users:
+            self.loop.run_until_complete(permission_service.get_user_data(1))
+            self.loop.run_until_complete(permission_service.get_user_data(1))
+
+        mock_get_users.assert_awaited_once()
+        self.assertEqual(permission_service.get_cache_metrics()["stale_hits"], 0)
+
+
+class Test09SharedCacheBackendPermissionService(BaseTestPermissionService):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_backend = SQLitePermissionCacheBackend(os.path.join(self.tmp_dir.name, "permissions.sqlite"))
+        options = {**self.options, "permission_cache_backend": self.cache_backend}
+        # two processes of the same host
+        self.permission_service = PermissionService(options)
+        self.other_permission_service = PermissionService(options)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_fetched_permissions_should_be_shared_with_the_other_processes(self):
+        http_patches: PatchHttpApiDict = self.mock_forest_http_api()
+        http_mocks: MockHttpApiDict = {name: patch.start() for name, patch in http_patches.items()}
+
+        for permission_service in [self.permission_service, self.other_permission_service]:
+            self.loop.run_until_complete(permission_service.can(self.mocked_caller, self.booking_collection, "browse"))
+            self.loop.run_until_complete(permission_service.get_scope(self.mocked_caller, self.booking_collection))
+
+        http_mocks["get_users"].assert_awaited_once()
+        http_mocks["get_rendering_permissions"].assert_awaited_once()
+        self.assertEqual(http_mocks["get_environment_permissions"].await_count, 2)
+        self.assertEqual(self.other_permission_service.rendering_cache[1], self.permission_service.rendering_cache[1])
+
+        [patch.stop() for name, patch in http_patches.items()]
+
+    def test_local_entries_should_expire_quickly_with_a_shared_backend(self):
+        self.assertEqual(self.permission_service.cache.ttl, PermissionService.SHARED_CACHE_LOCAL_TTL)
+        self.assertEqual(self.permission_service.rendering_cache.ttl, PermissionService.SHARED_CACHE_LOCAL_TTL)
+
+    def test_invalidation_should_delete_the_shared_entries(self):
+        with self.mock_forest_http_api()["get_rendering_permissions"]:
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(1))
+            self.loop.run_until_complete(self.permission_service._get_rendering_data(2))
+        with self.mock_forest_http_api()["get_users"]:
+            self.loop.run_until_complete(self.permission_service.get_user_data(1))
+
+        # made by the process listening to the server events
+        self.other_permission_service.invalidate_rendering_cache(1)
+        self.assertIsNone(self.cache_backend.get("forest.rendering:1"))
+        self.assertIsNotNone(self.cache_backend.get("forest.rendering:2"))
+
+        self.other_permission_service.invalidate_cache("forest.users")
+        self.assertIsNone(self.cache_backend.get("forest.users"))
+
+        self.other_permission_service.invalidate_cache("forest.rendering")
+        self.assertIsNone(self.cache_backend.get("forest.rendering:2"))
+
+    def test_forced_fetch_should_not_read_the_stale_shared_entry(self):
+        with self.mock_forest_http_api()["get_environment_permissions"] as mock_get_environment_permissions:
+            self.loop.run_until_complete(self.permission_service._get_collection_permissions_data())
+            # a deny leads the other process to fetch the permissions again
+            self.loop.run_until_complete(
+                self.other_permission_service._get_collection_permissions_data(force_fetch=True)
+            )
+
+        self.assertEqual(mock_get_environment_permissions.await_count, 2)
+        self.assertIsNotNone(self.cache_backend.get("forest.collections"))
+
+    def test_backend_errors_should_fallback_on_the_forest_server(self):
+        with patch.object(self.cache_backend, "get", side_effect=sqlite3.OperationalError("database is locked")):
+            with self.mock_forest_http_api()["get_users"] as mock_get_users:
+                with self.assertLogs("forestadmin", level=logging.WARNING) as logger:
+                    user = self.loop.run_until_complete(self.permission_service.get_user_data(1))
+
+        self.assertEqual(user["id"], 1)
+        mock_get_users.assert_awaited_once()
+        self.assertEqual(
+            logger.output, ["WARNING:forestadmin:Permission cache backend error on get: database is locked"]
+        )
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from forestadmin.agent_toolkit.services.permissions.single_flight import SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.single_flight = SingleFlight()
+        self.calls = 0
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    async def _fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"call": self.calls}
+
+    def test_concurrent_calls_of_a_key_should_share_one_call(self):
+        async def _run():
+            return await asyncio.gather(*[self.single_flight.do("key", self._fetch) for _ in range(5)])
+
+        results = self.loop.run_until_complete(_run())
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{"call": 1}] * 5)
+        self.assertEqual(self.single_flight.get_metrics(), {"issued": 1, "coalesced": 4})
+
+    def test_different_keys_should_not_be_coalesced(self):
+        async def _run():
+            return await asyncio.gather(
+                self.single_flight.do("key_1", self._fetch), self.single_flight.do("key_2", self._fetch)
+            )
+
+        self.loop.run_until_complete(_run())
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.single_flight.get_metrics(), {"issued": 2, "coalesced": 0})
+
+    def test_sequential_calls_should_not_be_coalesced(self):
+        self.loop.run_until_complete(self.single_flight.do("key", self._fetch))
+        self.loop.run_until_complete(self.single_flight.do("key", self._fetch))
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.single_flight.get_metrics(), {"issued": 2, "coalesced": 0})
+
+    def test_waiters_should_receive_the_error_of_the_call(self):
+        async def _fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("server error")
+
+        async def _run():
+            return await asyncio.gather(
+                *[self.single_flight.do("key", _fail) for _ in range(3)], return_exceptions=True
+            )
+
+        results = self.loop.run_until_complete(_run())
+
+        self.assertEqual([str(result) for result in results], ["server error"] * 3)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        # the key is released after a failure
+        self.assertEqual(self.loop.run_until_complete(self.single_flight.do("key", self._fetch)), {"call": 1})
+
+    def test_calls_from_other_event_loops_should_be_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        async def _slow_fetch():
+            self.calls += 1
+            started.set()
+            while not release.is_set():
+                await asyncio.sleep(0.005)
+            return "result"
+
+        def _call():
+            return asyncio.run(self.single_flight.do("key", _slow_fetch))
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(_call)
+            started.wait(1)
+            waiters = [executor.submit(_call) for _ in range(2)]
+            while self.single_flight.get_metrics()["coalesced"] < 2:
+                pass
+            release.set()
+            results = [leader.result(), *[waiter.result() for waiter in waiters]]
+
+        self.assertEqual(results, ["result"] * 3)
+        self.assertEqual(self.calls, 1)
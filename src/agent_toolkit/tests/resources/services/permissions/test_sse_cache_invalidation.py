@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock, call, patch
+
+from forestadmin.agent_toolkit.services.permissions.cache_backend import HostElection, SQLitePermissionCacheBackend
+from forestadmin.agent_toolkit.services.permissions.sse_cache_invalidation import SSECacheInvalidation
+from sseclient import Event
+
+
+class TestSSECacheInvalidation(TestCase):
+    def setUp(self) -> None:
+        self.permission_service = Mock(cache_backend=None)
+        self.sse_thread = SSECacheInvalidation(
+            self.permission_service, {"server_url": "http://localhost", "env_secret": "secret", "verify_ssl": True}
+        )
+
+    def test_heartbeat_should_not_invalidate_anything(self):
+        self.sse_thread._handle_message(Event(event="heartbeat"))
+
+        self.permission_service.invalidate_cache.assert_not_called()
+        self.permission_service.invalidate_rendering_cache.assert_not_called()
+
+    def test_refresh_users_should_invalidate_users(self):
+        self.sse_thread._handle_message(Event(event="refresh-users"))
+
+        self.permission_service.invalidate_cache.assert_called_once_with("forest.users")
+        self.permission_service.invalidate_rendering_cache.assert_not_called()
+
+    def test_refresh_renderings_should_only_invalidate_the_given_renderings(self):
+        self.sse_thread._handle_message(Event(event="refresh-renderings", data='{"renderingIds": [1, 4]}'))
+
+        self.permission_service.invalidate_cache.assert_called_once_with("forest.collections")
+        self.permission_service.invalidate_rendering_cache.assert_has_calls([call(1), call(4)])
+        self.assertEqual(self.permission_service.invalidate_rendering_cache.call_count, 2)
+
+    def test_refresh_renderings_without_rendering_ids_should_invalidate_all_renderings(self):
+        for data in ["", "{}", '{"renderingIds": null}', "not json"]:
+            self.permission_service.reset_mock()
+            self.sse_thread._handle_message(Event(event="refresh-renderings", data=data))
+
+            self.permission_service.invalidate_rendering_cache.assert_called_once_with()
+
+
+@skipUnless(os.name == "posix", "flock is posix only")
+class TestSSECacheInvalidationElection(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_backend = SQLitePermissionCacheBackend(os.path.join(self.tmp_dir.name, "permissions.sqlite"))
+        self.options = {"server_url": "http://localhost", "env_secret": "secret", "verify_ssl": True}
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_without_shared_cache_backend_there_should_be_no_election(self):
+        sse_thread = SSECacheInvalidation(Mock(cache_backend=None), self.options)
+        self.assertIsNone(sse_thread.election)
+
+    def test_only_the_elected_process_should_listen_to_the_events(self):
+        # another process of the host is already listening
+        other_process = HostElection(self.cache_backend.get_listener_lock_path())
+        other_process.try_acquire()
+
+        sse_thread = SSECacheInvalidation(Mock(cache_backend=self.cache_backend), self.options)
+        connected = threading.Event()
+        with patch.object(SSECacheInvalidation, "ELECTION_RETRY_DELAY", 0.01), patch(
+            "forestadmin.agent_toolkit.services.permissions.sse_cache_invalidation.urllib3.PoolManager",
+            side_effect=lambda **kwargs: connected.set() or sse_thread.stop(),
+        ):
+            sse_thread.start()
+            self.assertFalse(connected.wait(0.1))
+
+            # the listening process exits
+            other_process.release()
+            self.assertTrue(connected.wait(1))
+            sse_thread.join(1)
+
+        self.assertFalse(sse_thread.is_alive())
+        self.assertFalse(sse_thread.election.is_elected)
+
+    def test_the_election_should_be_released_when_giving_up(self):
+        sse_thread = SSECacheInvalidation(Mock(cache_backend=self.cache_backend), self.options)
+        sse_thread._exit_event = Mock()
+        with patch("forestadmin.agent_toolkit.services.permissions.sse_cache_invalidation.urllib3.PoolManager"), patch(
+            "forestadmin.agent_toolkit.services.permissions.sse_cache_invalidation.SSEClient",
+            return_value=Mock(events=Mock(side_effect=ConnectionError("connection refused"))),
+        ):
+            sse_thread.run()
+
+        self.assertEqual(sse_thread._exit_event.wait.call_count, 6)
+        self.assertFalse(sse_thread.election.is_elected)
+        other_process = HostElection(self.cache_backend.get_listener_lock_path())
+        self.assertTrue(other_process.try_acquire())
+        other_process.release()
+
+    def test_stop_should_end_the_wait_for_election(self):
+        other_process = HostElection(self.cache_backend.get_listener_lock_path())
+        other_process.try_acquire()
+
+        sse_thread = SSECacheInvalidation(Mock(cache_backend=self.cache_backend), self.options)
+        sse_thread.start()
+        sse_thread.stop()
+        sse_thread.join(1)
+
+        self.assertFalse(sse_thread.is_alive())
+        other_process.release()
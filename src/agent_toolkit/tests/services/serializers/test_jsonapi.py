@@ -1,7 +1,9 @@
+import json
 from datetime import date, datetime, time, timezone
 from unittest import TestCase, skip
 from uuid import UUID
 
+from forestadmin.agent_toolkit.services.serializers import add_search_metadata
 from forestadmin.agent_toolkit.services.serializers.exceptions import JsonApiDeserializerException
 from forestadmin.agent_toolkit.services.serializers.json_api_deserializer import JsonApiDeserializer
 from forestadmin.agent_toolkit.services.serializers.json_api_serializer import JsonApiSerializer
@@ -1353,3 +1355,111 @@ class TestJsonApiSerializer(TestJsonApi):
                 ],
             },
         )
+
+    def test_should_include_a_related_record_once(self):
+        records = []
+        for order_pk in ["825dfdf9-1339-4373-af7b-261d99b09622", "4f6ee9e2-dc5c-4d8a-9b8c-d0f3c1e9b2a4"]:
+            records.append(
+                {
+                    "order_pk": order_pk,
+                    "customer_id": 12,
+                    "customer": {"person_pk": 12, "first_name": "henry"},
+                }
+            )
+
+        dumped = JsonApiSerializer(
+            self.datasource, Projection("order_pk", "customer_id", "customer:person_pk", "customer:first_name")
+        ).serialize(records, self.collection_order)
+
+        self.assertEqual(
+            dumped["included"],
+            [
+                {
+                    "type": "Person",
+                    "attributes": {"person_pk": 12, "first_name": "henry"},
+                    "id": 12,
+                    "links": {"self": "/forest/Person/12"},
+                }
+            ],
+        )
+        self.assertEqual([item["relationships"]["customer"]["data"]["id"] for item in dumped["data"]], ["12", "12"])
+
+    def test_serialize_chunks_should_yield_the_serialized_document_with_search_metadata(self):
+        records = []
+        for i in range(5):
+            records.append(
+                {
+                    "order_pk": f"4f6ee9e2-dc5c-4d8a-9b8c-d0f3c1e9b2a{i}",
+                    "customer_id": 12 + i % 2,
+                    "customer": {"person_pk": 12 + i % 2, "first_name": "henry" if i % 2 else "jean"},
+                }
+            )
+        serializer = JsonApiSerializer(
+            self.datasource, Projection("order_pk", "customer_id", "customer:person_pk", "customer:first_name")
+        )
+        expected = add_search_metadata(serializer.serialize(records, self.collection_order), "13")
+
+        chunks = list(serializer.serialize_chunks(records, self.collection_order, json.dumps, "13", chunk_size=2))
+
+        # 2 chunks of 2 data items, the last item with the 2 included records, then the metadata
+        self.assertEqual(len(chunks), 4)
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        self.assertEqual(json.loads(b"".join(chunks)), json.loads(json.dumps(expected)))
+        self.assertEqual(len(expected["meta"]["decorators"]), 2)
+
+    def test_serialize_chunks_should_not_add_metadata_without_search(self):
+        serializer = JsonApiSerializer(self.datasource, Projection("order_pk"))
+
+        self.assertEqual(b"".join(serializer.serialize_chunks([], self.collection_order, json.dumps)), b'{"data":[]}')
+        self.assertEqual(
+            b"".join(serializer.serialize_chunks([], self.collection_order, json.dumps, " ")), b'{"data":[]}'
+        )
+
+    def test_should_compile_a_plan_once_per_collection_and_projection(self):
+        serializer = JsonApiSerializer(self.datasource, Projection("order_pk", "customer_id", "customer:first_name"))
+        plan = serializer._get_plan(self.collection_order)
+
+        self.assertIs(plan, serializer._get_plan(self.collection_order))
+        self.assertIs(
+            plan,
+            JsonApiSerializer(self.datasource, Projection("customer:first_name", "order_pk", "customer_id"))._get_plan(
+                self.collection_order
+            ),
+        )
+        self.assertIsNot(
+            plan, JsonApiSerializer(self.datasource, Projection("order_pk"))._get_plan(self.collection_order)
+        )
+
+    def test_should_compile_the_plan_again_when_a_related_schema_changes(self):
+        datasource = Datasource()
+        Collection.__abstractmethods__ = set()  # to instantiate abstract class
+        collection_book = Collection("Book", datasource)  # type:ignore
+        collection_author = Collection("Author", datasource)  # type:ignore
+        collection_book.add_fields(
+            {
+                "id": {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "is_primary_key": True},
+                "author_id": {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER},
+                "author": {
+                    "type": FieldType.MANY_TO_ONE,
+                    "foreign_collection": "Author",
+                    "foreign_key": "author_id",
+                    "foreign_key_target": "id",
+                },
+            }
+        )
+        collection_author.add_fields(
+            {"id": {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "is_primary_key": True}}
+        )
+        datasource.add_collection(collection_book)
+        datasource.add_collection(collection_author)
+        serializer = JsonApiSerializer(datasource, Projection("id", "author:id", "author:name"))
+        record = {"id": 1, "author": {"id": 2, "name": "Isaac"}}
+
+        self.assertEqual(serializer.serialize(record, collection_book)["included"][0]["attributes"], {"id": 2})
+        plan = serializer._get_plan(collection_book)
+
+        collection_author.add_field("name", {"type": FieldType.COLUMN, "column_type": PrimitiveType.STRING})
+        self.assertEqual(
+            serializer.serialize(record, collection_book)["included"][0]["attributes"], {"id": 2, "name": "Isaac"}
+        )
+        self.assertIsNot(plan, serializer._get_plan(collection_book))
@@ -118,6 +118,19 @@ class TestIsIpMatchAnyRule(BaseTestIpWhiteListService):
         self.assertIn("use_ip_whitelist", self.ip_whitelist.cache)
         self.assertIn("rules", self.ip_whitelist.cache)
 
+    def test_is_ip_match_any_rules_should_compile_the_rules_again_after_a_fetch(self):
+        with self.get_mock_http_ip_white_list([{"type": 0, "ip": "192.168.1.10"}]):
+            self.assertTrue(self.loop.run_until_complete(self.ip_whitelist.is_ip_match_any_rule("192.168.1.10")))
+        matcher = self.ip_whitelist.cache["matcher"]
+        self.assertTrue(self.loop.run_until_complete(self.ip_whitelist.is_ip_match_any_rule("192.168.1.10")))
+        self.assertIs(self.ip_whitelist.cache["matcher"], matcher)
+
+        with self.get_mock_http_ip_white_list([{"type": 0, "ip": "192.168.1.11"}]):
+            self.loop.run_until_complete(self.ip_whitelist.retrieve())
+        self.assertNotIn("matcher", self.ip_whitelist.cache)
+        self.assertFalse(self.loop.run_until_complete(self.ip_whitelist.is_ip_match_any_rule("192.168.1.10")))
+        self.assertTrue(self.loop.run_until_complete(self.ip_whitelist.is_ip_match_any_rule("192.168.1.11")))
+
 
 class TestOtherMethods(BaseTestIpWhiteListService):
     def test_call_to_retrieve_should_call_forest_http_api(self):
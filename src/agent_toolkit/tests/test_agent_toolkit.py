@@ -283,6 +283,7 @@ class TestAgent(TestCase):
 
         mocked_schema_emitter__get_serialized_schema.assert_called_once()
         mocked_forest_http_api__send_schema.assert_called_once()
+        agent._permission_service.build_action_endpoint_index.assert_called_once_with(agent.customizer.stack.datasource)
 
         # test we can only launch start once
         mocked_schema_emitter__get_serialized_schema.reset_mock()
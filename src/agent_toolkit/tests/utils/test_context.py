@@ -1,4 +1,6 @@
+import asyncio
 import json
+import threading
 from unittest import TestCase
 
 from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder
@@ -76,6 +78,50 @@ class TestHttpResponseBuilder(TestCase):
         )
         self.assertEqual(response.body, "test;test")
 
+    def test_build_csv_stream(self):
+        async def body():
+            yield "id\r\n"
+            yield "1\r\n"
+
+        response = HttpResponseBuilder.build_csv_stream_response(body(), "filename.csv")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(
+            response.headers,
+            {"content-type": "text/csv", "Content-Disposition": 'attachment; filename="filename.csv"'},
+        )
+        self.assertEqual([*response.iter_body_sync()], ["id\r\n", "1\r\n"])
+
+    def test_streaming_response_iter_body_sync_should_work_from_a_running_event_loop(self):
+        async def body():
+            yield "id\r\n"
+            yield "1\r\n"
+
+        async def consume_from_loop():
+            return [*HttpResponseBuilder.build_csv_stream_response(body(), "filename.csv").iter_body_sync()]
+
+        self.assertEqual(asyncio.run(consume_from_loop()), ["id\r\n", "1\r\n"])
+
+    def test_streaming_response_iter_body_sync_should_consume_the_body_on_the_given_loop(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        loops = []
+
+        async def body():
+            loops.append(asyncio.get_running_loop())
+            yield "id\r\n"
+            yield "1\r\n"
+
+        try:
+            response = HttpResponseBuilder.build_csv_stream_response(body(), "filename.csv")
+            self.assertEqual([*response.iter_body_sync(loop)], ["id\r\n", "1\r\n"])
+            self.assertEqual(loops, [loop])
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
     def test_build_success(self):
         response = HttpResponseBuilder.build_success_response({"test": "test"})
 
@@ -1,11 +1,18 @@
+import asyncio
 import copy
 from csv import DictReader
 from datetime import date, datetime
 from io import StringIO
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from forestadmin.agent_toolkit.utils.csv import Csv, CsvException
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, Operator, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import Aggregator, ConditionTreeBranch
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.page import Page
+from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
 
 
 class TestCsv(TestCase):
@@ -69,3 +76,115 @@ class TestCsv(TestCase):
         ret = Csv.make_csv(copy.deepcopy(self.data), fieldnames)
         data = self.read_csv(ret)
         self.assertNotIn("boolean_field", data[0].keys())
+
+    def test_make_csv_stream_should_yield_header_then_one_chunk_per_batch(self):
+        async def batches():
+            yield copy.deepcopy(self.data[:1])
+            yield copy.deepcopy(self.data[1:])
+
+        async def consume():
+            return [chunk async for chunk in Csv.make_csv_stream(batches(), [*self.data[0].keys()])]
+
+        chunks = asyncio.run(consume())
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0], "id,name,creation_date,last_seen,boolean_field,test_field\r\n")
+
+        data = self.read_csv(StringIO("".join(chunks)))
+        self.assertEqual(data, self.read_csv(Csv.make_csv(copy.deepcopy(self.data), self.data[0].keys())))
+
+    def test_make_csv_stream_error(self):
+        async def batches():
+            yield copy.deepcopy(self.data)
+
+        async def consume():
+            return [chunk async for chunk in Csv.make_csv_stream(batches(), [*self.data[0].keys()])]
+
+        with patch("forestadmin.agent_toolkit.utils.csv.DictWriter.writerow", side_effect=Exception):
+            self.assertRaises(CsvException, asyncio.run, consume())
+
+    def mk_collection(self, primary_keys, operators):
+        fields = {
+            name: {
+                "type": FieldType.COLUMN,
+                "column_type": PrimitiveType.NUMBER,
+                "is_primary_key": True,
+                "filter_operators": operators,
+            }
+            for name in primary_keys
+        }
+        fields["cost"] = {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "filter_operators": operators}
+        return Mock(schema={"fields": fields})
+
+    def test_iter_batches_should_read_pages_until_a_page_is_not_full(self):
+        fetch = AsyncMock(side_effect=[[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], []])
+        collection = self.mk_collection(["id"], {Operator.EQUAL, Operator.GREATER_THAN})
+        paginated_filter = PaginatedFilter(
+            {"sort": Sort([{"field": "cost", "ascending": True}, {"field": "id", "ascending": True}])}
+        )
+
+        async def consume():
+            return [batch async for batch in await Csv.iter_batches(fetch, collection, paginated_filter, 2)]
+
+        batches = asyncio.run(consume())
+        self.assertEqual(batches, [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}]])
+        self.assertEqual(fetch.await_count, 3)
+        self.assertEqual([call.args[0].page for call in fetch.await_args_list], [Page(0, 2), Page(2, 2), Page(4, 2)])
+        self.assertEqual(fetch.await_args.args[0].sort, paginated_filter.sort)
+
+    def test_iter_batches_should_read_after_the_last_primary_key_when_sorted_by_primary_keys(self):
+        fetch = AsyncMock(side_effect=[[{"id": 4}, {"id": 3}], [{"id": 2}]])
+        collection = self.mk_collection(["id"], {Operator.LESS_THAN})
+        condition_tree = ConditionTreeLeaf("cost", Operator.LESS_THAN, 200)
+        paginated_filter = PaginatedFilter(
+            {"condition_tree": condition_tree, "sort": Sort([{"field": "id", "ascending": False}])}
+        )
+
+        async def consume():
+            return [batch async for batch in await Csv.iter_batches(fetch, collection, paginated_filter, 2)]
+
+        batches = asyncio.run(consume())
+        self.assertEqual(batches, [[{"id": 4}, {"id": 3}], [{"id": 2}]])
+        self.assertEqual([call.args[0].page for call in fetch.await_args_list], [Page(0, 2), Page(0, 2)])
+        self.assertEqual(fetch.await_args_list[0].args[0].condition_tree, condition_tree)
+        self.assertEqual(
+            fetch.await_args.args[0].condition_tree,
+            ConditionTreeBranch(Aggregator.AND, [condition_tree, ConditionTreeLeaf("id", Operator.LESS_THAN, 3)]),
+        )
+
+    def test_iter_batches_should_read_after_the_last_composite_primary_key(self):
+        fetch = AsyncMock(side_effect=[[{"a": 1, "b": 8}, {"a": 2, "b": 9}], []])
+        collection = self.mk_collection(["a", "b"], {Operator.EQUAL, Operator.GREATER_THAN})
+        paginated_filter = PaginatedFilter(
+            {"sort": Sort([{"field": "a", "ascending": True}, {"field": "b", "ascending": True}])}
+        )
+
+        async def consume():
+            return [batch async for batch in await Csv.iter_batches(fetch, collection, paginated_filter, 2)]
+
+        asyncio.run(consume())
+        self.assertEqual(
+            fetch.await_args.args[0].condition_tree,
+            ConditionTreeBranch(
+                Aggregator.OR,
+                [
+                    ConditionTreeLeaf("a", Operator.GREATER_THAN, 2),
+                    ConditionTreeBranch(
+                        Aggregator.AND,
+                        [ConditionTreeLeaf("a", Operator.EQUAL, 2), ConditionTreeLeaf("b", Operator.GREATER_THAN, 9)],
+                    ),
+                ],
+            ),
+        )
+        self.assertEqual(fetch.await_args.args[0].page, Page(0, 2))
+
+    def test_iter_batches_should_use_an_offset_when_the_primary_keys_cannot_be_compared(self):
+        fetch = AsyncMock(side_effect=[[{"id": 1}, {"id": 2}], []])
+        collection = self.mk_collection(["id"], {Operator.EQUAL, Operator.IN})
+        paginated_filter = PaginatedFilter({"sort": Sort([{"field": "id", "ascending": True}])})
+
+        async def consume():
+            return [batch async for batch in await Csv.iter_batches(fetch, collection, paginated_filter, 2)]
+
+        asyncio.run(consume())
+        self.assertEqual([call.args[0].page for call in fetch.await_args_list], [Page(0, 2), Page(2, 2)])
+        self.assertIsNone(fetch.await_args.args[0].condition_tree)
@@ -1,13 +1,15 @@
 import asyncio
 import json
+from typing import Any, List, Tuple
 from unittest import TestCase
 from unittest.mock import AsyncMock, Mock, call, patch
 
 import aiohttp
-from aiohttp import client_exceptions
+from aiohttp import client_exceptions, web
+from aiohttp.test_utils import TestServer
 from aiohttp.web import HTTPException
 from forestadmin.agent_toolkit.resources.security.exceptions import OpenIdException
-from forestadmin.agent_toolkit.utils.http import ForestHttpApi, ForestHttpApiException, HttpOptions
+from forestadmin.agent_toolkit.utils.http import ForestHttpApi, ForestHttpApiException, ForestHttpClient, HttpOptions
 
 
 class TestForestHttp(TestCase):
@@ -122,11 +124,7 @@ class TestForestHttp(TestCase):
         mock_session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
         mock_session.post.return_value.__aexit__ = AsyncMock()
 
-        client_session_mock = Mock()
-        client_session_mock.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        client_session_mock.return_value.__aexit__ = AsyncMock()
-
-        with patch("forestadmin.agent_toolkit.utils.http.ClientSession", client_session_mock):
+        with patch.object(ForestHttpApi.client, "get_session", return_value=mock_session):
             response = self.loop.run_until_complete(
                 ForestHttpApi.post("http://addr", {"body": "dict"}, {"headers": "headers"})
             )
@@ -147,11 +145,7 @@ class TestForestHttp(TestCase):
         mock_session.post.return_value.__aenter__ = AsyncMock(return_value=response)
         mock_session.post.return_value.__aexit__ = AsyncMock()
 
-        client_session_mock = Mock()
-        client_session_mock.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        client_session_mock.return_value.__aexit__ = AsyncMock()
-
-        with patch("forestadmin.agent_toolkit.utils.http.ClientSession", client_session_mock):
+        with patch.object(ForestHttpApi.client, "get_session", return_value=mock_session):
             response = self.loop.run_until_complete(
                 ForestHttpApi.post("http://addr", {"body": "dict"}, {"headers": "headers"})
             )
@@ -168,11 +162,7 @@ class TestForestHttp(TestCase):
         mock_session.post.return_value.__aenter__ = AsyncMock()
         mock_session.post.return_value.__aexit__ = AsyncMock()
 
-        client_session_mock = Mock()
-        client_session_mock.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        client_session_mock.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        with patch("forestadmin.agent_toolkit.utils.http.ClientSession", client_session_mock):
+        with patch.object(ForestHttpApi.client, "get_session", return_value=mock_session):
             self.assertRaisesRegex(
                 ForestHttpApiException,
                 r"🌳🌳🌳Failed to fetch http://addr: client_error",
@@ -194,11 +184,7 @@ class TestForestHttp(TestCase):
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
         mock_session.get.return_value.__aexit__ = AsyncMock()
 
-        client_session_mock = Mock()
-        client_session_mock.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        client_session_mock.return_value.__aexit__ = AsyncMock()
-
-        with patch("forestadmin.agent_toolkit.utils.http.ClientSession", client_session_mock):
+        with patch.object(ForestHttpApi.client, "get_session", return_value=mock_session):
             response = self.loop.run_until_complete(ForestHttpApi.get("http://addr", {"headers": "headers"}))
 
             self.assertEqual(response, {"ret": True})
@@ -215,11 +201,7 @@ class TestForestHttp(TestCase):
         mock_session.get.return_value.__aenter__ = AsyncMock(return_value=response)
         mock_session.get.return_value.__aexit__ = AsyncMock()
 
-        client_session_mock = Mock()
-        client_session_mock.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        client_session_mock.return_value.__aexit__ = AsyncMock()
-
-        with patch("forestadmin.agent_toolkit.utils.http.ClientSession", client_session_mock):
+        with patch.object(ForestHttpApi.client, "get_session", return_value=mock_session):
             response = self.loop.run_until_complete(ForestHttpApi.get("http://addr", {"headers": "headers"}))
 
             self.assertIsNone(response)
@@ -232,12 +214,7 @@ class TestForestHttp(TestCase):
         mock_session.get.return_value.__aenter__ = AsyncMock()
         mock_session.get.return_value.__aexit__ = AsyncMock()
 
-        client_session_mock = Mock()
-        client_session_mock.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        client_session_mock.return_value.__aexit__ = AsyncMock(return_value=False)
-        client_session_mock.__aexit__ = AsyncMock(return_value=False)
-
-        with patch("forestadmin.agent_toolkit.utils.http.ClientSession", client_session_mock):
+        with patch.object(ForestHttpApi.client, "get_session", return_value=mock_session):
             self.assertRaisesRegex(
                 ForestHttpApiException,
                 r"🌳🌳🌳Failed to fetch http://addr: client_error",
@@ -380,3 +357,135 @@ class TestHandleError(TestCase):
             self.assertEqual(exc.error_description, "Two factor authentication is required to access this project")
         else:
             raise Exception("should have been in except block")
+
+
+class TestForestHttpClient(TestCase):
+    """against a local aiohttp server standing for the forest server"""
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.hits: List[Tuple[str, Any]] = []
+        self.answers: List[web.Response] = []
+
+        async def _handler(request: web.Request):
+            self.hits.append((request.method, request.transport.get_extra_info("peername")))
+            if request.path == "/slow":
+                await asyncio.sleep(1)
+            if self.answers:
+                return self.answers.pop(0)
+            return web.json_response({"ret": True})
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", _handler)
+        self.server = TestServer(app)
+        self.loop.run_until_complete(self.server.start_server())
+        self.client = ForestHttpClient(timeout=0.5, get_retries=2, retry_backoff=0)
+        self.client_patcher = patch.object(ForestHttpApi, "client", self.client)
+        self.client_patcher.start()
+
+    def tearDown(self) -> None:
+        self.client_patcher.stop()
+        self.loop.run_until_complete(self.client.close())
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+
+    def test_setup_client_should_configure_the_client(self):
+        ForestHttpApi.setup_client({"timeout": 12, "connect_timeout": 3, "max_connections": 4, "get_retries": 1})
+
+        self.assertEqual(ForestHttpApi.client.timeout.total, 12)
+        self.assertEqual(ForestHttpApi.client.timeout.connect, 3)
+        self.assertEqual(ForestHttpApi.client.max_connections, 4)
+        self.assertEqual(ForestHttpApi.client.get_retries, 1)
+
+    def test_requests_should_reuse_the_same_connection(self):
+        async def _calls():
+            await ForestHttpApi.get(str(self.server.make_url("/a")), {})
+            await ForestHttpApi.post(str(self.server.make_url("/b")), {"body": 1}, {})
+            await ForestHttpApi.get(str(self.server.make_url("/c")), {})
+
+        self.loop.run_until_complete(_calls())
+
+        self.assertEqual([method for method, _ in self.hits], ["GET", "POST", "GET"])
+        self.assertEqual(len({peername for _, peername in self.hits}), 1)
+
+    def test_get_should_retry_when_the_server_is_unavailable(self):
+        self.answers = [web.Response(status=503), web.Response(status=502)]
+
+        response = self.loop.run_until_complete(ForestHttpApi.get(str(self.server.make_url("/a")), {}))
+
+        self.assertEqual(response, {"ret": True})
+        self.assertEqual(len(self.hits), 3)
+
+    def test_get_should_raise_when_the_retries_are_exhausted(self):
+        self.answers = [web.Response(status=503) for _ in range(3)]
+
+        self.assertRaisesRegex(
+            ForestHttpApiException,
+            r"Forest is in maintenance for a few minutes",
+            self.loop.run_until_complete,
+            ForestHttpApi.get(str(self.server.make_url("/a")), {}),
+        )
+        self.assertEqual(len(self.hits), 3)
+
+    def test_get_should_not_retry_client_errors(self):
+        self.answers = [web.json_response({"errors": [{"status": 404}]}, status=404)]
+
+        self.assertRaisesRegex(
+            ForestHttpApiException,
+            r"failed to find the project related to the envSecret",
+            self.loop.run_until_complete,
+            ForestHttpApi.get(str(self.server.make_url("/a")), {}),
+        )
+        self.assertEqual(len(self.hits), 1)
+
+    def test_get_should_retry_on_timeout(self):
+        self.assertRaisesRegex(
+            ForestHttpApiException,
+            r"Failed to fetch http://.*/slow",
+            self.loop.run_until_complete,
+            ForestHttpApi.get(str(self.server.make_url("/slow")), {}),
+        )
+        self.assertEqual(len(self.hits), 3)
+
+    def test_post_should_not_be_retried(self):
+        self.answers = [web.Response(status=503)]
+
+        self.assertRaises(
+            ForestHttpApiException,
+            self.loop.run_until_complete,
+            ForestHttpApi.post(str(self.server.make_url("/a")), {"body": 1}, {}),
+        )
+        self.assertEqual(len(self.hits), 1)
+
+    def test_session_should_be_closed_when_the_tasks_of_its_loop_are_cancelled(self):
+        async def _call():
+            await ForestHttpApi.get(str(self.server.make_url("/a")), {})
+            return self.client.get_session()
+
+        session = self.loop.run_until_complete(_call())
+        self.assertFalse(session.closed)
+
+        # what asyncio.run and async_to_sync do before closing their loop
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.assertTrue(session.closed)
+
+    def test_each_event_loop_should_have_its_own_session(self):
+        async def _get_session():
+            return self.client.get_session()
+
+        session = self.loop.run_until_complete(_get_session())
+        self.assertIs(self.loop.run_until_complete(_get_session()), session)
+        self.assertIsNot(asyncio.run(_get_session()), session)
+
+    def test_sessions_should_be_forgotten_with_their_loop(self):
+        async def _get_session():
+            return self.client.get_session()
+
+        sessions = [asyncio.run(_get_session()) for _ in range(50)]
+
+        self.assertTrue(all(session.closed for session in sessions))
+        self.assertEqual(self.client._sessions, {})
+        self.assertEqual(self.client._session_closers, {})
@@ -1,6 +1,10 @@
+import random
+from ipaddress import IPv4Address, IPv4Network, IPv6Address
 from unittest import TestCase
+from unittest.mock import patch
 
-from forestadmin.agent_toolkit.utils.ip_whitelist_util import IpWhitelistUtil
+from forestadmin.agent_toolkit.utils.ip_whitelist_util import IpWhitelistMatcher, IpWhitelistUtil
+from forestadmin.datasource_toolkit.exceptions import ForestException
 
 
 class TestIpWhiteListUtilIsIpMatchIp(TestCase):
@@ -96,3 +100,88 @@ class TestIpWhiteListUtilIsIpMatchRangeSubnet(TestCase):
         self.assertFalse(
             IpWhitelistUtil.is_ip_match_subnet("fe80:0001:0000:0000:0211:24FF:FE80:C12C", "192.168.1.0/24")
         )
+
+
+class TestIpWhitelistMatcher(TestCase):
+    def test_should_match_single_ips_ranges_and_subnets_of_both_versions(self):
+        matcher = IpWhitelistMatcher(
+            [
+                {"type": 0, "ip": "192.168.1.10"},
+                {"type": 1, "ipMinimum": "10.0.0.1", "ipMaximum": "10.0.0.100"},
+                {"type": 2, "range": "200.10.10.0/24"},
+                {"type": 1, "ipMinimum": "2001:620::211:24ff:fe80:c100", "ipMaximum": "2001:620::211:24ff:fe80:c1ff"},
+                {"type": 2, "range": "fe80::/32"},
+            ]
+        )
+
+        for ip in [
+            "192.168.1.10",
+            "10.0.0.1",
+            "10.0.0.100",
+            "200.10.10.255",
+            "2001:620::211:24ff:fe80:c12c",
+            "fe80::1",
+        ]:
+            self.assertTrue(matcher.is_match(ip), ip)
+        for ip in ["192.168.1.11", "10.0.0.101", "200.10.11.0", "2001:620::211:24ff:fe80:c200", "fe81::1", "::2"]:
+            self.assertFalse(matcher.is_match(ip), ip)
+
+    def test_loopback_ip_rules_should_match_the_loopback_ips_of_both_versions(self):
+        matcher = IpWhitelistMatcher([{"type": 0, "ip": "127.0.0.1"}])
+
+        self.assertTrue(matcher.is_match("127.0.0.1"))
+        self.assertTrue(matcher.is_match("::1"))
+        self.assertFalse(matcher.is_match("192.168.1.1"))
+        self.assertFalse(IpWhitelistMatcher([{"type": 0, "ip": "192.168.1.1"}]).is_match("127.0.0.1"))
+
+    def test_should_merge_overlapping_and_adjacent_rules(self):
+        matcher = IpWhitelistMatcher(
+            [
+                {"type": 1, "ipMinimum": "10.0.0.1", "ipMaximum": "10.0.0.100"},
+                {"type": 2, "range": "10.0.0.0/28"},
+                {"type": 1, "ipMinimum": "10.0.0.101", "ipMaximum": "10.0.0.200"},
+                {"type": 0, "ip": "10.0.1.0"},
+            ]
+        )
+
+        self.assertEqual(matcher._starts[4], [int(IPv4Address("10.0.0.0")), int(IPv4Address("10.0.1.0"))])
+        self.assertEqual(matcher._ends[4], [int(IPv4Address("10.0.0.200")), int(IPv4Address("10.0.1.0"))])
+        self.assertEqual(matcher._starts[6], [])
+        self.assertFalse(matcher.is_match("10.0.0.201"))
+
+    def test_should_agree_with_the_rule_by_rule_matching(self):
+        rand = random.Random(42)
+        rules = []
+        for _ in range(100):
+            kind = rand.randrange(3)
+            base = int(IPv4Address("10.0.0.0")) + rand.randrange(1 << 16)
+            if kind == 0:
+                rules.append({"type": 0, "ip": str(IPv4Address(base))})
+            elif kind == 1:
+                rules.append({"type": 1, "ipMinimum": str(IPv4Address(base)), "ipMaximum": str(IPv4Address(base + 50))})
+            else:
+                rules.append({"type": 2, "range": str(IPv4Network((base, 26), strict=False))})
+        rules.append({"type": 2, "range": "fe80::/64"})
+        matcher = IpWhitelistMatcher(rules)
+
+        ips = [str(IPv4Address(int(IPv4Address("10.0.0.0")) + rand.randrange(1 << 17))) for _ in range(200)]
+        ips += [str(IPv6Address(int(IPv6Address("fe80::")) + rand.randrange(1 << 65))) for _ in range(50)]
+        for ip in ips:
+            expected = any(IpWhitelistUtil.is_ip_match_rule(ip, rule) for rule in rules)
+            self.assertEqual(matcher.is_match(ip), expected, ip)
+
+    def test_should_cache_the_decisions_per_client_ip(self):
+        matcher = IpWhitelistMatcher([{"type": 0, "ip": "192.168.1.10"}], decision_cache_size=1)
+
+        with patch.object(matcher, "_match", wraps=matcher._match) as spy_match:
+            self.assertTrue(matcher.is_match("192.168.1.10"))
+            self.assertTrue(matcher.is_match("192.168.1.10"))
+            self.assertFalse(matcher.is_match("192.168.1.11"))
+            self.assertTrue(matcher.is_match("192.168.1.10"))
+
+        self.assertEqual(spy_match.call_count, 3)
+
+    def test_should_raise_on_invalid_rule_type(self):
+        self.assertRaisesRegex(
+            ForestException, r"Invalid rule type", IpWhitelistMatcher, [{"type": 4, "range": "200.10.10.0/24"}]
+        )
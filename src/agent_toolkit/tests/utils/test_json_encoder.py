@@ -0,0 +1,127 @@
+import json
+import sys
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+from uuid import UUID
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.agent_toolkit.utils import json_encoder
+from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder
+from forestadmin.agent_toolkit.utils.json_encoder import (
+    JsonEncoder,
+    JsonEncoderException,
+    OrjsonEncoder,
+    StdlibJsonEncoder,
+    build_json_encoder,
+    encode_default,
+)
+
+# (value, its json encoding)
+CONFORMANCE_CASES = [
+    (datetime(2025, 2, 3, 14, 54, 56, 255, timezone.utc), '"2025-02-03T14:54:56.000255+00:00"'),
+    (datetime(2025, 2, 3, 14, 54, 56), '"2025-02-03T14:54:56"'),
+    (
+        datetime(2025, 7, 3, 14, 54, 56, tzinfo=zoneinfo.ZoneInfo("Europe/Paris")),
+        '"2025-07-03T14:54:56+02:00"',
+    ),
+    (date(2025, 2, 1), '"2025-02-01"'),
+    (time(15, 35, 25), '"15:35:25"'),
+    (time(15, 35, 25, 10), '"15:35:25.000010"'),
+    (Decimal("12"), "12"),
+    (Decimal("12.00"), "12"),
+    (Decimal("-12.5"), "-12.5"),
+    (Decimal("0.1"), "0.1"),
+    (Decimal("123456789012345678"), "123456789012345678"),
+    (UUID("b2f47557-8518-4e55-a02b-ed92d113d42f"), '"b2f47557-8518-4e55-a02b-ed92d113d42f"'),
+    (b"\x89PNG\r\n", '"iVBORw0K"'),
+    (bytearray(b"forest"), '"Zm9yZXN0"'),
+    (memoryview(b"forest"), '"Zm9yZXN0"'),
+    ("héllo \U0001f333", '"h\\u00e9llo \\ud83c\\udf33"'),
+    ([1, 2.5, None, True], "[1, 2.5, null, true]"),
+    ((12, 14), "[12, 14]"),
+    ({1: "a"}, '{"1": "a"}'),
+]
+
+
+class TestEncodeDefault(TestCase):
+    def test_should_raise_for_unsupported_values(self):
+        self.assertRaisesRegex(TypeError, r"Object of type set is not JSON serializable", encode_default, {1})
+
+    def test_non_finite_decimals_should_be_floats(self):
+        self.assertEqual(encode_default(Decimal("Infinity")), float("inf"))
+
+
+class TestStdlibJsonEncoder(TestCase):
+    def test_should_encode_the_conformance_cases(self):
+        encoder = StdlibJsonEncoder()
+        for value, expected in CONFORMANCE_CASES:
+            self.assertEqual(encoder.encode(value), expected, value)
+
+    def test_should_encode_nested_values(self):
+        body = {"data": {"attributes": {"at": datetime(2025, 2, 1, tzinfo=timezone.utc), "price": Decimal("9.99")}}}
+        self.assertEqual(
+            StdlibJsonEncoder().encode(body),
+            '{"data": {"attributes": {"at": "2025-02-01T00:00:00+00:00", "price": 9.99}}}',
+        )
+
+
+@skipUnless(json_encoder.orjson is not None, "orjson is not installed")
+class TestOrjsonEncoder(TestCase):
+    def test_should_encode_the_conformance_cases_like_the_json_module(self):
+        encoder = OrjsonEncoder()
+        for value, expected in CONFORMANCE_CASES:
+            encoded = encoder.encode(value)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(json.loads(encoded), json.loads(expected), value)
+
+    def test_should_use_the_fallback_for_the_values_orjson_cannot_encode(self):
+        encoder = OrjsonEncoder()
+        self.assertEqual(encoder.encode({"big": 2**70}), '{"big": 1180591620717411303424}')
+        self.assertEqual(encoder.encode("\ud800"), '"\\ud800"')
+
+    def test_should_raise_like_the_json_module_for_unsupported_values(self):
+        self.assertRaises(TypeError, OrjsonEncoder().encode, {"value": {1}})
+
+
+class TestBuildJsonEncoder(TestCase):
+    def test_should_build_the_encoders_by_name(self):
+        self.assertIsInstance(build_json_encoder("json"), StdlibJsonEncoder)
+        if json_encoder.orjson is not None:
+            self.assertIsInstance(build_json_encoder("orjson"), OrjsonEncoder)
+
+    def test_should_return_the_given_encoder(self):
+        encoder = StdlibJsonEncoder()
+        self.assertIs(build_json_encoder(encoder), encoder)
+
+    def test_should_fallback_on_the_json_module_when_orjson_is_not_installed(self):
+        with patch.object(json_encoder, "orjson", None), patch.object(json_encoder.ForestLogger, "log") as mock_log:
+            self.assertIsInstance(build_json_encoder("orjson"), StdlibJsonEncoder)
+            self.assertRaisesRegex(JsonEncoderException, r"orjson is not installed", OrjsonEncoder)
+        mock_log.assert_called_once_with(
+            "warning", "orjson is not installed, the responses are encoded with the json module."
+        )
+
+    def test_should_raise_on_unknown_encoder(self):
+        self.assertRaisesRegex(JsonEncoderException, r'Unknown json encoder "ujson"', build_json_encoder, "ujson")
+
+
+class TestHttpResponseBuilderJsonEncoder(TestCase):
+    def tearDown(self):
+        HttpResponseBuilder.setup_json_encoder(StdlibJsonEncoder())
+
+    def test_json_responses_should_be_encoded_by_the_configured_encoder(self):
+        class BytesEncoder(JsonEncoder):
+            def encode(self, body):
+                return json.dumps(body).encode("utf-8")
+
+        HttpResponseBuilder.setup_json_encoder(BytesEncoder())
+        response = HttpResponseBuilder.build_success_response({"count": 1})
+
+        self.assertEqual(response.body, b'{"count": 1}')
+        self.assertEqual(response.headers, {"content-type": "application/json"})
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import os
+import re
+import sys
+from importlib.metadata import version
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from forestadmin.agent_toolkit.agent import Agent as BaseAgent
+from forestadmin.agent_toolkit.forest_logger import ForestLogger
+from forestadmin.agent_toolkit.options import Options
+from forestadmin.agent_toolkit.utils.context import HttpResponseBuilder, Response
+from forestadmin.agent_toolkit.utils.forest_schema.type import AgentMeta
+from forestadmin.asgi_agent.exception import AsgiAgentException
+from forestadmin.asgi_agent.utils.dispatcher import get_dispatcher_method
+from forestadmin.asgi_agent.utils.requests import Receive, Scope, Send, convert_request, read_body, send_response
+
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+INDEX = "index"
+SCOPE_CACHE_INVALIDATION = "scope_cache_invalidation"
+
+
+class Route(NamedTuple):
+    pattern: Pattern[str]
+    methods: Tuple[str, ...]
+    resource: str
+    method: Optional[str] = None
+    detail: bool = False
+
+
+# same routes as the flask blueprint, ordered from the most specific to the least specific one
+# to match like werkzeug does ("/<collection_name>.csv" before "/<collection_name>")
+ROUTES: List[Tuple[str, Tuple[str, ...], str, Optional[str], bool]] = [
+    ("", ("GET",), INDEX, None, False),
+    ("/_internal/capabilities", ("POST",), "capabilities", "capabilities", False),
+    ("/_internal/native_query", ("POST",), "native_query", "native_query", False),
+    ("/authentication/callback", ("GET",), "authentication", "callback", False),
+    ("/authentication", ("POST",), "authentication", "authenticate", False),
+    ("/scope-cache-invalidation", ("POST",), SCOPE_CACHE_INVALIDATION, None, False),
+    ("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/load", ("POST",), "actions", "hook", False),
+    ("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/change", ("POST",), "actions", "hook", False),
+    ("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/search", ("POST",), "actions", "hook", False),
+    ("/_actions/<collection_name>/<int:action_name>/<slug>", ("POST",), "actions", "execute", False),
+    ("/stats/<collection_name>", ("POST",), "stats", None, False),
+    ("/_charts/<chart_name>", ("POST", "GET"), "datasource_charts", None, False),
+    ("/_charts/<collection_name>/<chart_name>", ("POST", "GET"), "collection_charts", None, False),
+    ("/<collection_name>/<pks>/relationships/<relation_name>/count", ("GET",), "crud_related", "count", False),
+    ("/<collection_name>/<pks>/relationships/<relation_name>.csv", ("GET",), "crud_related", "csv", False),
+    (
+        "/<collection_name>/<pks>/relationships/<relation_name>",
+        ("GET", "POST", "DELETE", "PUT"),
+        "crud_related",
+        None,
+        False,
+    ),
+    ("/<collection_name>/count", ("GET",), "crud", "count", False),
+    ("/<collection_name>.csv", ("GET",), "crud", "csv", False),
+    ("/<collection_name>/<pks>", ("GET", "PUT", "DELETE"), "crud", None, True),
+    ("/<collection_name>", ("GET", "POST", "DELETE"), "crud", None, False),
+]
+
+_PATH_PARAM = re.compile(r"<(?:(int):)?(\w+)>")
+
+
+def _compile_path(path: str) -> Pattern[str]:
+    regex = ""
+    last = 0
+    for match in _PATH_PARAM.finditer(path):
+        regex += re.escape(path[last : match.start()])
+        converter, name = match.groups()
+        regex += f"(?P<{name}>\\d+)" if converter == "int" else f"(?P<{name}>[^/]+)"
+        last = match.end()
+    regex += re.escape(path[last:])
+    return re.compile(f"^{regex}$")
+
+
+def build_routes(url_prefix: str) -> List[Route]:
+    return [
+        Route(_compile_path(f"{url_prefix}{path}"), methods, resource, method, detail)
+        for path, methods, resource, method, detail in ROUTES
+    ]
+
+
+class AsgiAgent(BaseAgent):
+    META: AgentMeta = {
+        "liana": "agent-python",
+        "liana_version": version("forestadmin-agent-asgi").replace("b", "-beta."),
+        # .replace because poetry force 0.0.1b25 instead of 0.0.1-beta.25
+        # for more details:
+        # https://python-poetry.org/docs/master/faq/ : "Why does Poetry not adhere to semantic versioning?"
+        "stack": {"engine": "python", "engine_version": ".".join(map(str, [*sys.version_info[:3]]))},
+    }
+
+    def __init__(self, options: Options, app: Optional[ASGIApp] = None):
+        """asgi application serving the forest routes on the event loop of the asgi server
+
+        Every request is dispatched on the server loop, so the agent state (clients, caches, locks) lives as long as
+        the server does. Requests outside of the forest routes are forwarded to `app` when it is given.
+        """
+        options = {"schema_path": os.path.join(os.getcwd(), ".forestadmin-schema.json"), **options}
+        super(AsgiAgent, self).__init__(options)
+        self._app = app
+        self._routes = build_routes(f'{self.options["prefix"]}/forest')
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    async def start(self):
+        if self._started:
+            return
+        if self._start_lock is None:
+            # created lazily to be bound to the server loop
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if not self._started:
+                await self._start()
+                self._started = True
+                ForestLogger.log("info", "Asgi agent initialized")
+
+    def stop(self):
+        if self._sse_thread.is_alive():
+            self._sse_thread.stop()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(scope, receive, send)
+
+        if scope["type"] == "http":
+            route, path_params, method_allowed = self._match(scope)
+            if route is not None:
+                return await self._handle(route, path_params, scope, receive, send)
+            if self._app is None:
+                if method_allowed:
+                    return await send_response(send, HttpResponseBuilder.build_unknown_response())
+                return await send_response(send, HttpResponseBuilder.build_method_not_allowed_response())
+
+        if self._app is None:
+            raise AsgiAgentException(f"Unsupported asgi scope type '{scope['type']}'.")
+        await self._app(scope, receive, send)
+
+    async def _lifespan(self, scope: Scope, receive: Receive, send: Send):
+        if self._app is not None:
+
+            async def _receive():
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await self.start()
+                elif message["type"] == "lifespan.shutdown":
+                    self.stop()
+                return message
+
+            return await self._app(scope, _receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.start()
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _match(self, scope: Scope) -> Tuple[Optional[Route], Dict[str, Any], bool]:
+        path: str = scope["path"]
+        root_path: str = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+
+        method_allowed = True
+        for route in self._routes:
+            match = route.pattern.match(path)
+            if match is None:
+                continue
+            if scope["method"] not in route.methods:
+                method_allowed = False
+                continue
+            path_params: Dict[str, Any] = match.groupdict()
+            if "action_name" in path_params:
+                path_params["action_name"] = int(path_params["action_name"])
+            return route, path_params, True
+        return None, {}, method_allowed
+
+    async def _handle(self, route: Route, path_params: Dict[str, Any], scope: Scope, receive: Receive, send: Send):
+        await self.start()
+        body = await read_body(receive)
+
+        if route.resource == INDEX:
+            response = Response(200)
+        elif route.resource == SCOPE_CACHE_INVALIDATION:
+            try:
+                body = json.loads(body)
+            except ValueError:
+                body = None
+            self._permission_service.invalidate_rendering_cache(
+                body.get("renderingId") if isinstance(body, dict) else None
+            )
+            response = HttpResponseBuilder.build_no_content_response()
+        else:
+            try:
+                request = convert_request(scope, body, path_params)
+            except ValueError:
+                return await send_response(send, Response(400))
+            resource = (await self.get_resources())[route.resource]
+            method = route.method or get_dispatcher_method(scope["method"], route.detail)
+            response = await resource.dispatch(request, method)
+
+        await send_response(send, response)
+
+
+def create_agent(options: Options, app: Optional[ASGIApp] = None) -> AsgiAgent:
+    return AsgiAgent(options, app)
@@ -0,0 +1,5 @@
+from forestadmin.datasource_toolkit.exceptions import ForestException
+
+
+class AsgiAgentException(ForestException):
+    pass
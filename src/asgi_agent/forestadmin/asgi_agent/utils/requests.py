@@ -0,0 +1,112 @@
+import json
+from typing import Any, Awaitable, Callable, Dict, List, MutableMapping, Tuple, Union
+from urllib.parse import parse_qsl
+
+from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response, StreamingResponse
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+HTTP_METHOD_MAPPING = {
+    "GET": RequestMethod.GET,
+    "POST": RequestMethod.POST,
+    "PUT": RequestMethod.PUT,
+    "DELETE": RequestMethod.DELETE,
+}
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def _header_name(raw_name: bytes) -> str:
+    # asgi servers lowercase the header names, resources expect them like other frameworks do ("Authorization")
+    return "-".join(part.capitalize() for part in raw_name.decode("latin-1").split("-"))
+
+
+def convert_headers(raw_headers: List[Tuple[bytes, bytes]]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    for raw_name, raw_value in raw_headers:
+        name = _header_name(raw_name)
+        value = raw_value.decode("latin-1")
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return headers
+
+
+async def read_body(receive: Receive) -> bytes:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+def convert_request(scope: Scope, body: bytes, path_params: Dict[str, Any]) -> Request:
+    method = HTTP_METHOD_MAPPING[scope["method"]]
+    query: Dict[str, Any] = {}
+    for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+        # the first value of a repeated parameter, as flask's request.args.to_dict()
+        query.setdefault(name, value)
+    query.update(path_params)
+    headers = convert_headers(scope.get("headers", []))
+    client = scope.get("client")
+    kwargs: Dict[str, Any] = {
+        "query": query,
+        "headers": headers,
+        "client_ip": headers.get("X-Forwarded-For", client[0] if client else None),
+    }
+    if method in [RequestMethod.POST, RequestMethod.PUT, RequestMethod.DELETE] and body:
+        kwargs["body"] = json.loads(body)
+
+    return Request(method, **kwargs)
+
+
+def _encode_headers(headers: Dict[str, str]) -> List[Tuple[bytes, bytes]]:
+    return [(name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in headers.items()]
+
+
+def _encode_body(body: Union[str, bytes, None]) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return body
+
+
+async def send_response(send: Send, response: Union[Response, FileResponse, StreamingResponse]):
+    headers = {"Access-Control-Allow-Private-Network": "true"}
+    if isinstance(response, FileResponse):
+        headers.update(
+            {
+                "Content-Type": response.mimetype,
+                "Content-Disposition": f"attachment; filename={response.name}",
+                **response.headers,
+            }
+        )
+        await send({"type": "http.response.start", "status": 200, "headers": _encode_headers(headers)})
+        if response.file is not None:
+            chunk = response.file.read(FILE_CHUNK_SIZE)
+            while chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = response.file.read(FILE_CHUNK_SIZE)
+        await send({"type": "http.response.body", "body": b""})
+
+    elif isinstance(response, StreamingResponse):
+        headers.update(response.headers)
+        await send({"type": "http.response.start", "status": response.status, "headers": _encode_headers(headers)})
+        try:
+            async for chunk in response.body:
+                await send({"type": "http.response.body", "body": _encode_body(chunk), "more_body": True})
+        finally:
+            if hasattr(response.body, "aclose"):
+                await response.body.aclose()
+        await send({"type": "http.response.body", "body": b""})
+
+    else:
+        headers.update(response.headers)
+        await send({"type": "http.response.start", "status": response.status, "headers": _encode_headers(headers)})
+        await send({"type": "http.response.body", "body": _encode_body(response.body)})
@@ -0,0 +1,301 @@
+import asyncio
+import json
+from unittest import TestCase
+from unittest.mock import ANY, AsyncMock, Mock, patch
+
+from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, Response, StreamingResponse
+from forestadmin.asgi_agent.agent import AsgiAgent, create_agent
+from forestadmin.asgi_agent.exception import AsgiAgentException
+
+
+async def call_asgi(app, method, path, query_string=b"", body=None, headers=None, root_path=""):
+    raw_body = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": root_path,
+        "query_string": query_string,
+        "headers": headers or [(b"host", b"localhost"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 4242),
+    }
+    # the body is received in two parts to check it is reassembled
+    messages = [
+        {"type": "http.request", "body": raw_body[:5], "more_body": True},
+        {"type": "http.request", "body": raw_body[5:], "more_body": False},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def parse_response(sent):
+    headers = {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+    return sent[0]["status"], headers, b"".join(message.get("body", b"") for message in sent[1:])
+
+
+class BaseTestAsgiAgent(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.loop = asyncio.new_event_loop()
+        cls.options = {
+            "env_secret": "da4fc9331a68a18c2262154c74d9acb22f335724c8f2a510f8df187fa808703e",
+            "auth_secret": "fake",
+            "schema_path": "/tmp/.forestadmin-schema.json",
+        }
+
+    def setUp(self) -> None:
+        self.mocked_resources = {}
+        for key in [
+            "native_query",
+            "capabilities",
+            "authentication",
+            "crud",
+            "crud_related",
+            "stats",
+            "actions",
+            "collection_charts",
+            "datasource_charts",
+        ]:
+            self.mocked_resources[key] = Mock()
+            self.mocked_resources[key].dispatch = AsyncMock(
+                return_value=Response(200, '{"mock": "ok"}', headers={"content-type": "application/json"})
+            )
+        self.get_resources_patcher = patch(
+            "forestadmin.agent_toolkit.agent.Agent.get_resources",
+            return_value=self.mocked_resources,
+            new_callable=AsyncMock,
+        )
+        self.get_resources_patcher.start()
+        self.start_patcher = patch("forestadmin.agent_toolkit.agent.Agent._start", new_callable=AsyncMock)
+        self.mocked_start = self.start_patcher.start()
+        self.agent = create_agent(self.options)
+
+    def tearDown(self) -> None:
+        self.get_resources_patcher.stop()
+        self.start_patcher.stop()
+
+    def call(self, *args, **kwargs):
+        return parse_response(self.loop.run_until_complete(call_asgi(self.agent, *args, **kwargs)))
+
+
+class TestAsgiAgentRoutes(BaseTestAsgiAgent):
+    def assert_dispatched(self, method, path, resource, resource_method, body=None):
+        status, headers, content = self.call(method, path, body=body)
+        self.assertEqual(status, 200, f"{method} {path}")
+        self.assertEqual(json.loads(content), {"mock": "ok"})
+        self.assertEqual(headers["content-type"], "application/json")
+        self.assertEqual(headers["access-control-allow-private-network"], "true")
+        self.mocked_resources[resource].dispatch.assert_awaited_with(ANY, resource_method)
+
+    def test_create_agent(self):
+        self.assertIsInstance(self.agent, AsgiAgent)
+        self.assertEqual(self.agent.options["schema_path"], "/tmp/.forestadmin-schema.json")
+
+    def test_index(self):
+        status, _, content = self.call("GET", "/forest")
+        self.assertEqual(status, 200)
+        self.assertEqual(content, b"")
+
+    def test_same_routes_as_flask_blueprint(self):
+        for method, path, resource, resource_method in [
+            ("POST", "/forest/_internal/capabilities", "capabilities", "capabilities"),
+            ("POST", "/forest/_internal/native_query", "native_query", "native_query"),
+            ("GET", "/forest/authentication/callback", "authentication", "callback"),
+            ("POST", "/forest/authentication", "authentication", "authenticate"),
+            ("POST", "/forest/_actions/customer/1/action_name/hooks/load", "actions", "hook"),
+            ("POST", "/forest/_actions/customer/1/action_name/hooks/change", "actions", "hook"),
+            ("POST", "/forest/_actions/customer/1/action_name/hooks/search", "actions", "hook"),
+            ("POST", "/forest/_actions/customer/1/action_name", "actions", "execute"),
+            ("POST", "/forest/stats/customer", "stats", "add"),
+            ("GET", "/forest/_charts/my_chart", "datasource_charts", "list"),
+            ("POST", "/forest/_charts/customer/my_chart", "collection_charts", "add"),
+            ("GET", "/forest/customer/count", "crud", "count"),
+            ("GET", "/forest/customer.csv", "crud", "csv"),
+            ("GET", "/forest/customer/1", "crud", "get"),
+            ("PUT", "/forest/customer/1", "crud", "update"),
+            ("DELETE", "/forest/customer/1", "crud", "delete"),
+            ("GET", "/forest/customer", "crud", "list"),
+            ("POST", "/forest/customer", "crud", "add"),
+            ("DELETE", "/forest/customer", "crud", "delete_list"),
+            ("GET", "/forest/customer/1/relationships/orders", "crud_related", "list"),
+            ("POST", "/forest/customer/1/relationships/orders", "crud_related", "add"),
+            ("DELETE", "/forest/customer/1/relationships/orders", "crud_related", "delete_list"),
+            ("PUT", "/forest/customer/1/relationships/orders", "crud_related", "update_list"),
+            ("GET", "/forest/customer/1/relationships/orders/count", "crud_related", "count"),
+            ("GET", "/forest/customer/1/relationships/orders.csv", "crud_related", "csv"),
+        ]:
+            with self.subTest(method=method, path=path):
+                self.assert_dispatched(method, path, resource, resource_method)
+
+    def test_request_conversion(self):
+        self.call(
+            "POST",
+            "/forest/_actions/customer/1/action_name",
+            query_string=b"timezone=Europe%2FParis",
+            body={"data": {"attributes": {}}},
+            headers=[(b"host", b"localhost"), (b"authorization", b"Bearer token"), (b"x-forwarded-for", b"10.0.0.1")],
+        )
+        request = self.mocked_resources["actions"].dispatch.await_args.args[0]
+        self.assertEqual(
+            request,
+            Request(
+                RequestMethod.POST,
+                body={"data": {"attributes": {}}},
+                query={
+                    "timezone": "Europe/Paris",
+                    "collection_name": "customer",
+                    "action_name": 1,
+                    "slug": "action_name",
+                },
+                headers={"Host": "localhost", "Authorization": "Bearer token", "X-Forwarded-For": "10.0.0.1"},
+                client_ip="10.0.0.1",
+            ),
+        )
+
+    def test_request_conversion_should_keep_the_first_value_of_repeated_parameters(self):
+        self.call("GET", "/forest/customer/count", query_string=b"timezone=Europe%2FParis&search=first&search=second")
+
+        request = self.mocked_resources["crud"].dispatch.await_args.args[0]
+        self.assertEqual(request.query["search"], "first")
+
+    def test_prefix_and_root_path(self):
+        agent = create_agent({**self.options, "prefix": "/admin"})
+        sent = self.loop.run_until_complete(call_asgi(agent, "GET", "/api/admin/forest/customer", root_path="/api"))
+        self.assertEqual(parse_response(sent)[0], 200)
+        self.mocked_resources["crud"].dispatch.assert_awaited_with(ANY, "list")
+
+    def test_scope_cache_invalidation(self):
+        with patch.object(self.agent._permission_service, "invalidate_rendering_cache") as mocked_invalidate_cache:
+            status, _, _ = self.call("POST", "/forest/scope-cache-invalidation", body={"renderingId": 12})
+        self.assertEqual(status, 204)
+        mocked_invalidate_cache.assert_called_once_with(12)
+
+    def test_scope_cache_invalidation_without_rendering_id(self):
+        with patch.object(self.agent._permission_service, "invalidate_rendering_cache") as mocked_invalidate_cache:
+            status, _, _ = self.call("POST", "/forest/scope-cache-invalidation")
+        self.assertEqual(status, 204)
+        mocked_invalidate_cache.assert_called_once_with(None)
+
+    def test_unknown_route_and_method(self):
+        self.assertEqual(self.call("GET", "/other")[0], 404)
+        self.assertEqual(self.call("PATCH", "/forest/customer")[0], 405)
+
+    def test_invalid_json_body(self):
+        async def _call():
+            messages = [{"type": "http.request", "body": b"{not json", "more_body": False}]
+            sent = []
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {"type": "http", "method": "POST", "path": "/forest/customer", "headers": [], "client": None}
+            await self.agent(scope, receive, send)
+            return sent
+
+        self.assertEqual(parse_response(self.loop.run_until_complete(_call()))[0], 400)
+
+    def test_streaming_response_is_sent_chunk_by_chunk(self):
+        async def _body():
+            yield "id\n"
+            yield "1\n"
+
+        self.mocked_resources["crud"].dispatch.return_value = StreamingResponse(
+            200, _body(), headers={"content-type": "text/csv"}
+        )
+        sent = self.loop.run_until_complete(call_asgi(self.agent, "GET", "/forest/customer.csv"))
+
+        self.assertEqual(
+            [message.get("body") for message in sent[1:]],
+            [b"id\n", b"1\n", b""],
+        )
+        self.assertEqual([message.get("more_body", False) for message in sent[1:]], [True, True, False])
+
+    def test_requests_are_dispatched_on_the_server_loop(self):
+        loops = []
+
+        async def _dispatch(request, method):
+            loops.append(asyncio.get_running_loop())
+            return Response(200, "{}")
+
+        self.mocked_resources["crud"].dispatch.side_effect = _dispatch
+
+        async def _serve():
+            await asyncio.gather(*[call_asgi(self.agent, "GET", "/forest/customer") for _ in range(5)])
+
+        self.loop.run_until_complete(_serve())
+        self.loop.run_until_complete(_serve())
+        self.assertEqual(len(loops), 10)
+        self.assertEqual(set(loops), {self.loop})
+        # the agent is started once, even when the first requests are concurrent
+        self.mocked_start.assert_awaited_once()
+
+
+class TestAsgiAgentLifespan(BaseTestAsgiAgent):
+    def run_lifespan(self, app):
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        self.loop.run_until_complete(app({"type": "lifespan"}, receive, send))
+        return sent
+
+    def test_lifespan_should_start_the_agent(self):
+        with patch.object(self.agent, "stop") as mocked_stop:
+            sent = self.run_lifespan(self.agent)
+        self.assertEqual(sent, [{"type": "lifespan.startup.complete"}, {"type": "lifespan.shutdown.complete"}])
+        self.mocked_start.assert_awaited_once()
+        mocked_stop.assert_called_once()
+
+    def test_lifespan_should_report_startup_failure(self):
+        self.mocked_start.side_effect = Exception("cannot start")
+        sent = self.run_lifespan(self.agent)
+        self.assertEqual(sent, [{"type": "lifespan.startup.failed", "message": "cannot start"}])
+
+    def test_lifespan_should_be_forwarded_to_the_wrapped_app(self):
+        async def wrapped_app(scope, receive, send):
+            while True:
+                message = await receive()
+                await send({"type": f"{message['type']}.complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+
+        agent = create_agent(self.options, wrapped_app)
+        sent = self.run_lifespan(agent)
+        self.assertEqual(sent, [{"type": "lifespan.startup.complete"}, {"type": "lifespan.shutdown.complete"}])
+        self.mocked_start.assert_awaited_once()
+
+
+class TestAsgiAgentWrappedApp(BaseTestAsgiAgent):
+    def test_other_requests_should_be_forwarded(self):
+        wrapped_app = AsyncMock()
+        agent = create_agent(self.options, wrapped_app)
+
+        self.loop.run_until_complete(call_asgi(agent, "GET", "/forest/customer"))
+        wrapped_app.assert_not_awaited()
+        self.loop.run_until_complete(call_asgi(agent, "GET", "/api/books"))
+        wrapped_app.assert_awaited_once()
+        self.assertEqual(wrapped_app.await_args.args[0]["path"], "/api/books")
+
+    def test_websocket_without_wrapped_app_should_raise(self):
+        self.assertRaisesRegex(
+            AsgiAgentException,
+            r"Unsupported asgi scope type 'websocket'",
+            self.loop.run_until_complete,
+            self.agent({"type": "websocket"}, AsyncMock(), AsyncMock()),
+        )
@@ -0,0 +1,122 @@
+"""Throughput of concurrent DjangoCollection read queries, sync_to_async worker vs orm executor, on a sqlite file.
+
+The sqlite driver releases the GIL while a query runs, so the queries of different threads can overlap on a multi
+core machine. --latency-ms adds a sleep to each query, to simulate the network round trip of a database server.
+
+usage: python benchmarks/bench_orm_executor.py [--rows 200000] [--requests 32] [--workers 1 2 4 8] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+import django
+from django.conf import settings
+
+
+def setup_django(db_path: str):
+    settings.configure(
+        INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth"],
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": db_path}},
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+def add_latency(latency: float):
+    from django.db.backends.signals import connection_created
+
+    def _wrapper(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def _on_connection_created(sender, connection, **kwargs):
+        # the signal is sent on each reconnection of the same wrapper
+        if _wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_wrapper)
+
+    connection_created.connect(_on_connection_created, weak=False)
+
+
+def populate(rows: int):
+    from django.contrib.auth.models import User as DjangoUser
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    DjangoUser.objects.bulk_create(
+        [DjangoUser(username=f"user {i}", email=f"user{i}@forest.com", password="-") for i in range(rows)],
+        batch_size=10_000,
+    )
+
+
+async def run(workers: int, requests: int) -> float:
+    from forestadmin.agent_toolkit.utils.context import User
+    from forestadmin.datasource_django.datasource import DjangoDatasource
+    from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+    from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+    from forestadmin.datasource_toolkit.interfaces.query.page import Page
+    from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+    from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
+
+    caller = User(
+        rendering_id=1,
+        user_id=1,
+        tags={},
+        email="bench@forestadmin.com",
+        first_name="bench",
+        last_name="mark",
+        team="operational",
+        timezone=zoneinfo.ZoneInfo("UTC"),
+        request={"ip": "127.0.0.1"},
+    )
+    datasource = DjangoDatasource(orm_executor_workers=workers if workers > 0 else None)
+    collection = datasource.get_collection("auth_user")
+    # unindexed filter + sort: sqlite has to scan the whole table for each request
+    filter_ = PaginatedFilter(
+        {
+            "condition_tree": ConditionTreeLeaf("email", "contains", "99"),
+            "sort": Sort([{"field": "email", "ascending": False}]),
+            "page": Page(0, 50),
+        }
+    )
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[collection.list(caller, filter_, Projection("id", "username", "email")) for _ in range(requests)]
+    )
+    duration = time.perf_counter() - start
+    if datasource.orm_executor is not None:
+        datasource.orm_executor.shutdown()
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(os.path.join(tmp_dir, "bench.sqlite"))
+        populate(args.rows)
+        if args.latency_ms:
+            add_latency(args.latency_ms / 1000)
+
+        print(f"{args.requests} concurrent list requests on {args.rows} rows, {args.latency_ms}ms of query latency")
+        print(f"{'mode':<22}{'total (s)':>12}{'requests/s':>14}")
+        for workers in [0, *args.workers]:
+            mode = "sync_to_async" if workers == 0 else f"orm executor ({workers})"
+            duration = asyncio.run(run(workers, args.requests))
+            print(f"{mode:<22}{duration:>12.3f}{args.requests / duration:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
-from typing import List, Optional
+from typing import Callable, List, Optional, TypeVar
 
 from asgiref.sync import sync_to_async
+from django import VERSION as DJANGO_VERSION
 from django.conf import settings
-from django.db import connection, connections
+from django.db import connection, connections, router
 from django.db.models import Model
 from forestadmin.agent_toolkit.forest_logger import ForestLogger
 from forestadmin.agent_toolkit.utils.context import User
 from forestadmin.datasource_django.interface import BaseDjangoCollection
 from forestadmin.datasource_django.utils.model_introspection import DjangoCollectionFactory
 from forestadmin.datasource_django.utils.native_driver_wrapper import NativeDriverWrapper, get_db_for_native_driver
+from forestadmin.datasource_django.utils.orm_executor import DjangoOrmExecutor, is_in_request_transaction
 from forestadmin.datasource_django.utils.polymorphic_util import DjangoPolymorphismUtil
 from forestadmin.datasource_django.utils.query_factory import DjangoQueryBuilder
 from forestadmin.datasource_django.utils.record_serializer import instance_to_record_data
@@ -20,12 +22,23 @@ from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import F
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 
+T = TypeVar("T")
+
 
 class DjangoCollection(BaseDjangoCollection):
-    def __init__(self, datasource: Datasource, model: Model, support_polymorphic_relations: bool):
+    def __init__(
+        self,
+        datasource: Datasource,
+        model: Model,
+        support_polymorphic_relations: bool,
+        use_async_orm: bool = False,
+        orm_executor: Optional[DjangoOrmExecutor] = None,
+    ):
         super().__init__(model._meta.db_table, datasource)
         self._model = model
         self.support_polymorphic_relations = support_polymorphic_relations
+        self.use_async_orm = use_async_orm
+        self.orm_executor = orm_executor
         schema = DjangoCollectionFactory.build(model, support_polymorphic_relations)
         self.add_fields(schema["fields"])
         self.enable_count()
@@ -34,7 +47,24 @@ class DjangoCollection(BaseDjangoCollection):
     def model(self) -> Model:
         return self._model
 
+    def _is_async_orm_usable(self) -> bool:
+        # polymorphic relations are resolved with lazy (sync only) queries
+        return self.use_async_orm and not self.support_polymorphic_relations
+
+    async def _run_read_query(self, fn: Callable[[], T]) -> T:
+        # writes stay on the thread sensitive worker, to be part of the request transaction (ATOMIC_REQUESTS), and
+        # reads join them there when a transaction may be open, to see its uncommitted writes
+        if self.orm_executor is not None and not await is_in_request_transaction(router.db_for_read(self.model)):
+            return await self.orm_executor.run(fn)
+        return await sync_to_async(fn)()
+
     async def list(self, caller: User, filter_: PaginatedFilter, projection: Projection) -> List[RecordsDataAlias]:
+        if self._is_async_orm_usable():
+            qs = DjangoQueryBuilder.mk_list(self, filter_, projection)
+            # aiterator handles prefetch_related since django 5.0
+            if not qs._prefetch_related_lookups or DJANGO_VERSION >= (5, 0):
+                return [instance_to_record_data(item, projection, self) async for item in qs.aiterator()]
+
         def _list():
             if self.support_polymorphic_relations:
                 DjangoPolymorphismUtil.request_content_type()
@@ -46,11 +76,14 @@ class DjangoCollection(BaseDjangoCollection):
                 ForestLogger.log("debug", f"SQL queries for list({len(connection.queries)}):{str(connection.queries)}")
             return ret
 
-        return await sync_to_async(_list)()
+        return await self._run_read_query(_list)
 
     async def aggregate(
         self, caller: User, filter_: Optional[Filter], aggregation: Aggregation, limit: Optional[int] = None
     ) -> List[AggregateResult]:
+        if self._is_async_orm_usable():
+            return await DjangoQueryBuilder.amk_aggregate(self, filter_, aggregation, limit)
+
         def _aggregate():
             if self.support_polymorphic_relations:
                 DjangoPolymorphismUtil.request_content_type()
@@ -61,10 +94,15 @@ class DjangoCollection(BaseDjangoCollection):
                 )
             return ret
 
-        return await sync_to_async(_aggregate)()
+        return await self._run_read_query(_aggregate)
 
     async def create(self, caller: User, data: List[RecordsDataAlias]) -> List[RecordsDataAlias]:
         projection = Projection(*[k for k in self.schema["fields"].keys() if is_column(self.schema["fields"][k])])
+        if self._is_async_orm_usable():
+            return [
+                instance_to_record_data(item, projection, self)
+                for item in await DjangoQueryBuilder.amk_create(self, data)
+            ]
 
         def _create():
             if self.support_polymorphic_relations:
@@ -80,6 +118,9 @@ class DjangoCollection(BaseDjangoCollection):
         return await sync_to_async(_create)()
 
     async def update(self, caller: User, filter_: Optional[Filter], patch: RecordsDataAlias) -> None:
+        if self._is_async_orm_usable():
+            return await DjangoQueryBuilder.amk_update(self, filter_, patch)
+
         def _update():
             if self.support_polymorphic_relations:
                 DjangoPolymorphismUtil.request_content_type()
@@ -92,6 +133,9 @@ class DjangoCollection(BaseDjangoCollection):
         await sync_to_async(_update)()
 
     async def delete(self, caller: User, filter_: Optional[Filter]) -> None:
+        if self._is_async_orm_usable():
+            return await DjangoQueryBuilder.amk_delete(self, filter_)
+
         def _delete():
             if self.support_polymorphic_relations:
                 DjangoPolymorphismUtil.request_content_type()
@@ -2,11 +2,13 @@ from datetime import date
 from typing import Dict, List, Optional, Union
 
 from asgiref.sync import sync_to_async
+from django import VERSION as DJANGO_VERSION
 from django.apps import apps
 from django.db import connections
 from forestadmin.datasource_django.collection import DjangoCollection
 from forestadmin.datasource_django.exception import DjangoDatasourceException
 from forestadmin.datasource_django.interface import BaseDjangoDatasource
+from forestadmin.datasource_django.utils.orm_executor import DjangoOrmExecutor, is_in_request_transaction
 from forestadmin.datasource_toolkit.exceptions import NativeQueryException
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 
@@ -16,6 +18,8 @@ class DjangoDatasource(BaseDjangoDatasource):
         self,
         support_polymorphic_relations: bool = False,
         live_query_connection: Optional[Union[str, Dict[str, str]]] = None,
+        use_async_orm: bool = False,
+        orm_executor_workers: Optional[int] = None,
     ) -> None:
         """ Create a django datasource.
         More information here:
@@ -29,7 +33,22 @@ class DjangoDatasource(BaseDjangoDatasource):
                 use live queries. If a string is given, this connection will be map to django 'default' database. \
                 Otherwise, you must use a dict `{'connectionName': 'DjangoDatabaseName'}`. \
                 None doesn't enable this feature.
+            use_async_orm (bool, optional, default to `False`): Query the database with the async queryset api \
+                (django >= 4.1) instead of running the orm calls in `sync_to_async`. Collections supporting \
+                polymorphic relations keep the sync orm.
+            orm_executor_workers (int, optional, default to `None`): Run the read queries (list, aggregate, live \
+                queries) of the sync orm on a pool of this many threads, each one with its own database \
+                connections. None keeps the single thread of `sync_to_async`. The reads on a database using \
+                ATOMIC_REQUESTS, or inside an atomic block, stay on the thread of `sync_to_async`.
         """
+        if use_async_orm and DJANGO_VERSION < (4, 1):
+            raise DjangoDatasourceException("The async orm needs django 4.1 or later.")
+        self.use_async_orm = use_async_orm
+        self.orm_executor: Optional[DjangoOrmExecutor] = None
+        if orm_executor_workers is not None:
+            if orm_executor_workers < 1:
+                raise DjangoDatasourceException("orm_executor_workers must be a positive integer.")
+            self.orm_executor = DjangoOrmExecutor(orm_executor_workers)
         self._django_live_query_connections: Dict[str, str] = self._handle_live_query_connections_param(
             live_query_connection
         )
@@ -61,7 +80,9 @@ class DjangoDatasource(BaseDjangoDatasource):
         models = apps.get_models(include_auto_created=True)
         for model in models:
             if model._meta.proxy is False:
-                collection = DjangoCollection(self, model, self.support_polymorphic_relations)
+                collection = DjangoCollection(
+                    self, model, self.support_polymorphic_relations, self.use_async_orm, self.orm_executor
+                )
                 self.add_collection(collection)
 
     async def execute_native_query(
@@ -72,7 +93,7 @@ class DjangoDatasource(BaseDjangoDatasource):
             raise NativeQueryException(f"Native query connection '{connection_name}' is not known by DjangoDatasource.")
 
         def _execute_native_query():
-            cursor = connections[self._django_live_query_connections[connection_name]].cursor()  # type: ignore
+            cursor = connections[db_name].cursor()  # type: ignore
             try:
                 # replace '\%' by '%%'
                 # %(var)s is already the correct  syntax
@@ -91,4 +112,7 @@ class DjangoDatasource(BaseDjangoDatasource):
             except Exception as e:
                 raise NativeQueryException(str(e))
 
+        db_name = self._django_live_query_connections[connection_name]
+        if self.orm_executor is not None and not await is_in_request_transaction(db_name):
+            return await self.orm_executor.run(_execute_native_query)
         return await sync_to_async(_execute_native_query)()
@@ -0,0 +1,31 @@
+import json
+
+from django.db import models
+from django.db.models.lookups import In
+
+
+@models.Field.register_lookup
+class InValues(In):
+    """`in` lookup binding its values as a single parameter, for the lists larger than the parameters limit
+
+    The values are read from a json array on sqlite and from an array on postgresql, other databases (and the values
+    which are neither integers nor strings) fall back on the `in` lookup.
+    """
+
+    lookup_name = "forestadmin_in_values"
+
+    def process_rhs(self, compiler, connection):
+        sql, params = super().process_rhs(compiler, connection)
+        if (
+            not self.rhs_is_direct_value()
+            or sql != f"({', '.join(['%s'] * len(params))})"
+            or not all(isinstance(param, (int, str)) and not isinstance(param, bool) for param in params)
+        ):
+            return sql, params
+
+        if connection.vendor == "sqlite":
+            return "(SELECT value FROM json_each(%s))", (json.dumps(list(params)),)
+        if connection.vendor == "postgresql":
+            db_type = self.lhs.output_field.cast_db_type(connection)
+            return f"(SELECT unnest(%s::{db_type}[]))", (list(params),)
+        return sql, params
@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+
+T = TypeVar("T")
+
+
+class DjangoOrmExecutor:
+    """run orm calls on a pool of threads, instead of the single thread used by `sync_to_async`
+
+    Django connections are per thread, so each worker uses its own connections. Like a request would, each call
+    starts and ends with `close_old_connections`, which closes broken connections and the ones older than
+    CONN_MAX_AGE.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="forest-django-orm")
+
+    async def run(self, fn: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._run_with_connection, fn)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _run_with_connection(fn: Callable[[], T]) -> T:
+        close_old_connections()
+        try:
+            return fn()
+        finally:
+            close_old_connections()
+
+
+async def is_in_request_transaction(db_name: str) -> bool:
+    """whether the queries on `db_name` may belong to a transaction opened on the thread sensitive worker
+
+    Such a transaction (ATOMIC_REQUESTS, `transaction.atomic`) is bound to the connection of its thread: the executor
+    threads would not see its uncommitted writes. Connections are per thread, so the atomic block is looked for on the
+    thread sensitive worker.
+    """
+    if connections[db_name].settings_dict.get("ATOMIC_REQUESTS"):
+        return True
+    return await sync_to_async(lambda: connections[db_name].in_atomic_block)()
@@ -6,6 +6,7 @@ import pandas as pd
 from django.db import models
 from forestadmin.datasource_django.exception import DjangoDatasourceException
 from forestadmin.datasource_django.interface import BaseDjangoCollection
+from forestadmin.datasource_django.utils.lookups import InValues
 from forestadmin.datasource_django.utils.polymorphic_util import DjangoPolymorphismUtil
 from forestadmin.datasource_django.utils.type_converter import FilterOperator
 from forestadmin.datasource_toolkit.interfaces.fields import (
@@ -27,6 +28,7 @@ from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch
 )
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import ConditionTreeBranch
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.optimizer import ConditionTreeOptimizer
 from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
 from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import BaseFilter, Filter
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
@@ -88,7 +90,7 @@ class DjangoQueryBuilder:
                     filter_.condition_tree, collection
                 )
 
-        qs = qs.filter(DjangoQueryConditionTreeBuilder.build(condition_tree))
+        qs = qs.filter(DjangoQueryConditionTreeBuilder.build(ConditionTreeOptimizer.optimize(condition_tree)))
 
         if isinstance(filter_, PaginatedFilter):
             qs = qs.order_by(*DjangoQueryPaginationBuilder.get_order_by(filter_))
@@ -160,13 +162,18 @@ class DjangoQueryBuilder:
         return DjangoQueryPaginationBuilder.paginate_queryset(qs, filter_)
 
     @classmethod
-    def mk_aggregate(
+    def _mk_aggregate_queryset(
         cls,
         collection: BaseDjangoCollection,
         filter_: Optional[Filter],
         aggregation: Aggregation,
         limit: Optional[int],
-    ) -> List[AggregateResult]:
+    ) -> Tuple[models.QuerySet, str, Optional[Dict[str, Any]]]:
+        """return the queryset, the aggregated field and the kwargs to give to `aggregate`
+
+        Without group, the kwargs are returned and the queryset must be aggregated. Otherwise, the kwargs are None
+        and the queryset already returns the grouped rows.
+        """
         full_projection = aggregation.projection
         if filter_.condition_tree:
             full_projection = full_projection.union(filter_.condition_tree.projection)
@@ -183,10 +190,7 @@ class DjangoQueryBuilder:
                 aggregate_kwargs = {
                     aggregated_field: cls.AGGREGATION_FUNC_MAPPING[aggregation.operation](aggregation.field)
                 }
-
-            qs = qs.aggregate(**aggregate_kwargs)
-            value = float(qs.get(aggregated_field, 0))
-            return [{"value": value, "group": {}}]
+            return qs, aggregated_field, aggregate_kwargs
 
         else:
             aggregated_field = None
@@ -205,8 +209,42 @@ class DjangoQueryBuilder:
             qs = qs.annotate(**annotate_kwargs)
             if limit:
                 qs = qs[0:limit]
+            return qs, aggregated_field, None
+
+    @classmethod
+    def mk_aggregate(
+        cls,
+        collection: BaseDjangoCollection,
+        filter_: Optional[Filter],
+        aggregation: Aggregation,
+        limit: Optional[int],
+    ) -> List[AggregateResult]:
+        qs, aggregated_field, aggregate_kwargs = cls._mk_aggregate_queryset(collection, filter_, aggregation, limit)
+        if aggregate_kwargs is not None:
+            value = float(qs.aggregate(**aggregate_kwargs).get(aggregated_field, 0))
+            return [{"value": value, "group": {}}]
 
-            return [DjangoQueryGroupByHelper.parse_groupby_row(row, aggregation.groups, aggregated_field) for row in qs]
+        return [DjangoQueryGroupByHelper.parse_groupby_row(row, aggregation.groups, aggregated_field) for row in qs]
+
+    @classmethod
+    async def amk_aggregate(
+        cls,
+        collection: BaseDjangoCollection,
+        filter_: Optional[Filter],
+        aggregation: Aggregation,
+        limit: Optional[int],
+    ) -> List[AggregateResult]:
+        qs, aggregated_field, aggregate_kwargs = cls._mk_aggregate_queryset(collection, filter_, aggregation, limit)
+        if aggregate_kwargs is not None:
+            if aggregation.operation == Aggregator.COUNT and aggregation.field is None:
+                value = float(await qs.acount())
+            else:
+                value = float((await qs.aaggregate(**aggregate_kwargs)).get(aggregated_field, 0))
+            return [{"value": value, "group": {}}]
+
+        return [
+            DjangoQueryGroupByHelper.parse_groupby_row(row, aggregation.groups, aggregated_field) async for row in qs
+        ]
 
     @staticmethod
     def mk_create(collection: BaseDjangoCollection, data: List[RecordsDataAlias]) -> List[models.Model]:
@@ -217,30 +255,60 @@ class DjangoQueryBuilder:
         return instances
 
     @staticmethod
+    async def amk_create(collection: BaseDjangoCollection, data: List[RecordsDataAlias]) -> List[models.Model]:
+        instances: List[models.Model] = [
+            await collection.model.objects.acreate(
+                **DjangoPolymorphismUtil.replace_content_type_in_patch(d, collection)
+            )
+            for d in data
+        ]
+        return instances
+
+    @staticmethod
+    def _mk_filtered_queryset(collection: BaseDjangoCollection, filter_: Optional[Filter]) -> models.QuerySet:
+        return collection.model.objects.filter(
+            DjangoQueryConditionTreeBuilder.build(
+                ConditionTreeOptimizer.optimize(
+                    DjangoPolymorphismUtil.replace_content_type_in_condition_tree(filter_.condition_tree, collection)
+                )
+            )
+        )
+
+    @classmethod
     def mk_update(
+        cls,
         collection: BaseDjangoCollection,
         filter_: Optional[Filter],
         patch: RecordsDataAlias,
     ):
         patch = DjangoPolymorphismUtil.replace_content_type_in_patch(patch, collection)
-        qs = collection.model.objects.filter(
-            DjangoQueryConditionTreeBuilder.build(
-                DjangoPolymorphismUtil.replace_content_type_in_condition_tree(filter_.condition_tree, collection)
-            )
-        )
+        qs = cls._mk_filtered_queryset(collection, filter_)
         qs.update(**{k.replace(":", "__"): v for k, v in patch.items()})
 
-    @staticmethod
-    def mk_delete(collection: BaseDjangoCollection, filter_: Optional[Filter]):
-        qs = collection.model.objects.filter(
-            DjangoQueryConditionTreeBuilder.build(
-                DjangoPolymorphismUtil.replace_content_type_in_condition_tree(filter_.condition_tree, collection)
-            )
-        )
-        qs.delete()
+    @classmethod
+    async def amk_update(
+        cls,
+        collection: BaseDjangoCollection,
+        filter_: Optional[Filter],
+        patch: RecordsDataAlias,
+    ):
+        patch = DjangoPolymorphismUtil.replace_content_type_in_patch(patch, collection)
+        qs = cls._mk_filtered_queryset(collection, filter_)
+        await qs.aupdate(**{k.replace(":", "__"): v for k, v in patch.items()})
+
+    @classmethod
+    def mk_delete(cls, collection: BaseDjangoCollection, filter_: Optional[Filter]):
+        cls._mk_filtered_queryset(collection, filter_).delete()
+
+    @classmethod
+    async def amk_delete(cls, collection: BaseDjangoCollection, filter_: Optional[Filter]):
+        await cls._mk_filtered_queryset(collection, filter_).adelete()
 
 
 class DjangoQueryConditionTreeBuilder:
+    # the values of larger `in` lists are bound as a single parameter, as the databases limit the count of parameters
+    MAX_BOUND_IN_VALUES = 500
+
     @classmethod
     def _build_leaf_condition(cls, leaf: ConditionTreeLeaf) -> models.Q:
         field = leaf.field.replace(":", "__")
@@ -250,6 +318,13 @@ class DjangoQueryConditionTreeBuilder:
         if key == "__isnull":
             value = True
 
+        if key == "__in" and isinstance(value, list) and len(value) > cls.MAX_BOUND_IN_VALUES:
+            values = [v for v in value if v is not None]
+            q_obj = models.Q(**{f"{field}__{InValues.lookup_name}": values})
+            if len(values) != len(value):
+                q_obj |= models.Q(**{f"{field}__isnull": True})
+            return ~q_obj if should_negate else q_obj
+
         if key == "__in" and isinstance(value, list) and None in value:
             q_obj = cls.build(ConditionTreeBranch("or", [ConditionTreeLeaf(leaf.field, "equal", v) for v in value]))
             return ~q_obj if should_negate else q_obj
@@ -262,6 +337,9 @@ class DjangoQueryConditionTreeBuilder:
     @classmethod
     def _aggregate(cls, aggregator: ConditionTreeAggregator, conditions: List[ConditionTree]) -> models.Q:
         ret: models.Q = models.Q()
+        if aggregator == ConditionTreeAggregator.OR and not conditions:
+            # an empty `or` matches nothing, while an empty Q matches everything
+            return models.Q(pk__in=[])
         if aggregator == ConditionTreeAggregator.AND:
             for cond in conditions:
                 ret &= cond
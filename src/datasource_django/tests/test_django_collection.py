@@ -13,6 +13,7 @@ from forestadmin.agent_toolkit.utils.context import User
 from forestadmin.datasource_django.collection import DjangoCollection
 from forestadmin.datasource_django.datasource import DjangoDatasource
 from forestadmin.datasource_django.exception import DjangoNativeDriver
+from forestadmin.datasource_django.utils.query_factory import DjangoQueryBuilder
 from forestadmin.datasource_toolkit.interfaces.fields import Operator
 from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation, DateOperation
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import (
@@ -22,6 +23,7 @@ from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch
     ConditionTreeBranch,
     ConditionTreeLeaf,
 )
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.optimizer import ConditionTreeOptimizer
 from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
 from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
 from forestadmin.datasource_toolkit.interfaces.query.page import Page
@@ -228,6 +230,48 @@ class TestDjangoCollectionCRUDList(TestCase):
             ],
         )
 
+    async def test_list_should_optimize_the_condition_tree(self):
+        filter_ = PaginatedFilter(
+            {
+                "condition_tree": ConditionTreeBranch(
+                    ConditionTreeAggregator.AND,
+                    [
+                        ConditionTreeBranch(
+                            ConditionTreeAggregator.OR,
+                            [ConditionTreeLeaf("book_pk", Operator.EQUAL, pk) for pk in range(1, 21)],
+                        ),
+                        ConditionTreeLeaf("book_pk", Operator.NOT_IN, [3, 4]),
+                        ConditionTreeBranch(ConditionTreeAggregator.AND, [ConditionTreeLeaf("name", Operator.PRESENT)]),
+                        ConditionTreeLeaf("name", Operator.PRESENT),
+                    ],
+                )
+            }
+        )
+        projection = Projection("book_pk", "name")
+
+        with patch.object(ConditionTreeOptimizer, "optimize", side_effect=lambda tree: tree):
+            sql = str(DjangoQueryBuilder.mk_list(self.book_collection, filter_, projection).query)
+            expected = await self.book_collection.list(self.mocked_caller, filter_, projection)
+        optimized_sql = str(DjangoQueryBuilder.mk_list(self.book_collection, filter_, projection).query)
+        ret = await self.book_collection.list(self.mocked_caller, filter_, projection)
+
+        self.assertEqual(ret, expected)
+        self.assertEqual(ret, [{"book_pk": 1, "name": "Foundation"}, {"book_pk": 2, "name": "Harry Potter"}])
+        self.assertLess(len(optimized_sql), len(sql) / 2, f"sql size: {len(sql)} -> {len(optimized_sql)} chars")
+
+    async def test_list_should_not_return_records_when_the_condition_tree_cant_match(self):
+        for condition_tree in [
+            ConditionTreeBranch(ConditionTreeAggregator.OR, []),
+            ConditionTreeBranch(
+                ConditionTreeAggregator.AND,
+                [ConditionTreeLeaf("book_pk", Operator.EQUAL, 1), ConditionTreeLeaf("book_pk", Operator.EQUAL, 2)],
+            ),
+        ]:
+            ret = await self.book_collection.list(
+                self.mocked_caller, PaginatedFilter({"condition_tree": condition_tree}), Projection("book_pk")
+            )
+            self.assertEqual(ret, [], condition_tree)
+
 
 class TestDjangoCollectionCRUDListPolymorphism(TestDjangoCollectionCRUDList):
     def setUp(self) -> None:
@@ -658,6 +702,52 @@ class TestDjangoCollectionCRUDCreateUpdateDelete(TestDjangoCollectionCRUDAggrega
 
         self.assertEqual(len(tolkiens), 4)
 
+    async def test_should_handle_in_lists_larger_than_the_parameters_limit(self):
+        # more values than the sqlite limit of bound parameters (32766)
+        pks = [pk for pk in range(1, 40_000) if pk != 2]
+        ret = await self.book_collection.list(
+            self.mocked_caller,
+            PaginatedFilter(
+                {
+                    "condition_tree": ConditionTreeLeaf("book_pk", Operator.IN, [*pks, None]),
+                    "sort": Sort([{"field": "book_pk", "ascending": False}]),
+                    "page": Page(skip=0, limit=1),
+                }
+            ),
+            Projection("book_pk"),
+        )
+        self.assertEqual(ret, [{"book_pk": 3}])
+
+        ret = await self.book_collection.aggregate(
+            self.mocked_caller,
+            Filter({"condition_tree": ConditionTreeLeaf("book_pk", Operator.NOT_IN, pks)}),
+            Aggregation({"operation": "Count"}),
+        )
+        self.assertEqual(ret, [{"value": 1, "group": {}}])
+
+        filter_ = Filter(
+            {
+                "condition_tree": ConditionTreeBranch(
+                    ConditionTreeAggregator.AND,
+                    [
+                        ConditionTreeLeaf("book_pk", Operator.IN, pks),
+                        ConditionTreeLeaf("name", Operator.EQUAL, "Foundation"),
+                    ],
+                )
+            }
+        )
+        await self.book_collection.update(self.mocked_caller, filter_, {"price": 9.99})
+        ret = await self.book_collection.list(
+            self.mocked_caller, PaginatedFilter.from_base_filter(filter_), Projection("book_pk", "price")
+        )
+        self.assertEqual(ret, [{"book_pk": 1, "price": 9.99}])
+
+        await self.book_collection.delete(self.mocked_caller, filter_)
+        ret = await self.book_collection.list(
+            self.mocked_caller, PaginatedFilter.from_base_filter(filter_), Projection("book_pk")
+        )
+        self.assertEqual(ret, [])
+
 
 class TestDjangoCollectionCRUDCreateUpdateDeletePolymorphism(TestDjangoCollectionCRUDCreateUpdateDelete):
     def setUp(self) -> None:
@@ -853,3 +943,63 @@ class TestDjangoCollectionNativeDriver(TestDjangoCollectionCRUDAggregateBase):
                         "Read database is 'default', and write database is 'other'.",
                         self.book_collection.get_native_driver,
                     )
+
+
+class AsyncOrmMixin:
+    """run the same tests with collections using the async queryset api"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        for collection_name in ["book_collection", "person_collection", "rating_collection", "tag_collection"]:
+            if hasattr(self, collection_name):
+                getattr(self, collection_name).use_async_orm = True
+
+        patcher = patch(
+            "forestadmin.datasource_django.collection.sync_to_async",
+            side_effect=AssertionError("the sync orm should not be used"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestDjangoCollectionCRUDListAsyncOrm(AsyncOrmMixin, TestDjangoCollectionCRUDList):
+    pass
+
+
+class TestDjangoCollectionCRUDAggregateNoGroupNoAggregateFieldAsyncOrm(
+    AsyncOrmMixin, TestDjangoCollectionCRUDAggregateNoGroupNoAggregateField
+):
+    pass
+
+
+class TestDjangoCollectionCRUDAggregateNoGroupAsyncOrm(AsyncOrmMixin, TestDjangoCollectionCRUDAggregateNoGroup):
+    pass
+
+
+class TestDjangoCollectionCRUDAggregateNoAggregateFieldAsyncOrm(
+    AsyncOrmMixin, TestDjangoCollectionCRUDAggregateNoAggregateField
+):
+    pass
+
+
+class TestDjangoCollectionCRUDAggregateNoAggregateOperationAsyncOrm(
+    AsyncOrmMixin, TestDjangoCollectionCRUDAggregateNoAggregateOperation
+):
+    pass
+
+
+class TestDjangoCollectionCRUDAggregateByDateAsyncOrm(AsyncOrmMixin, TestDjangoCollectionCRUDAggregateByDate):
+    pass
+
+
+class TestDjangoCollectionCRUDCreateUpdateDeleteAsyncOrm(AsyncOrmMixin, TestDjangoCollectionCRUDCreateUpdateDelete):
+    pass
+
+
+class TestDjangoCollectionAsyncOrmFallback(TestDjangoCollectionCRUDAggregateBase):
+    async def test_polymorphic_collections_should_keep_the_sync_orm(self):
+        collection = DjangoCollection(self.datasource, Person, True, use_async_orm=True)
+        with patch("forestadmin.datasource_django.collection.DjangoQueryBuilder.amk_aggregate") as mock_amk_aggregate:
+            ret = await collection.aggregate(self.mocked_caller, Filter({}), Aggregation({"operation": "Count"}))
+        mock_amk_aggregate.assert_not_called()
+        self.assertEqual(ret, [{"value": 2.0, "group": {}}])
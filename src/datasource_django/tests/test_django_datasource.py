@@ -28,7 +28,7 @@ class TestDjangoDatasource(TestCase):
     )
     @patch(
         "forestadmin.datasource_django.datasource.DjangoCollection",
-        side_effect=lambda datasource, model, support_polymorphic_relations: model,
+        side_effect=lambda datasource, model, support_polymorphic_relations, use_async_orm, orm_executor: model,
     )
     def test_create_collection_should_add_a_collection(self, mock_DjangoCollection: Mock, mock_get_models: Mock):
         with patch.object(DjangoDatasource, "_create_collections"):
@@ -38,12 +38,25 @@ class TestDjangoDatasource(TestCase):
         mock_get_models.assert_called_once_with(include_auto_created=True)
         mock_DjangoCollection.assert_has_calls(
             [
-                call(django_datasource, mock_collection1, False),
-                call(django_datasource, mock_collection2, False),
+                call(django_datasource, mock_collection1, False, False, None),
+                call(django_datasource, mock_collection2, False, False, None),
             ]
         )
         self.assertEqual(set(django_datasource.collections), set([mock_collection1, mock_collection2]))
 
+    def test_use_async_orm_should_be_given_to_collections(self):
+        datasource = DjangoDatasource(use_async_orm=True)
+        self.assertTrue(all(collection.use_async_orm for collection in datasource.collections))
+
+    def test_use_async_orm_should_raise_with_django_before_4_1(self):
+        with patch("forestadmin.datasource_django.datasource.DJANGO_VERSION", (4, 0, 0, "final", 0)):
+            self.assertRaisesRegex(
+                DjangoDatasourceException,
+                r"The async orm needs django 4.1 or later.",
+                DjangoDatasource,
+                use_async_orm=True,
+            )
+
     def test_django_datasource_should_find_all_models(self):
         datasource = DjangoDatasource()
         self.assertEqual(
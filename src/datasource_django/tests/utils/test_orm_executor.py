@@ -0,0 +1,172 @@
+import asyncio
+import sys
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import call, patch
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from django.db import connections, transaction
+from django.test import TransactionTestCase
+from forestadmin.agent_toolkit.utils.context import User
+from forestadmin.datasource_django.datasource import DjangoDatasource
+from forestadmin.datasource_django.exception import DjangoDatasourceException
+from forestadmin.datasource_django.utils.orm_executor import DjangoOrmExecutor
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
+from test_app.models import Person
+
+
+class TestDjangoOrmExecutor(TestCase):
+    def setUp(self) -> None:
+        self.executor = DjangoOrmExecutor(4)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+        self.loop.close()
+
+    def test_run_should_close_old_connections_around_the_call(self):
+        calls = []
+        with patch(
+            "forestadmin.datasource_django.utils.orm_executor.close_old_connections",
+            side_effect=lambda: calls.append("close_old_connections"),
+        ):
+            ret = self.loop.run_until_complete(self.executor.run(lambda: calls.append("fn") or "result"))
+
+        self.assertEqual(ret, "result")
+        self.assertEqual(calls, ["close_old_connections", "fn", "close_old_connections"])
+
+    def test_run_should_close_old_connections_when_the_call_fails(self):
+        def _fail():
+            raise ValueError("query error")
+
+        with patch("forestadmin.datasource_django.utils.orm_executor.close_old_connections") as mock_close:
+            self.assertRaisesRegex(ValueError, "query error", self.loop.run_until_complete, self.executor.run(_fail))
+        mock_close.assert_has_calls([call(), call()])
+
+    def test_calls_should_run_in_parallel_on_the_workers(self):
+        barrier = threading.Barrier(4, timeout=2)
+
+        def _query():
+            # deadlocks (and times out) unless the 4 calls run at the same time
+            barrier.wait()
+            time.sleep(0.01)
+            return threading.current_thread().name
+
+        async def _run():
+            return await asyncio.gather(*[self.executor.run(_query) for _ in range(4)])
+
+        thread_names = self.loop.run_until_complete(_run())
+        self.assertEqual(len(set(thread_names)), 4)
+        self.assertTrue(all(name.startswith("forest-django-orm") for name in thread_names))
+
+
+class TestDjangoDatasourceWithOrmExecutor(TransactionTestCase):
+    fixtures = ["person.json", "book.json", "rating.json"]
+
+    def setUp(self) -> None:
+        self.datasource = DjangoDatasource(live_query_connection="django", orm_executor_workers=2)
+        self.mocked_caller = User(
+            rendering_id=1,
+            user_id=1,
+            tags={},
+            email="dummy@user.fr",
+            first_name="dummy",
+            last_name="user",
+            team="operational",
+            timezone=zoneinfo.ZoneInfo("Europe/Paris"),
+            request={"ip": "127.0.0.1"},
+        )
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.datasource.orm_executor.shutdown()
+        self.loop.close()
+
+    def test_should_raise_on_invalid_workers_count(self):
+        self.assertRaisesRegex(
+            DjangoDatasourceException,
+            r"orm_executor_workers must be a positive integer.",
+            DjangoDatasource,
+            orm_executor_workers=0,
+        )
+
+    def test_read_queries_should_run_on_the_executor(self):
+        collection = self.datasource.get_collection("test_app_person")
+        self.assertIs(collection.orm_executor, self.datasource.orm_executor)
+
+        with patch.object(
+            self.datasource.orm_executor, "run", wraps=self.datasource.orm_executor.run
+        ) as spy_run, patch("forestadmin.datasource_django.collection.sync_to_async") as mock_sync_to_async:
+            records = self.loop.run_until_complete(
+                collection.list(
+                    self.mocked_caller,
+                    PaginatedFilter({"sort": Sort([{"field": "person_pk", "ascending": True}])}),
+                    Projection("person_pk", "first_name"),
+                )
+            )
+            count = self.loop.run_until_complete(
+                collection.aggregate(self.mocked_caller, Filter({}), Aggregation({"operation": "Count"}))
+            )
+            native = self.loop.run_until_complete(
+                self.datasource.execute_native_query("django", "select count(*) as value from test_app_person", {})
+            )
+
+        self.assertEqual(records, [{"person_pk": 1, "first_name": "Isaac"}, {"person_pk": 2, "first_name": "J.K."}])
+        self.assertEqual(count, [{"value": 2.0, "group": {}}])
+        self.assertEqual(native, [{"value": 2}])
+        self.assertEqual(spy_run.call_count, 3)
+        mock_sync_to_async.assert_not_called()
+
+    def test_reads_after_writes_should_see_the_request_transaction(self):
+        collection = self.datasource.get_collection("test_app_person")
+        request_transaction = transaction.atomic()
+
+        async def _run():
+            # as ATOMIC_REQUESTS, on the thread sensitive worker
+            await sync_to_async(request_transaction.__enter__)()
+            try:
+                await collection.create(
+                    self.mocked_caller, [{"first_name": "Terry", "last_name": "Pratchett", "birth_date": "1948-04-28"}]
+                )
+                return await collection.aggregate(self.mocked_caller, Filter({}), Aggregation({"operation": "Count"}))
+            finally:
+                await sync_to_async(request_transaction.__exit__)(RuntimeError, RuntimeError("rollback"), None)
+
+        with patch.dict(connections["default"].settings_dict, {"ATOMIC_REQUESTS": True}), patch.object(
+            self.datasource.orm_executor, "run", wraps=self.datasource.orm_executor.run
+        ) as spy_run:
+            count = self.loop.run_until_complete(_run())
+
+        self.assertEqual(count, [{"value": 3.0, "group": {}}])
+        spy_run.assert_not_called()
+
+    def test_reads_inside_an_atomic_block_of_the_request_thread_should_see_its_writes(self):
+        collection = self.datasource.get_collection("test_app_person")
+
+        with patch.object(
+            self.datasource.orm_executor, "run", wraps=self.datasource.orm_executor.run
+        ) as spy_run, self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Person.objects.create(first_name="Terry", last_name="Pratchett", birth_date="1948-04-28")
+                count = async_to_sync(collection.aggregate)(
+                    self.mocked_caller, Filter({}), Aggregation({"operation": "Count"})
+                )
+                native = async_to_sync(self.datasource.execute_native_query)(
+                    "django", "select count(*) as value from test_app_person", {}
+                )
+                raise RuntimeError("rollback")
+
+        self.assertEqual(count, [{"value": 3.0, "group": {}}])
+        self.assertEqual(native, [{"value": 3}])
+        spy_run.assert_not_called()
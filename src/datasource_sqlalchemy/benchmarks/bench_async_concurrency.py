@@ -0,0 +1,114 @@
+"""Event loop responsiveness of SqlAlchemyDatasource, sync mode vs asyncio mode, on a local sqlite file.
+
+Runs concurrent list requests on a populated table while a heartbeat coroutine measures the event loop lag.
+
+usage: python benchmarks/bench_async_concurrency.py [--rows 200000] [--concurrency 20]
+needs: pip install aiosqlite greenlet
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.agent_toolkit.utils.context import User
+from forestadmin.datasource_sqlalchemy.datasource import SqlAlchemyDatasource
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.page import Page
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from sqlalchemy import Column, Integer, String, create_engine, insert
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(64))
+    price = Column(Integer)
+
+
+CALLER = User(
+    rendering_id=1,
+    user_id=1,
+    tags={},
+    email="bench@forestadmin.com",
+    first_name="bench",
+    last_name="mark",
+    team="operational",
+    timezone=zoneinfo.ZoneInfo("UTC"),
+    request={"ip": "127.0.0.1"},
+)
+
+
+def populate(db_path: str, rows: int):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Item.__table__), [{"name": f"item {i}", "price": i % 1000} for i in range(1, rows + 1)]
+        )
+    engine.dispose()
+
+
+async def run(datasource: SqlAlchemyDatasource, concurrency: int):
+    collection = datasource.get_collection("item")
+    # unindexed filter + sort: sqlite has to scan the whole table for each request
+    filter_ = PaginatedFilter(
+        {
+            "condition_tree": ConditionTreeLeaf("name", "contains", "99"),
+            "sort": [{"field": "price", "ascending": False}],
+            "page": Page(0, 50),
+        }
+    )
+    stop = asyncio.Event()
+    lags = []
+
+    async def heartbeat():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def requests():
+        await asyncio.sleep(0.01)
+        await asyncio.gather(
+            *[collection.list(CALLER, filter_, Projection("id", "name", "price")) for _ in range(concurrency)]
+        )
+        stop.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(heartbeat(), requests())
+    return time.perf_counter() - start, max(lags), sorted(lags)[int(len(lags) * 0.99)], len(lags)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.sql")
+        populate(db_path, args.rows)
+        datasources = {
+            "sync": SqlAlchemyDatasource(Base, db_uri=f"sqlite:///{db_path}"),
+            "asyncio": SqlAlchemyDatasource(Base, db_uri=f"sqlite+aiosqlite:///{db_path}", is_async=True),
+        }
+        print(f"{args.concurrency} concurrent list requests on {args.rows} rows")
+        print(f"{'mode':<10}{'total (s)':>12}{'max lag (ms)':>16}{'p99 lag (ms)':>16}{'heartbeats':>12}")
+        for mode, datasource in datasources.items():
+            total, max_lag, p99_lag, ticks = asyncio.run(run(datasource, args.concurrency))
+            print(f"{mode:<10}{total:>12.3f}{max_lag * 1000:>16.1f}{p99_lag * 1000:>16.1f}{ticks:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import sys
 from collections import defaultdict
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, cast
 
 if sys.version_info >= (3, 9):
     import zoneinfo
@@ -40,6 +40,8 @@ from sqlalchemy.orm import Mapper, RelationshipProperty
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql import Alias, alias
 
+T = TypeVar("T")
+
 
 class SqlAlchemyCollectionFactory(BaseSqlAlchemyCollectionFactory):
     def __init__(self, collection: "SqlAlchemyCollection"):
@@ -122,6 +124,19 @@ class SqlAlchemyCollection(BaseSqlAlchemyCollection):
 
         return session
 
+    async def _run_in_transaction(self, fn: Callable[[Session], T], read_only: bool = False) -> T:
+        """run fn with a sync session in a transaction, on a read replica when read_only
+
+        In asyncio mode, fn is run through AsyncSession.run_sync: the queries are sent by the asyncio driver
+        and the event loop is not blocked while waiting for the database.
+        """
+        Session = self.datasource.get_sessionmaker(read_only)  # type: ignore
+        if self.datasource.is_async:
+            async with Session.begin() as session:
+                return await session.run_sync(fn)
+        with Session.begin() as session:
+            return fn(session)
+
     def get_column(self, name: str, alias_: Optional[Alias] = None) -> SqlAlchemyColumn:
         mapper = self.mapper
         if alias_ is not None:
@@ -187,25 +202,32 @@ class SqlAlchemyCollection(BaseSqlAlchemyCollection):
         aggregation: Aggregation,
         limit: Optional[int] = None,
     ) -> List[AggregateResult]:
-        with self.datasource.Session.begin() as session:  #  type: ignore
+        filter_ = cast(Filter, self._cast_filter(filter_)) or None
+
+        def _aggregate(session: Session) -> List[AggregateResult]:
             dialect: Dialect = session.bind.dialect  #  type: ignore
-            filter_ = cast(Filter, self._cast_filter(filter_)) or None
             query = QueryFactory.build_aggregate(dialect, self, filter_, aggregation, limit)
             res: List[Dict[str, Any]] = session.execute(query)  #  type: ignore
             return aggregations_to_records(res)
 
+        return await self._run_in_transaction(_aggregate, read_only=True)
+
     @handle_sqlalchemy_error
     async def create(self, caller: User, data: List[RecordsDataAlias]) -> List[RecordsDataAlias]:
-        with self.datasource.Session.begin() as session:  #  type: ignore
+        def _create(session: Session) -> List[RecordsDataAlias]:
             instances = QueryFactory.create(self, data)
             session.bulk_save_objects(instances, return_defaults=True)  # type: ignore
             return instances_to_records(self, instances)
 
+        return await self._run_in_transaction(_create)
+
     async def update(self, caller: User, filter_: Optional[Filter], patch: RecordsDataAlias) -> None:
-        with self.datasource.Session.begin() as session:  #  type: ignore
+        def _update(session: Session):
             query = QueryFactory.update(self, filter_, patch)
             session.execute(query)  # type: ignore
 
+        await self._run_in_transaction(_update)
+
     def _cast_condition_tree(self, tree: ConditionTree) -> ConditionTree:
         if isinstance(tree, ConditionTreeLeaf):
             if cast(Column, CollectionUtils.get_field_schema(self, tree.field))["column_type"] == PrimitiveType.DATE:
@@ -227,15 +249,19 @@ class SqlAlchemyCollection(BaseSqlAlchemyCollection):
         return filter_
 
     async def list(self, caller: User, filter_: PaginatedFilter, projection: Projection) -> List[RecordsDataAlias]:
-        with self.datasource.Session.begin() as session:  #  type: ignore
-            normalized_projection = self._normalize_projection(projection)
-            filter_ = cast(PaginatedFilter, self._cast_filter(filter_))
+        normalized_projection = self._normalize_projection(projection)
+        filter_ = cast(PaginatedFilter, self._cast_filter(filter_))
+
+        def _list(session: Session) -> List[RecordsDataAlias]:
             query = QueryFactory.build_list(self, filter_, normalized_projection)
             res = session.execute(query).all()  #  type: ignore
-            records = projections_to_records(normalized_projection, res, filter_.timezone)  # type: ignore
-            return records
+            return projections_to_records(normalized_projection, res, filter_.timezone)  # type: ignore
+
+        return await self._run_in_transaction(_list, read_only=True)
 
     async def delete(self, caller: User, filter_: Optional[Filter]) -> None:
-        with self.datasource.Session.begin() as session:  #  type: ignore
+        def _delete(session: Session):
             query = QueryFactory.delete(self, filter_)
             session.execute(query)  # type: ignore
+
+        await self._run_in_transaction(_delete)
@@ -1,3 +1,6 @@
+import itertools
+import time
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional
 
 from forestadmin.datasource_sqlalchemy.collections import SqlAlchemyCollection
@@ -6,16 +9,46 @@ from forestadmin.datasource_sqlalchemy.interfaces import BaseSqlAlchemyDatasourc
 from forestadmin.datasource_toolkit.exceptions import NativeQueryException
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Mapper, sessionmaker
 
+# time of the last write made by the current request (context), used for read-your-writes stickiness
+_last_write_time: ContextVar[Optional[float]] = ContextVar("forest_sqlalchemy_last_write_time", default=None)
+
 
 class SqlAlchemyDatasource(BaseSqlAlchemyDatasource):
-    def __init__(self, Base: Any, db_uri: Optional[str] = None, live_query_connection: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        Base: Any,
+        db_uri: Optional[str] = None,
+        live_query_connection: Optional[str] = None,
+        is_async: bool = False,
+        read_db_uris: Optional[List[str]] = None,
+        read_your_writes_window: Optional[float] = None,
+    ) -> None:
+        """is_async: use an AsyncEngine/AsyncSession, db_uri must then use an asyncio driver
+        (i.e. "sqlite+aiosqlite:///path/to/db.sql" or "postgresql+asyncpg://...")
+
+        read_db_uris: uris of read replicas; list, aggregate and native queries are sent to them (round robin),
+        create, update and delete to the primary database.
+        read_your_writes_window: for this number of seconds after a write, the reads of the same request are still
+        sent to the primary database."""
         super().__init__([live_query_connection] if live_query_connection is not None else None)
         self._base = Base
         self.__is_using_flask_sqlalchemy = hasattr(Base, "Model")
+        self.is_async = is_async
 
-        bind = create_engine(db_uri, echo=False) if db_uri is not None else self._find_db_uri(Base)
+        if is_async:
+            if db_uri is None:
+                raise SqlAlchemyDatasourceException(
+                    "The asyncio mode needs the database uri of an asyncio driver. You can pass it as a param: "
+                    + "SqlAlchemyDatasource(..., db_uri='sqlite+aiosqlite:///path/to/db.sql', is_async=True)."
+                )
+            bind = create_async_engine(db_uri, echo=False)
+            read_binds = [create_async_engine(uri, echo=False) for uri in read_db_uris or []]
+        else:
+            bind = create_engine(db_uri, echo=False) if db_uri is not None else self._find_db_uri(Base)
+            read_binds = [create_engine(uri, echo=False) for uri in read_db_uris or []]
         if bind is None:
             raise SqlAlchemyDatasourceException(
                 "Cannot find database uri in your SQLAlchemy Base class. "
@@ -25,9 +58,36 @@ class SqlAlchemyDatasource(BaseSqlAlchemyDatasource):
         if self.__is_using_flask_sqlalchemy:
             self._base = self._base.Model
 
-        self.Session = sessionmaker(bind)
+        self.Session = self._build_sessionmaker(bind)
+        self._read_sessions = [self._build_sessionmaker(read_bind) for read_bind in read_binds]
+        self._read_sessions_cycle = itertools.cycle(self._read_sessions)
+        self._read_your_writes_window = read_your_writes_window
         self._create_collections()
 
+    def _build_sessionmaker(self, bind) -> sessionmaker:
+        if self.is_async:
+            return sessionmaker(bind, class_=AsyncSession, expire_on_commit=False)
+        return sessionmaker(bind)
+
+    def get_sessionmaker(self, read_only: bool = False) -> sessionmaker:
+        """sessionmaker of a read replica for read_only operations, of the primary database otherwise"""
+        if not read_only:
+            if self._read_your_writes_window:
+                _last_write_time.set(time.monotonic())
+            return self.Session
+
+        if not self._read_sessions:
+            return self.Session
+
+        last_write_time = _last_write_time.get()
+        if (
+            self._read_your_writes_window
+            and last_write_time is not None
+            and time.monotonic() - last_write_time < self._read_your_writes_window
+        ):
+            return self.Session
+        return next(self._read_sessions_cycle)
+
     def _find_db_uri(self, base_class):
         engine = None
         try:
@@ -66,7 +126,6 @@ class SqlAlchemyDatasource(BaseSqlAlchemyDatasource):
                 f"The native query connection '{connection_name}' doesn't belongs to this datasource."
             )
         try:
-            session = self.Session()
             query = native_query
             if isinstance(query, str):
                 query = native_query
@@ -77,6 +136,14 @@ class SqlAlchemyDatasource(BaseSqlAlchemyDatasource):
                 query = query.replace("\\%", "%")
 
                 query = text(query)
+
+            Session = self.get_sessionmaker(read_only=True)
+            if self.is_async:
+                async with Session() as session:
+                    rows = await session.execute(query, parameters)
+                    return [*rows.mappings()]
+
+            session = Session()
             rows = session.execute(query, parameters)
             return [*rows.mappings()]
         except Exception as exc:
@@ -8,7 +8,7 @@ from forestadmin.datasource_toolkit.interfaces.query.projections import Projecti
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 from sqlalchemy import Table
 from sqlalchemy import column as SqlAlchemyColumn
-from sqlalchemy.orm import Mapper
+from sqlalchemy.orm import Mapper, sessionmaker
 from typing_extensions import Self
 
 
@@ -55,4 +55,13 @@ class BaseSqlAlchemyCollection(Collection, abc.ABC):
 
 
 class BaseSqlAlchemyDatasource(Datasource[Collection], abc.ABC):
-    pass
+    is_async: bool = False
+
+    Session: sessionmaker
+
+    def get_sessionmaker(self, read_only: bool = False) -> sessionmaker:
+        """return the sessionmaker to use, a read replica one when read_only is set and replicas are configured
+
+        The datasources without read replicas use their primary sessionmaker for every query.
+        """
+        return self.Session
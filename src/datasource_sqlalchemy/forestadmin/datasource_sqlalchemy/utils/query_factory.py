@@ -11,14 +11,15 @@ from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregat
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base import ConditionTree
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import Aggregator, ConditionTreeBranch
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.optimizer import ConditionTreeOptimizer
 from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
 from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
 from forestadmin.datasource_toolkit.interfaces.query.sort import PlainSortClause
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam
 from sqlalchemy import column as SqlAlchemyColumn
-from sqlalchemy import delete, not_, or_, select, update
+from sqlalchemy import delete, false, not_, or_, select, true, update
 from sqlalchemy.engine import Dialect
 from sqlalchemy.sql.elements import BooleanClauseList, UnaryExpression
 
@@ -29,9 +30,18 @@ class ConditionTreeFactoryException(DatasourceToolkitException):
 
 class ConditionTreeFactory:
     AGGREGATORS = {Aggregator.AND: and_, Aggregator.OR: or_}
+    # the values of larger `in` lists are rendered in the statement, as the databases limit the count of parameters
+    MAX_BOUND_IN_VALUES = 500
 
     @classmethod
     def _build_leaf_condition(cls, collection: BaseSqlAlchemyCollection, leaf: ConditionTreeLeaf) -> Tuple[Any, Any]:
+        if (
+            leaf.operator in [Operator.IN, Operator.NOT_IN]
+            and isinstance(leaf.value, list)
+            and len(leaf.value) > cls.MAX_BOUND_IN_VALUES
+        ):
+            return cls._build_large_in_condition(collection, leaf)
+
         if leaf.operator in [Operator.IN, Operator.NOT_IN] and isinstance(leaf.value, list) and None in leaf.value:
             operator, relationships = cls._build_branch_condition(
                 collection,
@@ -50,6 +60,20 @@ class ConditionTreeFactory:
         operator = FilterOperator.get_operator(columns, leaf.operator)
         return operator(leaf.value), relationships
 
+    @classmethod
+    def _build_large_in_condition(
+        cls, collection: BaseSqlAlchemyCollection, leaf: ConditionTreeLeaf
+    ) -> Tuple[Any, Any]:
+        columns, relationships = collection.get_columns(leaf.projection)
+        values = [value for value in leaf.value if value is not None]
+        # a single statement keeps the pagination, the sort and the aggregations right, unlike running it by chunks
+        condition = columns[0].in_(
+            bindparam("in_values", values, type_=columns[0].type, expanding=True, literal_execute=True, unique=True)
+        )
+        if len(values) != len(leaf.value):
+            condition = or_(columns[0].is_(None), condition)
+        return (condition if leaf.operator == Operator.IN else not_(condition)), relationships
+
     @classmethod
     def _get_aggregator(cls, aggregator: Aggregator):
         try:
@@ -62,6 +86,9 @@ class ConditionTreeFactory:
         cls, collection: BaseSqlAlchemyCollection, branch: ConditionTreeBranch
     ) -> Tuple[Any, Any]:
         relationships: Dict[int, List[SqlAlchemyColumn]] = defaultdict(list)
+        if not branch.conditions:
+            # an empty `or` matches nothing, an empty `and` everything
+            return (false() if branch.aggregator == Aggregator.OR else true()), relationships
         aggregator = cls._get_aggregator(branch.aggregator)
         clauses: List[Any] = []
         for condition in branch.conditions:
@@ -99,8 +126,9 @@ class FilterFactory:
             "relationships": defaultdict(list),
             "clauses": None,
         }
-        if filter and filter.condition_tree:
-            res["clauses"], clauses_relationships = ConditionTreeFactory.build(collection, filter.condition_tree)
+        condition_tree = ConditionTreeOptimizer.optimize(filter.condition_tree) if filter else None
+        if condition_tree:
+            res["clauses"], clauses_relationships = ConditionTreeFactory.build(collection, condition_tree)
             res["relationships"] = merge_relationships(res["relationships"], clauses_relationships)
         return res
 
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from unittest import TestCase, skipIf
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.agent_toolkit.utils.context import User
+from forestadmin.datasource_sqlalchemy.datasource import SqlAlchemyDatasource
+from forestadmin.datasource_sqlalchemy.exceptions import SqlAlchemyCollectionException, SqlAlchemyDatasourceException
+from forestadmin.datasource_toolkit.interfaces.fields import Operator
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+
+from .fixture import models
+
+try:
+    import aiosqlite  # noqa: F401
+    import greenlet  # noqa: F401
+
+    HAS_ASYNC_DRIVER = True
+except ImportError:
+    HAS_ASYNC_DRIVER = False
+
+# a query keeping sqlite busy for a while
+SLOW_QUERY = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 3000000) SELECT count(*) FROM c"
+
+
+class TestSqlAlchemyAsyncDatasource(TestCase):
+    def test_should_raise_when_no_db_uri_in_async_mode(self):
+        self.assertRaisesRegex(
+            SqlAlchemyDatasourceException,
+            r"The asyncio mode needs the database uri of an asyncio driver",
+            SqlAlchemyDatasource,
+            models.Base,
+            is_async=True,
+        )
+
+
+@skipIf(not HAS_ASYNC_DRIVER, "aiosqlite and greenlet are needed for the asyncio mode")
+class TestSqlAlchemyAsyncCollection(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.sql_alchemy_base = models.get_models_base("test_async_collection_operations")
+        if os.path.exists(cls.sql_alchemy_base.metadata.file_path):
+            os.remove(cls.sql_alchemy_base.metadata.file_path)
+        models.create_test_database(cls.sql_alchemy_base)
+        models.load_fixtures(cls.sql_alchemy_base)
+        cls.sync_datasource = SqlAlchemyDatasource(models.Base)
+        cls.async_datasource = SqlAlchemyDatasource(
+            models.Base,
+            db_uri=f"sqlite+aiosqlite:///{cls.sql_alchemy_base.metadata.file_path}",
+            live_query_connection="sqlalchemy",
+            is_async=True,
+        )
+        cls.mocked_caller = User(
+            rendering_id=1,
+            user_id=1,
+            tags={},
+            email="dummy@user.fr",
+            first_name="dummy",
+            last_name="user",
+            team="operational",
+            timezone=zoneinfo.ZoneInfo("Europe/Paris"),
+            request={"ip": "127.0.0.1"},
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.run_until_complete(cls.async_datasource.Session.kw["bind"].dispose())
+        os.remove(cls.sql_alchemy_base.metadata.file_path)
+        cls.loop.close()
+
+    def test_list_should_return_the_same_records_as_sync_mode(self):
+        filter_ = PaginatedFilter(
+            {
+                "condition_tree": ConditionTreeLeaf("id", Operator.LESS_THAN, 6),
+                "sort": [{"field": "id", "ascending": True}],
+                "timezone": zoneinfo.ZoneInfo("Europe/Paris"),
+            }
+        )
+        projection = Projection("id", "created_at", "status", "customer:first_name")
+
+        sync_results = self.loop.run_until_complete(
+            self.sync_datasource.get_collection("order").list(self.mocked_caller, filter_, projection)
+        )
+        async_results = self.loop.run_until_complete(
+            self.async_datasource.get_collection("order").list(self.mocked_caller, filter_, projection)
+        )
+
+        self.assertEqual(len(async_results), 5)
+        self.assertEqual(async_results, sync_results)
+
+    def test_aggregate_should_return_the_same_result_as_sync_mode(self):
+        aggregation = Aggregation({"operation": "Sum", "field": "amount", "groups": [{"field": "status"}]})
+
+        sync_results = self.loop.run_until_complete(
+            self.sync_datasource.get_collection("order").aggregate(self.mocked_caller, Filter({}), aggregation)
+        )
+        async_results = self.loop.run_until_complete(
+            self.async_datasource.get_collection("order").aggregate(self.mocked_caller, Filter({}), aggregation)
+        )
+
+        self.assertEqual(async_results, sync_results)
+
+    def test_create_update_delete(self):
+        collection = self.async_datasource.get_collection("order")
+        order = {
+            "id": 21,
+            "created_at": datetime(2021, 5, 30, 1, 9, 31, tzinfo=zoneinfo.ZoneInfo(key="UTC")),
+            "amount": 42,
+            "customer_id": 6,
+            "billing_address_id": 4,
+            "delivering_address_id": 4,
+            "status": "Rejected",
+        }
+        results = self.loop.run_until_complete(collection.create(self.mocked_caller, [order]))
+        self.assertEqual(results[0]["id"], 21)
+
+        filter_ = PaginatedFilter({"condition_tree": ConditionTreeLeaf("id", Operator.EQUAL, 21)})
+        self.loop.run_until_complete(collection.update(self.mocked_caller, filter_, {"amount": 43}))
+        results = self.loop.run_until_complete(collection.list(self.mocked_caller, filter_, Projection("amount")))
+        self.assertEqual(results, [{"amount": 43}])
+
+        self.loop.run_until_complete(collection.delete(self.mocked_caller, filter_))
+        results = self.loop.run_until_complete(collection.list(self.mocked_caller, filter_, Projection("id")))
+        self.assertEqual(results, [])
+
+    def test_create_error(self):
+        collection = self.async_datasource.get_collection("order")
+        order = {"id": 22, "customer_id": 6, "billing_address_id": 4, "delivering_address_id": 4}
+        self.assertRaises(
+            SqlAlchemyCollectionException, self.loop.run_until_complete, collection.create(self.mocked_caller, [order])
+        )
+
+    def test_execute_native_query(self):
+        result = self.loop.run_until_complete(
+            self.async_datasource.execute_native_query(
+                "sqlalchemy",
+                "select * from customer where first_name = %(first_name)s order by id",
+                {"first_name": "David"},
+            )
+        )
+        self.assertEqual(result, [{"id": 1, "first_name": "David", "last_name": "Myers", "age": 112}])
+
+    def test_event_loop_should_not_stall_during_queries(self):
+        async def longest_loop_stall(datasource: SqlAlchemyDatasource) -> float:
+            stop = asyncio.Event()
+            stalls = []
+
+            async def heartbeat():
+                last = time.perf_counter()
+                while not stop.is_set():
+                    await asyncio.sleep(0.001)
+                    now = time.perf_counter()
+                    stalls.append(now - last)
+                    last = now
+
+            async def slow_query():
+                await asyncio.sleep(0.01)
+                await datasource.execute_native_query("sqlalchemy", SLOW_QUERY, {})
+                stop.set()
+
+            await asyncio.gather(heartbeat(), slow_query())
+            return max(stalls)
+
+        sync_datasource = SqlAlchemyDatasource(models.Base, live_query_connection="sqlalchemy")
+        sync_stall = self.loop.run_until_complete(longest_loop_stall(sync_datasource))
+        async_stall = self.loop.run_until_complete(longest_loop_stall(self.async_datasource))
+
+        # in sync mode the loop is frozen during the whole query, in async mode it keeps ticking
+        self.assertLess(async_stall * 5, sync_stall)
@@ -14,12 +14,17 @@ from forestadmin.agent_toolkit.utils.context import User
 from forestadmin.datasource_sqlalchemy.collections import SqlAlchemyCollection, SqlAlchemyCollectionFactory
 from forestadmin.datasource_sqlalchemy.datasource import SqlAlchemyDatasource
 from forestadmin.datasource_sqlalchemy.exceptions import SqlAlchemyCollectionException
+from forestadmin.datasource_sqlalchemy.utils.query_factory import QueryFactory
 from forestadmin.datasource_toolkit.interfaces.fields import Operator
 from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import ConditionTreeBranch
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.optimizer import ConditionTreeOptimizer
 from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
+from forestadmin.datasource_toolkit.interfaces.query.page import Page
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql import text
 
@@ -283,6 +288,105 @@ class TestSqlAlchemyCollectionWithModels(BaseTestSqlAlchemyCollectionWithModels)
         )
         self.assertEqual(len(results), 2)
 
+    def test_list_should_optimize_the_condition_tree(self):
+        collection = self.datasource.get_collection("order")
+        # as built by a scope, a segment and a search: nested branches, duplicated leaves and equalities of a field
+        condition_tree = ConditionTreeBranch(
+            "and",
+            [
+                ConditionTreeBranch("and", [ConditionTreeLeaf("amount", Operator.GREATER_THAN, 0)]),
+                ConditionTreeBranch("or", [ConditionTreeLeaf("id", Operator.EQUAL, i) for i in range(1, 31)]),
+                ConditionTreeLeaf("id", Operator.IN, list(range(2, 40))),
+                ConditionTreeLeaf("id", Operator.NOT_EQUAL, 3),
+                ConditionTreeLeaf("amount", Operator.GREATER_THAN, 0),
+                ConditionTreeBranch(
+                    "or",
+                    [ConditionTreeLeaf("status", Operator.EQUAL, status) for status in ["Delivered", "Rejected"]],
+                ),
+            ],
+        )
+        filter_ = PaginatedFilter({"condition_tree": condition_tree})
+        projection = Projection("id")
+
+        def build_sql() -> str:
+            query = QueryFactory.build_list(collection, filter_, projection)
+            return str(query.compile(compile_kwargs={"literal_binds": True}))
+
+        with patch.object(ConditionTreeOptimizer, "optimize", side_effect=lambda tree: tree):
+            sql = build_sql()
+            expected = self.loop.run_until_complete(collection.list(self.mocked_caller, filter_, projection))
+        optimized_sql = build_sql()
+        results = self.loop.run_until_complete(collection.list(self.mocked_caller, filter_, projection))
+
+        self.assertEqual(results, expected)
+        self.assertLess(len(optimized_sql), len(sql) / 2, f"sql size: {len(sql)} -> {len(optimized_sql)} chars")
+        self.assertIn(" IN (2, 4, 5, 6, 7, 8", optimized_sql)
+
+    def test_list_should_not_return_records_when_the_condition_tree_cant_match(self):
+        collection = self.datasource.get_collection("order")
+        for condition_tree in [
+            ConditionTreeBranch("or", []),
+            ConditionTreeBranch(
+                "and", [ConditionTreeLeaf("id", Operator.EQUAL, 1), ConditionTreeLeaf("id", Operator.NOT_IN, [1, 2])]
+            ),
+        ]:
+            results = self.loop.run_until_complete(
+                collection.list(
+                    self.mocked_caller, PaginatedFilter({"condition_tree": condition_tree}), Projection("id")
+                )
+            )
+            self.assertEqual(results, [], condition_tree)
+
+    def test_should_handle_in_lists_larger_than_the_parameters_limit(self):
+        collection = self.datasource.get_collection("order")
+        # more values than the sqlite limit of bound parameters (32766)
+        ids = [id_ for id_ in range(1, 40_000) if id_ != 2]
+
+        filter_ = PaginatedFilter(
+            {
+                "condition_tree": ConditionTreeLeaf("id", Operator.IN, [*ids, None]),
+                "sort": Sort([{"field": "id", "ascending": True}]),
+                "page": Page(skip=1, limit=2),
+            }
+        )
+        results = self.loop.run_until_complete(collection.list(self.mocked_caller, filter_, Projection("id")))
+        self.assertEqual(results, [{"id": 3}, {"id": 4}])
+
+        filter_ = Filter({"condition_tree": ConditionTreeLeaf("id", Operator.NOT_IN, ids)})
+        results = self.loop.run_until_complete(
+            collection.aggregate(self.mocked_caller, filter_, Aggregation({"operation": "Count"}))
+        )
+        self.assertEqual(results, [{"value": 1, "group": {}}])
+
+        self.loop.run_until_complete(
+            collection.create(self.mocked_caller, [{"id": 13, "amount": 99, "customer_id": 9, "status": "Pending"}])
+        )
+        filter_ = Filter(
+            {
+                "condition_tree": ConditionTreeBranch(
+                    "and", [ConditionTreeLeaf("id", Operator.IN, ids), ConditionTreeLeaf("amount", Operator.EQUAL, 99)]
+                )
+            }
+        )
+        self.loop.run_until_complete(collection.update(self.mocked_caller, filter_, {"amount": 98}))
+        filter_ = Filter(
+            {
+                "condition_tree": ConditionTreeBranch(
+                    "and", [ConditionTreeLeaf("id", Operator.IN, ids), ConditionTreeLeaf("amount", Operator.EQUAL, 98)]
+                )
+            }
+        )
+        results = self.loop.run_until_complete(
+            collection.list(self.mocked_caller, PaginatedFilter.from_base_filter(filter_), Projection("id"))
+        )
+        self.assertEqual(results, [{"id": 13}])
+
+        self.loop.run_until_complete(collection.delete(self.mocked_caller, filter_))
+        results = self.loop.run_until_complete(
+            collection.list(self.mocked_caller, PaginatedFilter.from_base_filter(filter_), Projection("id"))
+        )
+        self.assertEqual(results, [])
+
     def test_list_should_handle_sort(self):
         collection = self.datasource.get_collection("order")
         filter_ = PaginatedFilter(
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import shutil
+import sys
+from unittest import TestCase
+from unittest.mock import patch
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.agent_toolkit.utils.context import User
+from forestadmin.datasource_sqlalchemy.datasource import SqlAlchemyDatasource
+from forestadmin.datasource_sqlalchemy.interfaces import BaseSqlAlchemyDatasource
+from forestadmin.datasource_toolkit.interfaces.fields import Operator
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from .fixture import models
+
+
+class TestSqlAlchemyReadReplicas(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.sql_alchemy_base = models.get_models_base("test_read_replicas_primary")
+        cls.primary_path = cls.sql_alchemy_base.metadata.file_path
+        cls.replica_path = cls.primary_path.replace("primary", "replica")
+        for path in [cls.primary_path, cls.replica_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        models.create_test_database(cls.sql_alchemy_base)
+        models.load_fixtures(cls.sql_alchemy_base)
+        shutil.copy(cls.primary_path, cls.replica_path)
+
+        # the replica lags behind: order 1 amount differs, so we can tell which database answered
+        engine = create_engine(f"sqlite:///{cls.replica_path}")
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE 'order' SET amount = -1 WHERE id = 1"))
+        engine.dispose()
+
+        cls.mocked_caller = User(
+            rendering_id=1,
+            user_id=1,
+            tags={},
+            email="dummy@user.fr",
+            first_name="dummy",
+            last_name="user",
+            team="operational",
+            timezone=zoneinfo.ZoneInfo("Europe/Paris"),
+            request={"ip": "127.0.0.1"},
+        )
+        cls.filter_order_1 = PaginatedFilter({"condition_tree": ConditionTreeLeaf("id", Operator.EQUAL, 1)})
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.primary_path)
+        os.remove(cls.replica_path)
+        cls.loop.close()
+
+    def _create_datasource(self, **kwargs) -> SqlAlchemyDatasource:
+        return SqlAlchemyDatasource(
+            models.Base,
+            db_uri=f"sqlite:///{self.primary_path}",
+            live_query_connection="sqlalchemy",
+            read_db_uris=[f"sqlite:///{self.replica_path}"],
+            **kwargs,
+        )
+
+    def _read_amount_of_order_1(self, datasource: SqlAlchemyDatasource):
+        records = self.loop.run_until_complete(
+            datasource.get_collection("order").list(self.mocked_caller, self.filter_order_1, Projection("amount"))
+        )
+        return records[0]["amount"]
+
+    def test_reads_should_go_to_the_replica(self):
+        datasource = self._create_datasource()
+
+        self.assertEqual(self._read_amount_of_order_1(datasource), -1)
+
+        result = self.loop.run_until_complete(
+            datasource.get_collection("order").aggregate(
+                self.mocked_caller,
+                Filter({"condition_tree": ConditionTreeLeaf("id", Operator.EQUAL, 1)}),
+                Aggregation({"operation": "Sum", "field": "amount"}),
+            )
+        )
+        self.assertEqual(result, [{"value": -1, "group": {}}])
+
+        result = self.loop.run_until_complete(
+            datasource.execute_native_query("sqlalchemy", "select amount from 'order' where id = 1", {})
+        )
+        self.assertEqual(result, [{"amount": -1}])
+
+    def test_writes_should_go_to_the_primary(self):
+        datasource = self._create_datasource()
+        filter_ = PaginatedFilter({"condition_tree": ConditionTreeLeaf("id", Operator.EQUAL, 2)})
+
+        self.loop.run_until_complete(
+            datasource.get_collection("order").update(self.mocked_caller, filter_, {"amount": 7})
+        )
+
+        primary_engine = create_engine(f"sqlite:///{self.primary_path}")
+        with primary_engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT amount FROM 'order' WHERE id = 2")).scalar(), 7)
+        primary_engine.dispose()
+        records = self.loop.run_until_complete(
+            datasource.get_collection("order").list(self.mocked_caller, filter_, Projection("amount"))
+        )
+        self.assertNotEqual(records[0]["amount"], 7)
+
+    def test_reads_should_be_sticky_to_primary_after_a_write_when_read_your_writes(self):
+        datasource = self._create_datasource(read_your_writes_window=10)
+        collection = datasource.get_collection("order")
+        filter_order_3 = Filter({"condition_tree": ConditionTreeLeaf("id", Operator.EQUAL, 3)})
+
+        async def read_after_write():
+            await collection.update(self.mocked_caller, filter_order_3, {"amount": 3})
+            return await collection.list(self.mocked_caller, self.filter_order_1, Projection("amount"))
+
+        records = self.loop.run_until_complete(read_after_write())
+        self.assertNotEqual(records[0]["amount"], -1)
+
+        # the reads of another request (task) are not affected
+        self.assertEqual(self._read_amount_of_order_1(datasource), -1)
+
+    def test_read_your_writes_stickiness_should_end_with_the_window(self):
+        datasource = self._create_datasource(read_your_writes_window=10)
+        collection = datasource.get_collection("order")
+        filter_order_3 = Filter({"condition_tree": ConditionTreeLeaf("id", Operator.EQUAL, 3)})
+
+        async def read_after_write():
+            with patch("forestadmin.datasource_sqlalchemy.datasource.time.monotonic", return_value=100):
+                await collection.update(self.mocked_caller, filter_order_3, {"amount": 3})
+            with patch("forestadmin.datasource_sqlalchemy.datasource.time.monotonic", return_value=111):
+                return await collection.list(self.mocked_caller, self.filter_order_1, Projection("amount"))
+
+        records = self.loop.run_until_complete(read_after_write())
+        self.assertEqual(records[0]["amount"], -1)
+
+    def test_reads_should_round_robin_between_replicas(self):
+        datasource = SqlAlchemyDatasource(
+            models.Base,
+            db_uri=f"sqlite:///{self.primary_path}",
+            read_db_uris=[f"sqlite:///{self.replica_path}", f"sqlite:///{self.primary_path}"],
+        )
+        amounts = [self._read_amount_of_order_1(datasource) for _ in range(4)]
+        self.assertEqual(amounts[0], -1)
+        self.assertNotEqual(amounts[1], -1)
+        self.assertEqual(amounts[0::2], [amounts[0]] * 2)
+        self.assertEqual(amounts[1::2], [amounts[1]] * 2)
+
+    def test_without_replica_reads_should_go_to_the_primary(self):
+        datasource = SqlAlchemyDatasource(models.Base, db_uri=f"sqlite:///{self.primary_path}")
+        self.assertNotEqual(self._read_amount_of_order_1(datasource), -1)
+        self.assertIs(datasource.get_sessionmaker(read_only=True), datasource.Session)
+
+    def test_datasources_without_replicas_support_should_use_their_primary_sessionmaker(self):
+        class CustomDatasource(BaseSqlAlchemyDatasource):
+            def __init__(self, session):
+                super().__init__()
+                self.Session = session
+
+        Session = sessionmaker(create_engine(f"sqlite:///{self.primary_path}"))
+        datasource = CustomDatasource(Session)
+        self.assertIs(datasource.get_sessionmaker(), Session)
+        self.assertIs(datasource.get_sessionmaker(read_only=True), Session)
@@ -0,0 +1,73 @@
+"""Duration of in memory aggregations (as emulated for computed fields), record by record vs column by column.
+
+The records have a number, a float, a status and an iso datetime, the aggregations are those of the dashboard charts.
+
+usage: python benchmarks/bench_aggregation.py [--records 1000000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
+from forestadmin.datasource_toolkit.utils.columnar_aggregation import aggregate_columns
+
+
+def build_records(count: int, rand: random.Random):
+    start = datetime(2020, 1, 1)
+    return [
+        {
+            "id": i,
+            "amount": rand.randrange(10_000),
+            "rate": rand.random(),
+            "status": rand.choice(["pending", "paid", "refunded", None]),
+            "created_at": (start + timedelta(minutes=rand.randrange(2_000_000))).isoformat() + "Z",
+        }
+        for i in range(count)
+    ]
+
+
+def measure(aggregate) -> float:
+    start = time.perf_counter()
+    aggregate()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    records = build_records(args.records, random.Random(42))
+    aggregations = [
+        ("count", Aggregation({"operation": "Count"})),
+        ("sum by status", Aggregation({"field": "amount", "operation": "Sum", "groups": [{"field": "status"}]})),
+        ("avg by status", Aggregation({"field": "rate", "operation": "Avg", "groups": [{"field": "status"}]})),
+        (
+            "count by month",
+            Aggregation({"operation": "Count", "groups": [{"field": "created_at", "operation": "Month"}]}),
+        ),
+        (
+            "max by week",
+            Aggregation(
+                {"field": "amount", "operation": "Max", "groups": [{"field": "created_at", "operation": "Week"}]}
+            ),
+        ),
+        (
+            "sum by quarter",
+            Aggregation(
+                {"field": "amount", "operation": "Sum", "groups": [{"field": "created_at", "operation": "Quarter"}]}
+            ),
+        ),
+    ]
+
+    print(f"{args.records} records")
+    print(f"{'aggregation':<18}{'one by one (s)':>16}{'columnar (s)':>14}{'speedup':>10}")
+    for name, aggregation in aggregations:
+        one_by_one = measure(lambda: aggregation._format_summaries(aggregation._create_summaries(records, "UTC")))
+        columnar = measure(lambda: aggregate_columns(aggregation, records, "UTC"))
+        print(f"{name:<18}{one_by_one:>16.3f}{columnar:>14.3f}{one_by_one / columnar:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Overhead of the decorator stack on an uncustomized collection, with and without bypassing its inert layers.
+
+The collection returns prebuilt records: the timings are the cost of going through the decorators only, the
+"collection" column being the cost of a direct call.
+
+usage: python benchmarks/bench_decorator_stack.py [--columns 20] [--iterations 5000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.agent_toolkit.utils.context import User
+from forestadmin.datasource_toolkit.collections import Collection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.decorators.decorator_stack import DecoratorStack
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, Operator, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import Filter
+from forestadmin.datasource_toolkit.interfaces.query.page import Page
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+from forestadmin.datasource_toolkit.interfaces.query.sort import Sort
+
+
+class BenchCollection(Collection):
+    def __init__(self, name: str, datasource: Datasource, records: List[Dict[str, Any]]):
+        super().__init__(name, datasource)
+        self.records = records
+
+    async def list(self, caller, filter_, projection):
+        return self.records
+
+    async def aggregate(self, caller, filter_, aggregation, limit=None):
+        return [{"value": len(self.records), "group": {}}]
+
+    async def create(self, caller, data):
+        return data
+
+    async def update(self, caller, filter_, patch):
+        pass
+
+
+BenchCollection.__abstractmethods__ = set()
+
+
+def build_datasource(columns: int) -> Datasource:
+    datasource = Datasource()
+    records = [{"id": i, **{f"column{j}": f"value{j}" for j in range(columns)}} for i in range(15)]
+    collection = BenchCollection("main", datasource, records)
+    operators = {Operator.EQUAL, Operator.IN, Operator.PRESENT}
+    collection.add_field(
+        "id",
+        {
+            "type": FieldType.COLUMN,
+            "column_type": PrimitiveType.NUMBER,
+            "is_primary_key": True,
+            "filter_operators": operators,
+            "is_sortable": True,
+        },
+    )
+    for i in range(columns):
+        collection.add_field(
+            f"column{i}",
+            {
+                "type": FieldType.COLUMN,
+                "column_type": PrimitiveType.STRING,
+                "filter_operators": operators,
+                "is_sortable": True,
+            },
+        )
+    datasource.add_collection(collection)
+    return datasource
+
+
+def measure(operation: Callable[[], Awaitable[Any]], iterations: int) -> float:
+    async def run():
+        for _ in range(iterations):
+            await operation()
+
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(run())
+        return (time.perf_counter() - start) / iterations
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    datasource = build_datasource(args.columns)
+    stack = DecoratorStack(datasource)
+    asyncio.new_event_loop().run_until_complete(stack.apply_queue_customization())
+    collection = datasource.get_collection("main")
+    decorated = stack.datasource.get_collection("main")
+
+    caller = User(
+        rendering_id=1,
+        user_id=1,
+        tags={},
+        email="user@bench.com",
+        first_name="user",
+        last_name="bench",
+        team="bench",
+        timezone=zoneinfo.ZoneInfo("UTC"),
+        request={"ip": "127.0.0.1"},
+    )
+    projection = Projection("id", *[f"column{i}" for i in range(args.columns)])
+    condition_tree = ConditionTreeLeaf("column0", Operator.EQUAL, "value0")
+    paginated_filter = PaginatedFilter(
+        {
+            "condition_tree": condition_tree,
+            "sort": Sort([{"field": "id", "ascending": True}]),
+            "page": Page(0, 15),
+            "timezone": zoneinfo.ZoneInfo("UTC"),
+        }
+    )
+    filter_ = Filter({"condition_tree": condition_tree, "timezone": zoneinfo.ZoneInfo("UTC")})
+    aggregation = Aggregation({"operation": "Count"})
+    operations = [
+        ("list", lambda c: c.list(caller, paginated_filter, projection)),
+        ("aggregate", lambda c: c.aggregate(caller, filter_, aggregation)),
+        ("create", lambda c: c.create(caller, [{"column0": "value"}])),
+        ("update", lambda c: c.update(caller, filter_, {"column0": "value"})),
+    ]
+
+    print(f"collection of {args.columns + 1} columns, {len(collection.records)} records per list")
+    print(f"{'method':<12}{'collection (µs)':>18}{'all layers (µs)':>18}{'bypassed (µs)':>16}{'speedup':>10}")
+    for name, operation in operations:
+        direct = measure(lambda: operation(collection), args.iterations)
+        stack._unlink_inert_layers()
+        unlinked = measure(lambda: operation(decorated), args.iterations)
+        stack._link_inert_layers()
+        linked = measure(lambda: operation(decorated), args.iterations)
+        print(f"{name:<12}{direct * 1e6:>18.2f}{unlinked * 1e6:>18.2f}{linked * 1e6:>16.2f}{unlinked / linked:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Cost of the derived projections (columns, relations, union, with_pks), Projection vs FrozenProjection.
+
+The projection lists the columns of a collection and of the collections of its many to one relations, as the agent
+builds it for a list request. The FrozenProjection is reused between the iterations, as a projection shared by the
+decorators of a collection.
+
+usage: python benchmarks/bench_projection.py [--columns 20] [--relations 5] [--iterations 2000]
+"""
+import argparse
+import time
+from typing import Callable
+
+from forestadmin.datasource_toolkit.collections import Collection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
+
+
+class BenchCollection(Collection):
+    pass
+
+
+BenchCollection.__abstractmethods__ = set()
+
+
+def build_datasource(columns: int, relations: int) -> Datasource:
+    datasource = Datasource()
+    for name in ["main", *[f"related{i}" for i in range(relations)]]:
+        collection = BenchCollection(name, datasource)
+        collection.add_field(
+            "id", {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "is_primary_key": True}
+        )
+        for i in range(columns):
+            collection.add_field(f"column{i}", {"type": FieldType.COLUMN, "column_type": PrimitiveType.STRING})
+        datasource.add_collection(collection)
+
+    main = datasource.get_collection("main")
+    for i in range(relations):
+        main.add_field(f"related{i}_id", {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER})
+        main.add_field(
+            f"related{i}",
+            {
+                "type": FieldType.MANY_TO_ONE,
+                "foreign_collection": f"related{i}",
+                "foreign_key": f"related{i}_id",
+                "foreign_key_target": "id",
+            },
+        )
+    return datasource
+
+
+def measure(operation: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--relations", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    datasource = build_datasource(args.columns, args.relations)
+    collection = datasource.get_collection("main")
+    paths = [f"column{i}" for i in range(args.columns)]
+    for i in range(args.relations):
+        paths.extend(f"related{i}:column{j}" for j in range(args.columns))
+    projection = Projection(*paths)
+    frozen = projection.freeze()
+    others = ["id", "column0", "related0:id"]
+
+    print(f"projection of {len(projection)} fields, {args.relations} relations")
+    print(f"{'operation':<12}{'Projection (µs)':>18}{'FrozenProjection (µs)':>24}{'speedup':>10}")
+    for name, operation in [
+        ("columns", lambda p: p.columns),
+        ("relations", lambda p: p.relations),
+        ("union", lambda p: p.union(others)),
+        ("with_pks", lambda p: p.with_pks(collection)),
+    ]:
+        mutable = measure(lambda: operation(projection), args.iterations)
+        immutable = measure(lambda: operation(frozen), args.iterations)
+        print(f"{name:<12}{mutable * 1e6:>18.2f}{immutable * 1e6:>24.2f}{mutable / immutable:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
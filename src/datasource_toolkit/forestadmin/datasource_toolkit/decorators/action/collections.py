@@ -48,6 +48,9 @@ class ActionCollectionDecorator(CollectionDecorator):
         self._actions[name] = action
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        return super()._is_inert(method) or not self._actions
+
     def _validate_root_only_or_no_pages(self, form_elements: List[DynamicFormElements], action_name: str):
         root_len = len(form_elements)
         pages_len = len(
@@ -61,6 +61,14 @@ class BinaryCollectionDecorator(CollectionDecorator):
         else:
             raise ForestException("Expected a binary field")
 
+    def _is_inert(self, method: str) -> bool:
+        # the binary fields of the related collections are converted as well
+        return super()._is_inert(method) or not any(
+            is_column(field) and field["column_type"] == PrimitiveType.BINARY
+            for collection in self.datasource.collections
+            for field in collection.child_collection.schema["fields"].values()
+        )
+
     def _refine_schema(self, sub_schema: CollectionSchema) -> CollectionSchema:
         fields: Dict[str, FieldAlias] = {}
         for field_name, field_schema in sub_schema["fields"].items():
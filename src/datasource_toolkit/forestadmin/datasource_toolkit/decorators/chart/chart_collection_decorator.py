@@ -27,6 +27,9 @@ class ChartCollectionDecorator(CollectionDecorator):
         ForestLogger.log("info", f"Chart {self.name}.{name} added with url: '{chart_url}'")
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        return super()._is_inert(method) or not self._charts
+
     async def render_chart(self, caller: User, name: str, record_id: List) -> Chart:
         if self._charts.get(name) is not None:
             context = CollectionChartContext(caller, self, record_id)
@@ -12,12 +12,16 @@ from forestadmin.datasource_toolkit.interfaces.query.filter.unpaginated import F
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 
+# the methods a layer forwards to its child collection, which it can be bypassed for when it doesn't customize them
+FORWARDED_METHODS = ("list", "create", "update", "delete", "aggregate", "execute", "get_form", "render_chart")
+
 
 class CollectionDecorator(Collection):
     def __init__(self, collection: Collection, datasource: Datasource[BoundCollection]):
         self.child_collection = collection
         self._datasource = datasource
         self._last_schema = None
+        self._linked_methods: List[str] = []
 
         # When the child collection invalidates its schema, we also invalidate ours.
         # This is done like this, and not in the markSchemaAsDirty method, because we don't have
@@ -35,6 +39,35 @@ class CollectionDecorator(Collection):
 
     def mark_schema_as_dirty(self):
         self._last_schema = None
+        # the layer may have been customized: it (and its parents, see __init__) must not be bypassed anymore
+        self.unlink_inert_methods()
+
+    def link_inert_methods(self):
+        """bypass this layer for the methods it doesn't customize, by calling the ones of its child collection
+
+        An inert child may itself be bypassed: the layers must be linked from the bottom of the stack to its top, and
+        linked again once they are customized.
+        """
+        self.unlink_inert_methods()
+        for method in FORWARDED_METHODS:
+            if self._is_inert(method):
+                setattr(self, method, getattr(self.child_collection, method))
+                self._linked_methods.append(method)
+
+    def unlink_inert_methods(self):
+        for method in self._linked_methods:
+            self.__dict__.pop(method, None)
+        self._linked_methods = []
+
+    def _is_inert(self, method: str) -> bool:
+        """whether the method only forwards its calls to the child collection
+
+        The subclasses customizing a method tell when their customizations are unused.
+        """
+        if getattr(type(self), method) is not getattr(CollectionDecorator, method):
+            return False
+        # create and render_chart have no filter to refine
+        return method in ("create", "render_chart") or type(self)._refine_filter is CollectionDecorator._refine_filter
 
     @property
     def datasource(self) -> Datasource:
@@ -65,6 +65,10 @@ class ComputedCollectionDecorator(CollectionDecorator):
         self._computeds[name] = cast(ComputedDefinition, {**computed, "column_type": column_type})
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        # the computed fields of the related collections are computed as well
+        return super()._is_inert(method) or not any(c._computeds for c in self.datasource.collections)
+
     async def list(self, caller: User, _filter: PaginatedFilter, projection: Projection) -> List[RecordsDataAlias]:
         new_projection = projection.replace(lambda path: rewrite_fields(self, path))
         records: List[RecordsDataAlias] = await super().list(caller, _filter, new_projection)  # type: ignore
@@ -3,6 +3,7 @@ from typing import Awaitable, Callable, List
 from forestadmin.datasource_toolkit.decorators.action.collections import ActionCollectionDecorator
 from forestadmin.datasource_toolkit.decorators.binary.collection import BinaryCollectionDecorator
 from forestadmin.datasource_toolkit.decorators.chart.chart_datasource_decorator import ChartDataSourceDecorator
+from forestadmin.datasource_toolkit.decorators.collection_decorator import CollectionDecorator
 from forestadmin.datasource_toolkit.decorators.computed.collections import ComputedCollectionDecorator
 from forestadmin.datasource_toolkit.decorators.datasource_decorator import DatasourceDecorator
 from forestadmin.datasource_toolkit.decorators.empty.collection import EmptyCollectionDecorator
@@ -28,6 +29,7 @@ from forestadmin.datasource_toolkit.interfaces.models.collections import Datasou
 class DecoratorStack:
     def __init__(self, datasource: Datasource) -> None:
         self._customizations: List = list()
+        self._is_linked = False
         last = datasource
 
         # Step 0: Do not query datasource when we know the result with yield an empty set.
@@ -71,6 +73,17 @@ class DecoratorStack:
         self._customizations.append(customization)
 
     async def apply_queue_customization(self):
+        if self._is_linked and not self._customizations:
+            return
+
+        # the customizations may make any layer of the stack active
+        self._unlink_inert_layers()
+        try:
+            await self._apply_queue_customization()
+        finally:
+            self._link_inert_layers()
+
+    async def _apply_queue_customization(self):
         queued_customization = self._customizations.copy()
         self._customizations = []
 
@@ -78,4 +91,28 @@ class DecoratorStack:
         while len(queued_customization) > 0:
             customization = queued_customization.pop()
             await customization()
-            await self.apply_queue_customization()
+            await self._apply_queue_customization()
+
+    def _get_layers(self) -> List[List[CollectionDecorator]]:
+        """the decorators of each collection, from the bottom of the stack to its top"""
+        layers = []
+        for collection in self.datasource.collections:
+            collection_layers = []
+            while isinstance(collection, CollectionDecorator):
+                collection_layers.append(collection)
+                collection = collection.child_collection
+            layers.append(collection_layers[::-1])
+        return layers
+
+    def _link_inert_layers(self):
+        """bypass, for each method of each collection, the decorators which don't customize it"""
+        for collection_layers in self._get_layers():
+            for layer in collection_layers:
+                layer.link_inert_methods()
+        self._is_linked = True
+
+    def _unlink_inert_layers(self):
+        for collection_layers in self._get_layers():
+            for layer in collection_layers:
+                layer.unlink_inert_methods()
+        self._is_linked = False
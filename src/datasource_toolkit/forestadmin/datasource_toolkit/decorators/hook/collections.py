@@ -44,6 +44,10 @@ class CollectionHookDecorator(CollectionDecorator):
     def add_hook(self, position: Position, type_: CrudMethod, handler: HookHandler):
         self._hooks[type_].add_handler(position, handler)
 
+    def _is_inert(self, method: str) -> bool:
+        hooks = self._hooks.get(method.capitalize())
+        return super()._is_inert(method) or (hooks is not None and not hooks.before and not hooks.after)
+
     async def list(self, caller: User, _filter: PaginatedFilter, projection: Projection) -> List[RecordsDataAlias]:
         before_context = HookBeforeListContext(self.child_collection, caller, _filter, projection)
         await self._hooks["List"].execute_before(before_context)
@@ -59,6 +59,10 @@ class OperatorsEmulateCollectionDecorator(CollectionDecorator):
         self._fields[name][Operator(operator)] = replace_by
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        # the conditions on the related collections are replaced as well
+        return super()._is_inert(method) or not any(c._fields for c in self.datasource.collections)
+
     def _refine_schema(self, sub_schema: CollectionSchema) -> CollectionSchema:
         fields: Dict[str, FieldAlias] = {}
 
@@ -35,6 +35,10 @@ class OverrideCollectionDecorator(CollectionDecorator):
     def add_delete_handler(self, handler: DeleteOverrideHandler):
         self._delete_handler = handler
 
+    def _is_inert(self, method: str) -> bool:
+        handlers = {"create": self._create_handler, "update": self._update_handler, "delete": self._delete_handler}
+        return super()._is_inert(method) or (method in handlers and handlers[method] is None)
+
     async def create(self, caller: User, data: List[RecordsDataAlias]) -> List[RecordsDataAlias]:
         if self._create_handler is not None:
             context = CreateOverrideCustomizationContext(self.child_collection, caller, data)
@@ -51,6 +51,9 @@ class PublicationCollectionDecorator(CollectionDecorator):
 
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        return super()._is_inert(method) or not self._blacklist
+
     def _refine_schema(self, sub_schema: CollectionSchema) -> CollectionSchema:
         new_field_schema = {}
         for name, field in sub_schema["fields"].items():
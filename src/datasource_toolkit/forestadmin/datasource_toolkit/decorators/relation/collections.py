@@ -32,6 +32,10 @@ class RelationCollectionDecorator(CollectionDecorator):
         self._relations[name] = relation
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        # the relations of the related collections are emulated as well
+        return super()._is_inert(method) or not any(c._relations for c in self.datasource.collections)
+
     def _refine_schema(self, sub_schema: CollectionSchema) -> CollectionSchema:
         schema = {**sub_schema, "fields": {**sub_schema["fields"]}}
         for name, relation in self._relations.items():
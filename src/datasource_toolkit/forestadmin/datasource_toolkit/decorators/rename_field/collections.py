@@ -70,6 +70,10 @@ class RenameFieldCollectionDecorator(CollectionDecorator):
             self._to_child_collection[new_name] = initial_name
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        # the fields of the related collections are renamed as well
+        return super()._is_inert(method) or not any(c._from_child_collection for c in self.datasource.collections)
+
     async def _refine_filter(
         self, caller: User, _filter: Union[Filter, PaginatedFilter, None]
     ) -> Union[Filter, PaginatedFilter, None]:
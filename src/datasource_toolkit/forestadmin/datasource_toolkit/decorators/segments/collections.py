@@ -23,6 +23,9 @@ class SegmentCollectionDecorator(CollectionDecorator):
         self._segments[name] = segment
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        return super()._is_inert(method) or not self._segments
+
     def _refine_schema(self, sub_schema: CollectionSchema) -> CollectionSchema:
         return {**sub_schema, "segments": [*sub_schema["segments"], *self._segments.keys()]}
 
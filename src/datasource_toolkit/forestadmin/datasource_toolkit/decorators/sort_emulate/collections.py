@@ -35,6 +35,10 @@ class SortCollectionDecorator(CollectionDecorator):
         self._sorts[name] = Sort(equivalent_sort) if equivalent_sort else None
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        # the sorts on the related collections are emulated as well
+        return super()._is_inert(method) or not any(c._sorts for c in self.datasource.collections)
+
     def _refine_schema(self, sub_schema: CollectionSchema) -> CollectionSchema:
         fields: Dict[str, FieldAlias] = {}
 
@@ -38,6 +38,9 @@ class ValidationCollectionDecorator(CollectionDecorator):
 
         self.mark_schema_as_dirty()
 
+    def _is_inert(self, method: str) -> bool:
+        return super()._is_inert(method) or not self.validations
+
     async def create(self, caller: User, data: List[RecordsDataAlias]) -> List[RecordsDataAlias]:
         for record in data:
             self.__validate(record, caller.timezone, True)
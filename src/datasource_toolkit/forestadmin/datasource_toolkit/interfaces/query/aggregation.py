@@ -1,14 +1,8 @@
 import enum
 import json
-import sys
 from datetime import date, datetime, timedelta
 from typing import Any, Callable, Dict, List, Literal, Optional, Union
 
-if sys.version_info >= (3, 9):
-    import zoneinfo
-else:
-    from backports import zoneinfo
-
 from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
 from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
 from forestadmin.datasource_toolkit.utils.records import RecordUtils
@@ -16,6 +10,9 @@ from typing_extensions import NotRequired, Self, TypedDict, TypeGuard
 
 Number = Union[int, float]
 
+# below this count, the records are aggregated one by one (building the columns costs more than it saves)
+COLUMNAR_AGGREGATION_MIN_RECORDS = 1000
+
 
 class Aggregator(enum.Enum):
     COUNT = "Count"
@@ -98,7 +95,13 @@ class Aggregation:
     def apply(
         self, records: List[RecordsDataAlias], timezone: str, limit: Optional[int] = None
     ) -> List[AggregateResult]:
-        rows = self._format_summaries(self._create_summaries(records, timezone))
+        rows = None
+        if len(records) >= COLUMNAR_AGGREGATION_MIN_RECORDS:
+            from forestadmin.datasource_toolkit.utils.columnar_aggregation import aggregate_columns
+
+            rows = aggregate_columns(self, records, timezone)
+        if rows is None:
+            rows = self._format_summaries(self._create_summaries(records, timezone))
         rows = sorted(rows, key=lambda r: r["value"])
         if limit is not None and len(rows) > limit:
             rows = rows[:limit]
@@ -208,9 +211,12 @@ class Aggregation:
         if operation:
             if value[-1] == "Z":
                 value = value[:-1]  # Python doesn't handle Z in the isoformat
-            dt = datetime.fromisoformat(value).replace(tzinfo=zoneinfo.ZoneInfo(timezone)).date()
+            # the date of the value, as written (the timezone doesn't change it)
+            dt = datetime.fromisoformat(value).date()
             if operation == DateOperation.YEAR:
                 return dt.replace(month=1, day=1).isoformat()
+            elif operation == DateOperation.QUARTER:
+                return dt.replace(month=dt.month - (dt.month - 1) % 3, day=1).isoformat()
             elif operation == DateOperation.MONTH:
                 return dt.replace(day=1).isoformat()
             elif operation == DateOperation.DAY:
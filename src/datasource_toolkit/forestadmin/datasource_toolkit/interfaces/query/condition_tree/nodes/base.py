@@ -53,10 +53,15 @@ class ConditionTree(abc.ABC):
     def apply(self, handler: "CallbackAlias") -> None:
         """apply handler to condition tree"""
 
+    def compile(self, collection: Collection, timezone: zoneinfo.ZoneInfo) -> "PredicateAlias":
+        """return a predicate equivalent to `match`, with the work which doesn't depend on the record done once"""
+        return lambda record: self.match(record, collection, timezone)
+
     def filter(
         self, records: List[RecordsDataAlias], collection: Collection, timezone: zoneinfo.ZoneInfo
     ) -> List[RecordsDataAlias]:
-        return list(filter(lambda record: self.match(record, collection, timezone), records))
+        predicate = self.compile(collection, timezone)
+        return [record for record in records if predicate(record)]
 
     @abc.abstractmethod
     def unnest(self) -> "ConditionTree":
@@ -84,3 +89,4 @@ HandlerAlias = Callable[["ConditionTreeLeaf"], HandlerResult]
 ReplacerAlias = HandlerAlias[Union[ConditionTree, ConditionTreeComponent]]
 AsyncReplacerAlias = HandlerAlias[Awaitable[Union[ConditionTree, ConditionTreeComponent]]]
 CallbackAlias = HandlerAlias[None]
+PredicateAlias = Callable[[RecordsDataAlias], bool]
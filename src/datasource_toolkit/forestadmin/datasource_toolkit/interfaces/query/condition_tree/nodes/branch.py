@@ -15,6 +15,7 @@ from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base i
     ConditionTree,
     ConditionTreeComponent,
     ConditionTreeException,
+    PredicateAlias,
     ReplacerAlias,
 )
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf, LeafComponents
@@ -74,6 +75,14 @@ class ConditionTreeBranch(ConditionTree):
             meth = any
         return meth([condition.match(record, collection, timezone) for condition in self.conditions])
 
+    def compile(self, collection: Collection, timezone: zoneinfo.ZoneInfo) -> PredicateAlias:
+        predicates = [condition.compile(collection, timezone) for condition in self.conditions]
+        if len(predicates) == 1:
+            return predicates[0]
+        if self.aggregator == Aggregator.OR:
+            return lambda record: any(predicate(record) for predicate in predicates)
+        return lambda record: all(predicate(record) for predicate in predicates)
+
     def some_leaf(self, handler: Callable[["ConditionTreeLeaf"], bool]) -> bool:  # noqa:F821
         for condition in self.conditions:
             handler_res = handler(condition)  # type: ignore
@@ -15,6 +15,7 @@ from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base i
     CallbackAlias,
     ConditionTree,
     ConditionTreeComponent,
+    PredicateAlias,
     ReplacerAlias,
 )
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.operators import (
@@ -210,6 +211,49 @@ class ConditionTreeLeaf(ConditionTree):
                 )
         return False
 
+    def compile(self, collection: Collection, timezone: zoneinfo.ZoneInfo) -> PredicateAlias:
+        if self.operator in (Operator.NOT_EQUAL, Operator.NOT_CONTAINS):
+            inverse_predicate = self.inverse().compile(collection, timezone)
+            return lambda record: not inverse_predicate(record)
+
+        if self.operator == Operator.LIKE and isinstance(self.value, str):
+            like_regex = self._compile_like_regex()
+
+            def test(value: Any) -> bool:
+                return bool(value) and like_regex.match(value) is not None
+
+        else:
+            test = {
+                Operator.EQUAL: self._equal,
+                Operator.LESS_THAN: self._less_than,
+                Operator.GREATER_THAN: self._greater_than,
+                Operator.LIKE: self._like,
+                Operator.LONGER_THAN: self._longer_than,
+                Operator.SHORTER_THAN: self._shorter_than,
+                Operator.INCLUDES_ALL: self._includes_all,
+            }.get(self.operator)
+        if test is None:
+            return self._compile_equivalent(collection, timezone)
+
+        get_value = RecordUtils.get_field_getter(self.field)
+        return lambda record: test(get_value(record))
+
+    def _compile_equivalent(self, collection: Collection, timezone: zoneinfo.ZoneInfo) -> PredicateAlias:
+        from forestadmin.datasource_toolkit.interfaces.query.condition_tree.equivalence import ConditionTreeEquivalent
+        from forestadmin.datasource_toolkit.utils.collections import CollectionUtils
+
+        column_type = CollectionUtils.get_field_schema(collection, self.field)
+        if not is_column(column_type):
+            raise ConditionTreeLeafException(
+                f"You can't find an equivalent for this kind of field ({column_type['type']})"
+            )
+        equivalent_tree = ConditionTreeEquivalent.get_equivalent_tree(
+            self, UNIQUE_OPERATORS, column_type["column_type"], timezone
+        )
+        if equivalent_tree is None:
+            return lambda record: False
+        return equivalent_tree.compile(collection, timezone)
+
     def some_leaf(self, handler: Callable[["ConditionTreeLeaf"], bool]) -> bool:  # noqa:F821
         return handler(self)
 
@@ -244,20 +288,16 @@ class ConditionTreeLeaf(ConditionTree):
         if not value:
             return False
 
+        return self._compile_like_regex().match(value) is not None
+
+    def _compile_like_regex(self) -> "re.Pattern[str]":
         escaped_pattern: str = re.sub(
             r"([\.\\\+\*\?\[\^\]\$\(\)\{\}\=\!\<\>\|\:\-])",  # type: ignore
             "\\\1",  # type: ignore
             self.value,  # type: ignore
         )
         escaped_pattern = escaped_pattern.replace("%", ".*").replace("_", ".")
-        return (
-            re.match(
-                f"^{escaped_pattern}$",
-                value,
-                re.I,
-            )
-            is not None
-        )
+        return re.compile(f"^{escaped_pattern}$", re.I)
 
     def to_plain_object(self) -> LeafComponents:  # type: ignore
         return LeafComponents(
@@ -0,0 +1,208 @@
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Hashable, List, Optional, Tuple
+
+from forestadmin.datasource_toolkit.interfaces.fields import Operator
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.factory import ConditionTreeFactory
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base import ConditionTree
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import Aggregator, ConditionTreeBranch
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import (
+    ConditionTreeLeaf,
+    ConditionTreeLeafException,
+)
+
+_INCLUSIVE_OPERATORS = {Operator.EQUAL, Operator.IN}
+_EXCLUSIVE_OPERATORS = {Operator.NOT_EQUAL, Operator.NOT_IN}
+
+
+class ConditionTreeOptimizer:
+    """rewrite a condition tree into an equivalent and smaller one
+
+    - the branches of a single condition are replaced by it, the nested branches of the same aggregator are flattened
+    - the duplicated conditions of a branch are removed
+    - the `equal`/`in` conditions of a field are merged in a single `in` when any of them matches (or), the
+      `not_equal`/`not_in` conditions in a single `not_in` when all of them match (and)
+    - the conditions which can't match any record (`in []`, `and` of disjoint values or of a condition and its
+      inverse) are replaced by MATCH_NONE, the ones matching any record (`not_in []`) by MATCH_ALL
+
+    The `equal`, `in`, `not_equal` and `not_in` conditions holding a null value are left untouched: the datasources
+    don't compare nulls the same way.
+    """
+
+    @classmethod
+    def optimize(cls, tree: Optional[ConditionTree]) -> Optional[ConditionTree]:
+        if isinstance(tree, ConditionTreeLeaf):
+            return cls._optimize_leaf(tree)
+        if isinstance(tree, ConditionTreeBranch):
+            return cls._optimize_branch(tree)
+        return tree
+
+    @classmethod
+    def is_match_none(cls, tree: Optional[ConditionTree]) -> bool:
+        return isinstance(tree, ConditionTreeBranch) and tree.aggregator == Aggregator.OR and not tree.conditions
+
+    @classmethod
+    def _optimize_leaf(cls, leaf: ConditionTreeLeaf) -> Optional[ConditionTree]:
+        values = cls._get_values(leaf)
+        if values is None or leaf.operator not in (Operator.IN, Operator.NOT_IN):
+            return leaf
+
+        if len(values) == 0:
+            return ConditionTreeFactory.MATCH_NONE if leaf.operator == Operator.IN else ConditionTreeFactory.MATCH_ALL
+        if len(values) != len(leaf.value):
+            return leaf.override({"value": values})
+        return leaf
+
+    @classmethod
+    def _optimize_branch(cls, branch: ConditionTreeBranch) -> Optional[ConditionTree]:
+        is_and = branch.aggregator == Aggregator.AND
+        conditions: List[ConditionTree] = []
+        for condition in branch.conditions:
+            optimized = cls.optimize(condition)
+            if optimized is ConditionTreeFactory.MATCH_ALL:
+                if not is_and:
+                    return ConditionTreeFactory.MATCH_ALL
+            elif cls.is_match_none(optimized):
+                if is_and:
+                    return ConditionTreeFactory.MATCH_NONE
+            elif isinstance(optimized, ConditionTreeBranch) and optimized.aggregator == branch.aggregator:
+                conditions.extend(optimized.conditions)
+            else:
+                conditions.append(optimized)
+
+        conditions = cls._merge_leaves(branch.aggregator, cls._deduplicate(conditions))
+        if conditions is None:
+            return ConditionTreeFactory.MATCH_NONE
+        if len(conditions) == 1:
+            return conditions[0]
+        if not conditions:
+            return ConditionTreeFactory.MATCH_ALL if is_and else ConditionTreeFactory.MATCH_NONE
+        return ConditionTreeBranch(branch.aggregator, conditions)
+
+    @classmethod
+    def _deduplicate(cls, conditions: List[ConditionTree]) -> List[ConditionTree]:
+        keys = set()
+        unique_conditions: List[ConditionTree] = []
+        for condition in conditions:
+            key = cls._get_key(condition)
+            if key not in keys:
+                keys.add(key)
+                unique_conditions.append(condition)
+        return unique_conditions
+
+    @classmethod
+    def _merge_leaves(cls, aggregator: Aggregator, conditions: List[ConditionTree]) -> Optional[List[ConditionTree]]:
+        """merge the leaves of each field, return None when the conditions of an `and` can't all match"""
+        leaves_by_field: DefaultDict[str, List[ConditionTreeLeaf]] = defaultdict(list)
+        for condition in conditions:
+            if cls._is_mergeable(aggregator, condition):
+                leaves_by_field[condition.field].append(condition)  # type: ignore
+
+        if aggregator == Aggregator.AND and cls._has_inverse(conditions):
+            return None
+
+        merged: Dict[int, Optional[ConditionTreeLeaf]] = {}
+        for leaves in leaves_by_field.values():
+            if len(leaves) < 2:
+                continue
+            if aggregator == Aggregator.OR:
+                leaf = cls._build_leaf(leaves[0].field, Operator.IN, cls._union(leaves))
+            else:
+                leaf = cls._intersect(leaves)
+                if leaf is None:
+                    return None
+            merged[id(leaves[0])] = leaf
+            merged.update({id(other): None for other in leaves[1:]})
+
+        if not merged:
+            return conditions
+        merged_conditions = [merged.get(id(condition), condition) for condition in conditions]
+        return [condition for condition in merged_conditions if condition is not None]
+
+    @classmethod
+    def _is_mergeable(cls, aggregator: Aggregator, condition: ConditionTree) -> bool:
+        if not isinstance(condition, ConditionTreeLeaf) or cls._get_values(condition) is None:
+            return False
+        if aggregator == Aggregator.OR:
+            return condition.operator in _INCLUSIVE_OPERATORS
+        return condition.operator in _INCLUSIVE_OPERATORS or condition.operator in _EXCLUSIVE_OPERATORS
+
+    @classmethod
+    def _has_inverse(cls, conditions: List[ConditionTree]) -> bool:
+        keys = {cls._get_key(condition) for condition in conditions}
+        for condition in conditions:
+            if isinstance(condition, ConditionTreeLeaf):
+                try:
+                    inverse = condition.inverse()
+                except ConditionTreeLeafException:
+                    continue
+                if cls._get_key(inverse) in keys:
+                    return True
+        return False
+
+    @classmethod
+    def _union(cls, leaves: List[ConditionTreeLeaf]) -> List[Any]:
+        values: List[Any] = []
+        for leaf in leaves:
+            values.extend(cls._get_values(leaf))  # type: ignore
+        return list(dict.fromkeys(values))
+
+    @classmethod
+    def _intersect(cls, leaves: List[ConditionTreeLeaf]) -> Optional[ConditionTreeLeaf]:
+        """the leaf matching the records matched by all the leaves, None if there is none"""
+        allowed: Optional[List[Any]] = None
+        excluded = cls._union([leaf for leaf in leaves if leaf.operator in _EXCLUSIVE_OPERATORS])
+        for leaf in leaves:
+            if leaf.operator in _INCLUSIVE_OPERATORS:
+                values = cls._get_values(leaf)
+                if allowed is None:
+                    allowed = values
+                else:
+                    allowed_values = set(values)  # type: ignore
+                    allowed = [value for value in allowed if value in allowed_values]
+
+        if allowed is None:
+            return cls._build_leaf(leaves[0].field, Operator.NOT_IN, excluded)
+
+        excluded_values = set(excluded)
+        allowed = [value for value in allowed if value not in excluded_values]
+        if not allowed:
+            return None
+        return cls._build_leaf(leaves[0].field, Operator.IN, allowed)
+
+    @staticmethod
+    def _build_leaf(field: str, operator: Operator, values: List[Any]) -> ConditionTreeLeaf:
+        if len(values) == 1:
+            return ConditionTreeLeaf(
+                field, Operator.EQUAL if operator == Operator.IN else Operator.NOT_EQUAL, values[0]
+            )
+        return ConditionTreeLeaf(field, operator, values)
+
+    @staticmethod
+    def _get_values(leaf: ConditionTreeLeaf) -> Optional[List[Hashable]]:
+        """the distinct values of an equal, not_equal, in or not_in leaf, None if they can't be compared safely"""
+        if leaf.operator in (Operator.EQUAL, Operator.NOT_EQUAL):
+            values = [leaf.value]
+        elif leaf.operator in (Operator.IN, Operator.NOT_IN) and isinstance(leaf.value, list):
+            values = leaf.value
+        else:
+            return None
+
+        try:
+            distinct_values = list(dict.fromkeys(values))
+        except TypeError:
+            return None
+        if None in distinct_values:
+            return None
+        return distinct_values
+
+    @classmethod
+    def _get_key(cls, tree: ConditionTree) -> Tuple[Any, ...]:
+        if isinstance(tree, ConditionTreeBranch):
+            return (tree.aggregator, tuple(cls._get_key(condition) for condition in tree.conditions))
+
+        leaf: ConditionTreeLeaf = tree  # type: ignore
+        try:
+            hash(leaf.value)
+        except TypeError:
+            return (leaf.field, leaf.operator, type(leaf.value), repr(leaf.value))
+        return (leaf.field, leaf.operator, type(leaf.value), leaf.value)
@@ -1,6 +1,5 @@
-from collections import Counter
 from functools import reduce
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Union, cast
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple, Union, cast
 
 from forestadmin.datasource_toolkit.exceptions import DatasourceToolkitException
 from forestadmin.datasource_toolkit.interfaces.fields import RelationAlias, is_polymorphic_many_to_one
@@ -26,16 +25,24 @@ class Projection(list):  # type: ignore
         return set(self) == set(other)
 
     @property
-    def relations(self: List[str]) -> Dict[str, "Projection"]:
+    def relations(self) -> Dict[str, "Projection"]:
         relations: Dict[str, Projection] = DefaultDict(Projection)
-        for path in self:
-            splited = path.split(":")
-            field = splited[0]
-            if len(splited) > 1:
-                relation = splited[1:]
-                relations[field] = Projection(*relations[field], ":".join(relation))
+        for field, sub_paths in self._split_relations().items():
+            relations[field] = Projection(*sub_paths)
         return relations
 
+    def _split_relations(self) -> Dict[str, List[str]]:
+        sub_paths: Dict[str, List[str]] = {}
+        for path in self:
+            field, separator, sub_path = path.partition(":")
+            if separator:
+                sub_paths.setdefault(field, []).append(sub_path)
+        return sub_paths
+
+    def freeze(self) -> "FrozenProjection":
+        """immutable and hashable copy of this projection, with its derived projections cached"""
+        return FrozenProjection(*self)
+
     def replace(self, handler: Callable[[str], Union["Projection", str, List[str]]]) -> "Projection":
         def reducer(memo: Projection, paths: Union["Projection", str, List[str]]) -> Projection:
             if isinstance(paths, str):
@@ -49,8 +56,10 @@ class Projection(list):  # type: ignore
         return reduce(reducer, handled, Projection())
 
     def union(self, *projections: Union["Projection", List[str]]) -> "Projection":
-        fields: List[str] = reduce(lambda x, y: [*x, *y], [self, *projections], [])  # type: ignore
-        return Projection(*Counter(fields))
+        fields: Dict[str, None] = dict.fromkeys(self)
+        for projection in projections:
+            fields.update(dict.fromkeys(projection))
+        return Projection(*fields)
 
     def apply(self, records: List[RecordsDataAlias]) -> List[RecordsDataAlias]:
         results: List[RecordsDataAlias] = []
@@ -107,5 +116,96 @@ class Projection(list):  # type: ignore
         return result
 
 
+class FrozenProjection(Projection):
+    """immutable and hashable projection
+
+    `columns`, `relations`, `union` and `with_pks` are computed once and cached on the instance, so a projection
+    shared by the decorators of a collection (or between requests) is only analysed once. The `with_pks` results are
+    dropped when the schema of one of the collections they were computed from changes.
+    """
+
+    _UNION_CACHE_SIZE = 32
+
+    def __init__(self, *items: Any):
+        super(FrozenProjection, self).__init__(*items)
+        self._hash: Optional[int] = None
+        self._columns: Optional[Tuple[str, ...]] = None
+        self._relations: Optional[Dict[str, FrozenProjection]] = None
+        self._unions: Dict[Tuple[Tuple[str, ...], ...], FrozenProjection] = {}
+        self._with_pks: Dict[int, Tuple[List[Tuple[Collection, Any, int]], FrozenProjection]] = {}
+
+    def _forbidden(self, *args: Any, **kwargs: Any):
+        raise ProjectionException("Cannot modify a frozen projection.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _forbidden
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _forbidden
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self))
+        return self._hash
+
+    def __reduce__(self):
+        return (FrozenProjection, tuple(self))
+
+    def __copy__(self) -> "FrozenProjection":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenProjection":
+        return self
+
+    def freeze(self) -> "FrozenProjection":
+        return self
+
+    @property
+    def columns(self) -> List[str]:
+        if self._columns is None:
+            self._columns = tuple(path for path in self if ":" not in path)
+        return list(self._columns)
+
+    @property
+    def relations(self) -> Dict[str, "Projection"]:
+        if self._relations is None:
+            self._relations = {
+                field: FrozenProjection(*sub_paths) for field, sub_paths in self._split_relations().items()
+            }
+        return DefaultDict(FrozenProjection, self._relations)
+
+    def union(self, *projections: Union["Projection", List[str]]) -> "FrozenProjection":
+        key = tuple(tuple(projection) for projection in projections)
+        result = self._unions.get(key)
+        if result is None:
+            result = super(FrozenProjection, self).union(*projections).freeze()
+            if len(self._unions) >= self._UNION_CACHE_SIZE:
+                self._unions.clear()
+            self._unions[key] = result
+        return result
+
+    def with_pks(self, collection: Collection) -> "FrozenProjection":
+        cached = self._with_pks.get(id(collection))
+        if cached is not None:
+            dependencies, result = cached
+            if dependencies[0][0] is collection and all(
+                dependency.schema is schema and len(schema["fields"]) == fields_count
+                for dependency, schema, fields_count in dependencies
+            ):
+                return result
+
+        result = super(FrozenProjection, self).with_pks(collection).freeze()
+        self._with_pks[id(collection)] = (self._get_dependencies(collection), result)
+        return result
+
+    def _get_dependencies(self, collection: Collection) -> List[Tuple[Collection, Any, int]]:
+        """the collections (and their schema) the result of `with_pks(collection)` is computed from"""
+        dependencies = [(collection, collection.schema, len(collection.schema["fields"]))]
+        for relation, projection in self.relations.items():
+            if is_polymorphic_many_to_one(collection.schema["fields"][relation]):
+                continue
+            schema = cast(RelationAlias, collection.schema["fields"][relation])
+            association = collection.datasource.get_collection(schema["foreign_collection"])
+            dependencies.extend(cast(FrozenProjection, projection)._get_dependencies(association))
+        return dependencies
+
+
 def is_projection(projection: Any) -> TypeGuard[Projection]:
     return isinstance(projection, Projection)
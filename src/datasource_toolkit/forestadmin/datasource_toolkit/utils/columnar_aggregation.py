@@ -0,0 +1,217 @@
+# pyright: reportMissingModuleSource=false
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import (
+    AggregateResult,
+    Aggregation,
+    Aggregator,
+    DateOperation,
+)
+from forestadmin.datasource_toolkit.interfaces.records import RecordsDataAlias
+from forestadmin.datasource_toolkit.utils.records import RecordUtils
+
+_NONE_TYPE = type(None)
+
+# the one by one aggregation tells groups apart by their json dump: only the types whose equality matches it (not 1 and
+# 1.0, 0.0 and -0.0, or datetimes of different timezones) are grouped by hashing
+_GROUP_TYPES = {str, int, bool, date, UUID}
+
+# marks the groups without any value of an average, which are not returned
+_NO_AVERAGE = object()
+
+
+class _UnsupportedColumn(Exception):
+    """the values of a column can't be aggregated with the semantics of Aggregation._create_summaries"""
+
+
+def aggregate_columns(
+    aggregation: Aggregation, records: List[RecordsDataAlias], timezone: str
+) -> Optional[List[AggregateResult]]:
+    """aggregate the records column by column with numpy, the results are in the order of the one by one aggregation
+
+    Return None when a column holds values which can't be aggregated this way (mixed types, nan, dicts, ...), the
+    records must then be aggregated one by one.
+    """
+    if len(records) == 0:
+        return []
+
+    try:
+        group_ids, groups = _group(aggregation, records, timezone)
+        values = _aggregate(aggregation, records, group_ids, len(groups))
+    except _UnsupportedColumn:
+        return None
+
+    return [{"group": group, "value": value} for group, value in zip(groups, values) if value is not _NO_AVERAGE]
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    # np.array would build a 2 dimensions array from a list of lists
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _get_column(records: List[RecordsDataAlias], field: str) -> np.ndarray:
+    if ":" not in field:
+        # RecordUtils.get_field_getter, inlined for the columns of the records
+        return _object_array([record.get(field) if record else record for record in records])
+    get_value = RecordUtils.get_field_getter(field)
+    return _object_array([get_value(record) for record in records])
+
+
+def _group(
+    aggregation: Aggregation, records: List[RecordsDataAlias], timezone: str
+) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """return the group of each record, numbered by order of appearance, and the values of each group"""
+    group_ids = np.zeros(len(records), dtype=np.int64)
+    columns: List[Tuple[str, np.ndarray]] = []
+    for group in aggregation.groups:
+        column = _get_column(records, group["field"])
+        if group.get("operation"):
+            column = _truncate_dates(aggregation, column, group["operation"], timezone)
+        codes = _factorize(column) + 1  # None values are coded -1
+        group_ids, _ = pd.factorize(group_ids * (codes.max() + 1) + codes)
+        columns.append((group["field"], column))
+
+    _, first_rows = np.unique(group_ids, return_index=True)
+    return group_ids, [{field: _get_group_value(column[row]) for field, column in columns} for row in first_rows]
+
+
+def _get_group_value(value: Any) -> Any:
+    # as Aggregation._create_group
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _factorize(column: np.ndarray) -> np.ndarray:
+    types = set(map(type, column))
+    types.discard(_NONE_TYPE)
+    if len(types) > 1 or not types <= _GROUP_TYPES:
+        raise _UnsupportedColumn()
+    codes, _ = pd.factorize(column)
+    return codes
+
+
+def _truncate_dates(
+    aggregation: Aggregation, column: np.ndarray, operation: DateOperation, timezone: str
+) -> np.ndarray:
+    """Aggregation._apply_date_operation of each value"""
+    try:
+        days = _to_days(column)
+    except (TypeError, ValueError, OverflowError):
+        return _apply_date_operation(aggregation, column, operation, timezone)
+
+    day_codes, distinct_days = pd.factorize(_truncate_days(days, operation).astype(np.int64))
+    labels = np.datetime_as_string(distinct_days.astype("datetime64[D]"), unit="D").tolist()
+    return _object_array(labels)[day_codes]
+
+
+def _apply_date_operation(
+    aggregation: Aggregation, column: np.ndarray, operation: DateOperation, timezone: str
+) -> np.ndarray:
+    """Aggregation._apply_date_operation of each distinct value, for the values numpy can't parse"""
+    try:
+        codes, uniques = pd.factorize(column)
+    except TypeError:
+        raise _UnsupportedColumn()
+    if (codes == -1).any():
+        # missing dates are not handled by the one by one aggregation either, let it raise
+        raise _UnsupportedColumn()
+
+    truncated = [
+        aggregation._apply_date_operation(value.isoformat() if isinstance(value, date) else value, operation, timezone)
+        for value in uniques
+    ]
+    return _object_array(truncated)[codes]
+
+
+def _to_days(values: np.ndarray) -> np.ndarray:
+    """the dates of iso strings, dates or datetimes, as written (without timezone conversion)"""
+    types = set(map(type, values))
+    if types == {str}:
+        strings = np.array(values, dtype="U10")
+        if not (np.char.str_len(strings) == 10).all():
+            raise ValueError("Not an iso date")
+        return strings.astype("datetime64[D]")
+    if types == {date}:
+        return np.array(values, dtype="datetime64[D]")
+    if types == {datetime}:
+        index = pd.DatetimeIndex(pd.to_datetime(values))
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.values.astype("datetime64[D]")
+    raise TypeError("Not a date")
+
+
+def _truncate_days(days: np.ndarray, operation: DateOperation) -> np.ndarray:
+    if operation == DateOperation.YEAR:
+        return days.astype("datetime64[Y]").astype("datetime64[D]")
+    if operation == DateOperation.QUARTER:
+        months = days.astype("datetime64[M]").astype(np.int64)
+        return (months - months % 3).astype("datetime64[M]").astype("datetime64[D]")
+    if operation == DateOperation.MONTH:
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    if operation == DateOperation.WEEK:
+        weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 is a thursday
+        return days - weekdays.astype("timedelta64[D]")
+    return days
+
+
+def _aggregate(
+    aggregation: Aggregation, records: List[RecordsDataAlias], group_ids: np.ndarray, groups_count: int
+) -> List[Any]:
+    if aggregation.operation == Aggregator.COUNT and not aggregation.field:
+        return np.bincount(group_ids, minlength=groups_count).tolist()
+
+    column = _get_column(records, aggregation.field)
+    is_present = np.not_equal(column, None)
+    ids = group_ids[is_present]
+    counts = np.bincount(ids, minlength=groups_count).tolist()
+    if aggregation.operation == Aggregator.COUNT:
+        return counts
+
+    numbers = _to_numbers(aggregation.operation, column[is_present])
+    if aggregation.operation in (Aggregator.SUM, Aggregator.AVG):
+        sums = np.zeros(groups_count, dtype=numbers.dtype)
+        np.add.at(sums, ids, numbers)  # unbuffered: the values are added in the order of the records
+        if aggregation.operation == Aggregator.SUM:
+            return [total if count else 0 for total, count in zip(sums.tolist(), counts)]
+        return [total / count if count else _NO_AVERAGE for total, count in zip(sums.tolist(), counts)]
+
+    if aggregation.operation == Aggregator.MIN:
+        extremes = np.full(groups_count, _get_limits(numbers.dtype)[1], dtype=numbers.dtype)
+        np.minimum.at(extremes, ids, numbers)
+    else:
+        extremes = np.full(groups_count, _get_limits(numbers.dtype)[0], dtype=numbers.dtype)
+        np.maximum.at(extremes, ids, numbers)
+    return [extreme if count else None for extreme, count in zip(extremes.tolist(), counts)]
+
+
+def _to_numbers(operation: Aggregator, values: np.ndarray) -> np.ndarray:
+    types = set(map(type, values))
+    if types <= {int}:
+        try:
+            numbers = values.astype(np.int64)
+        except OverflowError:
+            raise _UnsupportedColumn()
+        # the sums must not overflow
+        if len(numbers) > 0 and max(-int(numbers.min()), int(numbers.max())) * len(numbers) >= 2**63:
+            raise _UnsupportedColumn()
+        return numbers
+
+    if types <= {float} or (types <= {int, float} and operation == Aggregator.AVG):
+        numbers = values.astype(np.float64)
+        if np.isnan(numbers).any():
+            raise _UnsupportedColumn()
+        return numbers
+
+    raise _UnsupportedColumn()
+
+
+def _get_limits(dtype: np.dtype) -> Tuple[Any, Any]:
+    if dtype == np.int64:
+        return np.iinfo(np.int64).min, np.iinfo(np.int64).max
+    return -np.inf, np.inf
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Callable
 
 from forestadmin.datasource_toolkit.exceptions import DatasourceToolkitException
 from forestadmin.datasource_toolkit.interfaces.models.collections import CollectionSchema
@@ -30,3 +30,19 @@ class RecordUtils:
             if current_record:
                 current_record = current_record.get(path)
         return current_record
+
+    @staticmethod
+    def get_field_getter(field: str) -> Callable[[RecordsDataAlias], Any]:
+        """get_field_value for a single field, with its path split once"""
+        path = field.split(":")
+        if len(path) == 1:
+            name = path[0]
+            return lambda record: record.get(name) if record else record
+
+        def get_value(record: RecordsDataAlias) -> Any:
+            for name in path:
+                if record:
+                    record = record.get(name)
+            return record
+
+        return get_value
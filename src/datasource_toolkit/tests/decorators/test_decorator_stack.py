@@ -1,6 +1,14 @@
+import asyncio
+import sys
 from unittest import TestCase
-from unittest.mock import call, patch
+from unittest.mock import AsyncMock, call, patch
 
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.agent_toolkit.utils.context import User
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.datasources import Datasource
 from forestadmin.datasource_toolkit.decorators.action.collections import ActionCollectionDecorator
@@ -22,7 +30,9 @@ from forestadmin.datasource_toolkit.decorators.search.collections import SearchC
 from forestadmin.datasource_toolkit.decorators.segments.collections import SegmentCollectionDecorator
 from forestadmin.datasource_toolkit.decorators.sort_emulate.collections import SortCollectionDecorator
 from forestadmin.datasource_toolkit.decorators.validation.collection import ValidationCollectionDecorator
-from forestadmin.datasource_toolkit.interfaces.fields import Column, FieldType, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.fields import Column, FieldType, ManyToOne, Operator, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.query.filter.paginated import PaginatedFilter
+from forestadmin.datasource_toolkit.interfaces.query.projections import Projection
 
 
 class TestDecoratorStack(TestCase):
@@ -97,3 +107,125 @@ class TestDecoratorStack(TestCase):
         for patcher, mocked, arg_list_expected in patched_datasource_decorators:
             mocked.assert_called_once_with(*arg_list_expected)
             patcher.stop()
+
+
+class TestDecoratorStackInertLayers(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.loop = asyncio.new_event_loop()
+        cls.mocked_caller = User(
+            rendering_id=1,
+            user_id=1,
+            tags={},
+            email="dummy@user.fr",
+            first_name="dummy",
+            last_name="user",
+            team="operational",
+            timezone=zoneinfo.ZoneInfo("Europe/Paris"),
+            request={"ip": "127.0.0.1"},
+        )
+
+    def setUp(self) -> None:
+        self.datasource: Datasource = Datasource()
+        Collection.__abstractmethods__ = set()  # to instantiate abstract class
+
+        self.collection_product = Collection("Product", self.datasource)
+        self.collection_product.add_fields(
+            {
+                "id": Column(
+                    column_type=PrimitiveType.NUMBER,
+                    is_primary_key=True,
+                    type=FieldType.COLUMN,
+                    filter_operators={Operator.EQUAL, Operator.IN},
+                ),
+                "name": Column(column_type=PrimitiveType.STRING, type=FieldType.COLUMN, filter_operators={}),
+            }
+        )
+        self.collection_order = Collection("Order", self.datasource)
+        self.collection_order.add_fields(
+            {
+                "id": Column(
+                    column_type=PrimitiveType.NUMBER,
+                    is_primary_key=True,
+                    type=FieldType.COLUMN,
+                    filter_operators={Operator.EQUAL, Operator.IN},
+                ),
+                "product_id": Column(
+                    column_type=PrimitiveType.NUMBER,
+                    type=FieldType.COLUMN,
+                    filter_operators={Operator.EQUAL, Operator.IN},
+                ),
+            }
+        )
+        self.datasource.add_collection(self.collection_product)
+        self.datasource.add_collection(self.collection_order)
+        self.records = [{"id": 1, "name": "Pen"}]
+        self.collection_product.list = AsyncMock(return_value=self.records)
+
+        self.stack = DecoratorStack(self.datasource)
+        self.loop.run_until_complete(self.stack.apply_queue_customization())
+
+    def _list(self, collection: Collection):
+        return self.loop.run_until_complete(
+            collection.list(self.mocked_caller, PaginatedFilter({}), Projection("id", "name"))
+        )
+
+    def test_should_bypass_the_layers_which_only_forward_the_calls(self):
+        product = self.stack.datasource.get_collection("Product")
+
+        # rename_field to segment are bypassed, search refines every filter
+        self.assertIs(product.list.__self__, self.stack.search.get_collection("Product"))
+        self.assertIs(product.render_chart.__func__, Collection.render_chart)
+        self.assertEqual(self._list(product), self.records)
+        self.collection_product.list.assert_awaited_once()
+
+        self.stack._unlink_inert_layers()
+        self.assertEqual(product.list.__func__, type(product).list)
+        self.assertEqual(self._list(product), self.records)
+
+    def test_should_link_the_layers_again_when_they_are_customized(self):
+        product = self.stack.datasource.get_collection("Product")
+        hook = AsyncMock()
+
+        async def _add_hook():
+            self.stack.hook.get_collection("Product").add_hook("Before", "List", hook)
+
+        self.stack.queue_customization(_add_hook)
+        self.loop.run_until_complete(self.stack.apply_queue_customization())
+
+        self.assertIs(product.list.__self__, self.stack.hook.get_collection("Product"))
+        self.assertIs(product.create.__self__, self.stack.write.get_collection("Product"))
+        self.assertEqual(self._list(product), self.records)
+        hook.assert_awaited_once()
+
+    def test_should_not_bypass_the_layers_customizing_the_related_collections(self):
+        async def _add_relation():
+            self.stack.relation.get_collection("Order").add_relation(
+                "product",
+                ManyToOne(
+                    type=FieldType.MANY_TO_ONE,
+                    foreign_collection="Product",
+                    foreign_key="product_id",
+                    foreign_key_target="id",
+                ),
+            )
+
+        self.stack.queue_customization(_add_relation)
+        self.loop.run_until_complete(self.stack.apply_queue_customization())
+
+        self.assertNotIn("list", self.stack.relation.get_collection("Product").__dict__)
+        self.assertNotIn("list", self.stack.relation.get_collection("Order").__dict__)
+        self.assertIn("list", self.stack.segment.get_collection("Product").__dict__)
+
+    def test_should_unlink_the_layers_when_their_schema_is_dirty(self):
+        product = self.stack.datasource.get_collection("Product")
+        segment = AsyncMock(return_value={"field": "id", "operator": "equal", "value": 1})
+
+        self.stack.segment.get_collection("Product").add_segment("first", segment)
+
+        self.assertNotIn("list", product.__dict__)
+        self.assertNotIn("list", self.stack.segment.get_collection("Product").__dict__)
+        self.loop.run_until_complete(
+            product.list(self.mocked_caller, PaginatedFilter({"segment": "first"}), Projection("id", "name"))
+        )
+        segment.assert_awaited_once()
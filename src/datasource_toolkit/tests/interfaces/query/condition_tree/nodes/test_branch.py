@@ -112,6 +112,41 @@ def test_match(mock_any: mock.MagicMock, mock_all: mock.MagicMock):
     condition1.match.assert_called_once_with(record, collection, timezone)  # type: ignore
 
 
+def test_compile():
+    collection: Collection = mock.MagicMock()
+    records = [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}, {"id": 3, "title": "b"}]
+    title_b = ConditionTreeLeaf("title", Operator.EQUAL, "b")
+    id_1 = ConditionTreeLeaf("id", Operator.EQUAL, 1)
+    id_2 = ConditionTreeLeaf("id", Operator.EQUAL, 2)
+
+    tree = ConditionTreeBranch(Aggregator.OR, [id_1, id_2])
+    assert tree.filter(records, collection, "UTC") == records[:2]
+
+    tree = ConditionTreeBranch(Aggregator.AND, [title_b, ConditionTreeBranch(Aggregator.OR, [id_1, id_2])])
+    assert tree.filter(records, collection, "UTC") == [records[1]]
+
+    assert ConditionTreeBranch(Aggregator.AND, [title_b]).compile(collection, "UTC")(records[2]) is True
+    assert ConditionTreeBranch(Aggregator.AND, []).compile(collection, "UTC")(records[0]) is True
+    assert ConditionTreeBranch(Aggregator.OR, []).compile(collection, "UTC")(records[0]) is False
+
+
+def test_compile_should_short_circuit():
+    collection: Collection = mock.MagicMock()
+    condition = MagicMock()
+    condition.compile = MagicMock(return_value=MagicMock(return_value=False))
+    condition1 = MagicMock()
+    condition1.compile = MagicMock(return_value=MagicMock(return_value=True))
+
+    predicate = ConditionTreeBranch(Aggregator.AND, [condition, condition1]).compile(collection, "UTC")
+    assert predicate({"id": 1}) is False
+    assert predicate({"id": 2}) is False
+
+    condition.compile.assert_called_once_with(collection, "UTC")
+    condition1.compile.assert_called_once_with(collection, "UTC")
+    assert condition.compile.return_value.call_count == 2
+    condition1.compile.return_value.assert_not_called()
+
+
 def test_apply():
     handler = mock.MagicMock()
     condition = MagicMock()
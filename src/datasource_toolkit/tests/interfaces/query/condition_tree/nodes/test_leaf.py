@@ -1,7 +1,15 @@
+import sys
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
 import pytest
-from forestadmin.datasource_toolkit.interfaces.fields import Operator
+from forestadmin.datasource_toolkit.collections import Collection as BaseCollection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, Operator, PrimitiveType
 from forestadmin.datasource_toolkit.interfaces.models.collections import Collection
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base import CallbackAlias, ReplacerAlias
 from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import (
@@ -501,3 +509,97 @@ def test_like():
 
     assert tree._like("tsaaazz") is False  # type: ignore
     assert tree._like("tssaaaz") is False  # type: ignore
+
+
+def _build_collection_book() -> BaseCollection:
+    datasource = Datasource()
+    with patch.object(BaseCollection, "__abstractmethods__", new_callable=set):
+        collection_book = BaseCollection("Book", datasource)  # type: ignore
+        collection_author = BaseCollection("Author", datasource)  # type: ignore
+    collection_book.add_fields(
+        {
+            "id": {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "is_primary_key": True},
+            "title": {"type": FieldType.COLUMN, "column_type": PrimitiveType.STRING},
+            "tags": {"type": FieldType.COLUMN, "column_type": [PrimitiveType.STRING]},
+            "author_id": {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER},
+            "author": {
+                "type": FieldType.MANY_TO_ONE,
+                "foreign_collection": "Author",
+                "foreign_key": "author_id",
+                "foreign_key_target": "id",
+            },
+        }
+    )
+    collection_author.add_fields(
+        {
+            "id": {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "is_primary_key": True},
+            "name": {"type": FieldType.COLUMN, "column_type": PrimitiveType.STRING},
+        }
+    )
+    datasource.add_collection(collection_book)
+    datasource.add_collection(collection_author)
+    return collection_book
+
+
+def test_compile_should_return_the_same_results_as_match():
+    collection = _build_collection_book()
+    timezone = zoneinfo.ZoneInfo("Europe/Paris")
+    records = [
+        {"id": 1, "title": "Foundation", "tags": ["sf"], "author": {"id": 1, "name": "Isaac Asimov"}},
+        {"id": 2, "title": "foundation and empire", "tags": ["sf", "saga"], "author": {"id": 1, "name": "Isaac"}},
+        {"id": 3, "title": "", "tags": [], "author": None},
+        {"id": 4, "title": None, "tags": ["novel"], "author": {"id": 2, "name": None}},
+        {"id": 5, "title": "a.b-c (1)", "tags": ["sf"]},
+    ]
+    leaves = [
+        ConditionTreeLeaf("id", Operator.EQUAL, 2),
+        ConditionTreeLeaf("id", Operator.NOT_EQUAL, 2),
+        ConditionTreeLeaf("id", Operator.LESS_THAN, 3),
+        ConditionTreeLeaf("id", Operator.GREATER_THAN, 3),
+        ConditionTreeLeaf("id", Operator.IN, [1, 4]),
+        ConditionTreeLeaf("id", Operator.NOT_IN, [1, 4]),
+        ConditionTreeLeaf("title", Operator.LIKE, "%ound_tion%"),
+        ConditionTreeLeaf("title", Operator.LIKE, "a.b-c (%)"),
+        ConditionTreeLeaf("title", Operator.CONTAINS, "ound"),
+        ConditionTreeLeaf("title", Operator.NOT_CONTAINS, "ound"),
+        ConditionTreeLeaf("title", Operator.STARTS_WITH, "Found"),
+        ConditionTreeLeaf("title", Operator.ENDS_WITH, "empire"),
+        ConditionTreeLeaf("tags", Operator.LONGER_THAN, 1),
+        ConditionTreeLeaf("title", Operator.PRESENT),
+        ConditionTreeLeaf("title", Operator.BLANK),
+        ConditionTreeLeaf("title", Operator.MISSING),
+        ConditionTreeLeaf("tags", Operator.INCLUDES_ALL, ["sf", "saga"]),
+        ConditionTreeLeaf("author:name", Operator.EQUAL, "Isaac"),
+        ConditionTreeLeaf("author:name", Operator.NOT_EQUAL, "Isaac"),
+        ConditionTreeLeaf("author:id", Operator.IN, [2]),
+    ]
+
+    for leaf in leaves:
+        predicate = leaf.compile(collection, timezone)
+        expected = [leaf.match(record, collection, timezone) for record in records]
+        assert [predicate(record) for record in records] == expected, repr(leaf)
+        assert leaf.filter(records, collection, timezone) == [
+            record for record, matches in zip(records, expected) if matches
+        ]
+
+
+def test_compile_should_prepare_the_like_regex_once():
+    collection = _build_collection_book()
+    tree = ConditionTreeLeaf("title", Operator.LIKE, "%ound_tion%")
+
+    with patch.object(tree, "_compile_like_regex", wraps=tree._compile_like_regex) as mock_compile_like_regex:
+        records = tree.filter([{"title": "Foundation"}, {"title": "found"}, {"title": None}], collection, "UTC")
+
+    assert records == [{"title": "Foundation"}]
+    mock_compile_like_regex.assert_called_once()
+
+
+def test_compile_should_raise_as_match():
+    collection = _build_collection_book()
+    predicate = ConditionTreeLeaf("title", Operator.LESS_THAN, 3).compile(collection, "UTC")
+
+    with pytest.raises(ConditionTreeLeafException, match=r"Should be numbers \(abc, 3\)"):
+        predicate({"title": "abc"})
+
+    with pytest.raises(ConditionTreeLeafException, match="You can't find an equivalent for this kind of field"):
+        ConditionTreeLeaf("author", Operator.PRESENT).compile(collection, "UTC")
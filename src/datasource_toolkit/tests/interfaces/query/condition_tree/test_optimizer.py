@@ -0,0 +1,184 @@
+import random
+import sys
+from typing import List
+
+if sys.version_info >= (3, 9):
+    import zoneinfo
+else:
+    from backports import zoneinfo
+
+from forestadmin.datasource_toolkit.collections import Collection
+from forestadmin.datasource_toolkit.datasources import Datasource
+from forestadmin.datasource_toolkit.interfaces.fields import FieldType, Operator, PrimitiveType
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.factory import ConditionTreeFactory
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.base import ConditionTree
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.branch import Aggregator, ConditionTreeBranch
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.nodes.leaf import ConditionTreeLeaf
+from forestadmin.datasource_toolkit.interfaces.query.condition_tree.optimizer import ConditionTreeOptimizer
+
+
+def _leaf(field: str, operator: Operator, value=None) -> ConditionTreeLeaf:
+    return ConditionTreeLeaf(field, operator, value)
+
+
+def _and(*conditions: ConditionTree) -> ConditionTreeBranch:
+    return ConditionTreeBranch(Aggregator.AND, list(conditions))
+
+
+def _or(*conditions: ConditionTree) -> ConditionTreeBranch:
+    return ConditionTreeBranch(Aggregator.OR, list(conditions))
+
+
+def test_optimize_should_keep_the_trees_which_cant_be_simplified():
+    assert ConditionTreeOptimizer.optimize(None) is None
+
+    leaf = _leaf("id", Operator.EQUAL, 1)
+    assert ConditionTreeOptimizer.optimize(leaf) is leaf
+
+    tree = _or(_leaf("id", Operator.GREATER_THAN, 1), _leaf("title", Operator.PRESENT))
+    assert ConditionTreeOptimizer.optimize(tree) == tree
+
+
+def test_optimize_should_flatten_the_branches():
+    tree = _and(
+        _or(_leaf("id", Operator.GREATER_THAN, 1)),
+        _and(_leaf("title", Operator.PRESENT), _and(_leaf("rating", Operator.LESS_THAN, 3))),
+    )
+
+    assert ConditionTreeOptimizer.optimize(tree) == _and(
+        _leaf("id", Operator.GREATER_THAN, 1),
+        _leaf("title", Operator.PRESENT),
+        _leaf("rating", Operator.LESS_THAN, 3),
+    )
+    assert ConditionTreeOptimizer.optimize(_and(_or(_leaf("title", Operator.PRESENT)))) == _leaf(
+        "title", Operator.PRESENT
+    )
+
+
+def test_optimize_should_remove_the_duplicated_conditions():
+    tree = _and(
+        _leaf("tags", Operator.EQUAL, ["a"]),
+        _leaf("title", Operator.CONTAINS, "a"),
+        _leaf("tags", Operator.EQUAL, ["a"]),
+        _leaf("title", Operator.CONTAINS, "a"),
+        _or(_leaf("rating", Operator.LESS_THAN, 3), _leaf("rating", Operator.BLANK)),
+        _or(_leaf("rating", Operator.LESS_THAN, 3), _leaf("rating", Operator.BLANK)),
+    )
+
+    assert ConditionTreeOptimizer.optimize(tree) == _and(
+        _leaf("tags", Operator.EQUAL, ["a"]),
+        _leaf("title", Operator.CONTAINS, "a"),
+        _or(_leaf("rating", Operator.LESS_THAN, 3), _leaf("rating", Operator.BLANK)),
+    )
+    assert ConditionTreeOptimizer.optimize(_leaf("id", Operator.IN, [1, 2, 1])) == _leaf("id", Operator.IN, [1, 2])
+
+
+def test_optimize_should_merge_the_in_conditions_of_an_or():
+    tree = _or(
+        _leaf("id", Operator.EQUAL, 1),
+        _leaf("title", Operator.PRESENT),
+        _leaf("id", Operator.IN, [2, 3]),
+        _or(_leaf("id", Operator.EQUAL, 3), _leaf("id", Operator.EQUAL, 4)),
+    )
+
+    assert ConditionTreeOptimizer.optimize(tree) == _or(
+        _leaf("id", Operator.IN, [1, 2, 3, 4]), _leaf("title", Operator.PRESENT)
+    )
+
+
+def test_optimize_should_merge_the_conditions_of_a_field_of_an_and():
+    not_in = _and(_leaf("id", Operator.NOT_EQUAL, 1), _leaf("id", Operator.NOT_IN, [1, 2]))
+    assert ConditionTreeOptimizer.optimize(not_in) == _leaf("id", Operator.NOT_IN, [1, 2])
+
+    in_ = _and(
+        _leaf("id", Operator.IN, [1, 2, 3, 4]),
+        _leaf("id", Operator.IN, [4, 3, 2]),
+        _leaf("id", Operator.NOT_EQUAL, 2),
+        _leaf("title", Operator.PRESENT),
+    )
+    assert ConditionTreeOptimizer.optimize(in_) == _and(
+        _leaf("id", Operator.IN, [3, 4]), _leaf("title", Operator.PRESENT)
+    )
+
+    equal = _and(_leaf("id", Operator.IN, [1, 2]), _leaf("id", Operator.NOT_IN, [2, 3]))
+    assert ConditionTreeOptimizer.optimize(equal) == _leaf("id", Operator.EQUAL, 1)
+
+
+def test_optimize_should_not_merge_the_conditions_holding_null_values():
+    for tree in [
+        _or(_leaf("id", Operator.EQUAL, None), _leaf("id", Operator.IN, [1, 2])),
+        _and(_leaf("id", Operator.IN, [None, 1]), _leaf("id", Operator.NOT_EQUAL, 1)),
+        _and(_leaf("id", Operator.NOT_IN, [None, 1]), _leaf("id", Operator.NOT_EQUAL, 2)),
+    ]:
+        assert ConditionTreeOptimizer.optimize(tree) == tree
+
+
+def test_optimize_should_fold_the_constant_conditions():
+    match_none = ConditionTreeFactory.MATCH_NONE
+    match_all = ConditionTreeFactory.MATCH_ALL
+
+    assert ConditionTreeOptimizer.optimize(_leaf("id", Operator.IN, [])) == match_none
+    assert ConditionTreeOptimizer.optimize(_leaf("id", Operator.NOT_IN, [])) is match_all
+    assert ConditionTreeOptimizer.optimize(_and()) is match_all
+    assert ConditionTreeOptimizer.optimize(_or()) == match_none
+
+    present = _leaf("title", Operator.PRESENT)
+    assert ConditionTreeOptimizer.optimize(_and(present, _leaf("id", Operator.IN, []))) == match_none
+    assert ConditionTreeOptimizer.optimize(_or(present, _leaf("id", Operator.IN, []))) == present
+    assert ConditionTreeOptimizer.optimize(_and(present, _leaf("id", Operator.NOT_IN, []))) == present
+    assert ConditionTreeOptimizer.optimize(_or(present, _leaf("id", Operator.NOT_IN, []))) is match_all
+
+
+def test_optimize_should_detect_the_contradictions():
+    for tree in [
+        _and(_leaf("id", Operator.EQUAL, 1), _leaf("id", Operator.EQUAL, 2)),
+        _and(_leaf("id", Operator.IN, [1, 2]), _leaf("id", Operator.NOT_IN, [2, 1])),
+        _and(_leaf("id", Operator.IN, [1, 2]), _or(_leaf("id", Operator.IN, [3]), _leaf("id", Operator.EQUAL, 4))),
+        _and(_leaf("title", Operator.PRESENT), _leaf("rating", Operator.EQUAL, 1), _leaf("title", Operator.BLANK)),
+        _and(_leaf("title", Operator.CONTAINS, "a"), _leaf("title", Operator.NOT_CONTAINS, "a")),
+        _and(_leaf("id", Operator.EQUAL, None), _leaf("id", Operator.NOT_EQUAL, None)),
+    ]:
+        assert ConditionTreeOptimizer.is_match_none(ConditionTreeOptimizer.optimize(tree)), tree
+
+    # a condition or its inverse doesn't match the null values
+    tree = _or(_leaf("id", Operator.EQUAL, 1), _leaf("id", Operator.NOT_EQUAL, 1))
+    assert ConditionTreeOptimizer.optimize(tree) == tree
+
+
+def test_optimize_should_match_the_same_records():
+    class BookCollection(Collection):
+        pass
+
+    BookCollection.__abstractmethods__ = set()
+    collection = BookCollection("book", Datasource())
+    collection.add_field("id", {"type": FieldType.COLUMN, "column_type": PrimitiveType.NUMBER, "is_primary_key": True})
+    collection.add_field("title", {"type": FieldType.COLUMN, "column_type": PrimitiveType.STRING})
+    timezone = zoneinfo.ZoneInfo("UTC")
+    records = [{"id": id_, "title": title} for id_ in [None, 1, 2, 3, 4] for title in [None, "", "a", "b"]]
+
+    rand = random.Random(42)
+
+    def build_tree(depth: int) -> ConditionTree:
+        if depth == 0 or rand.random() < 0.3:
+            return rand.choice(
+                [
+                    lambda: _leaf("id", rand.choice([Operator.EQUAL, Operator.NOT_EQUAL]), rand.choice([1, 2, 3])),
+                    lambda: _leaf("id", Operator.IN, rand.sample([1, 2, 3, 4], rand.randrange(4))),
+                    # `not_in []` can't be emulated
+                    lambda: _leaf("id", Operator.NOT_IN, rand.sample([1, 2, 3, 4], rand.randrange(1, 4))),
+                    lambda: _leaf("title", rand.choice([Operator.PRESENT, Operator.BLANK])),
+                    lambda: _leaf("title", rand.choice([Operator.EQUAL, Operator.NOT_EQUAL]), rand.choice(["a", "b"])),
+                ]
+            )()
+        conditions: List[ConditionTree] = [build_tree(depth - 1) for _ in range(rand.randrange(4))]
+        return ConditionTreeBranch(rand.choice([Aggregator.AND, Aggregator.OR]), conditions)
+
+    for _ in range(500):
+        tree = build_tree(3)
+        optimized = ConditionTreeOptimizer.optimize(tree)
+        for record in records:
+            expected = tree.match(record, collection, timezone)
+            if optimized is None:
+                assert expected is True, (tree, record)
+            else:
+                assert optimized.match(record, collection, timezone) == expected, (tree, optimized, record)
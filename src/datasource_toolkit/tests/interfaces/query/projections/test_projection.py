@@ -1,10 +1,16 @@
+import copy
+import pickle
 from typing import List
 from unittest import mock
 
 import pytest
 from forestadmin.datasource_toolkit.collections import Collection
 from forestadmin.datasource_toolkit.interfaces.fields import FieldType
-from forestadmin.datasource_toolkit.interfaces.query.projections import Projection, ProjectionException
+from forestadmin.datasource_toolkit.interfaces.query.projections import (
+    FrozenProjection,
+    Projection,
+    ProjectionException,
+)
 
 
 def test_projection_columns():
@@ -117,3 +123,93 @@ def test_equal():
     projection_1 = Projection("c2", "r1:c1", "c3", "c2")
     projection_2 = Projection("c2", "c3", "r1:c1")
     assert projection_1 == projection_2
+
+
+def test_union_should_keep_the_order_of_the_fields():
+    projection = Projection("a", "c", "b")
+    assert list(projection.union(["c", "d"], Projection("a", "e"))) == ["a", "c", "b", "d", "e"]
+
+
+def test_frozen_projection_should_behave_as_a_projection():
+    projection = Projection("c1", "c2", "r1:c1", "r1:r2:c1", "r2:c1").freeze()
+
+    assert isinstance(projection, FrozenProjection)
+    assert projection == Projection("c1", "c2", "r1:c1", "r1:r2:c1", "r2:c1")
+    assert projection.columns == ["c1", "c2"]
+    assert projection.relations == {"r1": Projection("c1", "r2:c1"), "r2": Projection("c1")}
+    assert projection.relations["unknown"] == Projection()
+    assert projection.nest("r3") == Projection("r3:c1", "r3:c2", "r3:r1:c1", "r3:r1:r2:c1", "r3:r2:c1")
+    assert projection.union(["c3"]) == Projection("c1", "c2", "r1:c1", "r1:r2:c1", "r2:c1", "c3")
+    assert projection._reproject({"c1": 1, "c2": 2, "r1": None, "r2": {"c1": 3}}) == {
+        "c1": 1,
+        "c2": 2,
+        "r1": None,
+        "r2": {"c1": 3},
+    }
+
+
+def test_frozen_projection_should_be_immutable_and_hashable():
+    projection = FrozenProjection("c2", "c1")
+
+    for method, args in [
+        ("append", ("c3",)),
+        ("extend", (["c3"],)),
+        ("insert", (0, "c3")),
+        ("remove", ("c1",)),
+        ("pop", ()),
+        ("clear", ()),
+        ("sort", ()),
+        ("__setitem__", (0, "c3")),
+    ]:
+        with pytest.raises(ProjectionException, match="Cannot modify a frozen projection."):
+            getattr(projection, method)(*args)
+    with pytest.raises(ProjectionException):
+        projection += ["c3"]
+    projection.columns.append("c3")
+
+    assert projection == ["c2", "c1"]
+    assert projection.columns == ["c2", "c1"]
+    assert hash(projection) == hash(FrozenProjection("c1", "c2"))
+    assert {projection: 1}[FrozenProjection("c1", "c2")] == 1
+    assert copy.deepcopy(projection) is projection
+    assert list(pickle.loads(pickle.dumps(projection))) == ["c2", "c1"]
+    assert isinstance(Projection(*projection), Projection)
+    assert not isinstance(Projection(*projection), FrozenProjection)
+
+
+def test_frozen_projection_should_cache_the_derived_projections():
+    projection = FrozenProjection("c1", "r1:c1")
+
+    assert projection.relations["r1"] is projection.relations["r1"]
+    assert isinstance(projection.relations["r1"], FrozenProjection)
+    assert projection.union(["c2"]) is projection.union(["c2"])
+    assert isinstance(projection.union(["c2"]), FrozenProjection)
+
+
+def test_frozen_projection_with_pks_should_be_cached_until_a_schema_changes():
+    projection = FrozenProjection("c1", "r1:c1")
+    with mock.patch.object(Collection, "__abstractmethods__", new_callable=set):
+        collection = Collection(name="t", datasource=mock.MagicMock())  # type: ignore
+        collection.add_fields(
+            {
+                "id": {"type": FieldType.COLUMN, "column_type": "Number", "is_primary_key": True},
+                "c1": {"type": FieldType.COLUMN, "column_type": "String"},
+                "r1": {"type": FieldType.MANY_TO_ONE, "foreign_collection": "t2"},
+            }
+        )
+        collection2 = Collection(name="t2", datasource=mock.MagicMock())  # type: ignore
+        collection2.add_fields(
+            {
+                "id": {"type": FieldType.COLUMN, "column_type": "Number", "is_primary_key": True},
+                "c1": {"type": FieldType.COLUMN, "column_type": "String"},
+            }
+        )
+        collection.datasource.get_collection.return_value = collection2
+
+        with_pks = projection.with_pks(collection)
+        assert with_pks == ["c1", "r1:c1", "id", "r1:id"]
+        assert isinstance(with_pks, FrozenProjection)
+        assert projection.with_pks(collection) is with_pks
+
+        collection2.add_field("id2", {"type": FieldType.COLUMN, "column_type": "Number", "is_primary_key": True})
+        assert projection.with_pks(collection) == ["c1", "r1:c1", "id", "r1:id", "r1:id2"]
@@ -540,6 +540,7 @@ def test_create_group(apply_date_operation_mock: mock.Mock, get_field_value_mock
     (
         (None, "2022-05-03T22:04:23.200Z"),
         (DateOperation.YEAR, "2022-01-01"),
+        (DateOperation.QUARTER, "2022-04-01"),
         (DateOperation.MONTH, "2022-05-01"),
         (DateOperation.DAY, "2022-05-03"),
         (DateOperation.WEEK, "2022-05-02"),
@@ -0,0 +1,137 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import patch
+
+from forestadmin.datasource_toolkit.interfaces.query.aggregation import Aggregation
+from forestadmin.datasource_toolkit.utils.columnar_aggregation import aggregate_columns
+
+
+class TestColumnarAggregation(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        rand = random.Random(42)
+        cls.records = []
+        for i in range(500):
+            created_at = datetime(2020, 1, 1) + timedelta(hours=rand.randrange(20_000))
+            cls.records.append(
+                {
+                    "id": i,
+                    "price": rand.choice([None, rand.randrange(-50, 100)]),
+                    "rate": rand.choice([None, rand.random() * 10]),
+                    "status": rand.choice(["pending", "paid", None]),
+                    "is_active": rand.choice([True, False]),
+                    "created_at": rand.choice(
+                        [
+                            f"{created_at.isoformat()}Z",
+                            created_at.replace(tzinfo=timezone(timedelta(hours=2))).isoformat(),
+                        ]
+                    ),
+                    "created_on": created_at.date(),
+                    "updated_at": created_at,
+                    "author": rand.choice([None, {"name": rand.choice(["Isaac", "Ursula"])}]),
+                }
+            )
+
+    def assert_same_as_one_by_one(self, aggregation: Aggregation, records=None):
+        records = records if records is not None else self.records
+        expected = aggregation._format_summaries(aggregation._create_summaries(records, "Europe/Paris"))
+        results = aggregate_columns(aggregation, records, "Europe/Paris")
+
+        self.assertIsNotNone(results)
+        self.assertEqual(results, expected)
+        self.assertEqual([type(row["value"]) for row in results], [type(row["value"]) for row in expected])
+
+    def test_should_aggregate_as_one_by_one(self):
+        groups = [
+            [],
+            [{"field": "status"}],
+            [{"field": "is_active"}, {"field": "author:name"}],
+        ]
+        for aggregation in [
+            *[{"operation": "Count", "groups": group} for group in groups],
+            *[{"field": "author:name", "operation": "Count", "groups": group} for group in groups],
+            *[
+                {"field": field, "operation": operation, "groups": group}
+                for field in ["price", "rate"]
+                for operation in ["Sum", "Avg", "Min", "Max"]
+                for group in groups
+            ],
+        ]:
+            with self.subTest(aggregation=aggregation):
+                self.assert_same_as_one_by_one(Aggregation(aggregation))
+
+    def test_should_group_by_date_as_one_by_one(self):
+        for field in ["created_at", "created_on", "updated_at"]:
+            for operation in ["Year", "Quarter", "Month", "Week", "Day"]:
+                with self.subTest(field=field, operation=operation):
+                    self.assert_same_as_one_by_one(
+                        Aggregation(
+                            {"field": "price", "operation": "Sum", "groups": [{"field": field, "operation": operation}]}
+                        )
+                    )
+
+    def test_should_group_by_dates_as_one_by_one(self):
+        aggregation = Aggregation({"operation": "Count", "groups": [{"field": "created_on"}]})
+
+        results = aggregate_columns(aggregation, self.records, "UTC")
+        self.assertIsInstance(results[0]["group"]["created_on"], str)
+        self.assert_same_as_one_by_one(aggregation)
+
+    def test_should_group_by_quarter(self):
+        records = [
+            {"created_at": "2022-01-31T10:00:00Z"},
+            {"created_at": "2022-03-31T23:00:00Z"},
+            {"created_at": "2022-04-01"},
+            {"created_at": "1969-12-31"},
+        ]
+        aggregation = Aggregation({"operation": "Count", "groups": [{"field": "created_at", "operation": "Quarter"}]})
+
+        self.assertEqual(
+            aggregate_columns(aggregation, records, "UTC"),
+            [
+                {"group": {"created_at": "2022-01-01"}, "value": 2},
+                {"group": {"created_at": "2022-04-01"}, "value": 1},
+                {"group": {"created_at": "1969-10-01"}, "value": 1},
+            ],
+        )
+        self.assert_same_as_one_by_one(aggregation, records)
+
+    def test_should_fallback_on_the_one_by_one_aggregation_of_the_dates_numpy_cant_parse(self):
+        records = [{"created_at": date(1, 5, 3)}, {"created_at": "2022-05-03"}, {"created_at": "2022-05-04T10:00"}]
+        aggregation = Aggregation({"operation": "Count", "groups": [{"field": "created_at", "operation": "Month"}]})
+
+        with patch.object(Aggregation, "_apply_date_operation", wraps=aggregation._apply_date_operation) as mock_apply:
+            self.assertEqual(
+                aggregate_columns(aggregation, records, "UTC"),
+                [
+                    {"group": {"created_at": "0001-05-01"}, "value": 1},
+                    {"group": {"created_at": "2022-05-01"}, "value": 2},
+                ],
+            )
+        self.assertEqual(mock_apply.call_count, 3)
+
+    def test_should_return_none_when_the_columns_cant_be_aggregated_as_one_by_one(self):
+        for records, aggregation in [
+            # 1 and 1.0 are different groups
+            ([{"rank": 1}, {"rank": 1.0}], {"operation": "Count", "groups": [{"field": "rank"}]}),
+            ([{"tags": ["a"]}], {"operation": "Count", "groups": [{"field": "tags"}]}),
+            ([{"price": 1}, {"price": 1.5}], {"field": "price", "operation": "Sum"}),
+            ([{"price": float("nan")}], {"field": "price", "operation": "Max"}),
+            ([{"price": 2**62}, {"price": 2**62}], {"field": "price", "operation": "Sum"}),
+            ([{"name": "a"}, {"name": "b"}], {"field": "name", "operation": "Min"}),
+            ([{"created_at": None}], {"operation": "Count", "groups": [{"field": "created_at", "operation": "Day"}]}),
+        ]:
+            with self.subTest(records=records, aggregation=aggregation):
+                self.assertIsNone(aggregate_columns(Aggregation(aggregation), records, "UTC"))
+
+    def test_apply_should_aggregate_large_lists_by_columns(self):
+        aggregation = Aggregation({"field": "price", "operation": "Sum", "groups": [{"field": "status"}]})
+        expected = aggregation._format_summaries(aggregation._create_summaries(self.records, "UTC"))
+
+        with patch("forestadmin.datasource_toolkit.interfaces.query.aggregation.COLUMNAR_AGGREGATION_MIN_RECORDS", 100):
+            with patch.object(aggregation, "_create_summaries") as mock_create_summaries:
+                results = aggregation.apply(self.records, "UTC", limit=2)
+
+        mock_create_summaries.assert_not_called()
+        self.assertEqual(results, sorted(expected, key=lambda row: row["value"])[:2])
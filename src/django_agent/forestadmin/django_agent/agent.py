@@ -29,7 +29,7 @@ class DjangoAgent(BaseAgent):
         super(DjangoAgent, self).__init__(config)
 
     def __parse_config(self) -> Options:
-        django_only_settings = ["FOREST_CUSTOMIZE_FUNCTION"]
+        django_only_settings = ["FOREST_CUSTOMIZE_FUNCTION", "FOREST_ASYNC_VIEWS"]
         if getattr(settings, "BASE_DIR", None) is not None:
             base_dir = settings.BASE_DIR
         else:
@@ -1,9 +1,12 @@
 import json
-from typing import Dict
+from typing import Dict, Optional, Union
 
+from django import VERSION as DJANGO_VERSION
+from django.core.handlers.asgi import ASGIRequest
 from django.http import HttpRequest as DjangoRequest
 from django.http import HttpResponse as DjangoResponse
-from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response
+from django.http import StreamingHttpResponse as DjangoStreamingResponse
+from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response, StreamingResponse
 
 
 def convert_request(django_request: DjangoRequest, path_params: Dict[str, str] = None) -> Request:
@@ -21,8 +24,17 @@ def convert_request(django_request: DjangoRequest, path_params: Dict[str, str] =
     return Request(method, **kwargs)
 
 
-def convert_response(response: Response) -> DjangoResponse:
-    if isinstance(response, FileResponse):
+def convert_response(
+    response: Union[Response, FileResponse, StreamingResponse], django_request: Optional[DjangoRequest] = None
+) -> DjangoResponse:
+    if isinstance(response, StreamingResponse):
+        # django >= 4.2 streams async iterators under asgi, but buffers them entirely under wsgi
+        if DJANGO_VERSION >= (4, 2) and isinstance(django_request, ASGIRequest):
+            content = response.body
+        else:
+            content = response.iter_body_sync()
+        return DjangoStreamingResponse(content, headers=response.headers, status=response.status)
+    elif isinstance(response, FileResponse):
         return DjangoResponse(
             response.file,
             headers={
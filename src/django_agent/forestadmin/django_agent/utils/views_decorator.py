@@ -1,6 +1,25 @@
+from asgiref.sync import async_to_sync
+from django import VERSION as DJANGO_VERSION
+from django.conf import settings
+from django.db import transaction
+
 try:
     from django.contrib.auth.decorators import login_not_required as no_django_login_required  # type: ignore
 except ImportError:
 
     def no_django_login_required(fn):
         return fn
+
+
+def async_views_enabled() -> bool:
+    return DJANGO_VERSION >= (4, 1) and bool(getattr(settings, "FOREST_ASYNC_VIEWS", False))
+
+
+def forest_view(fn):
+    """serve the coroutine as a native async view when FOREST_ASYNC_VIEWS is set (django >= 4.1)
+
+    Otherwise, it is served as a sync view (through async_to_sync), so ATOMIC_REQUESTS still wraps it in a transaction.
+    """
+    if async_views_enabled():
+        return transaction.non_atomic_requests(fn)
+    return async_to_sync(fn)
@@ -1,12 +1,11 @@
-from asgiref.sync import async_to_sync
 from django.http import HttpRequest
 from forestadmin.django_agent.apps import DjangoAgentApp
 from forestadmin.django_agent.utils.converter import convert_request, convert_response
-from forestadmin.django_agent.utils.views_decorator import no_django_login_required  # type: ignore
+from forestadmin.django_agent.utils.views_decorator import forest_view, no_django_login_required  # type: ignore
 
 
 @no_django_login_required
-@async_to_sync
+@forest_view
 async def hook(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["actions"]
     response = await resource.dispatch(convert_request(request, kwargs), "hook")
@@ -14,7 +13,7 @@ async def hook(request: HttpRequest, **kwargs):
 
 
 @no_django_login_required
-@async_to_sync
+@forest_view
 async def execute(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["actions"]
     response = await resource.dispatch(convert_request(request, kwargs), "execute")
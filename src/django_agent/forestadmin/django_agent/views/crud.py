@@ -1,14 +1,13 @@
-from asgiref.sync import async_to_sync
 from django.db import transaction
 from django.http import HttpRequest
 from forestadmin.django_agent.apps import DjangoAgentApp
 from forestadmin.django_agent.utils.converter import convert_request, convert_response
 from forestadmin.django_agent.utils.dispatcher import get_dispatcher_method
-from forestadmin.django_agent.utils.views_decorator import no_django_login_required  # type: ignore
+from forestadmin.django_agent.utils.views_decorator import forest_view, no_django_login_required  # type: ignore
 
 
 @no_django_login_required
-@async_to_sync
+@forest_view
 async def detail(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["crud"]
     action = get_dispatcher_method(request.method, True)
@@ -29,11 +28,11 @@ async def count(request: HttpRequest, **kwargs):
 async def csv(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["crud"]
     response = await resource.dispatch(convert_request(request, kwargs), "csv")
-    return convert_response(response)
+    return convert_response(response, request)
 
 
 @no_django_login_required
-@async_to_sync
+@forest_view
 async def list_(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["crud"]
     action = get_dispatcher_method(request.method, False)
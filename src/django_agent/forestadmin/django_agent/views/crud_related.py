@@ -1,10 +1,9 @@
-from asgiref.sync import async_to_sync
 from django.db import transaction
 from django.http import HttpRequest
 from forestadmin.django_agent.apps import DjangoAgentApp
 from forestadmin.django_agent.utils.converter import convert_request, convert_response
 from forestadmin.django_agent.utils.dispatcher import get_dispatcher_method
-from forestadmin.django_agent.utils.views_decorator import no_django_login_required  # type: ignore
+from forestadmin.django_agent.utils.views_decorator import forest_view, no_django_login_required  # type: ignore
 
 
 @no_django_login_required
@@ -20,11 +19,11 @@ async def count(request: HttpRequest, **kwargs):
 async def csv(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["crud_related"]
     response = await resource.dispatch(convert_request(request, kwargs), "csv")
-    return convert_response(response)
+    return convert_response(response, request)
 
 
 @no_django_login_required
-@async_to_sync
+@forest_view
 async def list_(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["crud_related"]
     action = get_dispatcher_method(request.method, False)
@@ -1,3 +1,5 @@
+import json
+
 from django.db import transaction
 from django.http import HttpRequest, HttpResponse
 from forestadmin.django_agent.apps import DjangoAgentApp
@@ -13,7 +15,13 @@ async def index(request: HttpRequest):
 @no_django_login_required
 @transaction.non_atomic_requests
 async def scope_cache_invalidation(request: HttpRequest):
-    DjangoAgentApp.get_agent()._permission_service.invalidate_cache("forest.rendering")
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        body = None
+    DjangoAgentApp.get_agent()._permission_service.invalidate_rendering_cache(
+        body.get("renderingId") if isinstance(body, dict) else None
+    )
     return HttpResponse(status=204)
 
 
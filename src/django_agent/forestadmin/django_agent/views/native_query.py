@@ -1,10 +1,10 @@
-from asgiref.sync import async_to_sync
 from django.http import HttpRequest
 from forestadmin.django_agent.apps import DjangoAgentApp
 from forestadmin.django_agent.utils.converter import convert_request, convert_response
+from forestadmin.django_agent.utils.views_decorator import forest_view
 
 
-@async_to_sync
+@forest_view
 async def native_query(request: HttpRequest, **kwargs):
     resource = (await DjangoAgentApp.get_agent().get_resources())["native_query"]
     response = await resource.dispatch(convert_request(request, kwargs), "native_query")
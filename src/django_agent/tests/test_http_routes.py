@@ -1,12 +1,14 @@
 import asyncio
+import importlib
 import json
 from io import BytesIO
 from unittest.mock import ANY, AsyncMock, patch
 
 from django.apps.registry import apps
-from django.test import TestCase
-from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response
+from django.test import RequestFactory, TestCase, override_settings
+from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response, StreamingResponse
 from forestadmin.django_agent.agent import DjangoAgent
+from forestadmin.django_agent.views import crud as crud_views
 
 
 class TestDjangoAgentRoutes(TestCase):
@@ -97,8 +99,8 @@ class TestDjangoAgentGenericRoutes(TestDjangoAgentRoutes):
     def test_scope_cache_invalidation(self):
         with patch.object(
             self.django_agent._permission_service,
-            "invalidate_cache",
-            spy=self.django_agent._permission_service.invalidate_cache,
+            "invalidate_rendering_cache",
+            spy=self.django_agent._permission_service.invalidate_rendering_cache,
         ) as spy_invalidate:
             response = self.client.get(
                 f"/{self.conf_prefix}forest/scope-cache-invalidation",
@@ -106,7 +108,22 @@ class TestDjangoAgentGenericRoutes(TestDjangoAgentRoutes):
             )
             self.assertEqual(response.status_code, 204)
             self.assertEqual(response.content, b"")
-            spy_invalidate.assert_called_once_with("forest.rendering")
+            spy_invalidate.assert_called_once_with(None)
+
+    def test_scope_cache_invalidation_of_a_rendering(self):
+        with patch.object(
+            self.django_agent._permission_service,
+            "invalidate_rendering_cache",
+            spy=self.django_agent._permission_service.invalidate_rendering_cache,
+        ) as spy_invalidate:
+            response = self.client.post(
+                f"/{self.conf_prefix}forest/scope-cache-invalidation",
+                {"renderingId": 12},
+                content_type="application/json",
+                HTTP_X_FORWARDED_FOR="179.114.131.49",
+            )
+            self.assertEqual(response.status_code, 204)
+            spy_invalidate.assert_called_once_with(12)
 
 
 class TestDjangoAgentAuthenticationRoutes(TestDjangoAgentRoutes):
@@ -277,6 +294,22 @@ class TestDjangoAgentCrudRoutes(TestDjangoAgentRoutes):
         self.assertEqual(response.headers["Content-Disposition"], "attachment; filename=text.csv")
         self.assertEqual(response.content, b"test file")
 
+    def test_csv_should_stream_streaming_responses(self):
+        async def body():
+            yield "id,name\r\n"
+            yield "1,foo\r\n"
+
+        streaming_response = StreamingResponse(
+            200, body(), headers={"content-type": "text/csv", "Content-Disposition": 'attachment; filename="test.csv"'}
+        )
+        with patch.object(self.crud_resource, "dispatch", new_callable=AsyncMock, return_value=streaming_response):
+            response = self.client.get(f"/{self.conf_prefix}forest/customer.csv")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.headers["Content-Type"], "text/csv")
+        self.assertEqual(b"".join(response.streaming_content), b"id,name\r\n1,foo\r\n")
+
     def test_add(self):
         self.client.post(
             f"/{self.conf_prefix}forest/customer",
@@ -506,3 +539,32 @@ class TestDjangoAgentNativeQueryRoutes(TestDjangoAgentRoutes):
                 client_ip="127.0.0.1",
             ),
         )
+
+
+class TestDjangoAgentAsyncViews(TestDjangoAgentRoutes):
+    def tearDown(self) -> None:
+        importlib.reload(crud_views)
+
+    def test_views_should_be_sync_by_default(self):
+        self.assertFalse(asyncio.iscoroutinefunction(crud_views.list_))
+        self.assertFalse(asyncio.iscoroutinefunction(crud_views.detail))
+
+    def test_views_should_be_native_async_views_when_enabled(self):
+        with override_settings(FOREST_ASYNC_VIEWS=True):
+            importlib.reload(crud_views)
+        self.assertTrue(asyncio.iscoroutinefunction(crud_views.list_))
+        self.assertTrue(asyncio.iscoroutinefunction(crud_views.detail))
+        self.assertTrue(getattr(crud_views.list_, "_non_atomic_requests", None))
+
+        request = RequestFactory().get("/forest/customer?timezone=Europe%2FParis")
+        response = self.loop.run_until_complete(crud_views.list_(request, collection_name="customer"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"mock": "ok"}')
+        self.mocked_resources["crud"].dispatch.assert_awaited_with(ANY, "list")
+
+    def test_views_should_stay_sync_before_django_4_1(self):
+        with override_settings(FOREST_ASYNC_VIEWS=True), patch(
+            "forestadmin.django_agent.utils.views_decorator.DJANGO_VERSION", (4, 0, 0, "final", 0)
+        ):
+            importlib.reload(crud_views)
+        self.assertFalse(asyncio.iscoroutinefunction(crud_views.list_))
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import os
 import sys
 from importlib.metadata import version
@@ -22,6 +23,7 @@ from forestadmin.agent_toolkit.utils.context import Request
 from forestadmin.agent_toolkit.utils.forest_schema.type import AgentMeta
 from forestadmin.flask_agent.exception import FlaskAgentException
 from forestadmin.flask_agent.utils.dispatcher import get_dispatcher_method
+from forestadmin.flask_agent.utils.event_loop import BackgroundEventLoop, EventLoopMetrics
 from forestadmin.flask_agent.utils.requests import convert_request, convert_response
 
 
@@ -35,9 +37,18 @@ class FlaskAgent(BaseAgent):
         "stack": {"engine": "python", "engine_version": ".".join(map(str, [*sys.version_info[:3]]))},
     }
 
-    def __init__(self, app: Flask):
-        self.loop = asyncio.new_event_loop()
+    def __init__(self, app: Flask, background_loop: Optional[bool] = None):
+        """with background_loop (or the FOREST_BACKGROUND_LOOP setting), the agent runs one event loop in a thread
+        for its whole life, and the views submit their work to it instead of running on a loop per request"""
         self._app = app
+        if background_loop is None:
+            background_loop = bool(app.config.get("FOREST_BACKGROUND_LOOP", False))
+        self.background_loop: Optional[BackgroundEventLoop] = None
+        if background_loop:
+            self.background_loop = BackgroundEventLoop()
+            self.loop = self.background_loop.loop
+        else:
+            self.loop = asyncio.new_event_loop()
         super(FlaskAgent, self).__init__(self.__parse_config(app.config))
 
         self._blueprint: Optional[Blueprint] = build_blueprint(self)
@@ -46,12 +57,16 @@ class FlaskAgent(BaseAgent):
         self._app.register_blueprint(self.blueprint, url_prefix=f'{self.options["prefix"]}/forest')
 
     def __parse_config(self, flask_settings: Config) -> Options:
+        flask_only_settings = ["FOREST_BACKGROUND_LOOP"]
         settings: Options = {"schema_path": os.path.join(self._app.root_path, ".forestadmin-schema.json")}
 
         for key, value in flask_settings.items():
             if not key.upper().startswith("FOREST_"):
                 continue
 
+            if key.upper() in flask_only_settings:
+                continue
+
             forest_key = key.lower().replace("forest_", "")
             # Options.__annotations__ is a dict of {key_name:type_class}
             if forest_key not in Options.__annotations__.keys():
@@ -83,13 +98,22 @@ class FlaskAgent(BaseAgent):
         # if not os.environ.get("FLASK_RUN_FROM_CLI") == "true" or (  # run from wsgi process
         #     self._app.debug is not True and os.environ.get("WERKZEUG_RUN_MAIN") == "true"
         # ):
-        self.loop.run_until_complete(self._start())
+        if self.background_loop is not None:
+            self.background_loop.start()
+            self.background_loop.run(self._start())
+        else:
+            self.loop.run_until_complete(self._start())
         ForestLogger.log("info", "Flask agent initialized")
 
+    def get_event_loop_metrics(self) -> Optional[EventLoopMetrics]:
+        if self.background_loop is None:
+            return None
+        return self.background_loop.get_metrics()
+
 
-def create_agent(app: Flask) -> FlaskAgent:
+def create_agent(app: Flask, background_loop: Optional[bool] = None) -> FlaskAgent:
     with app.app_context():
-        agent = FlaskAgent(app)
+        agent = FlaskAgent(app, background_loop)
     return agent
 
 
@@ -102,6 +126,21 @@ def build_blueprint(agent: FlaskAgent):  # noqa: C901
     blueprint = Blueprint("flask_forest", __name__)
     blueprint.after_request(_after_request)
 
+    def _route(rule: str, **options):
+        def decorator(view):
+            if agent.background_loop is None:
+                return blueprint.route(rule, **options)(view)
+
+            @functools.wraps(view)
+            def submit_to_agent_loop(**kwargs):
+                # the body is read here, the loop thread must not block on the wsgi stream
+                request.get_data()
+                return agent.background_loop.run(view(**kwargs))
+
+            return blueprint.route(rule, **options)(submit_to_agent_loop)
+
+        return decorator
+
     def _get_dispatch(
         request: FlaskRequest,
         method: Union[CrudLiteralMethod, AuthLiteralMethod, Literal["execute", "hook"], None] = None,
@@ -128,89 +167,92 @@ def build_blueprint(agent: FlaskAgent):  # noqa: C901
         detail: bool = False,
     ) -> FlaskResponse:
         response = await resource.dispatch(*_get_dispatch(request, method=method, detail=detail))
-        return convert_response(response)
+        return convert_response(response, agent.background_loop.loop if agent.background_loop else None)
 
-    @blueprint.route("", methods=["GET"])
+    @_route("", methods=["GET"])
     async def index() -> FlaskResponse:  # type: ignore
         rsp = FlaskResponse()
         rsp.status = 200
         return rsp
 
-    @blueprint.route("/_internal/capabilities", methods=["POST"])
+    @_route("/_internal/capabilities", methods=["POST"])
     async def capabilities() -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["capabilities"], "capabilities")
 
-    @blueprint.route("/_internal/native_query", methods=["POST"])
+    @_route("/_internal/native_query", methods=["POST"])
     async def native_query() -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["native_query"], "native_query")
 
-    @blueprint.route("/authentication/callback", methods=["GET"])
+    @_route("/authentication/callback", methods=["GET"])
     async def callback() -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["authentication"], "callback")
 
-    @blueprint.route("/authentication", methods=["POST"])
+    @_route("/authentication", methods=["POST"])
     async def authentication() -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["authentication"], "authenticate")
 
-    @blueprint.route("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/load", methods=["POST"])
+    @_route("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/load", methods=["POST"])
     async def load_hook(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["actions"], "hook")
 
-    @blueprint.route("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/change", methods=["POST"])
+    @_route("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/change", methods=["POST"])
     async def change_hook(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["actions"], "hook")
 
-    @blueprint.route("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/search", methods=["POST"])
+    @_route("/_actions/<collection_name>/<int:action_name>/<slug>/hooks/search", methods=["POST"])
     async def search_hook(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["actions"], "hook")
 
-    @blueprint.route("/_actions/<collection_name>/<int:action_name>/<slug>", methods=["POST"])
+    @_route("/_actions/<collection_name>/<int:action_name>/<slug>", methods=["POST"])
     async def actions(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["actions"], "execute")
 
-    @blueprint.route("/stats/<collection_name>", methods=["POST"])
+    @_route("/stats/<collection_name>", methods=["POST"])
     async def stats(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["stats"])
 
-    @blueprint.route("/_charts/<chart_name>", methods=["POST", "GET"])
+    @_route("/_charts/<chart_name>", methods=["POST", "GET"])
     async def charts(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["datasource_charts"])
 
-    @blueprint.route("/_charts/<collection_name>/<chart_name>", methods=["POST", "GET"])
+    @_route("/_charts/<collection_name>/<chart_name>", methods=["POST", "GET"])
     async def charts_collection(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["collection_charts"])
 
-    @blueprint.route("/<collection_name>/count", methods=["GET"])
+    @_route("/<collection_name>/count", methods=["GET"])
     async def count(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud"], "count")
 
-    @blueprint.route("/<collection_name>/<pks>", methods=["GET", "PUT", "DELETE"])
+    @_route("/<collection_name>/<pks>", methods=["GET", "PUT", "DELETE"])
     async def detail(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud"], detail=True)
 
-    @blueprint.route("/<collection_name>", methods=["GET", "POST", "DELETE"])
+    @_route("/<collection_name>", methods=["GET", "POST", "DELETE"])
     async def list_(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud"])
 
-    @blueprint.route("/<collection_name>.csv", methods=["GET"])
+    @_route("/<collection_name>.csv", methods=["GET"])
     async def csv(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud"], "csv")
 
-    @blueprint.route("/<collection_name>/<pks>/relationships/<relation_name>", methods=["GET", "POST", "DELETE", "PUT"])
+    @_route("/<collection_name>/<pks>/relationships/<relation_name>", methods=["GET", "POST", "DELETE", "PUT"])
     async def list_related(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud_related"])
 
-    @blueprint.route("/<collection_name>/<pks>/relationships/<relation_name>/count", methods=["GET"])
+    @_route("/<collection_name>/<pks>/relationships/<relation_name>/count", methods=["GET"])
     async def count_related(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud_related"], "count")
 
-    @blueprint.route("/<collection_name>/<pks>/relationships/<relation_name>.csv", methods=["GET"])
+    @_route("/<collection_name>/<pks>/relationships/<relation_name>.csv", methods=["GET"])
     async def csv_related(**_) -> FlaskResponse:  # type: ignore
         return await _get_collection_response(request, (await agent.get_resources())["crud_related"], "csv")
 
-    @blueprint.route("/scope-cache-invalidation", methods=["POST"])
+    @_route("/scope-cache-invalidation", methods=["POST"])
     async def scope_cache_invalidation(**_) -> FlaskResponse:  # type: ignore
-        agent._permission_service.invalidate_cache("forest.rendering")
+        body = request.get_json(silent=True)
+        agent._permission_service.invalidate_rendering_cache(
+            body.get("renderingId") if isinstance(body, dict) else None
+        )
         rsp = FlaskResponse(status=204)
         return rsp
 
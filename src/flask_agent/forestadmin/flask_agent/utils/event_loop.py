@@ -0,0 +1,112 @@
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Any, Coroutine, Optional, TypedDict, TypeVar
+
+from forestadmin.flask_agent.exception import FlaskAgentException
+
+T = TypeVar("T")
+
+
+class EventLoopMetrics(TypedDict):
+    queue_depth: int
+    max_queue_depth: int
+    in_flight: int
+    loop_lag: float
+    max_loop_lag: float
+
+
+class BackgroundEventLoop:
+    """event loop running forever in a daemon thread, the flask views submit their coroutines to it
+
+    queue_depth is the number of submitted coroutines waiting for the loop to start them, in_flight the number of
+    started and not finished ones. loop_lag is the delay (in seconds) the loop takes to wake up a sleeping task.
+    """
+
+    def __init__(self, lag_probe_interval: float = 0.5):
+        self.loop = asyncio.new_event_loop()
+        self._lag_probe_interval = lag_probe_interval
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._in_flight = 0
+        self._loop_lag = 0.0
+        self._max_loop_lag = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._thread = threading.Thread(target=self._run_forever, name="forest-event-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def run(self, coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """run the coroutine on the loop thread and wait for its result
+
+        The coroutine runs in a copy of the caller context, so flask request context stays available.
+        """
+        if not self.is_running:
+            coroutine.close()
+            raise FlaskAgentException("The agent event loop is not running.")
+
+        with self._lock:
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_in_context(coroutine, contextvars.copy_context()), self.loop
+        )
+        return future.result(timeout)
+
+    def get_metrics(self) -> EventLoopMetrics:
+        with self._lock:
+            return {
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "in_flight": self._in_flight,
+                "loop_lag": self._loop_lag,
+                "max_loop_lag": self._max_loop_lag,
+            }
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.create_task(self._probe_lag())
+        try:
+            self.loop.run_forever()
+        finally:
+            # the lag probe, and the tasks closing the http sessions bound to this loop
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    async def _run_in_context(self, coroutine: Coroutine[Any, Any, T], context: contextvars.Context) -> T:
+        with self._lock:
+            self._queue_depth -= 1
+            self._in_flight += 1
+        try:
+            # a task created inside context.run works on a copy of this context
+            return await context.run(asyncio.ensure_future, coroutine)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def _probe_lag(self):
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self._lag_probe_interval)
+            lag = max(0.0, time.perf_counter() - before - self._lag_probe_interval)
+            with self._lock:
+                self._loop_lag = lag
+                self._max_loop_lag = max(self._max_loop_lag, lag)
@@ -1,8 +1,9 @@
-from typing import Any, Dict, Union
+import asyncio
+from typing import Any, Dict, Optional, Union
 
 from flask.wrappers import Request as FlaskRequest
 from flask.wrappers import Response as FlaskResponse
-from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response
+from forestadmin.agent_toolkit.utils.context import FileResponse, Request, RequestMethod, Response, StreamingResponse
 
 HTTP_METHOD_MAPPING = {
     "GET": RequestMethod.GET,
@@ -25,7 +26,9 @@ def convert_request(flask_request: FlaskRequest):
     return Request(method, **kwargs)
 
 
-def convert_response(response: Union[Response, FileResponse]) -> FlaskResponse:
+def convert_response(
+    response: Union[Response, FileResponse, StreamingResponse], loop: Optional[asyncio.AbstractEventLoop] = None
+) -> FlaskResponse:
     if isinstance(response, FileResponse):
         flask_response = FlaskResponse(
             response.file,
@@ -35,6 +38,8 @@ def convert_response(response: Union[Response, FileResponse]) -> FlaskResponse:
                 **response.headers,
             },
         )
+    elif isinstance(response, StreamingResponse):
+        flask_response = FlaskResponse(response.iter_body_sync(loop), status=response.status, headers=response.headers)
     else:
         flask_response = FlaskResponse(response.body)
         for name, value in response.headers.items():
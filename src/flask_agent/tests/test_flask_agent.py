@@ -1,3 +1,4 @@
+import asyncio
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
@@ -97,3 +98,30 @@ class TestFlaskAgent(TestCase):
         with patch.dict(self.flask_app.extensions, {"csrf": csrf_extension_mock}):
             agent = FlaskAgent(self.flask_app)
             csrf_extension_mock.exempt.assert_called_once_with(agent._blueprint)
+
+    def test_background_loop_should_be_enabled_by_setting(self):
+        agent = FlaskAgent(self.flask_app)
+        assert agent.background_loop is None
+        assert agent.get_event_loop_metrics() is None
+
+        with patch.dict(self.flask_app.config, {"FOREST_BACKGROUND_LOOP": True}):
+            agent = FlaskAgent(self.flask_app)
+        assert agent.background_loop is not None
+        assert agent.loop is agent.background_loop.loop
+        assert "background_loop" not in agent.options
+
+    def test_start_should_run_the_agent_start_on_the_background_loop(self):
+        agent = create_agent(self.flask_app, background_loop=True)
+        loops = []
+
+        async def _start():
+            loops.append(asyncio.get_running_loop())
+
+        try:
+            with patch.object(agent, "_start", new=_start):
+                agent.start()
+            assert agent.background_loop.is_running
+            assert loops == [agent.loop]
+            assert agent.get_event_loop_metrics()["queue_depth"] == 0
+        finally:
+            agent.background_loop.stop()
@@ -3,7 +3,7 @@ from unittest import TestCase
 from unittest.mock import ANY, AsyncMock, patch
 
 from flask import Flask
-from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, Response
+from forestadmin.agent_toolkit.utils.context import Request, RequestMethod, Response, StreamingResponse
 from forestadmin.flask_agent.agent import create_agent
 
 
@@ -277,7 +277,74 @@ class TestFlaskAgentBlueprint(TestCase):
         )
 
     def test_invalidate_cache(self):
-        with patch.object(self.agent._permission_service, "invalidate_cache") as mocked_invalidate_cache:
+        with patch.object(self.agent._permission_service, "invalidate_rendering_cache") as mocked_invalidate_cache:
+            response = self.client.post("/forest/scope-cache-invalidation", json={"renderingId": 12})
+            mocked_invalidate_cache.assert_called_with(12)
+        assert response.status_code == 204
+
+        with patch.object(self.agent._permission_service, "invalidate_rendering_cache") as mocked_invalidate_cache:
             response = self.client.post("/forest/scope-cache-invalidation")
-            mocked_invalidate_cache.assert_called_with("forest.rendering")
+            mocked_invalidate_cache.assert_called_with(None)
         assert response.status_code == 204
+
+
+class TestFlaskAgentBlueprintBackgroundLoop(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.mocked_resources = {"crud": AsyncMock()}
+        cls.app = Flask(__name__)
+        cls.app.config.update(
+            {
+                "FOREST_ENV_SECRET": "da4fc9331a68a18c2262154c74d9acb22f335724c8f2a510f8df187fa808703e",
+                "FOREST_AUTH_SECRET": "fake",
+                "FOREST_BACKGROUND_LOOP": True,
+            }
+        )
+        cls.get_resources_patcher = patch(
+            "forestadmin.agent_toolkit.agent.Agent.get_resources",
+            return_value=cls.mocked_resources,
+            new_callable=AsyncMock,
+        )
+        cls.get_resources_patcher.start()
+        cls.agent = create_agent(cls.app)
+        cls.agent.background_loop.start()
+        cls.client = cls.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.agent.background_loop.stop()
+        cls.get_resources_patcher.stop()
+
+    def test_requests_should_be_dispatched_on_the_agent_loop(self):
+        loops = []
+
+        async def _dispatch(request, method):
+            loops.append(asyncio.get_running_loop())
+            return Response(200, '{"mock": "ok"}', headers={"content-type": "application/json"})
+
+        self.mocked_resources["crud"].dispatch = AsyncMock(side_effect=_dispatch)
+        for _ in range(3):
+            response = self.client.post("/forest/customer?timezone=Europe%2FParis", json={"data": {}})
+            assert response.status_code == 200
+            assert response.json == {"mock": "ok"}
+
+        self.assertEqual(loops, [self.agent.loop] * 3)
+        request = self.mocked_resources["crud"].dispatch.await_args.args[0]
+        self.assertEqual(request.body, {"data": {}})
+        self.assertEqual(request.query, {"timezone": "Europe/Paris", "collection_name": "customer"})
+
+    def test_streamed_body_should_be_consumed_on_the_agent_loop(self):
+        loops = []
+
+        async def _body():
+            loops.append(asyncio.get_running_loop())
+            yield "id\n"
+            yield "1\n"
+
+        self.mocked_resources["crud"].dispatch = AsyncMock(
+            return_value=StreamingResponse(200, _body(), headers={"content-type": "text/csv"})
+        )
+        response = self.client.get("/forest/customer.csv")
+        assert response.status_code == 200
+        assert response.data == b"id\n1\n"
+        self.assertEqual(loops, [self.agent.loop])
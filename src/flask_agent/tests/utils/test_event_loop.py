@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from forestadmin.flask_agent.exception import FlaskAgentException
+from forestadmin.flask_agent.utils.event_loop import BackgroundEventLoop
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class TestBackgroundEventLoop(TestCase):
+    def setUp(self):
+        self.background_loop = BackgroundEventLoop(lag_probe_interval=0.01)
+        self.background_loop.start()
+
+    def tearDown(self):
+        self.background_loop.stop()
+
+    def test_run_should_return_the_coroutine_result_computed_on_the_loop_thread(self):
+        async def _coroutine():
+            return threading.current_thread().name, asyncio.get_running_loop()
+
+        thread_name, loop = self.background_loop.run(_coroutine())
+        self.assertEqual(thread_name, "forest-event-loop")
+        self.assertIs(loop, self.background_loop.loop)
+
+    def test_run_should_raise_the_coroutine_exception(self):
+        async def _coroutine():
+            raise ValueError("boom")
+
+        self.assertRaisesRegex(ValueError, "boom", self.background_loop.run, _coroutine())
+
+    def test_run_should_keep_the_caller_context(self):
+        async def _coroutine():
+            return request_id.get()
+
+        def _call(value):
+            request_id.set(value)
+            return self.background_loop.run(_coroutine())
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual([*executor.map(_call, range(8))], [*range(8)])
+
+    def test_run_should_raise_when_the_loop_is_not_running(self):
+        self.background_loop.stop()
+
+        async def _coroutine():
+            pass
+
+        self.assertRaisesRegex(
+            FlaskAgentException, r"The agent event loop is not running.", self.background_loop.run, _coroutine()
+        )
+
+    def test_metrics_should_report_queue_depth_and_loop_lag(self):
+        release = threading.Event()
+
+        async def _block_loop():
+            # freeze the loop thread so the next submissions wait in the queue
+            release.wait(1)
+            time.sleep(0.05)
+
+        async def _noop():
+            pass
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            blocking = executor.submit(self.background_loop.run, _block_loop())
+            time.sleep(0.02)
+            waiting = [executor.submit(self.background_loop.run, _noop()) for _ in range(3)]
+            time.sleep(0.02)
+            metrics = self.background_loop.get_metrics()
+            self.assertEqual(metrics["queue_depth"], 3)
+            self.assertEqual(metrics["in_flight"], 1)
+            release.set()
+            blocking.result()
+            [future.result() for future in waiting]
+
+        time.sleep(0.05)
+        metrics = self.background_loop.get_metrics()
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(metrics["max_queue_depth"], 3)
+        self.assertGreaterEqual(metrics["max_loop_lag"], 0.05)
+
+    def test_stop_should_cancel_the_pending_tasks(self):
+        cancelled = threading.Event()
+
+        async def _wait_forever():
+            try:
+                await asyncio.get_running_loop().create_future()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def _start_task():
+            asyncio.get_running_loop().create_task(_wait_forever())
+
+        self.background_loop.run(_start_task())
+        self.background_loop.stop()
+        self.assertTrue(cancelled.is_set())
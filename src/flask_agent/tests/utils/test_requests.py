@@ -4,7 +4,7 @@ from unittest.mock import Mock
 
 from flask.wrappers import Request as FlaskRequest
 from flask.wrappers import Response as FlaskResponse
-from forestadmin.agent_toolkit.utils.context import FileResponse, Request, Response
+from forestadmin.agent_toolkit.utils.context import FileResponse, Request, Response, StreamingResponse
 from forestadmin.flask_agent.utils.requests import convert_request, convert_response
 
 
@@ -96,3 +96,20 @@ class TestResponse(TestCase):
         assert response.headers["Content-Disposition"] == "attachment; filename=test.json"
         assert response.headers["Content-Disposition"] == "attachment; filename=test.json"
         assert response.data == b'{"data": []}'
+
+    def test_streaming_response(self):
+        async def body():
+            yield "id,name\r\n"
+            yield "1,foo\r\n"
+
+        streaming_response = StreamingResponse(
+            200, body(), headers={"content-type": "text/csv", "Content-Disposition": 'attachment; filename="test.csv"'}
+        )
+        response = convert_response(streaming_response)
+
+        assert isinstance(response, FlaskResponse)
+        assert response.is_streamed
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "text/csv"
+        assert response.headers["Content-Disposition"] == 'attachment; filename="test.csv"'
+        assert response.get_data() == b"id,name\r\n1,foo\r\n"